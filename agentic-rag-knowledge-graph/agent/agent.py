@@ -16,6 +16,7 @@ from .tools import (
     vector_search_tool,
     graph_search_tool,
     hybrid_search_tool,
+    comprehensive_search_tool,
     get_document_tool,
     list_documents_tool,
     get_entity_relationships_tool,
@@ -23,6 +24,7 @@ from .tools import (
     VectorSearchInput,
     GraphSearchInput,
     HybridSearchInput,
+    ComprehensiveSearchInput,
     DocumentInput,
     DocumentListInput,
     EntityRelationshipInput,
@@ -46,6 +48,7 @@ class AgentDependencies:
         if self.search_preferences is None:
             self.search_preferences = {
                 "use_vector": True,
+                "use_hybrid": True,
                 "use_graph": True,
                 "default_limit": 10
             }
@@ -178,6 +181,50 @@ async def hybrid_search(
     ]
 
 
+@rag_agent.tool
+async def comprehensive_search(
+    ctx: RunContext[AgentDependencies],
+    query: str,
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Search documents and the knowledge graph at once with fused ranking.
+    
+    This tool runs vector, hybrid and knowledge graph search concurrently
+    and merges them into a single ranked list. Best as the default first
+    search, since one call covers semantic, keyword and relationship matches.
+    
+    Args:
+        query: Search query
+        limit: Maximum number of results to return (1-50)
+    
+    Returns:
+        List of chunks and graph facts ranked by fused relevance score
+    """
+    preferences = ctx.deps.search_preferences
+    input_data = ComprehensiveSearchInput(
+        query=query,
+        limit=limit,
+        use_vector=preferences.get("use_vector", True),
+        use_hybrid=preferences.get("use_hybrid", True),
+        use_graph=preferences.get("use_graph", True)
+    )
+    
+    results = await comprehensive_search_tool(input_data)
+    
+    # Convert results to dict for agent
+    return [
+        {
+            "content": r.content,
+            "score": r.score,
+            "document_title": r.document_title,
+            "document_source": r.document_source,
+            "chunk_id": r.chunk_id
+        }
+        for r in results
+    ]
+
+
 @rag_agent.tool
 async def get_document(
     ctx: RunContext[AgentDependencies],
@@ -255,7 +302,8 @@ async def list_documents(
 async def get_entity_relationships(
     ctx: RunContext[AgentDependencies],
     entity_name: str,
-    depth: int = 2
+    depth: int = 2,
+    relationship_types: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Get all relationships for a specific entity in the knowledge graph.
@@ -267,13 +315,15 @@ async def get_entity_relationships(
     Args:
         entity_name: Name of the entity to explore (e.g., "Google", "OpenAI")
         depth: Maximum traversal depth for relationships (1-5)
+        relationship_types: Relationship types to follow (e.g., ["PARTNERS_WITH"]), optional
     
     Returns:
         Entity relationships and connected entities with relationship types
     """
     input_data = EntityRelationshipInput(
         entity_name=entity_name,
-        depth=depth
+        depth=depth,
+        relationship_types=relationship_types
     )
     
     return await get_entity_relationships_tool(input_data)
@@ -25,10 +25,12 @@ from .db_utils import (
     create_session,
     get_session,
     add_message,
-    get_session_messages,
+    add_conversation_turn,
+    get_recent_messages,
+    session_cache,
     test_connection
 )
-from .graph_utils import initialize_graph, close_graph, test_graph_connection
+from .graph_utils import initialize_graph, close_graph, test_graph_connection, graph_client
 from .models import (
     ChatRequest,
     ChatResponse,
@@ -139,6 +141,10 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 async def get_or_create_session(request: ChatRequest) -> str:
     """Get existing session or create new one."""
     if request.session_id:
+        # Sessions seen by this process skip the lookup round-trip
+        if session_cache.has_session(request.session_id):
+            return request.session_id
+        
         session = await get_session(request.session_id)
         if session:
             return request.session_id
@@ -164,15 +170,7 @@ async def get_conversation_context(
     Returns:
         List of messages
     """
-    messages = await get_session_messages(session_id, limit=max_messages)
-    
-    return [
-        {
-            "role": msg["role"],
-            "content": msg["content"]
-        }
-        for msg in messages
-    ]
+    return await get_recent_messages(session_id, limit=max_messages)
 
 
 def extract_tool_calls(result) -> List[ToolCall]:
@@ -254,7 +252,8 @@ async def save_conversation_turn(
     session_id: str,
     user_message: str,
     assistant_message: str,
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None,
+    assistant_metadata: Optional[Dict[str, Any]] = None
 ):
     """
     Save a conversation turn to the database.
@@ -264,21 +263,15 @@ async def save_conversation_turn(
         user_message: User's message
         assistant_message: Assistant's response
         metadata: Optional metadata
+        assistant_metadata: Optional assistant-specific metadata (defaults to metadata)
     """
-    # Save user message
-    await add_message(
+    # Both messages are written in a single round-trip
+    await add_conversation_turn(
         session_id=session_id,
-        role="user",
-        content=user_message,
-        metadata=metadata or {}
-    )
-    
-    # Save assistant message
-    await add_message(
-        session_id=session_id,
-        role="assistant",
-        content=assistant_message,
-        metadata=metadata or {}
+        user_content=user_message,
+        assistant_content=assistant_message,
+        user_metadata=metadata or {},
+        assistant_metadata=assistant_metadata if assistant_metadata is not None else metadata or {}
     )
 
 
@@ -385,6 +378,17 @@ async def health_check():
         raise HTTPException(status_code=500, detail="Health check failed")
 
 
+@app.get("/graph/statistics")
+async def graph_statistics():
+    """Knowledge graph statistics endpoint."""
+    try:
+        return await graph_client.get_graph_statistics()
+        
+    except Exception as e:
+        logger.error(f"Graph statistics failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """Non-streaming chat endpoint."""
@@ -441,14 +445,6 @@ async def chat_stream(request: ChatRequest):
                     ])
                     full_prompt = f"Previous conversation:\n{context_str}\n\nCurrent question: {request.message}"
                 
-                # Save user message immediately
-                await add_message(
-                    session_id=session_id,
-                    role="user",
-                    content=request.message,
-                    metadata={"user_id": request.user_id}
-                )
-                
                 full_response = ""
                 
                 # Stream using agent.iter() pattern
@@ -486,12 +482,13 @@ async def chat_stream(request: ChatRequest):
                     ]
                     yield f"data: {json.dumps({'type': 'tools', 'tools': tools_data})}\n\n"
                 
-                # Save assistant response
-                await add_message(
+                # Save user message and assistant response together
+                await save_conversation_turn(
                     session_id=session_id,
-                    role="assistant",
-                    content=full_response,
-                    metadata={
+                    user_message=request.message,
+                    assistant_message=full_response,
+                    metadata={"user_id": request.user_id},
+                    assistant_metadata={
                         "streamed": True,
                         "tool_calls": len(tools_used)
                     }
@@ -501,6 +498,19 @@ async def chat_stream(request: ChatRequest):
                 
             except Exception as e:
                 logger.error(f"Stream error: {e}")
+                
+                # Keep the user message in history even when the stream fails;
+                # the error itself is not an assistant turn
+                try:
+                    await add_message(
+                        session_id=session_id,
+                        role="user",
+                        content=request.message,
+                        metadata={"user_id": request.user_id}
+                    )
+                except Exception as save_error:
+                    logger.error(f"Failed to save user message: {save_error}")
+                
                 error_chunk = {
                     "type": "error",
                     "content": f"Stream error: {str(e)}"
@@ -7,6 +7,7 @@ import json
 import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta, timezone
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
 from uuid import UUID
 import logging
@@ -66,9 +67,130 @@ class DatabasePool:
             yield connection
 
 
+class SessionContextCache:
+    """
+    In-process LRU cache of recent conversation messages per session.
+    
+    Writes go through to PostgreSQL first and are then mirrored here, so a
+    warm session never has to re-read its history. The cache is local to the
+    process; it is a read-side optimization, the database stays authoritative.
+    """
+    
+    def __init__(self, max_sessions: int = 1000, max_messages: int = 10):
+        """
+        Initialize session context cache.
+        
+        Args:
+            max_sessions: Maximum number of sessions kept in memory
+            max_messages: Number of most recent messages kept per session
+        """
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
+    def _get_entry(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a live cache entry, evicting it if the session expired."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        
+        expires_at = entry["expires_at"]
+        if expires_at and expires_at <= datetime.now(timezone.utc):
+            del self._sessions[session_id]
+            return None
+        
+        self._sessions.move_to_end(session_id)
+        return entry
+    
+    def _put_entry(self, session_id: str, entry: Dict[str, Any]):
+        """Insert an entry and evict least recently used sessions."""
+        self._sessions[session_id] = entry
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+    
+    def has_session(self, session_id: str) -> bool:
+        """Check whether a live session is known to the cache."""
+        return self._get_entry(session_id) is not None
+    
+    def remember_session(self, session_id: str, expires_at: Optional[datetime] = None):
+        """
+        Record that a session exists, keeping any cached messages.
+        
+        Args:
+            session_id: Session UUID
+            expires_at: Session expiry time
+        """
+        entry = self._get_entry(session_id)
+        if entry is None:
+            self._put_entry(session_id, {"expires_at": expires_at, "messages": None})
+        else:
+            entry["expires_at"] = expires_at
+    
+    def get_messages(self, session_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached recent messages for a session.
+        
+        Args:
+            session_id: Session UUID
+        
+        Returns:
+            Messages oldest first, or None if history is not cached
+        """
+        entry = self._get_entry(session_id)
+        if entry is None or entry["messages"] is None:
+            return None
+        return list(entry["messages"])
+    
+    def set_messages(self, session_id: str, messages: List[Dict[str, Any]]):
+        """
+        Replace cached history for a session.
+        
+        Args:
+            session_id: Session UUID
+            messages: Most recent messages, oldest first
+        """
+        entry = self._get_entry(session_id)
+        expires_at = entry["expires_at"] if entry else None
+        self._put_entry(session_id, {
+            "expires_at": expires_at,
+            "messages": deque(messages, maxlen=self.max_messages)
+        })
+    
+    def append_messages(self, session_id: str, messages: List[Dict[str, Any]]):
+        """
+        Mirror persisted messages into the cache if history is cached.
+        
+        Args:
+            session_id: Session UUID
+            messages: Newly persisted messages, oldest first
+        """
+        entry = self._get_entry(session_id)
+        if entry is not None and entry["messages"] is not None:
+            entry["messages"].extend(messages)
+    
+    def invalidate(self, session_id: Optional[str] = None):
+        """
+        Drop one session or the whole cache.
+        
+        Args:
+            session_id: Session to drop, or None to clear everything
+        """
+        if session_id is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(session_id, None)
+
+
 # Global database pool instance
 db_pool = DatabasePool()
 
+# Global session context cache
+session_cache = SessionContextCache(
+    max_sessions=int(os.getenv("SESSION_CACHE_MAX_SESSIONS", "1000")),
+    max_messages=int(os.getenv("SESSION_CACHE_MAX_MESSAGES", "10"))
+)
+
 
 async def initialize_database():
     """Initialize database connection pool."""
@@ -111,6 +233,10 @@ async def create_session(
             expires_at
         )
         
+        # A brand new session has no history to read back
+        session_cache.remember_session(result["id"], expires_at)
+        session_cache.set_messages(result["id"], [])
+        
         return result["id"]
 
 
@@ -142,6 +268,7 @@ async def get_session(session_id: str) -> Optional[Dict[str, Any]]:
         )
         
         if result:
+            session_cache.remember_session(result["id"], result["expires_at"])
             return {
                 "id": result["id"],
                 "user_id": result["user_id"],
@@ -212,9 +339,59 @@ async def add_message(
             json.dumps(metadata or {})
         )
         
+        session_cache.append_messages(session_id, [{"role": role, "content": content}])
+        
         return result["id"]
 
 
+async def add_conversation_turn(
+    session_id: str,
+    user_content: str,
+    assistant_content: str,
+    user_metadata: Optional[Dict[str, Any]] = None,
+    assistant_metadata: Optional[Dict[str, Any]] = None
+) -> Tuple[str, str]:
+    """
+    Add a user/assistant message pair to a session in a single round-trip.
+    
+    Args:
+        session_id: Session UUID
+        user_content: User message content
+        assistant_content: Assistant message content
+        user_metadata: Optional user message metadata
+        assistant_metadata: Optional assistant message metadata
+    
+    Returns:
+        Tuple of (user message ID, assistant message ID)
+    """
+    async with db_pool.acquire() as conn:
+        # Both rows share one statement (and so one transaction); the
+        # assistant row is offset so created_at ordering stays stable.
+        results = await conn.fetch(
+            """
+            INSERT INTO messages (session_id, role, content, metadata, created_at)
+            VALUES
+                ($1::uuid, 'user', $2, $4, CURRENT_TIMESTAMP),
+                ($1::uuid, 'assistant', $3, $5, CURRENT_TIMESTAMP + INTERVAL '1 microsecond')
+            RETURNING id::text, role
+            """,
+            session_id,
+            user_content,
+            assistant_content,
+            json.dumps(user_metadata or {}),
+            json.dumps(assistant_metadata or {})
+        )
+        
+        ids = {row["role"]: row["id"] for row in results}
+    
+    session_cache.append_messages(session_id, [
+        {"role": "user", "content": user_content},
+        {"role": "assistant", "content": assistant_content}
+    ])
+    
+    return ids["user"], ids["assistant"]
+
+
 async def get_session_messages(
     session_id: str,
     limit: Optional[int] = None
@@ -259,6 +436,46 @@ async def get_session_messages(
         ]
 
 
+async def get_recent_messages(
+    session_id: str,
+    limit: int = 10
+) -> List[Dict[str, str]]:
+    """
+    Get the most recent messages for a session, served from cache when warm.
+    
+    Args:
+        session_id: Session UUID
+        limit: Maximum number of messages to return
+    
+    Returns:
+        List of role/content messages ordered oldest first
+    """
+    cached = session_cache.get_messages(session_id)
+    if cached is not None and (limit <= session_cache.max_messages or len(cached) < session_cache.max_messages):
+        return cached[-limit:] if limit else []
+    
+    async with db_pool.acquire() as conn:
+        results = await conn.fetch(
+            """
+            SELECT role, content
+            FROM messages
+            WHERE session_id = $1::uuid
+            ORDER BY created_at DESC
+            LIMIT $2
+            """,
+            session_id,
+            max(limit, session_cache.max_messages)
+        )
+    
+    messages = [
+        {"role": row["role"], "content": row["content"]}
+        for row in reversed(results)
+    ]
+    session_cache.set_messages(session_id, messages)
+    
+    return messages[-limit:] if limit else []
+
+
 # Document Management Functions
 async def get_document(document_id: str) -> Optional[Dict[str, Any]]:
     """
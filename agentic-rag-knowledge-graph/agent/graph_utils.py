@@ -3,14 +3,18 @@ Graph utilities for Neo4j/Graphiti integration.
 """
 
 import os
+import re
 import json
+import time
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple, Hashable
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 import asyncio
 
+from neo4j import RoutingControl
 from graphiti_core import Graphiti
+from graphiti_core.helpers import DEFAULT_DATABASE
 from graphiti_core.utils.maintenance.graph_data_operations import clear_data
 from graphiti_core.llm_client.config import LLMConfig
 from graphiti_core.llm_client.openai_client import OpenAIClient
@@ -23,6 +27,138 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Entity tool cache configuration
+ENTITY_CACHE_TTL = float(os.getenv("GRAPH_ENTITY_CACHE_TTL", "300"))
+ENTITY_CACHE_MAX_ENTITIES = int(os.getenv("GRAPH_ENTITY_CACHE_MAX_ENTITIES", "1000"))
+MAX_TRAVERSAL_DEPTH = 5
+
+# Graph statistics cache configuration
+GRAPH_STATS_TTL = float(os.getenv("GRAPH_STATS_TTL", "30"))
+
+# Graphiti node labels and relationship types reported in statistics
+GRAPH_NODE_LABELS = ["Entity", "Episodic", "Community"]
+GRAPH_RELATIONSHIP_TYPES = ["RELATES_TO", "MENTIONS", "HAS_MEMBER"]
+
+# Lucene special characters for fulltext index queries
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+
+
+def _to_iso(value: Any) -> Optional[str]:
+    """Convert a Neo4j or Python temporal value to an ISO string."""
+    if value is None:
+        return None
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class EntityResultCache:
+    """
+    TTL cache of entity tool results, grouped per entity.
+    
+    Entries are grouped by the normalized name of the stored entity they
+    were computed for, so that all cached results for an entity can be
+    dropped when new episodes mention it. Names that callers used to reach
+    that entity (other casing, aliases, fulltext matches) are kept as
+    aliases of the group.
+    """
+    
+    def __init__(self, ttl: float = ENTITY_CACHE_TTL, max_entities: int = ENTITY_CACHE_MAX_ENTITIES):
+        """
+        Initialize entity result cache.
+        
+        Args:
+            ttl: Seconds a cached result stays valid
+            max_entities: Maximum number of entities kept in the cache
+        """
+        self.ttl = ttl
+        self.max_entities = max_entities
+        self._entries: Dict[str, Dict[Hashable, Tuple[float, Any]]] = {}
+        self._aliases: Dict[str, str] = {}  # requested name -> stored entity name
+    
+    @staticmethod
+    def _normalize(entity_name: str) -> str:
+        """Normalize an entity name for cache lookups."""
+        return entity_name.strip().lower()
+    
+    def _group(self, entity_name: str) -> str:
+        """Get the entry group a requested name belongs to."""
+        name = self._normalize(entity_name)
+        return self._aliases.get(name, name)
+    
+    def _drop_group(self, name: str):
+        """Drop an entry group and the aliases pointing at it."""
+        self._entries.pop(name, None)
+        for alias in [alias for alias, group in self._aliases.items() if group == name]:
+            del self._aliases[alias]
+    
+    def get(self, entity_name: str, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached result.
+        
+        Args:
+            entity_name: Entity name as requested by the caller
+            key: Query-specific cache key
+        
+        Returns:
+            Cached result or None if missing/expired
+        """
+        results = self._entries.get(self._group(entity_name))
+        if not results or key not in results:
+            return None
+        
+        expires_at, value = results[key]
+        if expires_at <= time.monotonic():
+            del results[key]
+            return None
+        return value
+    
+    def set(
+        self,
+        entity_name: str,
+        key: Hashable,
+        value: Any,
+        resolved_name: Optional[str] = None
+    ):
+        """
+        Cache a result.
+        
+        Args:
+            entity_name: Entity name as requested by the caller
+            key: Query-specific cache key
+            value: Result to cache
+            resolved_name: Stored entity name the result was computed for
+                (defaults to entity_name)
+        """
+        requested = self._normalize(entity_name)
+        name = self._normalize(resolved_name) if resolved_name is not None else requested
+        if name not in self._entries and len(self._entries) >= self.max_entities:
+            # Drop the oldest entity (dicts keep insertion order)
+            self._drop_group(next(iter(self._entries)))
+        if requested != name:
+            self._aliases[requested] = name
+        self._entries.setdefault(name, {})[key] = (time.monotonic() + self.ttl, value)
+    
+    def invalidate(self, entity_names: Optional[List[str]] = None):
+        """
+        Drop cached results.
+        
+        Args:
+            entity_names: Stored entity names to drop, or None to clear everything
+        """
+        if entity_names is None:
+            self._entries.clear()
+            self._aliases.clear()
+            return
+        for entity_name in entity_names:
+            name = self._normalize(entity_name)
+            self._drop_group(name)
+            # A request for this name may now resolve to the new entity
+            self._aliases.pop(name, None)
+
+
 # Help from this PR for setting up the custom clients: https://github.com/getzep/graphiti/pull/601/files
 class GraphitiClient:
     """Manages Graphiti knowledge graph operations."""
@@ -68,6 +204,12 @@ class GraphitiClient:
         
         self.graphiti: Optional[Graphiti] = None
         self._initialized = False
+        
+        # Results of Cypher-backed entity tools
+        self.entity_cache = EntityResultCache()
+        
+        # (expires_at, statistics) from the last get_graph_statistics call
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
     
     async def initialize(self):
         """Initialize Graphiti client."""
@@ -150,7 +292,7 @@ class GraphitiClient:
         # Import EpisodeType for proper source handling
         from graphiti_core.nodes import EpisodeType
         
-        await self.graphiti.add_episode(
+        result = await self.graphiti.add_episode(
             name=episode_id,
             episode_body=content,
             source=EpisodeType.text,  # Always use text type for our content
@@ -158,6 +300,14 @@ class GraphitiClient:
             reference_time=episode_timestamp
         )
         
+        # Cached entity results are stale for every entity the episode touched
+        self._stats_cache = None
+        nodes = getattr(result, "nodes", None)
+        if nodes is None:
+            self.entity_cache.invalidate()
+        else:
+            self.entity_cache.invalidate([node.name for node in nodes])
+        
         logger.info(f"Added episode {episode_id} to knowledge graph")
     
     async def search(
@@ -200,19 +350,78 @@ class GraphitiClient:
             logger.error(f"Graph search failed: {e}")
             return []
     
+    async def _run_read_query(self, cypher: str, **params) -> List[Any]:
+        """
+        Run a read-only Cypher query on the underlying Neo4j driver.
+        
+        Args:
+            cypher: Cypher query
+            **params: Query parameters
+        
+        Returns:
+            Result records
+        """
+        records, _, _ = await self.graphiti.driver.execute_query(
+            cypher,
+            params=params,
+            database_=DEFAULT_DATABASE,
+            routing_=RoutingControl.READ
+        )
+        return records
+    
+    async def _resolve_entity_name(self, entity_name: str) -> Optional[str]:
+        """
+        Resolve a user-supplied name to a stored entity name.
+        
+        Tries an exact match on the indexed name first, then falls back to
+        the Graphiti name/summary fulltext index.
+        
+        Args:
+            entity_name: Entity name as given by the caller
+        
+        Returns:
+            Stored entity name, or None if no entity matches
+        """
+        records = await self._run_read_query(
+            """
+            MATCH (n:Entity {name: $name})
+            RETURN n.name AS name
+            LIMIT 1
+            """,
+            name=entity_name
+        )
+        if records:
+            return records[0]["name"]
+        
+        records = await self._run_read_query(
+            """
+            CALL db.index.fulltext.queryNodes("node_name_and_summary", $search_text, {limit: 1})
+            YIELD node
+            RETURN node.name AS name
+            """,
+            search_text=_LUCENE_SPECIAL.sub(r"\\\1", entity_name)
+        )
+        return records[0]["name"] if records else None
+    
     async def get_related_entities(
         self,
         entity_name: str,
         relationship_types: Optional[List[str]] = None,
-        depth: int = 1
+        depth: int = 1,
+        limit: int = 100
     ) -> Dict[str, Any]:
         """
-        Get entities related to a given entity using Graphiti search.
+        Get entities related to a given entity by traversing the graph.
+        
+        Traverses current (non-expired) RELATES_TO edges hop by hop in
+        Cypher instead of running a semantic search, and caches the result
+        per resolved entity.
         
         Args:
             entity_name: Name of the entity
-            relationship_types: Types of relationships to follow (not used with Graphiti)
-            depth: Maximum depth to traverse (not used with Graphiti)
+            relationship_types: Relationship names to follow (all if None)
+            depth: Maximum depth to traverse (1-5)
+            limit: Maximum number of relationships to return
         
         Returns:
             Related entities and relationships
@@ -220,43 +429,148 @@ class GraphitiClient:
         if not self._initialized:
             await self.initialize()
         
-        # Use Graphiti search to find related information about the entity
-        results = await self.graphiti.search(f"relationships involving {entity_name}")
+        depth = max(1, min(depth, MAX_TRAVERSAL_DEPTH))
+        types = sorted(t.upper() for t in relationship_types) if relationship_types else None
+        cache_key = ("related", depth, tuple(types) if types else None, limit)
         
-        # Extract entity information from the search results
-        related_entities = set()
-        facts = []
+        cached = self.entity_cache.get(entity_name, cache_key)
+        if cached is not None:
+            return cached
         
-        for result in results:
-            facts.append({
-                "fact": result.fact,
-                "uuid": str(result.uuid),
-                "valid_at": str(result.valid_at) if hasattr(result, 'valid_at') and result.valid_at else None
-            })
-            
-            # Simple entity extraction from fact text (could be enhanced)
-            if entity_name.lower() in result.fact.lower():
-                related_entities.add(entity_name)
-        
-        return {
-            "central_entity": entity_name,
-            "related_facts": facts,
-            "search_method": "graphiti_semantic_search"
+        resolved_name = await self._resolve_entity_name(entity_name)
+        relationships = []
+        
+        if resolved_name:
+            relationships = await self._traverse_relationships(resolved_name, depth, types, limit)
+        
+        related_entities = sorted({
+            name
+            for rel in relationships
+            for name in (rel["from"], rel["to"])
+            if name != resolved_name
+        })
+        
+        result = {
+            "central_entity": resolved_name or entity_name,
+            "related_entities": related_entities,
+            "relationships": relationships,
+            "related_facts": [
+                {
+                    "fact": rel["fact"],
+                    "uuid": rel["uuid"],
+                    "valid_at": rel["valid_at"]
+                }
+                for rel in relationships
+            ],
+            "depth": depth,
+            "search_method": "cypher_traversal"
         }
+        
+        if resolved_name:
+            self.entity_cache.set(entity_name, cache_key, result, resolved_name=resolved_name)
+        return result
+    
+    async def _traverse_relationships(
+        self,
+        name: str,
+        depth: int,
+        types: Optional[List[str]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect current RELATES_TO edges within depth hops of an entity.
+        
+        Expands one hop per query from the entities reached by the previous
+        hop, so each relationship is read once rather than once per path
+        through it, and nearer relationships fill the limit first.
+        
+        Args:
+            name: Stored entity name to start from
+            depth: Maximum number of hops
+            types: Relationship names to follow (all if None)
+            limit: Maximum number of relationships to return
+        
+        Returns:
+            Relationships ordered by hop distance
+        """
+        relationships = []
+        seen_edges: List[str] = []
+        visited: Set[str] = set()
+        frontier: Optional[List[str]] = None
+        
+        for _ in range(depth):
+            remaining = limit - len(relationships)
+            if remaining <= 0 or frontier == []:
+                break
+            
+            # The first hop starts from every entity stored under the name
+            start = (
+                "MATCH (n:Entity {name: $name})" if frontier is None
+                else "MATCH (n:Entity) WHERE n.uuid IN $frontier"
+            )
+            records = await self._run_read_query(
+                f"""
+                {start}
+                MATCH (n)-[r:RELATES_TO]-(m:Entity)
+                WHERE r.expired_at IS NULL
+                  AND ($types IS NULL OR r.name IN $types)
+                  AND NOT r.uuid IN $seen
+                WITH r, collect(n.uuid) AS from_uuids, collect(m.uuid) AS to_uuids
+                RETURN startNode(r).name AS source,
+                       endNode(r).name AS target,
+                       r.name AS type,
+                       r.fact AS fact,
+                       r.uuid AS uuid,
+                       r.valid_at AS valid_at,
+                       r.invalid_at AS invalid_at,
+                       from_uuids,
+                       to_uuids
+                LIMIT $limit
+                """,
+                name=name,
+                frontier=frontier,
+                types=types,
+                seen=seen_edges,
+                limit=remaining
+            )
+            
+            reached = set()
+            for record in records:
+                seen_edges.append(record["uuid"])
+                visited.update(record["from_uuids"])
+                reached.update(record["to_uuids"])
+                relationships.append({
+                    "from": record["source"],
+                    "to": record["target"],
+                    "type": record["type"],
+                    "fact": record["fact"],
+                    "uuid": str(record["uuid"]),
+                    "valid_at": _to_iso(record["valid_at"]),
+                    "invalid_at": _to_iso(record["invalid_at"])
+                })
+            frontier = sorted(reached - visited)
+            visited.update(reached)
+        
+        return relationships
     
     async def get_entity_timeline(
         self,
         entity_name: str,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        limit: int = 100
     ) -> List[Dict[str, Any]]:
         """
-        Get timeline of facts for an entity using Graphiti.
+        Get timeline of facts for an entity, newest first.
+        
+        Date bounds and ordering are applied in Cypher against the indexed
+        valid_at property of the entity's relationships.
         
         Args:
             entity_name: Name of the entity
-            start_date: Start of time range (not currently used)
-            end_date: End of time range (not currently used)
+            start_date: Start of time range (inclusive)
+            end_date: End of time range (inclusive)
+            limit: Maximum number of facts to return
         
         Returns:
             Timeline of facts
@@ -264,26 +578,84 @@ class GraphitiClient:
         if not self._initialized:
             await self.initialize()
         
-        # Search for temporal information about the entity
-        results = await self.graphiti.search(f"timeline history of {entity_name}")
+        # Graphiti stores zoned datetimes; naive bounds would never compare
+        if start_date and start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        if end_date and end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
         
+        cache_key = (
+            "timeline",
+            start_date.isoformat() if start_date else None,
+            end_date.isoformat() if end_date else None,
+            limit
+        )
+        
+        cached = self.entity_cache.get(entity_name, cache_key)
+        if cached is not None:
+            return cached
+        
+        resolved_name = await self._resolve_entity_name(entity_name)
         timeline = []
-        for result in results:
-            timeline.append({
-                "fact": result.fact,
-                "uuid": str(result.uuid),
-                "valid_at": str(result.valid_at) if hasattr(result, 'valid_at') and result.valid_at else None,
-                "invalid_at": str(result.invalid_at) if hasattr(result, 'invalid_at') and result.invalid_at else None
-            })
         
-        # Sort by valid_at if available
-        timeline.sort(key=lambda x: x.get('valid_at') or '', reverse=True)
+        if resolved_name:
+            records = await self._run_read_query(
+                """
+                MATCH (:Entity {name: $name})-[e:RELATES_TO]-(:Entity)
+                WHERE ($start_date IS NULL OR e.valid_at >= $start_date)
+                  AND ($end_date IS NULL OR e.valid_at <= $end_date)
+                WITH DISTINCT e
+                RETURN e.fact AS fact,
+                       e.uuid AS uuid,
+                       e.valid_at AS valid_at,
+                       e.invalid_at AS invalid_at
+                ORDER BY e.valid_at IS NULL, e.valid_at DESC
+                LIMIT $limit
+                """,
+                name=resolved_name,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit
+            )
+            
+            timeline = [
+                {
+                    "fact": record["fact"],
+                    "uuid": str(record["uuid"]),
+                    "valid_at": _to_iso(record["valid_at"]),
+                    "invalid_at": _to_iso(record["invalid_at"])
+                }
+                for record in records
+            ]
         
+        if resolved_name:
+            self.entity_cache.set(entity_name, cache_key, timeline, resolved_name=resolved_name)
         return timeline
     
+    async def ping(self) -> bool:
+        """
+        Check Neo4j connectivity with a trivial query.
+        
+        Returns:
+            True if the database answered
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        try:
+            records = await self._run_read_query("RETURN 1 AS ok")
+            return bool(records) and records[0]["ok"] == 1
+        except Exception as e:
+            logger.error(f"Graph ping failed: {e}")
+            return False
+    
     async def get_graph_statistics(self) -> Dict[str, Any]:
         """
-        Get basic statistics about the knowledge graph.
+        Get statistics about the knowledge graph.
+        
+        Counts come from single-label / single-type count queries, which
+        Neo4j answers from its count store without scanning the graph.
+        Results are cached for GRAPH_STATS_TTL seconds.
         
         Returns:
             Graph statistics
@@ -291,20 +663,54 @@ class GraphitiClient:
         if not self._initialized:
             await self.initialize()
         
-        # For now, return a simple search to verify the graph is working
-        # More detailed statistics would require direct Neo4j access
+        if self._stats_cache and self._stats_cache[0] > time.monotonic():
+            return self._stats_cache[1]
+        
+        subqueries = [
+            f"CALL {{ MATCH (n:{label}) RETURN count(n) AS `{label}` }}"
+            for label in GRAPH_NODE_LABELS
+        ] + [
+            f"CALL {{ MATCH ()-[r:{rel_type}]->() RETURN count(r) AS `{rel_type}` }}"
+            for rel_type in GRAPH_RELATIONSHIP_TYPES
+        ]
+        
         try:
-            test_results = await self.graphiti.search("test")
-            return {
-                "graphiti_initialized": True,
-                "sample_search_results": len(test_results),
-                "note": "Detailed statistics require direct Neo4j access"
-            }
+            records = await self._run_read_query(
+                "\n".join(subqueries) + """
+                CALL { MATCH (n) RETURN count(n) AS total_nodes }
+                CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+                CALL {
+                    OPTIONAL MATCH (e:Episodic)
+                    WHERE e.created_at IS NOT NULL
+                    WITH e ORDER BY e.created_at DESC LIMIT 1
+                    RETURN e.created_at AS last_episode_at
+                }
+                RETURN *
+                """
+            )
         except Exception as e:
+            logger.error(f"Failed to get graph statistics: {e}")
             return {
-                "graphiti_initialized": False,
+                "graphiti_initialized": self._initialized,
                 "error": str(e)
             }
+        
+        record = records[0] if records else {}
+        
+        stats = {
+            "graphiti_initialized": True,
+            "total_nodes": record.get("total_nodes", 0),
+            "total_relationships": record.get("total_relationships", 0),
+            "nodes_by_label": {label: record.get(label, 0) for label in GRAPH_NODE_LABELS},
+            "relationships_by_type": {
+                rel_type: record.get(rel_type, 0) for rel_type in GRAPH_RELATIONSHIP_TYPES
+            },
+            "last_episode_at": _to_iso(record.get("last_episode_at")),
+            "computed_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        self._stats_cache = (time.monotonic() + GRAPH_STATS_TTL, stats)
+        return stats
     
     async def clear_graph(self):
         """Clear all data from the graph (USE WITH CAUTION)."""
@@ -314,6 +720,8 @@ class GraphitiClient:
         try:
             # Use Graphiti's proper clear_data function with the driver
             await clear_data(self.graphiti.driver)
+            self.entity_cache.invalidate()
+            self._stats_cache = None
             logger.warning("Cleared all data from knowledge graph")
         except Exception as e:
             logger.error(f"Failed to clear graph using clear_data: {e}")
@@ -349,6 +757,8 @@ class GraphitiClient:
                 cross_encoder=OpenAIRerankerClient(client=llm_client, config=llm_config)
             )
             await self.graphiti.build_indices_and_constraints()
+            self.entity_cache.invalidate()
+            self._stats_cache = None
             
             logger.warning("Reinitialized Graphiti client (fresh indices created)")
 
@@ -416,7 +826,8 @@ async def search_knowledge_graph(
 
 async def get_entity_relationships(
     entity: str,
-    depth: int = 2
+    depth: int = 2,
+    relationship_types: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Get relationships for an entity.
@@ -424,11 +835,16 @@ async def get_entity_relationships(
     Args:
         entity: Entity name
         depth: Maximum traversal depth
+        relationship_types: Relationship names to follow (all if None)
     
     Returns:
         Entity relationships
     """
-    return await graph_client.get_related_entities(entity, depth=depth)
+    return await graph_client.get_related_entities(
+        entity,
+        relationship_types=relationship_types,
+        depth=depth
+    )
 
 
 async def test_graph_connection() -> bool:
@@ -440,9 +856,7 @@ async def test_graph_connection() -> bool:
     """
     try:
         await graph_client.initialize()
-        stats = await graph_client.get_graph_statistics()
-        logger.info(f"Graph connection successful. Stats: {stats}")
-        return True
+        return await graph_client.ping()
     except Exception as e:
         logger.error(f"Graph connection test failed: {e}")
         return False
\ No newline at end of file
@@ -207,6 +207,7 @@ class IngestionConfig(BaseModel):
     chunk_overlap: int = Field(default=200, ge=0, le=1000)
     max_chunk_size: int = Field(default=2000, ge=500, le=10000)
     use_semantic_chunking: bool = True
+    use_local_chunking: bool = Field(default=False, description="Split long sections with a local sentence model instead of the LLM")
     extract_entities: bool = True
     # New option for faster ingestion
     skip_graph_building: bool = Field(default=False, description="Skip knowledge graph building for faster ingestion")
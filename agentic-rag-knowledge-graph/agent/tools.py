@@ -4,7 +4,7 @@ Tools for the Pydantic AI agent.
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable
 from datetime import datetime
 import asyncio
 
@@ -35,6 +35,10 @@ logger = logging.getLogger(__name__)
 embedding_client = get_embedding_client()
 EMBEDDING_MODEL = get_embedding_model()
 
+# Comprehensive retrieval configuration
+COMPREHENSIVE_SEARCH_TIMEOUT = float(os.getenv("COMPREHENSIVE_SEARCH_TIMEOUT", "10"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+
 
 async def generate_embedding(text: str) -> List[float]:
     """
@@ -76,6 +80,17 @@ class HybridSearchInput(BaseModel):
     text_weight: float = Field(default=0.3, description="Weight for text similarity (0-1)")
 
 
+class ComprehensiveSearchInput(BaseModel):
+    """Input for comprehensive retrieval tool."""
+    query: str = Field(..., description="Search query")
+    limit: int = Field(default=10, description="Maximum number of fused results")
+    text_weight: float = Field(default=0.3, description="Weight for text similarity in hybrid search (0-1)")
+    use_vector: bool = Field(default=True, description="Include vector search")
+    use_hybrid: bool = Field(default=True, description="Include hybrid search")
+    use_graph: bool = Field(default=True, description="Include knowledge graph search")
+    timeout: float = Field(default=COMPREHENSIVE_SEARCH_TIMEOUT, description="Timeout in seconds applied to each source")
+
+
 class DocumentInput(BaseModel):
     """Input for document retrieval."""
     document_id: str = Field(..., description="Document ID to retrieve")
@@ -91,6 +106,7 @@ class EntityRelationshipInput(BaseModel):
     """Input for entity relationship query."""
     entity_name: str = Field(..., description="Name of the entity")
     depth: int = Field(default=2, description="Maximum traversal depth")
+    relationship_types: Optional[List[str]] = Field(None, description="Relationship types to follow (all if omitted)")
 
 
 class EntityTimelineInput(BaseModel):
@@ -100,6 +116,124 @@ class EntityTimelineInput(BaseModel):
     end_date: Optional[str] = Field(None, description="End date (ISO format)")
 
 
+def _to_chunk_results(results: List[Dict[str, Any]], score_key: str) -> List[ChunkResult]:
+    """
+    Convert database search rows to ChunkResult models.
+    
+    Args:
+        results: Rows returned by vector_search or hybrid_search
+        score_key: Row key holding the relevance score
+    
+    Returns:
+        List of ChunkResult models
+    """
+    return [
+        ChunkResult(
+            chunk_id=str(r["chunk_id"]),
+            document_id=str(r["document_id"]),
+            content=r["content"],
+            score=r[score_key],
+            metadata=r["metadata"],
+            document_title=r["document_title"],
+            document_source=r["document_source"]
+        )
+        for r in results
+    ]
+
+
+def _graph_to_chunk_results(results: List[GraphSearchResult]) -> List[ChunkResult]:
+    """
+    Represent knowledge graph facts as ChunkResult models for rank fusion.
+    
+    Args:
+        results: Graph search results
+    
+    Returns:
+        List of ChunkResult models keyed by fact UUID
+    """
+    return [
+        ChunkResult(
+            chunk_id=r.uuid,
+            document_id=r.source_node_uuid or r.uuid,
+            content=r.fact,
+            score=1.0,
+            metadata={
+                "source": "graph",
+                "valid_at": r.valid_at,
+                "invalid_at": r.invalid_at
+            },
+            document_title="Knowledge Graph",
+            document_source="graphiti"
+        )
+        for r in results
+    ]
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[ChunkResult]],
+    limit: int = 10,
+    k: int = RRF_K
+) -> List[ChunkResult]:
+    """
+    Fuse ranked result lists with reciprocal rank fusion.
+    
+    Each result scores sum(1 / (k + rank)) over the lists it appears in,
+    deduplicated by chunk_id. Scores are normalized so a result ranked
+    first by every list scores 1.0.
+    
+    Args:
+        result_lists: Ranked result lists (best first)
+        limit: Maximum number of fused results
+        k: RRF smoothing constant
+    
+    Returns:
+        Fused results ordered by RRF score (best first)
+    """
+    scores: Dict[str, float] = {}
+    best: Dict[str, ChunkResult] = {}
+    
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            scores[result.chunk_id] = scores.get(result.chunk_id, 0.0) + 1.0 / (k + rank)
+            best.setdefault(result.chunk_id, result)
+    
+    if not scores:
+        return []
+    
+    max_score = len(result_lists) / (k + 1)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    
+    return [
+        best[chunk_id].model_copy(update={"score": score / max_score})
+        for chunk_id, score in ranked
+    ]
+
+
+async def _with_timeout(
+    source: str,
+    coro: Awaitable[List[Any]],
+    timeout: float
+) -> List[Any]:
+    """
+    Await one retrieval source, returning no results on timeout or failure.
+    
+    Args:
+        source: Source name for logging
+        coro: Search coroutine
+        timeout: Timeout in seconds
+    
+    Returns:
+        Search results, or an empty list
+    """
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"{source} search timed out after {timeout}s")
+    except Exception as e:
+        logger.error(f"{source} search failed: {e}")
+    return []
+
+
 # Tool Implementation Functions
 async def vector_search_tool(input_data: VectorSearchInput) -> List[ChunkResult]:
     """
@@ -122,18 +256,7 @@ async def vector_search_tool(input_data: VectorSearchInput) -> List[ChunkResult]
         )
 
         # Convert to ChunkResult models
-        return [
-            ChunkResult(
-                chunk_id=str(r["chunk_id"]),
-                document_id=str(r["document_id"]),
-                content=r["content"],
-                score=r["similarity"],
-                metadata=r["metadata"],
-                document_title=r["document_title"],
-                document_source=r["document_source"]
-            )
-            for r in results
-        ]
+        return _to_chunk_results(results, "similarity")
         
     except Exception as e:
         logger.error(f"Vector search failed: {e}")
@@ -195,24 +318,90 @@ async def hybrid_search_tool(input_data: HybridSearchInput) -> List[ChunkResult]
         )
         
         # Convert to ChunkResult models
-        return [
-            ChunkResult(
-                chunk_id=str(r["chunk_id"]),
-                document_id=str(r["document_id"]),
-                content=r["content"],
-                score=r["combined_score"],
-                metadata=r["metadata"],
-                document_title=r["document_title"],
-                document_source=r["document_source"]
-            )
-            for r in results
-        ]
+        return _to_chunk_results(results, "combined_score")
         
     except Exception as e:
         logger.error(f"Hybrid search failed: {e}")
         return []
 
 
+async def comprehensive_search_tool(input_data: ComprehensiveSearchInput) -> List[ChunkResult]:
+    """
+    Run vector, hybrid and graph search concurrently and fuse the results.
+    
+    The query is embedded once and shared by the vector and hybrid searches,
+    while graph search starts immediately alongside the embedding call. Each
+    source is bounded by its own timeout so a slow source only drops its own
+    results.
+    
+    Args:
+        input_data: Search parameters
+    
+    Returns:
+        Results fused with reciprocal rank fusion (best first)
+    """
+    # Graph search does not need our embedding, so start it right away
+    graph_task = None
+    if input_data.use_graph:
+        graph_task = asyncio.create_task(_with_timeout(
+            "Graph",
+            search_knowledge_graph(query=input_data.query),
+            input_data.timeout
+        ))
+    
+    # (score key, search coroutine) pairs sharing one query embedding
+    chunk_searches = []
+    if input_data.use_vector or input_data.use_hybrid:
+        embedding = await _with_timeout(
+            "Embedding",
+            generate_embedding(input_data.query),
+            input_data.timeout
+        )
+        
+        if embedding:
+            if input_data.use_vector:
+                chunk_searches.append(("similarity", _with_timeout(
+                    "Vector",
+                    vector_search(embedding=embedding, limit=input_data.limit),
+                    input_data.timeout
+                )))
+            if input_data.use_hybrid:
+                chunk_searches.append(("combined_score", _with_timeout(
+                    "Hybrid",
+                    hybrid_search(
+                        embedding=embedding,
+                        query_text=input_data.query,
+                        limit=input_data.limit,
+                        text_weight=input_data.text_weight
+                    ),
+                    input_data.timeout
+                )))
+    
+    chunk_rows = await asyncio.gather(*(coro for _, coro in chunk_searches))
+    result_lists = [
+        _to_chunk_results(rows, score_key)
+        for (score_key, _), rows in zip(chunk_searches, chunk_rows)
+    ]
+    
+    if graph_task is not None:
+        graph_rows = await graph_task
+        result_lists.append(_graph_to_chunk_results([
+            GraphSearchResult(
+                fact=r["fact"],
+                uuid=r["uuid"],
+                valid_at=r.get("valid_at"),
+                invalid_at=r.get("invalid_at"),
+                source_node_uuid=r.get("source_node_uuid")
+            )
+            for r in graph_rows
+        ]))
+    
+    return reciprocal_rank_fusion(
+        [results for results in result_lists if results],
+        limit=input_data.limit
+    )
+
+
 async def get_document_tool(input_data: DocumentInput) -> Optional[Dict[str, Any]]:
     """
     Retrieve a complete document.
@@ -286,7 +475,8 @@ async def get_entity_relationships_tool(input_data: EntityRelationshipInput) ->
     try:
         return await get_entity_relationships(
             entity=input_data.entity_name,
-            depth=input_data.depth
+            depth=input_data.depth,
+            relationship_types=input_data.relationship_types
         )
         
     except Exception as e:
@@ -344,6 +534,8 @@ async def perform_comprehensive_search(
     """
     Perform a comprehensive search using multiple methods.
     
+    See comprehensive_search_tool for a single fused, ranked result list.
+    
     Args:
         query: Search query
         use_vector: Whether to use vector search
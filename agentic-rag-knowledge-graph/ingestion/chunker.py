@@ -5,6 +5,7 @@ Semantic chunking implementation for intelligent document splitting.
 import os
 import re
 import logging
+import importlib.util
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import asyncio
@@ -40,6 +41,12 @@ class ChunkingConfig:
     min_chunk_size: int = 100
     use_semantic_splitting: bool = True
     preserve_structure: bool = True
+    # Local embedding-based splitting (no API calls for splittable sections)
+    use_local_splitting: bool = False
+    local_model_name: str = "all-MiniLM-L6-v2"
+    breakpoint_percentile: float = 10.0
+    embedding_batch_size: int = 64
+    llm_refinement: bool = True
     
     def __post_init__(self):
         """Validate configuration."""
@@ -47,6 +54,8 @@ class ChunkingConfig:
             raise ValueError("Chunk overlap must be less than chunk size")
         if self.min_chunk_size <= 0:
             raise ValueError("Minimum chunk size must be positive")
+        if not 0 <= self.breakpoint_percentile <= 100:
+            raise ValueError("Breakpoint percentile must be between 0 and 100")
 
 
 @dataclass
@@ -69,6 +78,8 @@ class DocumentChunk:
 class SemanticChunker:
     """Semantic document chunker using LLM for intelligent splitting."""
     
+    chunk_method = "semantic"
+    
     def __init__(self, config: ChunkingConfig):
         """
         Initialize chunker.
@@ -326,7 +337,7 @@ class SemanticChunker:
             # Create chunk metadata
             chunk_metadata = {
                 **base_metadata,
-                "chunk_method": "semantic" if self.config.use_semantic_splitting else "simple",
+                "chunk_method": self.chunk_method if self.config.use_semantic_splitting else "simple",
                 "total_chunks": len(chunks)
             }
             
@@ -343,6 +354,183 @@ class SemanticChunker:
         return chunk_objects
 
 
+class LocalSemanticChunker(SemanticChunker):
+    """
+    Semantic chunker that splits long sections locally.
+    
+    Boundaries are placed where the embedding similarity between adjacent
+    sentences drops, using a small sentence-transformers model. Sections
+    are still grouped by markdown structure first; the LLM is only used
+    for sections that cannot be split at sentence boundaries.
+    """
+    
+    chunk_method = "local_semantic"
+    
+    # Sentence models shared across chunker instances, keyed by name
+    _models: Dict[str, Any] = {}
+    
+    _sentence_pattern = re.compile(r'(?<=[.!?])\s+|\n+')
+    
+    def __init__(self, config: ChunkingConfig):
+        """
+        Initialize chunker.
+        
+        Args:
+            config: Chunking configuration
+        """
+        super().__init__(config)
+        self._local_available = importlib.util.find_spec("sentence_transformers") is not None
+        if not self._local_available:
+            fallback = "LLM splitting" if config.llm_refinement else "simple splitting"
+            logger.warning(
+                f"sentence-transformers not installed, long sections will use {fallback}"
+            )
+    
+    def _get_model(self):
+        """Load (once) and return the local sentence embedding model."""
+        name = self.config.local_model_name
+        if name not in self._models:
+            from sentence_transformers import SentenceTransformer
+            self._models[name] = SentenceTransformer(name, device="cpu")
+        return self._models[name]
+    
+    def _split_sentences(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Split text into sentence spans.
+        
+        Args:
+            text: Text to split
+        
+        Returns:
+            List of (start, end) character spans of non-empty sentences
+        """
+        spans = []
+        start = 0
+        for match in self._sentence_pattern.finditer(text):
+            if text[start:match.start()].strip():
+                spans.append((start, match.start()))
+            start = match.end()
+        if text[start:].strip():
+            spans.append((start, len(text)))
+        return spans
+    
+    def _embed_sentences(self, sentences: List[str]):
+        """
+        Embed sentences in batches.
+        
+        Args:
+            sentences: Sentences to embed
+        
+        Returns:
+            Array of L2-normalized embeddings, one row per sentence
+        """
+        return self._get_model().encode(
+            sentences,
+            batch_size=self.config.embedding_batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+    
+    def _find_boundaries(self, spans: List[Tuple[int, int]], embeddings) -> Optional[List[int]]:
+        """
+        Choose chunk boundaries from adjacent-sentence similarity drops.
+        
+        Args:
+            spans: Sentence spans of the section
+            embeddings: Normalized sentence embeddings
+        
+        Returns:
+            Sentence indices where chunks end, or None if the section
+            cannot be split within max_chunk_size
+        """
+        import numpy as np
+        
+        starts = np.array([start for start, _ in spans])
+        ends = np.array([end for _, end in spans])
+        if (ends - starts).max() > self.config.max_chunk_size:
+            return None
+        
+        # similarities[i] compares sentence i with sentence i + 1
+        similarities = np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:])
+        threshold = np.percentile(similarities, self.config.breakpoint_percentile)
+        
+        boundaries = []
+        start = 0
+        n = len(spans)
+        
+        while start < n:
+            # sizes[j] is the chunk length when ending after sentence start + j
+            sizes = ends[start:] - starts[start]
+            if sizes[-1] <= self.config.chunk_size:
+                boundaries.append(n)
+                break
+            
+            # Candidate exclusive end indices within the size window
+            candidates = np.arange(start + 1, n)
+            candidate_sizes = sizes[:-1]
+            window = (candidate_sizes >= self.config.min_chunk_size) & (candidate_sizes <= self.config.chunk_size)
+            if not window.any():
+                window = candidate_sizes <= self.config.max_chunk_size
+            candidates = candidates[window]
+            
+            if len(candidates) == 0:
+                # Next sentence alone fills the chunk
+                end = start + 1
+            else:
+                candidate_similarities = similarities[candidates - 1]
+                drops = candidates[candidate_similarities <= threshold]
+                end = int(drops[0]) if len(drops) else int(candidates[np.argmin(candidate_similarities)])
+            
+            boundaries.append(end)
+            start = end
+        
+        # Fold a short trailing chunk into its predecessor when it fits
+        if len(boundaries) > 1:
+            last_start = boundaries[-2]
+            previous_start = boundaries[-3] if len(boundaries) > 2 else 0
+            if (ends[-1] - starts[last_start] < self.config.min_chunk_size and
+                    ends[-1] - starts[previous_start] <= self.config.max_chunk_size):
+                del boundaries[-2]
+        
+        return boundaries
+    
+    async def _split_long_section(self, section: str) -> List[str]:
+        """
+        Split a long section at sentence-similarity drops.
+        
+        Args:
+            section: Section to split
+        
+        Returns:
+            List of sub-chunks
+        """
+        spans = self._split_sentences(section)
+        
+        boundaries = None
+        if self._local_available and len(spans) > 1:
+            try:
+                sentences = [section[start:end] for start, end in spans]
+                embeddings = await asyncio.to_thread(self._embed_sentences, sentences)
+                boundaries = self._find_boundaries(spans, embeddings)
+            except Exception as e:
+                logger.error(f"Local semantic splitting failed: {e}")
+        
+        if boundaries is None:
+            if self.config.llm_refinement:
+                return await super()._split_long_section(section)
+            return self._simple_split(section)
+        
+        # Slice the original text so chunks can be located in the document
+        chunks = []
+        start = 0
+        for end in boundaries:
+            chunks.append(section[spans[start][0]:spans[end - 1][1]].strip())
+            start = end
+        
+        return chunks
+
+
 class SimpleChunker:
     """Simple non-semantic chunker for faster processing."""
     
@@ -460,7 +648,9 @@ def create_chunker(config: ChunkingConfig):
     Returns:
         Chunker instance
     """
-    if config.use_semantic_splitting:
+    if config.use_semantic_splitting and config.use_local_splitting:
+        return LocalSemanticChunker(config)
+    elif config.use_semantic_splitting:
         return SemanticChunker(config)
     else:
         return SimpleChunker(config)
@@ -65,7 +65,8 @@ class DocumentIngestionPipeline:
             chunk_size=config.chunk_size,
             chunk_overlap=config.chunk_overlap,
             max_chunk_size=config.max_chunk_size,
-            use_semantic_splitting=config.use_semantic_chunking
+            use_semantic_splitting=config.use_semantic_chunking,
+            use_local_splitting=config.use_local_chunking
         )
         
         self.chunker = create_chunker(self.chunker_config)
@@ -410,6 +411,7 @@ async def main():
     parser.add_argument("--chunk-size", type=int, default=1000, help="Chunk size for splitting documents")
     parser.add_argument("--chunk-overlap", type=int, default=200, help="Chunk overlap size")
     parser.add_argument("--no-semantic", action="store_true", help="Disable semantic chunking")
+    parser.add_argument("--local-semantic", action="store_true", help="Use local sentence-embedding splitting instead of the LLM")
     parser.add_argument("--no-entities", action="store_true", help="Disable entity extraction")
     parser.add_argument("--fast", "-f", action="store_true", help="Fast mode: skip knowledge graph building")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
@@ -428,6 +430,7 @@ async def main():
         chunk_size=args.chunk_size,
         chunk_overlap=args.chunk_overlap,
         use_semantic_chunking=not args.no_semantic,
+        use_local_chunking=args.local_semantic,
         extract_entities=not args.no_entities,
         skip_graph_building=args.fast
     )
@@ -10,10 +10,14 @@ from datetime import datetime, timezone, timedelta
 
 from agent.db_utils import (
     DatabasePool,
+    SessionContextCache,
+    session_cache,
     create_session,
     get_session,
     update_session,
     add_message,
+    add_conversation_turn,
+    get_recent_messages,
     get_session_messages,
     get_document,
     list_documents,
@@ -236,6 +240,126 @@ class TestMessageManagement:
             mock_conn.fetch.assert_called_once()
 
 
+    @pytest.mark.asyncio
+    async def test_add_conversation_turn(self):
+        """Test adding a user/assistant pair in one round-trip."""
+        session_cache.invalidate()
+        session_cache.set_messages("session-123", [])
+        
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            mock_conn = AsyncMock()
+            mock_conn.fetch.return_value = [
+                {"id": "message-1", "role": "user"},
+                {"id": "message-2", "role": "assistant"}
+            ]
+            mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+            mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+            
+            user_id, assistant_id = await add_conversation_turn(
+                session_id="session-123",
+                user_content="Hello",
+                assistant_content="Hi there!",
+                assistant_metadata={"tool_calls": 0}
+            )
+            
+            assert (user_id, assistant_id) == ("message-1", "message-2")
+            mock_conn.fetch.assert_called_once()
+            
+            call_args = mock_conn.fetch.call_args
+            assert "INSERT INTO messages" in call_args[0][0]
+            assert call_args[0][2] == "Hello"
+            assert call_args[0][3] == "Hi there!"
+            assert json.loads(call_args[0][5]) == {"tool_calls": 0}
+        
+        assert session_cache.get_messages("session-123") == [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there!"}
+        ]
+        session_cache.invalidate()
+    
+    @pytest.mark.asyncio
+    async def test_get_recent_messages_cached(self):
+        """Test recent messages are served from cache without a query."""
+        session_cache.invalidate()
+        session_cache.set_messages("session-123", [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there!"}
+        ])
+        
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            messages = await get_recent_messages("session-123", limit=1)
+            
+            assert messages == [{"role": "assistant", "content": "Hi there!"}]
+            mock_pool.acquire.assert_not_called()
+        
+        session_cache.invalidate()
+    
+    @pytest.mark.asyncio
+    async def test_get_recent_messages_loads_cache(self):
+        """Test a cache miss loads newest messages and populates the cache."""
+        session_cache.invalidate()
+        
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            mock_conn = AsyncMock()
+            mock_conn.fetch.return_value = [
+                {"role": "assistant", "content": "Hi there!"},
+                {"role": "user", "content": "Hello"}
+            ]
+            mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+            mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+            
+            messages = await get_recent_messages("session-123", limit=10)
+            
+            assert [msg["role"] for msg in messages] == ["user", "assistant"]
+            assert "ORDER BY created_at DESC" in mock_conn.fetch.call_args[0][0]
+        
+        assert session_cache.get_messages("session-123") == messages
+        session_cache.invalidate()
+
+
+class TestSessionContextCache:
+    """Test in-process session context cache."""
+    
+    def test_append_only_when_history_cached(self):
+        """Test write-through ignores sessions without cached history."""
+        cache = SessionContextCache()
+        
+        cache.append_messages("session-1", [{"role": "user", "content": "Hello"}])
+        assert cache.get_messages("session-1") is None
+        
+        cache.set_messages("session-1", [])
+        cache.append_messages("session-1", [{"role": "user", "content": "Hello"}])
+        assert cache.get_messages("session-1") == [{"role": "user", "content": "Hello"}]
+    
+    def test_keeps_most_recent_messages(self):
+        """Test history is trimmed to max_messages."""
+        cache = SessionContextCache(max_messages=2)
+        cache.set_messages("session-1", [
+            {"role": "user", "content": str(i)} for i in range(5)
+        ])
+        
+        assert [msg["content"] for msg in cache.get_messages("session-1")] == ["3", "4"]
+    
+    def test_evicts_least_recently_used(self):
+        """Test LRU eviction once max_sessions is exceeded."""
+        cache = SessionContextCache(max_sessions=2)
+        cache.set_messages("session-1", [])
+        cache.set_messages("session-2", [])
+        cache.get_messages("session-1")
+        cache.set_messages("session-3", [])
+        
+        assert cache.has_session("session-1")
+        assert not cache.has_session("session-2")
+        assert cache.has_session("session-3")
+    
+    def test_expired_session_dropped(self):
+        """Test expired sessions are not served."""
+        cache = SessionContextCache()
+        cache.remember_session("session-1", datetime.now(timezone.utc) - timedelta(minutes=1))
+        
+        assert not cache.has_session("session-1")
+
+
 class TestDocumentManagement:
     """Test document management functions."""
     
@@ -0,0 +1,254 @@
+"""
+Tests for graph utilities.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from datetime import datetime, timezone
+
+from agent.graph_utils import (
+    GraphitiClient,
+    EntityResultCache,
+    test_graph_connection as graph_test_connection
+)
+
+
+@pytest.fixture
+def graph_client():
+    """Graphiti client with a mocked Neo4j driver."""
+    client = GraphitiClient()
+    client.graphiti = Mock()
+    client.graphiti.driver.execute_query = AsyncMock()
+    client.graphiti.search = AsyncMock()
+    client._initialized = True
+    return client
+
+
+def query_results(*record_lists):
+    """Build execute_query return values from record lists."""
+    return [(records, None, None) for records in record_lists]
+
+
+class TestEntityResultCache:
+    """Test entity result cache."""
+    
+    def test_get_set_normalizes_names(self):
+        """Test entries are shared across name casing."""
+        cache = EntityResultCache(ttl=60)
+        cache.set("Google", "key", {"value": 1})
+        
+        assert cache.get(" google ", "key") == {"value": 1}
+        assert cache.get("Google", "other") is None
+    
+    def test_expired_entries_dropped(self):
+        """Test expired entries are not served."""
+        cache = EntityResultCache(ttl=0)
+        cache.set("Google", "key", {"value": 1})
+        
+        assert cache.get("Google", "key") is None
+    
+    def test_invalidate_entities(self):
+        """Test invalidating selected entities and everything."""
+        cache = EntityResultCache(ttl=60)
+        cache.set("Google", "key", 1)
+        cache.set("Microsoft", "key", 2)
+        
+        cache.invalidate(["google"])
+        assert cache.get("Google", "key") is None
+        assert cache.get("Microsoft", "key") == 2
+        
+        cache.invalidate()
+        assert cache.get("Microsoft", "key") is None
+    
+    def test_aliases_follow_resolved_entity(self):
+        """Test results cached for a resolved name are invalidated through it."""
+        cache = EntityResultCache(ttl=60)
+        cache.set("msft", "key", 1, resolved_name="Microsoft")
+        
+        assert cache.get("MSFT", "key") == 1
+        assert cache.get("Microsoft", "key") == 1
+        
+        cache.invalidate(["Microsoft"])
+        assert cache.get("msft", "key") is None
+    
+    def test_invalidate_drops_alias_for_new_entity(self):
+        """Test a name no longer maps to its old match once an entity takes that name."""
+        cache = EntityResultCache(ttl=60)
+        cache.set("Finance", "key", 1, resolved_name="FinanceHub")
+        
+        cache.invalidate(["finance"])
+        assert cache.get("Finance", "key") is None
+        assert cache.get("FinanceHub", "key") == 1
+
+
+class TestEntityQueries:
+    """Test Cypher-backed entity tools."""
+    
+    @pytest.mark.asyncio
+    async def test_get_related_entities(self, graph_client):
+        """Test traversal results, depth clamping and caching."""
+        graph_client.graphiti.driver.execute_query.side_effect = query_results(
+            [{"name": "Google"}],
+            [{
+                "source": "Google",
+                "target": "DeepMind",
+                "type": "OWNS",
+                "fact": "Google owns DeepMind",
+                "uuid": "edge-1",
+                "valid_at": datetime(2014, 1, 26, tzinfo=timezone.utc),
+                "invalid_at": None,
+                "from_uuids": ["node-google"],
+                "to_uuids": ["node-deepmind"]
+            }],
+            []
+        )
+        
+        result = await graph_client.get_related_entities("Google", relationship_types=["owns"], depth=10)
+        
+        assert result["related_entities"] == ["DeepMind"]
+        assert result["relationships"][0]["type"] == "OWNS"
+        assert result["relationships"][0]["valid_at"] == "2014-01-26T00:00:00+00:00"
+        assert result["depth"] == 5
+        
+        # The second hop starts from the reached entity and skips seen edges;
+        # it finds nothing, so the traversal stops before depth 5
+        execute_query = graph_client.graphiti.driver.execute_query
+        assert execute_query.call_count == 3
+        second_hop = execute_query.call_args.kwargs["params"]
+        assert second_hop["frontier"] == ["node-deepmind"]
+        assert second_hop["seen"] == ["edge-1"]
+        assert second_hop["types"] == ["OWNS"]
+        graph_client.graphiti.search.assert_not_called()
+        
+        # Second call is served from cache
+        again = await graph_client.get_related_entities("google", relationship_types=["OWNS"], depth=5)
+        assert again == result
+        assert execute_query.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_get_related_entities_stops_at_limit(self, graph_client):
+        """Test later hops are not queried once the limit is reached."""
+        graph_client.graphiti.driver.execute_query.side_effect = query_results(
+            [{"name": "Google"}],
+            [{
+                "source": "Google",
+                "target": "DeepMind",
+                "type": "OWNS",
+                "fact": "Google owns DeepMind",
+                "uuid": "edge-1",
+                "valid_at": None,
+                "invalid_at": None,
+                "from_uuids": ["node-google"],
+                "to_uuids": ["node-deepmind"]
+            }]
+        )
+        
+        result = await graph_client.get_related_entities("Google", depth=3, limit=1)
+        
+        assert len(result["relationships"]) == 1
+        assert graph_client.graphiti.driver.execute_query.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_related_entities_unknown(self, graph_client):
+        """Test unknown entities return an empty result."""
+        graph_client.graphiti.driver.execute_query.side_effect = query_results([], [])
+        
+        result = await graph_client.get_related_entities("Nobody")
+        
+        assert result["central_entity"] == "Nobody"
+        assert result["relationships"] == []
+    
+    @pytest.mark.asyncio
+    async def test_get_entity_timeline_bounds(self, graph_client):
+        """Test date bounds are passed to Cypher as zoned datetimes."""
+        graph_client.graphiti.driver.execute_query.side_effect = query_results(
+            [{"name": "Microsoft"}],
+            [{"fact": "Microsoft invests in OpenAI", "uuid": "edge-1", "valid_at": None, "invalid_at": None}]
+        )
+        
+        timeline = await graph_client.get_entity_timeline(
+            "Microsoft",
+            start_date=datetime(2019, 1, 1)
+        )
+        
+        assert timeline[0]["fact"] == "Microsoft invests in OpenAI"
+        params = graph_client.graphiti.driver.execute_query.call_args.kwargs["params"]
+        assert params["start_date"] == datetime(2019, 1, 1, tzinfo=timezone.utc)
+        assert params["end_date"] is None
+    
+    @pytest.mark.asyncio
+    async def test_add_episode_invalidates_mentioned_entities(self, graph_client):
+        """Test adding an episode drops cached results for its entities."""
+        graph_client.entity_cache.set("Google", "key", 1)
+        graph_client.entity_cache.set("Apple", "key", 2)
+        
+        node = Mock()
+        node.name = "Google"
+        graph_client.graphiti.add_episode = AsyncMock(return_value=Mock(nodes=[node]))
+        
+        await graph_client.add_episode("ep-1", "Google acquired a startup", "news")
+        
+        assert graph_client.entity_cache.get("Google", "key") is None
+        assert graph_client.entity_cache.get("Apple", "key") == 2
+    
+    @pytest.mark.asyncio
+    async def test_add_episode_invalidates_resolved_aliases(self, graph_client):
+        """Test results requested under another name are dropped with the stored entity."""
+        graph_client.graphiti.driver.execute_query.side_effect = query_results(
+            [],
+            [{"name": "Alphabet Inc."}],
+            [{"fact": "Alphabet reorganized", "uuid": "edge-1", "valid_at": None, "invalid_at": None}]
+        )
+        
+        timeline = await graph_client.get_entity_timeline("alphabet")
+        assert graph_client.entity_cache.get("Alphabet", ("timeline", None, None, 100)) == timeline
+        
+        node = Mock()
+        node.name = "Alphabet Inc."
+        graph_client.graphiti.add_episode = AsyncMock(return_value=Mock(nodes=[node]))
+        
+        await graph_client.add_episode("ep-1", "Alphabet announced earnings", "news")
+        
+        assert graph_client.entity_cache.get("alphabet", ("timeline", None, None, 100)) is None
+
+
+class TestGraphStatistics:
+    """Test graph statistics and health checks."""
+    
+    @pytest.mark.asyncio
+    async def test_statistics_from_counts(self, graph_client):
+        """Test statistics are built from count queries and cached."""
+        graph_client.graphiti.driver.execute_query.return_value = ([{
+            "Entity": 12,
+            "Episodic": 3,
+            "Community": 0,
+            "RELATES_TO": 20,
+            "MENTIONS": 15,
+            "HAS_MEMBER": 0,
+            "total_nodes": 15,
+            "total_relationships": 35,
+            "last_episode_at": datetime(2024, 5, 1, tzinfo=timezone.utc)
+        }], None, None)
+        
+        stats = await graph_client.get_graph_statistics()
+        
+        assert stats["nodes_by_label"]["Entity"] == 12
+        assert stats["relationships_by_type"]["RELATES_TO"] == 20
+        assert stats["total_relationships"] == 35
+        assert stats["last_episode_at"] == "2024-05-01T00:00:00+00:00"
+        graph_client.graphiti.search.assert_not_called()
+        
+        await graph_client.get_graph_statistics()
+        graph_client.graphiti.driver.execute_query.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_connection_check_pings(self, graph_client):
+        """Test health check uses a ping instead of search or statistics."""
+        graph_client.graphiti.driver.execute_query.return_value = ([{"ok": 1}], None, None)
+        
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr("agent.graph_utils.graph_client", graph_client)
+            assert await graph_test_connection() is True
+        
+        assert "RETURN 1" in graph_client.graphiti.driver.execute_query.call_args.args[0]
+        graph_client.graphiti.search.assert_not_called()
@@ -0,0 +1,110 @@
+"""
+Tests for agent tools.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from agent.models import ChunkResult
+from agent.tools import (
+    ComprehensiveSearchInput,
+    comprehensive_search_tool,
+    reciprocal_rank_fusion
+)
+
+
+def make_chunk(chunk_id: str, score: float = 0.5) -> ChunkResult:
+    """Create a chunk result for testing."""
+    return ChunkResult(
+        chunk_id=chunk_id,
+        document_id="doc-1",
+        content=f"Content {chunk_id}",
+        score=score,
+        document_title="Test Document",
+        document_source="test.md"
+    )
+
+
+def make_row(chunk_id: str, score_key: str) -> dict:
+    """Create a database search row for testing."""
+    return {
+        "chunk_id": chunk_id,
+        "document_id": "doc-1",
+        "content": f"Content {chunk_id}",
+        score_key: 0.8,
+        "metadata": {},
+        "document_title": "Test Document",
+        "document_source": "test.md"
+    }
+
+
+class TestReciprocalRankFusion:
+    """Test reciprocal rank fusion."""
+    
+    def test_shared_results_rank_first(self):
+        """Test results found by several sources outrank single-source ones."""
+        fused = reciprocal_rank_fusion([
+            [make_chunk("a"), make_chunk("b")],
+            [make_chunk("b"), make_chunk("c")]
+        ])
+        
+        assert [r.chunk_id for r in fused] == ["b", "a", "c"]
+        assert len({r.chunk_id for r in fused}) == 3
+    
+    def test_top_result_everywhere_scores_one(self):
+        """Test scores are normalized to the best possible fused score."""
+        fused = reciprocal_rank_fusion([[make_chunk("a")], [make_chunk("a")]])
+        
+        assert fused[0].score == pytest.approx(1.0)
+    
+    def test_limit_and_empty(self):
+        """Test limit is applied and empty input is handled."""
+        fused = reciprocal_rank_fusion([[make_chunk(str(i)) for i in range(5)]], limit=2)
+        
+        assert len(fused) == 2
+        assert reciprocal_rank_fusion([]) == []
+
+
+class TestComprehensiveSearch:
+    """Test comprehensive retrieval."""
+    
+    @pytest.mark.asyncio
+    async def test_embeds_once_and_fuses_sources(self):
+        """Test the query is embedded once and all sources are fused."""
+        with patch('agent.tools.generate_embedding', new_callable=AsyncMock) as mock_embed, \
+             patch('agent.tools.vector_search', new_callable=AsyncMock) as mock_vector, \
+             patch('agent.tools.hybrid_search', new_callable=AsyncMock) as mock_hybrid, \
+             patch('agent.tools.search_knowledge_graph', new_callable=AsyncMock) as mock_graph:
+            mock_embed.return_value = [0.1] * 1536
+            mock_vector.return_value = [make_row("a", "similarity")]
+            mock_hybrid.return_value = [make_row("a", "combined_score"), make_row("b", "combined_score")]
+            mock_graph.return_value = [{"fact": "Google owns DeepMind", "uuid": "fact-1"}]
+            
+            results = await comprehensive_search_tool(ComprehensiveSearchInput(query="AI"))
+            
+            mock_embed.assert_called_once_with("AI")
+            assert mock_vector.call_args.kwargs["embedding"] == mock_hybrid.call_args.kwargs["embedding"]
+            assert results[0].chunk_id == "a"
+            assert {r.chunk_id for r in results} == {"a", "b", "fact-1"}
+    
+    @pytest.mark.asyncio
+    async def test_slow_source_times_out(self):
+        """Test a slow source is dropped without failing the search."""
+        async def slow_graph_search(query):
+            await asyncio.sleep(1)
+            return [{"fact": "late", "uuid": "fact-1"}]
+        
+        with patch('agent.tools.generate_embedding', new_callable=AsyncMock) as mock_embed, \
+             patch('agent.tools.vector_search', new_callable=AsyncMock) as mock_vector, \
+             patch('agent.tools.search_knowledge_graph', side_effect=slow_graph_search):
+            mock_embed.return_value = [0.1] * 1536
+            mock_vector.return_value = [make_row("a", "similarity")]
+            
+            results = await comprehensive_search_tool(ComprehensiveSearchInput(
+                query="AI",
+                use_hybrid=False,
+                timeout=0.05
+            ))
+            
+            assert [r.chunk_id for r in results] == ["a"]
@@ -3,12 +3,14 @@ Tests for document chunking functionality.
 """
 
 import pytest
+import numpy as np
 from unittest.mock import Mock, AsyncMock, patch
 
 from ingestion.chunker import (
     ChunkingConfig,
     DocumentChunk,
     SemanticChunker,
+    LocalSemanticChunker,
     SimpleChunker,
     create_chunker
 )
@@ -250,6 +252,89 @@ This is content under the section.
             assert all(len(chunk) <= config.max_chunk_size for chunk in chunks)
 
 
+class TestLocalSemanticChunker:
+    """Test local embedding-based chunker (with mocked sentence model)."""
+    
+    @staticmethod
+    def topic_embeddings(sentences):
+        """Embed sentences as one-hot vectors of their topic keyword."""
+        topics = ["google", "microsoft", "apple"]
+        return np.array([
+            [1.0 if topic in sentence.lower() else 0.0 for topic in topics]
+            for sentence in sentences
+        ])
+    
+    @pytest.mark.asyncio
+    async def test_splits_at_similarity_drop(self):
+        """Test boundaries fall where adjacent sentences change topic."""
+        config = ChunkingConfig(chunk_size=150, chunk_overlap=10, max_chunk_size=300, min_chunk_size=20)
+        chunker = LocalSemanticChunker(config)
+        chunker._local_available = True  # sentence model is mocked below
+        
+        section = (
+            "Google builds Gemini models. Google runs DeepMind research. Google ships TPUs to cloud users. "
+            "Microsoft invests in OpenAI. Microsoft sells Azure OpenAI Service. Microsoft adds Copilot to Office."
+        )
+        
+        with patch.object(chunker, '_embed_sentences', side_effect=self.topic_embeddings), \
+             patch('pydantic_ai.Agent') as mock_agent_class:
+            chunks = await chunker._split_long_section(section)
+            
+            mock_agent_class.assert_not_called()
+        
+        assert len(chunks) == 2
+        assert "Microsoft" not in chunks[0]
+        assert "Google" not in chunks[1]
+        assert all(chunk in section for chunk in chunks)
+    
+    @pytest.mark.asyncio
+    async def test_unsplittable_section_without_llm(self):
+        """Test sections without sentence boundaries fall back locally."""
+        config = ChunkingConfig(chunk_size=50, chunk_overlap=10, max_chunk_size=100, llm_refinement=False)
+        chunker = LocalSemanticChunker(config)
+        
+        with patch('pydantic_ai.Agent') as mock_agent_class:
+            chunks = await chunker._split_long_section("word " * 60)
+            
+            mock_agent_class.assert_not_called()
+        
+        assert len(chunks) > 1
+    
+    def test_missing_sentence_transformers_warns_once(self):
+        """Test the local model dependency is checked at construction."""
+        config = ChunkingConfig(llm_refinement=False)
+        
+        with patch('ingestion.chunker.importlib.util.find_spec', return_value=None), \
+             patch('ingestion.chunker.logger') as mock_logger:
+            chunker = LocalSemanticChunker(config)
+        
+        assert chunker._local_available is False
+        mock_logger.warning.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_missing_sentence_transformers_skips_local_split(self):
+        """Test sections are split without the sentence model when it is missing."""
+        config = ChunkingConfig(chunk_size=50, chunk_overlap=10, max_chunk_size=100, llm_refinement=False)
+        chunker = LocalSemanticChunker(config)
+        chunker._local_available = False
+        
+        with patch.object(chunker, '_embed_sentences') as mock_embed:
+            chunks = await chunker._split_long_section("A sentence here. " * 20)
+            
+            mock_embed.assert_not_called()
+        
+        assert len(chunks) > 1
+    
+    def test_chunk_method_metadata(self):
+        """Test chunks record the local splitting method."""
+        config = ChunkingConfig(use_local_splitting=True)
+        chunker = LocalSemanticChunker(config)
+        
+        chunks = chunker._create_chunk_objects(["Some text"], "Some text", {})
+        
+        assert chunks[0].metadata["chunk_method"] == "local_semantic"
+
+
 class TestFactoryFunction:
     """Test chunker factory function."""
     
@@ -261,6 +346,13 @@ class TestFactoryFunction:
         assert isinstance(chunker, SemanticChunker)
         assert chunker.config == config
     
+    def test_create_local_semantic_chunker(self):
+        """Test creating local semantic chunker."""
+        config = ChunkingConfig(use_semantic_splitting=True, use_local_splitting=True)
+        chunker = create_chunker(config)
+        
+        assert isinstance(chunker, LocalSemanticChunker)
+    
     def test_create_simple_chunker(self):
         """Test creating simple chunker."""
         config = ChunkingConfig(use_semantic_splitting=False)
@@ -67,6 +67,8 @@ class ApplicationConfig:
     # Graph search settings
     max_graph_depth: int = 3
     max_graph_nodes: int = 50
+    # Materialized metric summaries older than this are ignored
+    metric_summary_max_age_seconds: int = 900
     
     # Agent settings
     max_iterations: int = 10
@@ -106,7 +108,8 @@ class Settings:
         
         self.app = ApplicationConfig(
             log_level=os.getenv("LOG_LEVEL", "INFO"),
-            environment=os.getenv("ENVIRONMENT", "development")
+            environment=os.getenv("ENVIRONMENT", "development"),
+            metric_summary_max_age_seconds=int(os.getenv("METRIC_SUMMARY_MAX_AGE", "900"))
         )
     
     def validate(self) -> None:
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Recompute the materialized results of the enhanced Cypher queries
+
+Run after loading or fixing data so the graph retriever serves the new numbers;
+summaries older than METRIC_SUMMARY_MAX_AGE are ignored either way:
+
+    python scripts/materialize_enhanced_queries.py                              # all queries
+    python scripts/materialize_enhanced_queries.py team_cost_to_revenue_ratio   # selected queries
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_community.graphs import Neo4jGraph
+
+from config.settings import settings
+from src.tools.enhanced_cypher_queries import SUMMARIZED_QUERY_PARAMS
+from src.tools.query_summaries import materialize_summaries
+
+
+def main():
+    query_keys = sys.argv[1:] or None
+    unknown = [key for key in query_keys or [] if key not in SUMMARIZED_QUERY_PARAMS]
+    if unknown:
+        print(f"Unknown queries: {', '.join(unknown)} (available: {', '.join(sorted(SUMMARIZED_QUERY_PARAMS))})")
+        sys.exit(1)
+    
+    graph = Neo4jGraph(
+        url=settings.neo4j.uri,
+        username=settings.neo4j.username,
+        password=settings.neo4j.password
+    )
+    results = materialize_summaries(graph, query_keys)
+    
+    for name, result in results.items():
+        print(f"{name}: {result if isinstance(result, str) else f'{result:.0f}ms'}")
+    if any(isinstance(result, str) for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ from config.settings import settings
 from src.state.types import RetrievalResult
 from .base import BaseRetriever
 from src.tools.enhanced_cypher_queries import ENHANCED_CYPHER_QUERIES
+from src.tools.query_summaries import read_summary, READ_SUMMARY_QUERY
 
 logger = logging.getLogger(__name__)
 
@@ -183,11 +184,16 @@ class GraphRetriever(BaseRetriever):
                 # Extract parameters from the query
                 params = self._extract_query_parameters(query, query_key)
                 
-                # Execute the enhanced query directly
+                # Execute the enhanced query directly, preferring a fresh materialized summary
                 try:
-                    graph_results = self.graph.query(cypher_template, params)
-                    cypher_query = cypher_template
-                    logger.info(f"Enhanced query returned {len(graph_results)} results")
+                    graph_results = self._query_metric_summary(query_key, params)
+                    if graph_results is not None:
+                        cypher_query = READ_SUMMARY_QUERY
+                        logger.info(f"Metric summary returned {len(graph_results)} results")
+                    else:
+                        graph_results = self.graph.query(cypher_template, params)
+                        cypher_query = cypher_template
+                        logger.info(f"Enhanced query returned {len(graph_results)} results")
                 except Exception as e:
                     logger.warning(f"Enhanced query failed, falling back to Text2Cypher: {e}")
                     # Fall back to regular Text2Cypher
@@ -250,6 +256,17 @@ class GraphRetriever(BaseRetriever):
             logger.error(f"Error in graph retrieval: {e}")
             return []
     
+    def _query_metric_summary(self, query_key: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Read the materialized results of an enhanced query; None if none exist or they are stale."""
+        try:
+            return read_summary(
+                self.graph, query_key, params,
+                max_age_seconds=settings.app.metric_summary_max_age_seconds
+            )
+        except Exception as e:
+            logger.debug(f"Metric summary for {query_key} unavailable: {e}")
+            return None
+    
     def _extract_query_parameters(self, query: str, query_key: str) -> Dict[str, Any]:
         """Extract parameters needed for enhanced queries."""
         import re
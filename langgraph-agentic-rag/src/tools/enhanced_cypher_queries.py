@@ -611,4 +611,15 @@ ENHANCED_CYPHER_QUERIES = {
             END,
             max_risk_severity DESC
     """
-}
\ No newline at end of file
+}
+
+
+# Queries whose results are worth materializing (see src/tools/query_summaries.py),
+# with the parameter sets to precompute. Questions with other parameters run
+# the full query.
+SUMMARIZED_QUERY_PARAMS = {
+    "arr_percentage_by_score": [{"score_threshold": threshold} for threshold in (50, 60, 70, 80, 90)],
+    "team_cost_to_revenue_ratio": [{}],
+    "roadmap_behind_schedule_percentage": [{}],
+    "company_objectives_risk_count": [{}]
+}
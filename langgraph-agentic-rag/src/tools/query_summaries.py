@@ -0,0 +1,123 @@
+"""Materialized results of the enhanced Cypher queries.
+
+Each (query, parameter set) in SUMMARIZED_QUERY_PARAMS is run unchanged and its
+rows are stored verbatim as JSON on MetricRow nodes under a MetricSummary node,
+so a summary read returns exactly what the full query returned when it was
+computed. Summary names are prefixed with ``enhanced:`` and do not clash with
+the summaries maintained by the spyro metrics job.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from .enhanced_cypher_queries import ENHANCED_CYPHER_QUERIES, SUMMARIZED_QUERY_PARAMS
+
+logger = logging.getLogger(__name__)
+
+
+WRITE_SUMMARY_QUERY = """
+    MERGE (m:MetricSummary {name: $name})
+    WITH m
+    OPTIONAL MATCH (m)-[:HAS_ROW]->(old:MetricRow)
+    DETACH DELETE old
+    WITH DISTINCT m
+    SET m.query_key = $query_key,
+        m.computed_at = datetime(),
+        m.compute_ms = $compute_ms,
+        m.row_count = size($rows)
+    WITH m
+    UNWIND $rows AS row
+    CREATE (m)-[:HAS_ROW]->(:MetricRow {metric: $name, rank: row.rank, payload: row.payload})
+"""
+
+# One row per stored result; a single null payload means the query returned
+# no rows, and no rows at all means the summary is missing or stale
+READ_SUMMARY_QUERY = """
+    MATCH (m:MetricSummary {name: $name})
+    WHERE m.computed_at >= datetime() - duration({seconds: $max_age_seconds})
+    OPTIONAL MATCH (m)-[:HAS_ROW]->(r:MetricRow)
+    RETURN r.payload as payload
+    ORDER BY r.rank
+"""
+
+
+def summary_name(query_key: str, params: Dict[str, Any]) -> str:
+    """Name of the summary holding the results of a query for the given parameters."""
+    name = f"enhanced:{query_key}"
+    if params:
+        name += "?" + urlencode(sorted(params.items()))
+    return name
+
+
+def is_summarized(query_key: str, params: Dict[str, Any]) -> bool:
+    """Whether the query is materialized for exactly these parameters."""
+    return params in SUMMARIZED_QUERY_PARAMS.get(query_key, [])
+
+
+def materialize_query(graph, query_key: str, params: Dict[str, Any]) -> float:
+    """Run one enhanced query and store its rows; returns the compute time in ms."""
+    start = time.monotonic()
+    rows = graph.query(ENHANCED_CYPHER_QUERIES[query_key], params)
+    compute_ms = (time.monotonic() - start) * 1000
+    graph.query(WRITE_SUMMARY_QUERY, {
+        "name": summary_name(query_key, params),
+        "query_key": query_key,
+        "compute_ms": round(compute_ms, 1),
+        # JSON keeps nulls, lists and column order, which node properties cannot
+        "rows": [
+            {"rank": rank, "payload": json.dumps(row)}
+            for rank, row in enumerate(rows, start=1)
+        ]
+    })
+    return compute_ms
+
+
+def materialize_summaries(graph, query_keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Recompute the materialized query results.
+
+    Args:
+        graph: Neo4jGraph connection
+        query_keys: Queries to recompute (defaults to all in SUMMARIZED_QUERY_PARAMS)
+
+    Returns:
+        Mapping of summary name to compute time in ms, or the error message
+    """
+    results: Dict[str, Any] = {}
+    for query_key in query_keys or list(SUMMARIZED_QUERY_PARAMS):
+        for params in SUMMARIZED_QUERY_PARAMS[query_key]:
+            name = summary_name(query_key, params)
+            try:
+                compute_ms = materialize_query(graph, query_key, params)
+                results[name] = round(compute_ms, 1)
+                logger.info(f"Materialized {name} in {compute_ms:.0f}ms")
+            except Exception as e:
+                logger.error(f"Failed to materialize {name}: {e}")
+                results[name] = f"error: {e}"
+    return results
+
+
+def read_summary(
+    graph,
+    query_key: str,
+    params: Dict[str, Any],
+    max_age_seconds: int
+) -> Optional[List[Dict[str, Any]]]:
+    """Read the stored results of a query.
+
+    Returns:
+        The rows the full query returned when the summary was computed, or
+        None if the query is not materialized for these parameters or the
+        summary is missing or older than max_age_seconds
+    """
+    if not is_summarized(query_key, params):
+        return None
+    records = graph.query(READ_SUMMARY_QUERY, {
+        "name": summary_name(query_key, params),
+        "max_age_seconds": max_age_seconds
+    })
+    if not records:
+        return None
+    return [json.loads(record["payload"]) for record in records if record["payload"] is not None]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the transformation library
+
+Times the per-value cost of the transformations used on large CRM syncs
+and the per-record cost of batch mapping. Run from the package root:
+
+    python benchmarks/bench_transformations.py [--records N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.transformations import TransformationLibrary, DateParser, DATE_FORMATS
+from src.mapping_rules import CommonPatterns, MappingRule, MappingRuleSet, TransformationType
+from src.llm_mapper import LLMMapper
+from src.schema_mapper import SchemaMapper
+
+
+def strptime_loop(value):
+    """normalize_date as a plain ordered strptime loop, for reference"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def make_dates(count, rng):
+    """Date strings in one format, as exported from a single CRM field"""
+    return [
+        f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2015, 2025)}"
+        for _ in range(count)
+    ]
+
+
+def make_records(count, rng):
+    """Salesforce-style account records"""
+    return [
+        {
+            "Id": f"acc_{i}",
+            "Name": f"Company {i}",
+            "AnnualRevenue": f"${rng.randint(1, 900) * 1000:,}",
+            "Size": rng.choice(["SMB", "Mid-Market", "Enterprise"]),
+            "Industry": rng.choice(["Technology", "Retail", "Healthcare"]),
+            "CreatedDate": f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00Z",
+            "LastModifiedDate": f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2024"
+        }
+        for i in range(count)
+    ]
+
+
+def make_rule_set():
+    rule_set = MappingRuleSet("benchmark")
+    for source, target, transformation, params in [
+        ("Id", "id", TransformationType.RENAME, {}),
+        ("Name", "name", TransformationType.RENAME, {}),
+        ("AnnualRevenue", "arr", TransformationType.CAST, {"to_type": "integer"}),
+        ("Size", "size", TransformationType.DIRECT, {}),
+        ("Industry", "industry", TransformationType.DIRECT, {}),
+        ("CreatedDate", "created_date", TransformationType.CAST, {"to_type": "date"}),
+        ("LastModifiedDate", "updated_date", TransformationType.CAST, {"to_type": "date"})
+    ]:
+        rule_set.add_rule(MappingRule(
+            source_field=source,
+            target_entity="Customer",
+            target_field=target,
+            transformation=transformation,
+            transform_params=params
+        ))
+    return rule_set
+
+
+def per_item(label, func, items, repeat=3):
+    """Best-of-repeat time per item in microseconds"""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<48} {best / items * 1e6:>10.2f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000, help="values/records per benchmark")
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    n = args.records
+    dates = make_dates(n, rng)
+    money = [f"${rng.randint(1, 10 ** 6):,}.{rng.randint(0, 99):02d}" for _ in range(n)]
+    fields = ["customer_id", "created_at", "annual_revenue", "contact_email", "status"] * (n // 5)
+    
+    print(f"{'benchmark':<48} {'per item':>13}")
+    
+    per_item("normalize_date: ordered strptime loop", lambda: [strptime_loop(d) for d in dates], n)
+    
+    def cold_parse():
+        parser = DateParser()
+        return [parser.parse(d) for d in dates]
+    
+    per_item("normalize_date: format sniffing, cold memo", cold_parse, n)
+    warm = DateParser(memo_size=2 * n)
+    [warm.parse(d) for d in dates]
+    per_item("normalize_date: warm memo", lambda: [warm.parse(d) for d in dates], n)
+    
+    per_item("normalize_money", lambda: [TransformationLibrary.normalize_money(m) for m in money], n)
+    per_item(
+        "cast_type integer",
+        lambda: [TransformationLibrary.cast_type(m, "integer") for m in money],
+        n
+    )
+    per_item(
+        "regex_extract",
+        lambda: [TransformationLibrary.regex_extract(m, r"\d+", 0) for m in money],
+        n
+    )
+    per_item(
+        "CommonPatterns.detect_field_type",
+        lambda: [CommonPatterns.detect_field_type(f) for f in fields],
+        len(fields)
+    )
+    llm_mapper = LLMMapper()
+    per_item(
+        "LLMMapper._detect_transformation",
+        lambda: [llm_mapper._detect_transformation(f, {}) for f in fields],
+        len(fields)
+    )
+    
+    records = make_records(n, rng)
+    rule_set = make_rule_set()
+    mapper = SchemaMapper(llm_enabled=False)
+    per_item(
+        "apply_mapping_batch, record by record",
+        lambda: mapper.apply_mapping_batch(records, rule_set, columnar=False),
+        n,
+        repeat=1
+    )
+    per_item(
+        "apply_mapping_batch, columnar",
+        lambda: mapper.apply_mapping_batch(records, rule_set),
+        n
+    )
+
+
+if __name__ == "__main__":
+    main()
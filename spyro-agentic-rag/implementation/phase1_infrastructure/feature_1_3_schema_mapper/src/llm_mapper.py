@@ -12,6 +12,8 @@ from .entity_models import SPYRO_ENTITIES
 
 logger = logging.getLogger(__name__)
 
+_WORD = re.compile(r'\w+')
+
 
 class LLMMapper:
     """Mock LLM mapper for testing - simulates intelligent mapping"""
@@ -112,6 +114,7 @@ class LLMMapper:
             "enum": ["status", "state", "type", "category", "level", "priority"],
             "array": ["list", "items", "features", "tags", "skills"]
         }
+        self._transform_regexes = {}
     
     async def generate_mappings(
         self,
@@ -198,8 +201,8 @@ class LLMMapper:
     def _calculate_similarity(self, field1: str, field2: str) -> float:
         """Calculate field name similarity"""
         # Simple token-based similarity
-        tokens1 = set(re.findall(r'\w+', field1.lower()))
-        tokens2 = set(re.findall(r'\w+', field2.lower()))
+        tokens1 = set(_WORD.findall(field1.lower()))
+        tokens2 = set(_WORD.findall(field2.lower()))
         
         if not tokens1 or not tokens2:
             return 0.0
@@ -225,37 +228,33 @@ class LLMMapper:
         field_lower = field_name.lower()
         
         # Check for date fields
-        for pattern in self.transform_patterns["date"]:
-            if pattern in field_lower:
-                return {
-                    "type": TransformationType.CAST,
-                    "params": {"to_type": "date"}
-                }
+        if self._transform_regex("date").search(field_lower):
+            return {
+                "type": TransformationType.CAST,
+                "params": {"to_type": "date"}
+            }
         
-        # Check for money fields  
-        for pattern in self.transform_patterns["money"]:
-            if pattern in field_lower:
-                return {
-                    "type": TransformationType.CAST,
-                    "params": {"to_type": "integer"}
-                }
+        # Check for money fields
+        if self._transform_regex("money").search(field_lower):
+            return {
+                "type": TransformationType.CAST,
+                "params": {"to_type": "integer"}
+            }
         
         # Check for enum fields
-        for pattern in self.transform_patterns["enum"]:
-            if pattern in field_lower:
-                # Would need actual values to create proper mapping
-                return {
-                    "type": TransformationType.DIRECT,
-                    "params": {}
-                }
+        if self._transform_regex("enum").search(field_lower):
+            # Would need actual values to create proper mapping
+            return {
+                "type": TransformationType.DIRECT,
+                "params": {}
+            }
         
         # Check for array fields
-        for pattern in self.transform_patterns["array"]:
-            if pattern in field_lower:
-                return {
-                    "type": TransformationType.SPLIT,
-                    "params": {"separator": ","}
-                }
+        if self._transform_regex("array").search(field_lower):
+            return {
+                "type": TransformationType.SPLIT,
+                "params": {"separator": ","}
+            }
         
         # Default to direct mapping
         return {
@@ -263,6 +262,15 @@ class LLMMapper:
             "params": {}
         }
     
+    def _transform_regex(self, category: str) -> "re.Pattern":
+        """Alternation of a category's substrings, compiled once per pattern list"""
+        patterns = tuple(self.transform_patterns[category])
+        cached = self._transform_regexes.get(category)
+        if cached is None or cached[0] != patterns:
+            cached = (patterns, re.compile("|".join(re.escape(p) for p in patterns)))
+            self._transform_regexes[category] = cached
+        return cached[1]
+    
     async def improve_mapping(
         self,
         current_mapping: MappingRule,
@@ -90,6 +90,8 @@ class MappingRuleSet:
     description: str = ""
     rules: List[MappingRule] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Last CompiledRuleSet built from these rules (see CompiledRuleSet.for_rule_set)
+    _compiled: Any = field(default=None, init=False, repr=False, compare=False)
     
     def add_rule(self, rule: MappingRule):
         """Add a mapping rule"""
@@ -161,25 +163,28 @@ class CommonPatterns:
         r"arr"
     ]
     
+    @classmethod
+    def _pattern_table(cls) -> List[tuple]:
+        """(field type, compiled patterns) in match order, compiled once per pattern list"""
+        key = (tuple(cls.CUSTOMER_ID_PATTERNS), tuple(cls.DATE_PATTERNS), tuple(cls.MONEY_PATTERNS))
+        if cls.__dict__.get("_compiled_key") != key:
+            cls._compiled_table = [
+                (field_type, [re.compile(pattern) for pattern in patterns])
+                for field_type, patterns in zip(("customer_id", "date", "money"), key)
+            ]
+            cls._compiled_key = key
+        return cls._compiled_table
+    
     @classmethod
     def detect_field_type(cls, field_name: str) -> Optional[str]:
         """Detect likely field type from name"""
         field_lower = field_name.lower()
         
-        # Check customer ID patterns
-        for pattern in cls.CUSTOMER_ID_PATTERNS:
-            if re.match(pattern, field_lower):
-                return "customer_id"
-        
-        # Check date patterns
-        for pattern in cls.DATE_PATTERNS:
-            if re.match(pattern, field_lower):
-                return "date"
-        
-        # Check money patterns
-        for pattern in cls.MONEY_PATTERNS:
-            if re.match(pattern, field_lower):
-                return "money"
+        # Check customer ID, date and money patterns
+        for field_type, patterns in cls._pattern_table():
+            for pattern in patterns:
+                if pattern.match(field_lower):
+                    return field_type
         
         # Check other common patterns
         if "email" in field_lower:
@@ -0,0 +1,406 @@
+"""Compiled execution of mapping rule sets
+
+Applying a MappingRuleSet record by record regroups its rules by target
+entity, resolves every transform by name and validates each entity through
+the generic schema walk. CompiledRuleSet does that work once: rules are
+grouped per entity, source paths and transforms are bound into closures,
+and the entity schema is turned into per-field validators. Records can then
+be mapped one at a time or, for batches, column by column.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .entity_models import EntityField, FieldType, get_entity_fields, validate_entity_data
+from .mapping_rules import MappingRule, MappingRuleSet, TransformationType
+from .transformations import TransformationLibrary
+
+
+# Transformations that pass the extracted value through unchanged
+PASSTHROUGH_TRANSFORMS = {
+    TransformationType.DIRECT,
+    TransformationType.RENAME,
+    TransformationType.EXTRACT
+}
+
+# Cast targets whose results are immutable, so equal inputs can share them
+MEMOIZABLE_CASTS = {"string", "integer", "float", "boolean", "date"}
+
+# isinstance checks matching EntityField.validate_value
+_FIELD_TYPES = {
+    FieldType.STRING: str,
+    FieldType.INTEGER: int,
+    FieldType.FLOAT: (int, float),
+    FieldType.BOOLEAN: bool,
+    FieldType.ARRAY: list,
+    FieldType.OBJECT: dict
+}
+
+
+def _path_getter(field_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Bind MappingRule._extract_value to one dot-notation path"""
+    if "." not in field_path:
+        def get(data):
+            return data.get(field_path) if isinstance(data, dict) else None
+        return get
+    
+    parts = field_path.split(".")
+    
+    def get_nested(data):
+        value = data
+        for part in parts:
+            if isinstance(value, dict) and part in value:
+                value = value[part]
+            elif isinstance(value, list) and part.isdigit():
+                idx = int(part)
+                if 0 <= idx < len(value):
+                    value = value[idx]
+                else:
+                    return None
+            else:
+                return None
+        return value
+    
+    return get_nested
+
+
+def _memoize_strings(transform: Callable[[Any], Any]) -> Callable[[List[Any]], List[Any]]:
+    """Column version of a pure transform, computing each distinct string once
+    
+    Values that raise are returned as the exception instance so the caller
+    can report them per record, as the row path does.
+    """
+    def column(values):
+        memo = {}
+        out = []
+        for value in values:
+            if type(value) is str:
+                if value in memo:
+                    out.append(memo[value])
+                    continue
+            try:
+                result = transform(value)
+            except Exception as e:
+                result = e
+            if type(value) is str:
+                memo[value] = result
+            out.append(result)
+        return out
+    
+    return column
+
+
+def _element_wise(transform: Callable[[Any], Any]) -> Callable[[List[Any]], List[Any]]:
+    """Column version of a transform that is applied value by value"""
+    def column(values):
+        out = []
+        for value in values:
+            try:
+                out.append(transform(value))
+            except Exception as e:
+                out.append(e)
+        return out
+    
+    return column
+
+
+def _column_validator(field_def: EntityField) -> Callable[[List[Any]], List[bool]]:
+    """Vectorized EntityField.validate_value for non-None values"""
+    if field_def.field_type in _FIELD_TYPES:
+        expected = _FIELD_TYPES[field_def.field_type]
+        return lambda values: [isinstance(v, expected) for v in values]
+    if field_def.field_type in (FieldType.DATE, FieldType.DATETIME):
+        return lambda values: [isinstance(v, (str, datetime)) for v in values]
+    return lambda values: [field_def.validate_value(v) for v in values]
+
+
+@dataclass
+class CompiledRule:
+    """A mapping rule with its source path and transform bound"""
+    rule: MappingRule
+    extract: Callable[[Dict[str, Any]], Any]
+    transform: Optional[Callable[[Any], Any]]
+    column_transform: Optional[Callable[[List[Any]], List[Any]]]
+    source_fields: Tuple[str, ...]
+    
+    def apply(self, source_data: Dict[str, Any]) -> Any:
+        """Equivalent of MappingRule.apply with a bound transform library"""
+        value = self.extract(source_data)
+        return value if self.transform is None else self.transform(value)
+    
+    def apply_column(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Apply the rule to each record; failures are exception instances"""
+        values = [self.extract(record) for record in records]
+        if self.transform is None:
+            return values
+        return self.column_transform(values)
+
+
+@dataclass
+class CompiledEntity:
+    """Rules, required fields and validators of one target entity"""
+    name: str
+    rules: List[CompiledRule]
+    required_fields: List[str]
+    field_defs: Dict[str, EntityField]
+    validators: Dict[str, Callable[[List[Any]], List[bool]]] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        self.validators = {
+            name: _column_validator(field_def)
+            for name, field_def in self.field_defs.items()
+        }
+    
+    def warnings_for(self, entity_data: Dict[str, Any]) -> List[str]:
+        """Validation and missing-field warnings for one mapped entity"""
+        warnings = [
+            f"{self.name}: {error}"
+            for error in validate_entity_data(self.name, entity_data)
+        ]
+        if not self.is_complete(entity_data):
+            warnings.append(self.skip_warning(entity_data))
+        return warnings
+    
+    def is_complete(self, entity_data: Dict[str, Any]) -> bool:
+        """Whether all required fields are present"""
+        return all(name in entity_data for name in self.required_fields)
+    
+    def skip_warning(self, entity_data: Dict[str, Any]) -> str:
+        """Warning for an entity skipped for missing required fields"""
+        missing = [f for f in self.required_fields if f not in entity_data]
+        return f"Skipping {self.name}: missing required fields {missing}"
+
+
+@dataclass
+class ColumnarMapping:
+    """Output of mapping a batch of records column by column"""
+    entities: Dict[str, List[Dict[str, Any]]]
+    errors: Dict[int, List[str]]
+    warnings: Dict[int, List[str]]
+    unmapped_fields: Set[str]
+
+
+class CompiledRuleSet:
+    """A MappingRuleSet compiled against a TransformationLibrary
+    
+    Transforms are resolved when the rule set is compiled; transforms
+    registered afterwards need a recompile, which for_rule_set detects.
+    """
+    
+    def __init__(self, rule_set: MappingRuleSet, transform_lib: TransformationLibrary):
+        """Compile a rule set
+        
+        Args:
+            rule_set: Mapping rules to compile
+            transform_lib: Library resolving transform names
+        """
+        self.name = rule_set.name
+        self.transform_lib = transform_lib
+        self.transform_version = transform_lib.version
+        # Copied, so in-place edits of source lists or params are noticed
+        self._rule_state = [(rule, copy.deepcopy(self._rule_values(rule))) for rule in rule_set.rules]
+        grouped: Dict[str, List[CompiledRule]] = {}
+        for rule in rule_set.rules:
+            grouped.setdefault(rule.target_entity, []).append(
+                self._compile_rule(rule, transform_lib)
+            )
+        
+        self.entities = []
+        for name, rules in grouped.items():
+            fields = get_entity_fields(name)
+            self.entities.append(CompiledEntity(
+                name=name,
+                rules=rules,
+                required_fields=[f for f, d in fields.items() if d.required],
+                field_defs=fields
+            ))
+        
+        self.source_fields = {
+            source for entity in self.entities
+            for rule in entity.rules for source in rule.source_fields
+        }
+    
+    @classmethod
+    def for_rule_set(cls, rule_set: MappingRuleSet, transform_lib: TransformationLibrary) -> "CompiledRuleSet":
+        """Compiled form of a rule set, reused while it is still current
+        
+        The compiled form is kept on the rule set itself, so it is freed
+        with the rule set and never confused with another one.
+        """
+        compiled = rule_set._compiled
+        if compiled is None or not compiled.is_current(rule_set, transform_lib):
+            compiled = cls(rule_set, transform_lib)
+            rule_set._compiled = compiled
+        return compiled
+    
+    def is_current(self, rule_set: MappingRuleSet, transform_lib: TransformationLibrary) -> bool:
+        """Whether the rules, their parameters and the transforms are unchanged since compiling"""
+        if (transform_lib is not self.transform_lib or
+                transform_lib.version != self.transform_version or
+                rule_set.name != self.name or
+                len(rule_set.rules) != len(self._rule_state)):
+            return False
+        return all(
+            rule is compiled_rule and self._rule_values(rule) == values
+            for rule, (compiled_rule, values) in zip(rule_set.rules, self._rule_state)
+        )
+    
+    @staticmethod
+    def _rule_values(rule: MappingRule) -> Tuple:
+        """Everything compilation reads from a rule"""
+        return (
+            rule.source_field,
+            rule.target_entity,
+            rule.target_field,
+            rule.transformation,
+            rule.transform_params
+        )
+    
+    @staticmethod
+    def _compile_rule(rule: MappingRule, transform_lib: TransformationLibrary) -> CompiledRule:
+        """Bind a rule's source extraction and transform"""
+        if isinstance(rule.source_field, list):
+            getters = [(f, _path_getter(f)) for f in rule.source_field]
+            extract = lambda data: {f: get(data) for f, get in getters}
+            source_fields = tuple(rule.source_field)
+        else:
+            extract = _path_getter(rule.source_field)
+            source_fields = (rule.source_field,)
+        
+        transform = None
+        column_transform = None
+        if rule.transformation == TransformationType.CONSTANT:
+            constant = rule.transform_params.get("value")
+            transform = lambda value: constant
+            column_transform = lambda values: [constant] * len(values)
+        elif rule.transformation not in PASSTHROUGH_TRANSFORMS:
+            transform_fn = transform_lib.get_transform(rule.transformation)
+            if transform_fn:
+                params = dict(rule.transform_params)
+                if (rule.transformation == TransformationType.CAST and
+                        params.get("to_type") == "date" and len(source_fields) == 1):
+                    # Dates of one source field share a format
+                    params["date_parser"] = transform_lib.date_parser(source_fields[0])
+                transform = partial(transform_fn, **params)
+                if (rule.transformation == TransformationType.CAST and
+                        rule.transform_params.get("to_type") in MEMOIZABLE_CASTS):
+                    column_transform = _memoize_strings(transform)
+                else:
+                    column_transform = _element_wise(transform)
+        
+        return CompiledRule(
+            rule=rule,
+            extract=extract,
+            transform=transform,
+            column_transform=column_transform,
+            source_fields=source_fields
+        )
+    
+    def map_record(
+        self,
+        source_data: Dict[str, Any]
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str], List[str], Set[str]]:
+        """Map one record
+        
+        Returns:
+            Tuple of (entities, errors, warnings, mapped source fields)
+        """
+        entities = {}
+        errors = []
+        warnings = []
+        mapped_fields = set()
+        
+        for entity in self.entities:
+            entity_data = {}
+            for compiled in entity.rules:
+                rule = compiled.rule
+                try:
+                    value = compiled.apply(source_data)
+                    if value is not None:
+                        entity_data[rule.target_field] = value
+                        mapped_fields.update(compiled.source_fields)
+                except Exception as e:
+                    errors.append(
+                        f"Error applying rule for {rule.source_field} -> "
+                        f"{entity.name}.{rule.target_field}: {str(e)}"
+                    )
+            
+            warnings.extend(entity.warnings_for(entity_data))
+            if entity.is_complete(entity_data):
+                entities.setdefault(entity.name, []).append(entity_data)
+        
+        return entities, errors, warnings, mapped_fields
+    
+    def map_columns(self, records: List[Dict[str, Any]]) -> ColumnarMapping:
+        """Map a batch of dict records one rule column at a time
+        
+        Produces the same entities, per-record errors and warnings, and
+        union of unmapped fields as mapping each record with map_record.
+        """
+        n = len(records)
+        result = ColumnarMapping(entities={}, errors={}, warnings={}, unmapped_fields=set())
+        mapped = {source: [False] * n for source in self.source_fields}
+        
+        for entity in self.entities:
+            rows = [{} for _ in range(n)]
+            missing_required = [0] * n
+            invalid = [False] * n
+            unknown = [False] * n
+            
+            for compiled in entity.rules:
+                rule = compiled.rule
+                target = rule.target_field
+                column = compiled.apply_column(records)
+                
+                present = []
+                for i, value in enumerate(column):
+                    if value is None:
+                        continue
+                    if isinstance(value, Exception):
+                        result.errors.setdefault(i, []).append(
+                            f"Error applying rule for {rule.source_field} -> "
+                            f"{entity.name}.{target}: {str(value)}"
+                        )
+                        continue
+                    rows[i][target] = value
+                    present.append(i)
+                
+                for source in compiled.source_fields:
+                    flags = mapped[source]
+                    for i in present:
+                        flags[i] = True
+            
+            # Validate column by column; only flagged rows take the full walk
+            for target, validator in entity.validators.items():
+                values = [row.get(target) for row in rows]
+                positions = [i for i, v in enumerate(values) if v is not None]
+                if entity.field_defs[target].required and len(positions) < n:
+                    present = set(positions)
+                    for i in range(n):
+                        if i not in present:
+                            missing_required[i] += 1
+                for i, ok in zip(positions, validator([values[i] for i in positions])):
+                    if not ok:
+                        invalid[i] = True
+            targets = {compiled.rule.target_field for compiled in entity.rules}
+            unknown_targets = targets - set(entity.field_defs)
+            if unknown_targets or not entity.field_defs:
+                unknown = [bool(unknown_targets & row.keys()) or not entity.field_defs for row in rows]
+            
+            for i, row in enumerate(rows):
+                if missing_required[i] or invalid[i] or unknown[i]:
+                    result.warnings.setdefault(i, []).extend(entity.warnings_for(row))
+                if not missing_required[i]:
+                    result.entities.setdefault(entity.name, []).append(row)
+        
+        # A field is unmapped if some record has it without a rule mapping it
+        all_fields = set().union(*records)
+        result.unmapped_fields = all_fields - self.source_fields
+        for source in all_fields & self.source_fields:
+            if any(source in record and not flag for record, flag in zip(records, mapped[source])):
+                result.unmapped_fields.add(source)
+        
+        return result
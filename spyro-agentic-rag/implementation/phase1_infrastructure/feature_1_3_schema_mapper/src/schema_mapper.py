@@ -6,13 +6,14 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 import asyncio
 
-from .entity_models import SPYRO_ENTITIES, validate_entity_data, get_required_fields
+from .entity_models import SPYRO_ENTITIES, get_required_fields
 from .mapping_rules import (
     MappingRule, MappingRuleSet, TransformationType, 
     CommonPatterns, create_default_rules
 )
 from .transformations import TransformationLibrary, CUSTOMER_SIZE_MAPPING, SUBSCRIPTION_STATUS_MAPPING
 from .llm_mapper import LLMMapper
+from .rule_compiler import CompiledRuleSet
 
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,7 @@ class SchemaMapper:
         
         # Register common transformations
         self._register_common_transforms()
-    
+
     def _register_common_transforms(self):
         """Register common custom transformations"""
         # Customer size normalization
@@ -234,6 +235,17 @@ class SchemaMapper:
         
         return mappings
     
+    def compile_rules(self, mapping_rules: MappingRuleSet) -> CompiledRuleSet:
+        """Compile a rule set, reusing the compiled form while its rules are unchanged
+        
+        Args:
+            mapping_rules: Mapping rules to compile
+        
+        Returns:
+            Compiled rule set bound to this mapper's transformations
+        """
+        return CompiledRuleSet.for_rule_set(mapping_rules, self.transform_lib)
+    
     def apply_mapping(
         self,
         source_data: Dict[str, Any],
@@ -244,61 +256,15 @@ class SchemaMapper:
         Args:
             source_data: Source data record
             mapping_rules: Mapping rules to apply
-            
+        
         Returns:
             Mapping result with transformed entities
         """
         result = MappingResult()
-        mapped_fields = set()
-        
-        # Group rules by target entity
-        entity_rules = {}
-        for rule in mapping_rules.rules:
-            if rule.target_entity not in entity_rules:
-                entity_rules[rule.target_entity] = []
-            entity_rules[rule.target_entity].append(rule)
-        
-        # Apply rules for each entity
-        for entity_name, rules in entity_rules.items():
-            entity_data = {}
-            
-            for rule in rules:
-                try:
-                    value = rule.apply(source_data, self.transform_lib)
-                    if value is not None:
-                        entity_data[rule.target_field] = value
-                        
-                        # Track mapped fields
-                        if isinstance(rule.source_field, str):
-                            mapped_fields.add(rule.source_field)
-                        else:
-                            mapped_fields.update(rule.source_field)
-                
-                except Exception as e:
-                    result.errors.append(
-                        f"Error applying rule for {rule.source_field} -> "
-                        f"{entity_name}.{rule.target_field}: {str(e)}"
-                    )
-            
-            # Validate entity data
-            validation_errors = validate_entity_data(entity_name, entity_data)
-            
-            if validation_errors:
-                result.warnings.extend([
-                    f"{entity_name}: {error}" for error in validation_errors
-                ])
-            
-            # Only add entity if it has required fields
-            required_fields = get_required_fields(entity_name)
-            if all(field in entity_data for field in required_fields):
-                if entity_name not in result.entities:
-                    result.entities[entity_name] = []
-                result.entities[entity_name].append(entity_data)
-            else:
-                missing = [f for f in required_fields if f not in entity_data]
-                result.warnings.append(
-                    f"Skipping {entity_name}: missing required fields {missing}"
-                )
+        
+        # Apply the compiled rules for each entity
+        compiled = self.compile_rules(mapping_rules)
+        result.entities, result.errors, result.warnings, mapped_fields = compiled.map_record(source_data)
         
         # Track unmapped fields
         result.unmapped_fields = [
@@ -323,7 +289,8 @@ class SchemaMapper:
         self,
         source_records: List[Dict[str, Any]],
         mapping_rules: MappingRuleSet,
-        continue_on_error: bool = True
+        continue_on_error: bool = True,
+        columnar: bool = True
     ) -> MappingResult:
         """Apply mapping rules to multiple records
         
@@ -331,10 +298,15 @@ class SchemaMapper:
             source_records: List of source data records
             mapping_rules: Mapping rules to apply
             continue_on_error: Whether to continue on mapping errors
-            
+            columnar: Map the batch rule by rule over columns of values
+                instead of record by record
+        
         Returns:
             Combined mapping result
         """
+        if columnar and all(isinstance(record, dict) for record in source_records):
+            return self._apply_mapping_columns(source_records, mapping_rules)
+        
         combined_result = MappingResult()
         
         for idx, record in enumerate(source_records):
@@ -379,6 +351,40 @@ class SchemaMapper:
         
         return combined_result
     
+    def _apply_mapping_columns(
+        self,
+        source_records: List[Dict[str, Any]],
+        mapping_rules: MappingRuleSet
+    ) -> MappingResult:
+        """Columnar apply_mapping_batch, with the same combined result"""
+        combined_result = MappingResult()
+        
+        mapped = self.compile_rules(mapping_rules).map_columns(source_records)
+        combined_result.entities = mapped.entities
+        combined_result.unmapped_fields = list(mapped.unmapped_fields)
+        
+        for idx in sorted(mapped.errors):
+            combined_result.errors.extend([
+                f"Record {idx}: {error}" for error in mapped.errors[idx]
+            ])
+        for idx in sorted(mapped.warnings):
+            combined_result.warnings.extend([
+                f"Record {idx}: {warning}" for warning in mapped.warnings[idx]
+            ])
+        
+        # Update statistics
+        combined_result.statistics = {
+            "total_records": len(source_records),
+            "successful_records": len(source_records) - len(combined_result.errors),
+            "total_entities_created": {
+                name: len(records)
+                for name, records in combined_result.entities.items()
+            },
+            "unmapped_fields_count": len(combined_result.unmapped_fields)
+        }
+        
+        return combined_result
+    
     def save_mapping_rules(
         self,
         rule_set: MappingRuleSet,
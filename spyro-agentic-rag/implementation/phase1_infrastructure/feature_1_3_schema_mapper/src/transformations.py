@@ -2,17 +2,147 @@
 
 from typing import Any, Dict, List, Optional, Callable, Union
 from datetime import datetime, date
+from functools import lru_cache
 import re
 import json
 from decimal import Decimal
 
 
+# Date formats tried by normalize_date, in order
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%fZ"
+]
+
+# Characters stripped from money strings
+_NON_NUMERIC = re.compile(r'[^\d.-]')
+
+# strptime directive -> the kind of text it matches
+_DIRECTIVE_CLASSES = {
+    "Y": "year", "m": "num", "d": "num", "H": "num", "M": "num", "S": "num",
+    "y": "num", "f": "fraction", "b": "word", "B": "word", "a": "word", "A": "word"
+}
+_DIRECTIVE = re.compile(r"%(.)")
+
+
+@lru_cache(maxsize=256)
+def compiled_pattern(pattern: str) -> "re.Pattern":
+    """Compile a regex pattern once per process"""
+    return re.compile(pattern)
+
+
+def _format_skeleton(fmt: str) -> str:
+    """Format with each directive replaced by the kind of text it matches
+    
+    Two formats can only parse the same string if their skeletons are equal.
+    """
+    return _DIRECTIVE.sub(lambda m: "%" + _DIRECTIVE_CLASSES.get(m.group(1), m.group(1)), fmt)
+
+
+class DateParser:
+    """normalize_date over a fixed format list, remembering what worked
+    
+    Values from one source field almost always share a format, so the
+    format that parsed the previous value is tried first. Only formats
+    earlier in the list with the same skeleton (e.g. %m/%d/%Y before
+    %d/%m/%Y) could also parse the value, and those are tried before it,
+    so results match trying every format in order. Parsed strings are kept
+    in a bounded memo.
+    """
+    
+    def __init__(self, formats: Optional[List[str]] = None, memo_size: int = 4096):
+        """Initialize parser
+        
+        Args:
+            formats: Formats to try, in priority order
+            memo_size: Maximum number of memoized strings
+        """
+        self.formats = list(formats or DATE_FORMATS)
+        self.memo_size = memo_size
+        self.last_format: Optional[int] = None
+        self._memo: Dict[str, Optional[str]] = {}
+        
+        skeletons = [_format_skeleton(fmt) for fmt in self.formats]
+        self._earlier_overlaps = [
+            [j for j in range(i) if skeletons[j] == skeletons[i]]
+            for i in range(len(self.formats))
+        ]
+    
+    def _try(self, value: str, index: int) -> Optional[str]:
+        try:
+            return datetime.strptime(value, self.formats[index]).date().isoformat()
+        except ValueError:
+            return None
+    
+    def _parse_string(self, value: str) -> Optional[str]:
+        """First format in list order that parses value"""
+        last = self.last_format
+        if last is not None:
+            result = self._try(value, last)
+            if result is not None:
+                for index in self._earlier_overlaps[last]:
+                    earlier = self._try(value, index)
+                    if earlier is not None:
+                        self.last_format = index
+                        return earlier
+                return result
+        
+        for index in range(len(self.formats)):
+            if index == last:
+                continue
+            result = self._try(value, index)
+            if result is not None:
+                self.last_format = index
+                return result
+        
+        return None
+    
+    def parse(self, value: Any) -> Optional[str]:
+        """Normalize a date, datetime or date string to ISO format"""
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        elif isinstance(value, date):
+            return value.isoformat()
+        elif not isinstance(value, str):
+            return None
+        
+        try:
+            return self._memo[value]
+        except KeyError:
+            pass
+        
+        result = self._parse_string(value)
+        if len(self._memo) >= self.memo_size:
+            # Evict the oldest entry
+            del self._memo[next(iter(self._memo))]
+        self._memo[value] = result
+        return result
+    
+    def clear(self):
+        """Forget memoized strings and the last winning format"""
+        self._memo.clear()
+        self.last_format = None
+
+
+# Parser used when no field-specific parser is given
+_DEFAULT_DATE_PARSER = DateParser()
+
+
 class TransformationLibrary:
     """Library of transformation functions"""
     
     def __init__(self):
         self._transforms = self._register_default_transforms()
         self._custom_transforms = {}
+        self._date_parsers: Dict[str, DateParser] = {}
+        # Bumped on every registration so compiled rule sets can tell they are stale
+        self.version = 0
     
     def _register_default_transforms(self) -> Dict[str, Callable]:
         """Register default transformation functions"""
@@ -43,11 +173,19 @@ class TransformationLibrary:
     def register_custom_transform(self, name: str, func: Callable):
         """Register a custom transformation function"""
         self._custom_transforms[name] = func
+        self.version += 1
+    
+    def date_parser(self, source_field: str) -> DateParser:
+        """Date parser remembering the formats of one source field"""
+        if source_field not in self._date_parsers:
+            self._date_parsers[source_field] = DateParser()
+        return self._date_parsers[source_field]
     
     # Core transformation functions
     
     @staticmethod
-    def cast_type(value: Any, to_type: str, default: Any = None) -> Any:
+    def cast_type(value: Any, to_type: str, default: Any = None,
+                  date_parser: Optional[DateParser] = None) -> Any:
         """Cast value to specified type"""
         if value is None:
             return default
@@ -69,7 +207,7 @@ class TransformationLibrary:
                     return value.lower() in ('true', 'yes', '1', 'on')
                 return bool(value)
             elif to_type == "date":
-                return TransformationLibrary.normalize_date(value)
+                return TransformationLibrary.normalize_date(value, date_parser=date_parser)
             elif to_type == "array":
                 return TransformationLibrary.to_array(value)
             else:
@@ -145,7 +283,7 @@ class TransformationLibrary:
         if not isinstance(value, str):
             return default
         
-        match = re.search(pattern, value)
+        match = compiled_pattern(pattern).search(value)
         if match:
             try:
                 return match.group(group)
@@ -204,14 +342,15 @@ class TransformationLibrary:
                 return result
             elif operator == "contains" and test_value in str(field_value):
                 return result
-            elif operator == "matches" and re.match(test_value, str(field_value)):
+            elif operator == "matches" and compiled_pattern(test_value).match(str(field_value)):
                 return result
         
         # Return default if specified
         return conditions[-1].get("default") if conditions else None
     
     @staticmethod
-    def normalize_date(value: Any, format: Optional[str] = None) -> Optional[str]:
+    def normalize_date(value: Any, format: Optional[str] = None,
+                       date_parser: Optional[DateParser] = None) -> Optional[str]:
         """Normalize date to ISO format"""
         if value is None:
             return None
@@ -222,24 +361,14 @@ class TransformationLibrary:
             return value.isoformat()
         
         if isinstance(value, str):
-            # Try common date formats
-            formats = [format] if format else [
-                "%Y-%m-%d",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y/%m/%d",
-                "%m/%d/%Y",
-                "%d/%m/%Y",
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%dT%H:%M:%S.%fZ"
-            ]
-            
-            for fmt in formats:
+            if format:
                 try:
-                    dt = datetime.strptime(value, fmt)
-                    return dt.date().isoformat()
+                    return datetime.strptime(value, format).date().isoformat()
                 except ValueError:
-                    continue
+                    return None
+            
+            # Try common date formats
+            return (date_parser or _DEFAULT_DATE_PARSER).parse(value)
         
         return None
     
@@ -252,7 +381,7 @@ class TransformationLibrary:
         # Convert to float first
         if isinstance(value, str):
             # Remove currency symbols and commas
-            value = re.sub(r'[^\d.-]', '', value)
+            value = _NON_NUMERIC.sub('', value)
         
         try:
             amount = float(value)
@@ -0,0 +1,156 @@
+"""Tests for compiled rule set execution"""
+
+import pytest
+import os
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.schema_mapper import SchemaMapper
+from src.mapping_rules import MappingRule, MappingRuleSet, TransformationType
+from src.rule_compiler import CompiledRuleSet
+
+
+class TestRuleCompiler:
+    """Test cases for CompiledRuleSet"""
+    
+    @pytest.fixture
+    def rule_set(self) -> MappingRuleSet:
+        """Rules covering passthrough, casts, nested paths, constants and failures"""
+        rule_set = MappingRuleSet("compiled")
+        for source, entity, target, transformation, params in [
+            ("Id", "Customer", "id", TransformationType.RENAME, {}),
+            ("Name", "Customer", "name", TransformationType.DIRECT, {}),
+            ("Size", "Customer", "size", TransformationType.DIRECT, {}),
+            ("Industry", "Customer", "industry", TransformationType.DIRECT, {}),
+            ("Revenue", "Customer", "arr", TransformationType.CAST, {"to_type": "integer"}),
+            ("Created", "Customer", "created_date", TransformationType.CAST, {"to_type": "date"}),
+            ("Modified", "Customer", "updated_date", TransformationType.CAST, {"to_type": "date"}),
+            ("Owner.Email", "Customer", "contact_email", TransformationType.EXTRACT, {}),
+            ("Tags", "Customer", "segment", TransformationType.SPLIT, {"separator": ","}),
+            ("Id", "Product", "id", TransformationType.RENAME, {}),
+            ("Plan", "Product", "category", TransformationType.CONSTANT, {"value": "subscription"}),
+            (["Seats", "Price"], "Product", "price", TransformationType.COMPUTE, {"expression": "Seats * Price"})
+        ]:
+            rule_set.add_rule(MappingRule(
+                source_field=source,
+                target_entity=entity,
+                target_field=target,
+                transformation=transformation,
+                transform_params=params
+            ))
+        return rule_set
+    
+    @pytest.fixture
+    def records(self):
+        """Records with valid, invalid, missing and failing values"""
+        return [
+            {
+                "Id": "acc_1", "Name": "Acme", "Size": "Enterprise", "Industry": "Tech",
+                "Revenue": "$1,200,000", "Created": "2023-01-15", "Modified": "01/20/2024",
+                "Owner": {"Email": "a@acme.com"}, "Seats": 10, "Price": 99, "Extra": 1
+            },
+            {
+                "Id": "acc_2", "Name": "Beta", "Size": "Huge", "Industry": "Retail",
+                "Revenue": "n/a", "Created": "2023-01-15", "Modified": "2024-02-01T10:00:00Z",
+                "Tags": "smb,retail", "Seats": "many", "Price": 10
+            },
+            {
+                "Id": "acc_3", "Name": "Gamma", "Size": "SMB", "Industry": "Health",
+                "Revenue": 5000, "Created": "2023-01-15", "Modified": "2024-03-01"
+            },
+            {"Name": "No Id"}
+        ]
+    
+    def test_columnar_batch_matches_row_batch(self, rule_set, records):
+        """Test that the columnar batch path produces the row path's result"""
+        mapper = SchemaMapper(llm_enabled=False)
+        
+        columnar = mapper.apply_mapping_batch(records, rule_set)
+        row = mapper.apply_mapping_batch(records, rule_set, columnar=False)
+        
+        assert columnar.entities == row.entities
+        assert columnar.errors == row.errors
+        assert columnar.warnings == row.warnings
+        assert set(columnar.unmapped_fields) == set(row.unmapped_fields)
+        assert columnar.statistics == row.statistics
+        
+        # The failing compute, invalid enum, failed cast and missing id all surface
+        assert any("Record 1: Error applying rule" in e for e in columnar.errors)
+        assert any("Invalid value for field size: Huge" in w for w in columnar.warnings)
+        assert any("Record 3: Skipping Customer" in w for w in columnar.warnings)
+        assert len(columnar.entities["Customer"]) == 2
+    
+    def test_map_record_matches_rule_apply(self, rule_set, records):
+        """Test that compiled rules produce the values of MappingRule.apply"""
+        mapper = SchemaMapper(llm_enabled=False)
+        compiled = CompiledRuleSet(rule_set, mapper.transform_lib)
+        
+        for record in records[:1] + records[2:]:
+            entities, _, _, _ = compiled.map_record(record)
+            for rule in rule_set.rules:
+                value = rule.apply(record, mapper.transform_lib)
+                mapped = entities.get(rule.target_entity, [{}])[0]
+                if value is not None and rule.target_entity in entities:
+                    assert mapped[rule.target_field] == value
+    
+    def test_compiled_rules_cached_until_changed(self, rule_set):
+        """Test that a rule set is recompiled only when its rules change"""
+        mapper = SchemaMapper(llm_enabled=False)
+        
+        compiled = mapper.compile_rules(rule_set)
+        assert mapper.compile_rules(rule_set) is compiled
+        
+        rule_set.add_rule(MappingRule(
+            source_field="Region",
+            target_entity="Customer",
+            target_field="region"
+        ))
+        recompiled = mapper.compile_rules(rule_set)
+        assert recompiled is not compiled
+        
+        result = mapper.apply_mapping({"Id": "x", "Region": "EMEA"}, rule_set)
+        assert "Region" not in result.unmapped_fields
+    
+    @staticmethod
+    def _compiled_value(mapper, rule_set, target_field, record):
+        """Value the currently compiled rule for a target field produces"""
+        for entity in mapper.compile_rules(rule_set).entities:
+            for compiled in entity.rules:
+                if compiled.rule.target_field == target_field:
+                    return compiled.apply(record)
+    
+    def test_recompiled_after_param_mutation(self, rule_set):
+        """Test that editing transform params in place invalidates the compiled form"""
+        mapper = SchemaMapper(llm_enabled=False)
+        record = {"Plan": "pro"}
+        
+        assert self._compiled_value(mapper, rule_set, "category", record) == "subscription"
+        
+        rule_set.get_rule_by_source("Plan").transform_params["value"] = "license"
+        assert self._compiled_value(mapper, rule_set, "category", record) == "license"
+    
+    def test_recompiled_after_transform_registered(self):
+        """Test that a transform registered after compiling is picked up"""
+        mapper = SchemaMapper(llm_enabled=False)
+        rule_set = MappingRuleSet("late_transform")
+        rule_set.add_rule(MappingRule(
+            source_field="Name",
+            target_entity="Customer",
+            target_field="name",
+            transformation="shout"
+        ))
+        record = {"Name": "acme"}
+        
+        assert self._compiled_value(mapper, rule_set, "name", record) == "acme"
+        
+        mapper.transform_lib.register_custom_transform("shout", lambda value: value.upper())
+        assert self._compiled_value(mapper, rule_set, "name", record) == "ACME"
+    
+    def test_compiled_form_not_shared_between_rule_sets(self, rule_set):
+        """Test that equal but distinct rule sets each get their own compiled form"""
+        mapper = SchemaMapper(llm_enabled=False)
+        other = MappingRuleSet("compiled", rules=list(rule_set.rules))
+        
+        assert mapper.compile_rules(rule_set) is not mapper.compile_rules(other)
+        assert mapper.compile_rules(rule_set) is mapper.compile_rules(rule_set)
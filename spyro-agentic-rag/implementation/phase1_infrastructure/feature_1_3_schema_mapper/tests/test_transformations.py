@@ -8,7 +8,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.transformations import TransformationLibrary
+from src.transformations import TransformationLibrary, DateParser
 
 
 class TestTransformationLibrary:
@@ -164,6 +164,41 @@ class TestTransformationLibrary:
         assert TransformationLibrary.normalize_date("invalid") is None
         assert TransformationLibrary.normalize_date(None) is None
     
+    def test_date_parser_matches_format_order(self):
+        """Test that remembering formats never changes which format wins"""
+        parser = DateParser()
+        
+        # Day-first value makes %d/%m/%Y the remembered format
+        assert parser.parse("15/01/2024") == "2024-01-15"
+        # An ambiguous value still parses month-first, as the format order says
+        assert parser.parse("01/02/2024") == "2024-01-02"
+        assert parser.parse("2024-01-15T10:30:00Z") == "2024-01-15"
+        assert parser.parse("13/13/2024") is None
+        assert parser.parse(datetime(2024, 1, 15, 10, 30)) == "2024-01-15"
+    
+    def test_date_parser_memo_is_bounded(self):
+        """Test that the memo evicts old strings"""
+        parser = DateParser(memo_size=3)
+        for day in range(1, 8):
+            assert parser.parse(f"2024-01-{day:02d}") == f"2024-01-{day:02d}"
+        
+        assert len(parser._memo) == 3
+        assert "2024-01-07" in parser._memo
+        
+        parser.clear()
+        assert len(parser._memo) == 0 and parser.last_format is None
+    
+    def test_date_parser_per_field(self):
+        """Test that each source field gets its own parser"""
+        lib = TransformationLibrary()
+        
+        assert lib.date_parser("created") is lib.date_parser("created")
+        assert lib.date_parser("created") is not lib.date_parser("updated")
+        assert TransformationLibrary.cast_type(
+            "15/01/2024", "date", date_parser=lib.date_parser("created")
+        ) == "2024-01-15"
+        assert TransformationLibrary.normalize_date("2024.01.15", format="%Y.%m.%d") == "2024-01-15"
+    
     def test_normalize_money(self):
         """Test money normalization"""
         # Test various formats
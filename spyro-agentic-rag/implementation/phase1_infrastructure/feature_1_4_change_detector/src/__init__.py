@@ -2,7 +2,7 @@
 
 from .models import Change, ChangeType, ChangeSignificance
 from .change_detector import ChangeDetector
-from .state_store import StateStore, InMemoryStateStore, FileStateStore
+from .state_store import StateStore, InMemoryStateStore, FileStateStore, SQLiteStateStore
 from .significance_rules import SignificanceRule, SignificanceEvaluator
 
 __all__ = [
@@ -13,6 +13,7 @@ __all__ = [
     "StateStore",
     "InMemoryStateStore",
     "FileStateStore",
+    "SQLiteStateStore",
     "SignificanceRule",
     "SignificanceEvaluator"
 ]
\ No newline at end of file
@@ -52,17 +52,35 @@ class ChangeDetector:
         Returns:
             List of detected changes
         """
-        # Get current state
-        current_snapshot = await self.state_store.get_latest_snapshot(entity_type)
-        
         # Create new snapshot
         new_snapshot = self._create_snapshot(entity_type, new_data, id_field)
         
+        if self.state_store.indexed:
+            # Compare against the checksum index, loading only changed entities
+            old_checksums = await self.state_store.get_entity_checksums(entity_type)
+            current_snapshot = None
+            if old_checksums is not None:
+                changed_ids = [
+                    eid for eid, checksum in old_checksums.items()
+                    if eid not in new_snapshot.entities
+                    or new_snapshot.entities[eid].checksum != checksum
+                ]
+                current_snapshot = StateSnapshot(
+                    timestamp=new_snapshot.timestamp,
+                    entity_type=entity_type,
+                    entities=await self.state_store.get_entity_states(entity_type, changed_ids)
+                )
+        else:
+            # Get current state
+            current_snapshot = await self.state_store.get_latest_snapshot(entity_type)
+            old_checksums = None
+        
         # Detect changes
         changes = await self._compare_snapshots(
             current_snapshot,
             new_snapshot,
-            calculate_significance
+            calculate_significance,
+            old_checksums
         )
         
         # Filter by significance if threshold is set
@@ -140,9 +158,14 @@ class ChangeDetector:
         self,
         old_snapshot: Optional[StateSnapshot],
         new_snapshot: StateSnapshot,
-        calculate_significance: bool
+        calculate_significance: bool,
+        old_checksums: Optional[Dict[str, Optional[str]]] = None
     ) -> List[Change]:
-        """Compare two snapshots to find changes"""
+        """Compare two snapshots to find changes
+        
+        If old_checksums is given it lists every old entity, and old_snapshot
+        only needs to hold the deleted and modified ones.
+        """
         changes = []
         
         if not old_snapshot:
@@ -165,8 +188,13 @@ class ChangeDetector:
             
             return changes
         
+        if old_checksums is None:
+            old_checksums = {
+                eid: estate.checksum for eid, estate in old_snapshot.entities.items()
+            }
+        
         # Get entity IDs
-        old_ids = set(old_snapshot.entities.keys())
+        old_ids = set(old_checksums.keys())
         new_ids = set(new_snapshot.entities.keys())
         
         # Find creates (new IDs)
@@ -207,12 +235,12 @@ class ChangeDetector:
         
         # Find updates (common IDs)
         for entity_id in old_ids & new_ids:
-            old_entity = old_snapshot.entities[entity_id]
             new_entity = new_snapshot.entities[entity_id]
             
             # Quick check using checksum
-            if old_entity.checksum == new_entity.checksum:
+            if old_checksums[entity_id] == new_entity.checksum:
                 continue
+            old_entity = old_snapshot.entities[entity_id]
             
             # Find changed fields
             fields_changed = []
@@ -275,8 +303,12 @@ class ChangeDetector:
         Returns:
             List of changes for the entity
         """
-        # This would require storing changes, not just snapshots
-        # For now, we can reconstruct by comparing snapshots
+        # Stores keeping per-entity versions answer in O(changes)
+        versions = await self.state_store.get_entity_versions(entity_type, entity_id, limit + 1)
+        if versions is not None:
+            return self._history_from_versions(entity_type, entity_id, versions, limit)
+        
+        # Otherwise reconstruct by comparing snapshots
         snapshots = await self.state_store.list_snapshots(entity_type, limit + 1)
         
         if len(snapshots) < 2:
@@ -289,69 +321,16 @@ class ChangeDetector:
             newer = snapshots[i]
             older = snapshots[i + 1]
             
-            newer_entity = newer.get_entity(entity_id)
-            older_entity = older.get_entity(entity_id)
-            
-            # Skip if entity doesn't exist in either snapshot
-            if not newer_entity and not older_entity:
-                continue
-            
-            # Entity created
-            if newer_entity and not older_entity:
-                change = Change(
-                    entity_type=entity_type,
-                    entity_id=entity_id,
-                    operation=ChangeType.CREATE,
-                    fields_changed=list(newer_entity.data.keys()),
-                    old_values={},
-                    new_values=newer_entity.data,
-                    timestamp=newer.timestamp
-                )
-                changes.append(change)
-            
-            # Entity deleted
-            elif not newer_entity and older_entity:
-                change = Change(
-                    entity_type=entity_type,
-                    entity_id=entity_id,
-                    operation=ChangeType.DELETE,
-                    fields_changed=list(older_entity.data.keys()),
-                    old_values=older_entity.data,
-                    new_values={},
-                    timestamp=newer.timestamp
-                )
+            change = self._entity_change(
+                entity_type,
+                entity_id,
+                older.get_entity(entity_id),
+                newer.get_entity(entity_id),
+                newer.timestamp
+            )
+            if change:
                 changes.append(change)
             
-            # Entity updated
-            elif newer_entity and older_entity:
-                # Find changed fields
-                fields_changed = []
-                old_values = {}
-                new_values = {}
-                
-                all_fields = set(older_entity.data.keys()) | set(newer_entity.data.keys())
-                
-                for field in all_fields:
-                    old_value = older_entity.data.get(field)
-                    new_value = newer_entity.data.get(field)
-                    
-                    if old_value != new_value:
-                        fields_changed.append(field)
-                        old_values[field] = old_value
-                        new_values[field] = new_value
-                
-                if fields_changed:
-                    change = Change(
-                        entity_type=entity_type,
-                        entity_id=entity_id,
-                        operation=ChangeType.UPDATE,
-                        fields_changed=fields_changed,
-                        old_values=old_values,
-                        new_values=new_values,
-                        timestamp=newer.timestamp
-                    )
-                    changes.append(change)
-            
             if len(changes) >= limit:
                 break
         
@@ -361,19 +340,103 @@ class ChangeDetector:
             oldest_entity = oldest_snapshot.get_entity(entity_id)
             if oldest_entity:
                 # Entity existed in the oldest snapshot, so it was created
-                change = Change(
-                    entity_type=entity_type,
-                    entity_id=entity_id,
-                    operation=ChangeType.CREATE,
-                    fields_changed=list(oldest_entity.data.keys()),
-                    old_values={},
-                    new_values=oldest_entity.data,
-                    timestamp=oldest_snapshot.timestamp
-                )
+                changes.append(self._entity_change(
+                    entity_type, entity_id, None, oldest_entity, oldest_snapshot.timestamp
+                ))
+        
+        return changes[:limit]
+    
+    def _history_from_versions(
+        self,
+        entity_type: str,
+        entity_id: str,
+        versions: List[Tuple[datetime, Optional[EntityState]]],
+        limit: int
+    ) -> List[Change]:
+        """Build entity history from its stored versions, newest first"""
+        changes = []
+        
+        for (timestamp, newer_entity), (_, older_entity) in zip(versions, versions[1:]):
+            change = self._entity_change(entity_type, entity_id, older_entity, newer_entity, timestamp)
+            if change:
                 changes.append(change)
         
+        # The oldest version read created the entity unless it is a deletion
+        if versions and len(changes) < limit:
+            timestamp, oldest_entity = versions[-1]
+            if oldest_entity:
+                changes.append(self._entity_change(
+                    entity_type, entity_id, None, oldest_entity, timestamp
+                ))
+        
         return changes[:limit]
     
+    def _entity_change(
+        self,
+        entity_type: str,
+        entity_id: str,
+        older_entity: Optional[EntityState],
+        newer_entity: Optional[EntityState],
+        timestamp: datetime
+    ) -> Optional[Change]:
+        """Change between two states of an entity, None if there is none"""
+        # Skip if entity doesn't exist in either state
+        if not newer_entity and not older_entity:
+            return None
+        
+        # Entity created
+        if newer_entity and not older_entity:
+            return Change(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                operation=ChangeType.CREATE,
+                fields_changed=list(newer_entity.data.keys()),
+                old_values={},
+                new_values=newer_entity.data,
+                timestamp=timestamp
+            )
+        
+        # Entity deleted
+        if not newer_entity:
+            return Change(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                operation=ChangeType.DELETE,
+                fields_changed=list(older_entity.data.keys()),
+                old_values=older_entity.data,
+                new_values={},
+                timestamp=timestamp
+            )
+        
+        # Entity updated: find changed fields
+        fields_changed = []
+        old_values = {}
+        new_values = {}
+        
+        all_fields = set(older_entity.data.keys()) | set(newer_entity.data.keys())
+        
+        for field in all_fields:
+            old_value = older_entity.data.get(field)
+            new_value = newer_entity.data.get(field)
+            
+            if old_value != new_value:
+                fields_changed.append(field)
+                old_values[field] = old_value
+                new_values[field] = new_value
+        
+        if not fields_changed:
+            return None
+        
+        return Change(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            operation=ChangeType.UPDATE,
+            fields_changed=fields_changed,
+            old_values=old_values,
+            new_values=new_values,
+            timestamp=timestamp
+        )
+    
     async def rollback_to_snapshot(
         self,
         entity_type: str,
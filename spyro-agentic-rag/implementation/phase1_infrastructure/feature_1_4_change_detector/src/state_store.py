@@ -1,10 +1,12 @@
 """State storage implementations for change detection"""
 
+import hashlib
 import json
 import os
+import sqlite3
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 import asyncio
 import aiofiles
 import orjson
@@ -15,6 +17,9 @@ from .models import EntityState, StateSnapshot
 class StateStore(ABC):
     """Abstract base class for state storage"""
     
+    # Whether get_entity_checksums answers without loading entity data
+    indexed = False
+    
     @abstractmethod
     async def save_snapshot(self, snapshot: StateSnapshot) -> None:
         """Save a state snapshot"""
@@ -44,6 +49,41 @@ class StateStore(ABC):
     async def clear(self) -> None:
         """Clear all stored state"""
         pass
+    
+    async def get_entity_checksums(self, entity_type: str) -> Optional[Dict[str, Optional[str]]]:
+        """Get entity checksums of the latest snapshot, or None if there is none"""
+        snapshot = await self.get_latest_snapshot(entity_type)
+        if snapshot is None:
+            return None
+        return {eid: estate.checksum for eid, estate in snapshot.entities.items()}
+    
+    async def get_entity_states(
+        self,
+        entity_type: str,
+        entity_ids: Iterable[str]
+    ) -> Dict[str, EntityState]:
+        """Get the latest states of the given entities"""
+        snapshot = await self.get_latest_snapshot(entity_type)
+        if snapshot is None:
+            return {}
+        return {
+            eid: snapshot.entities[eid]
+            for eid in entity_ids if eid in snapshot.entities
+        }
+    
+    async def get_entity_versions(
+        self,
+        entity_type: str,
+        entity_id: str,
+        limit: int = 10
+    ) -> Optional[List[Tuple[datetime, Optional[EntityState]]]]:
+        """Get the stored versions of one entity, newest first
+        
+        Each version is a (snapshot timestamp, state) pair, with a None
+        state where the entity was deleted. Returns None if the store does
+        not keep per-entity versions.
+        """
+        return None
 
 
 class InMemoryStateStore(StateStore):
@@ -211,4 +251,351 @@ class FileStateStore(StateStore):
             import shutil
             if os.path.exists(self.base_dir):
                 shutil.rmtree(self.base_dir)
-                os.makedirs(self.base_dir, exist_ok=True)
\ No newline at end of file
+                os.makedirs(self.base_dir, exist_ok=True)
+
+
+def _state_checksum(state: EntityState) -> str:
+    """Checksum of an entity, computing one if the state has none"""
+    if state.checksum is not None:
+        return state.checksum
+    sorted_data = json.dumps(state.data, sort_keys=True, default=str)
+    return hashlib.md5(sorted_data.encode()).hexdigest()
+
+
+class SQLiteStateStore(StateStore):
+    """Delta-encoded state storage in SQLite
+    
+    The first snapshot of an entity type is stored in full; every later
+    snapshot only stores the entities whose checksum changed, plus a
+    tombstone for each deleted entity. A checksum index holds the current
+    checksum of every live entity, so change detection can compare
+    checksums without loading entity data, and an entity's history is read
+    from its own version rows. Storage grows with churn rather than with
+    snapshot size.
+    
+    Unchanged entities keep the last_modified and version of the snapshot
+    in which they last changed.
+    
+    Deltas are chained in the order snapshots are saved, so that order also
+    decides which snapshot is the latest, whatever their timestamps.
+    """
+    
+    indexed = True
+    
+    # Parameters per query when selecting entities by id
+    _ID_CHUNK = 500
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_type TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            metadata BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS snapshots_by_type
+            ON snapshots (entity_type, id);
+        CREATE TABLE IF NOT EXISTS entity_versions (
+            entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            snapshot_id INTEGER NOT NULL,
+            checksum TEXT,
+            state BLOB,
+            PRIMARY KEY (entity_type, entity_id, snapshot_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS versions_by_snapshot
+            ON entity_versions (snapshot_id);
+        CREATE TABLE IF NOT EXISTS entity_index (
+            entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            snapshot_id INTEGER NOT NULL,
+            PRIMARY KEY (entity_type, entity_id)
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, db_path: str = ":memory:"):
+        """Initialize SQLite store
+        
+        Args:
+            db_path: Path of the database file, or ":memory:"
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        self._lock = asyncio.Lock()
+    
+    async def _run(self, fn, *args):
+        """Run a blocking database call off the event loop"""
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args)
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+    
+    @staticmethod
+    def _encode_state(state: EntityState) -> bytes:
+        """Serialize the parts of an entity state not stored as columns"""
+        return orjson.dumps({
+            "data": state.data,
+            "last_modified": state.last_modified.isoformat(),
+            "version": state.version,
+            "checksum": state.checksum
+        })
+    
+    @staticmethod
+    def _decode_state(entity_type: str, entity_id: str, blob: bytes) -> EntityState:
+        """Rebuild an entity state from its stored version"""
+        state = orjson.loads(blob)
+        state["entity_type"] = entity_type
+        state["entity_id"] = entity_id
+        return EntityState.from_dict(state)
+    
+    def _snapshot_ids(self, entity_type: str, limit: Optional[int] = None) -> List[Tuple[int, str, bytes]]:
+        """Snapshot rows of an entity type, last saved first"""
+        query = (
+            "SELECT id, timestamp, metadata FROM snapshots WHERE entity_type = ? "
+            "ORDER BY id DESC"
+        )
+        if limit is None:
+            return self._conn.execute(query, (entity_type,)).fetchall()
+        return self._conn.execute(query + " LIMIT ?", (entity_type, limit)).fetchall()
+    
+    def _rebuild_snapshot(self, entity_type: str, row: Tuple[int, str, bytes]) -> StateSnapshot:
+        """Reconstruct a snapshot from the versions written up to it"""
+        snapshot_id, timestamp, metadata = row
+        # SQLite takes the other columns from the row holding the maximum
+        versions = self._conn.execute(
+            "SELECT entity_id, state, MAX(snapshot_id) FROM entity_versions "
+            "WHERE entity_type = ? AND snapshot_id <= ? GROUP BY entity_id",
+            (entity_type, snapshot_id)
+        )
+        return StateSnapshot(
+            timestamp=datetime.fromisoformat(timestamp),
+            entity_type=entity_type,
+            entities={
+                eid: self._decode_state(entity_type, eid, state)
+                for eid, state, _ in versions if state is not None
+            },
+            metadata=orjson.loads(metadata)
+        )
+    
+    def _save_snapshot(self, snapshot: StateSnapshot) -> None:
+        """Store the delta of a snapshot against the current index"""
+        entity_type = snapshot.entity_type
+        with self._conn:
+            current = dict(self._conn.execute(
+                "SELECT entity_id, checksum FROM entity_index WHERE entity_type = ?",
+                (entity_type,)
+            ))
+            snapshot_id = self._conn.execute(
+                "INSERT INTO snapshots (entity_type, timestamp, metadata) VALUES (?, ?, ?)",
+                (
+                    entity_type,
+                    snapshot.timestamp.isoformat(timespec="microseconds"),
+                    orjson.dumps(snapshot.metadata)
+                )
+            ).lastrowid
+            
+            versions = []
+            for eid, state in snapshot.entities.items():
+                checksum = _state_checksum(state)
+                if current.pop(eid, None) != checksum:
+                    versions.append((entity_type, eid, snapshot_id, checksum, self._encode_state(state)))
+            deleted = [(entity_type, eid, snapshot_id, None, None) for eid in current]
+            
+            self._conn.executemany(
+                "INSERT INTO entity_versions VALUES (?, ?, ?, ?, ?)",
+                versions + deleted
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entity_index VALUES (?, ?, ?, ?)",
+                [(t, eid, checksum, sid) for t, eid, sid, checksum, _ in versions]
+            )
+            self._conn.executemany(
+                "DELETE FROM entity_index WHERE entity_type = ? AND entity_id = ?",
+                [(entity_type, eid) for eid in current]
+            )
+    
+    async def save_snapshot(self, snapshot: StateSnapshot) -> None:
+        """Save a state snapshot"""
+        await self._run(self._save_snapshot, snapshot)
+    
+    async def get_latest_snapshot(self, entity_type: str) -> Optional[StateSnapshot]:
+        """Get the most recent snapshot for an entity type"""
+        snapshots = await self.list_snapshots(entity_type, limit=1)
+        return snapshots[0] if snapshots else None
+    
+    def _get_entity_state(self, entity_type: str, entity_id: str) -> Optional[EntityState]:
+        rows = self._snapshot_ids(entity_type, limit=1)
+        if not rows:
+            return None
+        row = self._conn.execute(
+            "SELECT state FROM entity_versions "
+            "WHERE entity_type = ? AND entity_id = ? AND snapshot_id <= ? "
+            "ORDER BY snapshot_id DESC LIMIT 1",
+            (entity_type, entity_id, rows[0][0])
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return self._decode_state(entity_type, entity_id, row[0])
+    
+    async def get_entity_state(self, entity_type: str, entity_id: str) -> Optional[EntityState]:
+        """Get state for a specific entity"""
+        return await self._run(self._get_entity_state, entity_type, entity_id)
+    
+    def _list_snapshots(self, entity_type: str, limit: int) -> List[StateSnapshot]:
+        return [
+            self._rebuild_snapshot(entity_type, row)
+            for row in self._snapshot_ids(entity_type, limit)
+        ]
+    
+    async def list_snapshots(self, entity_type: str, limit: int = 10) -> List[StateSnapshot]:
+        """List available snapshots for an entity type"""
+        return await self._run(self._list_snapshots, entity_type, limit)
+    
+    def _delete_snapshot(self, entity_type: str, snapshot_id: int) -> None:
+        """Remove one snapshot, folding its versions into the next one"""
+        following = self._conn.execute(
+            "SELECT MIN(id) FROM snapshots WHERE entity_type = ? AND id > ?",
+            (entity_type, snapshot_id)
+        ).fetchone()[0]
+        if following is not None:
+            # Versions the next snapshot does not override now start there
+            self._conn.execute(
+                "UPDATE entity_versions SET snapshot_id = ? "
+                "WHERE entity_type = ? AND snapshot_id = ? AND entity_id NOT IN ("
+                "SELECT entity_id FROM entity_versions WHERE entity_type = ? AND snapshot_id = ?)",
+                (following, entity_type, snapshot_id, entity_type, following)
+            )
+            # Index entries point at an entity's latest version, which the
+            # next snapshot cannot override, so they all move with it
+            self._conn.execute(
+                "UPDATE entity_index SET snapshot_id = ? WHERE entity_type = ? AND snapshot_id = ?",
+                (following, entity_type, snapshot_id)
+            )
+        self._conn.execute(
+            "DELETE FROM entity_versions WHERE entity_type = ? AND snapshot_id = ?",
+            (entity_type, snapshot_id)
+        )
+        self._conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+    
+    def _rebuild_index(self, entity_type: str) -> None:
+        """Recompute the checksum index from the stored versions"""
+        self._conn.execute("DELETE FROM entity_index WHERE entity_type = ?", (entity_type,))
+        self._conn.execute(
+            "INSERT INTO entity_index "
+            "SELECT entity_type, entity_id, checksum, snapshot_id FROM ("
+            "SELECT entity_type, entity_id, checksum, state, MAX(snapshot_id) AS snapshot_id "
+            "FROM entity_versions WHERE entity_type = ? GROUP BY entity_id"
+            ") WHERE state IS NOT NULL",
+            (entity_type,)
+        )
+    
+    def _delete_old_snapshots(self, entity_type: str, keep_count: int) -> int:
+        with self._conn:
+            rows = self._snapshot_ids(entity_type)
+            old_ids = sorted(row[0] for row in rows[keep_count:])
+            if not old_ids:
+                return 0
+            
+            head = max(row[0] for row in rows)
+            for snapshot_id in old_ids:
+                self._delete_snapshot(entity_type, snapshot_id)
+            
+            # Tombstones in the new base snapshot have nothing left to hide
+            self._conn.execute(
+                "DELETE FROM entity_versions WHERE entity_type = ? AND state IS NULL "
+                "AND snapshot_id = (SELECT MIN(id) FROM snapshots WHERE entity_type = ?)",
+                (entity_type, entity_type)
+            )
+            if head in old_ids:
+                self._rebuild_index(entity_type)
+            return len(old_ids)
+    
+    async def delete_old_snapshots(self, entity_type: str, keep_count: int = 5) -> int:
+        """Delete old snapshots, keeping the most recent ones"""
+        return await self._run(self._delete_old_snapshots, entity_type, keep_count)
+    
+    def _clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM entity_index")
+            self._conn.execute("DELETE FROM entity_versions")
+            self._conn.execute("DELETE FROM snapshots")
+    
+    async def clear(self) -> None:
+        """Clear all stored state"""
+        await self._run(self._clear)
+    
+    def _get_entity_checksums(self, entity_type: str) -> Optional[Dict[str, str]]:
+        if not self._snapshot_ids(entity_type, limit=1):
+            return None
+        return dict(self._conn.execute(
+            "SELECT entity_id, checksum FROM entity_index WHERE entity_type = ?",
+            (entity_type,)
+        ))
+    
+    async def get_entity_checksums(self, entity_type: str) -> Optional[Dict[str, str]]:
+        """Get current entity checksums from the index, or None if there is no snapshot
+        
+        Entities saved without a checksum are indexed by the MD5 of their
+        data serialized with sorted keys.
+        """
+        return await self._run(self._get_entity_checksums, entity_type)
+    
+    def _get_entity_states(self, entity_type: str, entity_ids: List[str]) -> Dict[str, EntityState]:
+        states = {}
+        for start in range(0, len(entity_ids), self._ID_CHUNK):
+            chunk = entity_ids[start:start + self._ID_CHUNK]
+            rows = self._conn.execute(
+                "SELECT v.entity_id, v.state FROM entity_index i "
+                "JOIN entity_versions v ON v.entity_type = i.entity_type "
+                "AND v.entity_id = i.entity_id AND v.snapshot_id = i.snapshot_id "
+                f"WHERE i.entity_type = ? AND i.entity_id IN ({', '.join('?' * len(chunk))})",
+                (entity_type, *chunk)
+            )
+            for eid, state in rows:
+                states[eid] = self._decode_state(entity_type, eid, state)
+        return states
+    
+    async def get_entity_states(
+        self,
+        entity_type: str,
+        entity_ids: Iterable[str]
+    ) -> Dict[str, EntityState]:
+        """Get the current states of the given entities through the index"""
+        return await self._run(self._get_entity_states, entity_type, list(entity_ids))
+    
+    def _get_entity_versions(
+        self,
+        entity_type: str,
+        entity_id: str,
+        limit: int
+    ) -> List[Tuple[datetime, Optional[EntityState]]]:
+        rows = self._conn.execute(
+            "SELECT s.timestamp, v.state FROM entity_versions v "
+            "JOIN snapshots s ON s.id = v.snapshot_id "
+            "WHERE v.entity_type = ? AND v.entity_id = ? "
+            "ORDER BY v.snapshot_id DESC LIMIT ?",
+            (entity_type, entity_id, limit)
+        )
+        return [
+            (
+                datetime.fromisoformat(timestamp),
+                None if state is None else self._decode_state(entity_type, entity_id, state)
+            )
+            for timestamp, state in rows
+        ]
+    
+    async def get_entity_versions(
+        self,
+        entity_type: str,
+        entity_id: str,
+        limit: int = 10
+    ) -> Optional[List[Tuple[datetime, Optional[EntityState]]]]:
+        """Get the stored versions of one entity, newest first"""
+        return await self._run(self._get_entity_versions, entity_type, entity_id, limit)
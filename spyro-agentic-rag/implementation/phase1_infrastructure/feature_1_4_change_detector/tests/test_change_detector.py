@@ -9,7 +9,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.change_detector import ChangeDetector
-from src.state_store import InMemoryStateStore
+from src.state_store import InMemoryStateStore, SQLiteStateStore
 from src.models import Change, ChangeType
 from src.significance_rules import SignificanceEvaluator
 
@@ -369,4 +369,107 @@ class TestChangeDetector:
         
         assert len(changes) == 1
         # Default significance should be used
-        assert changes[0].significance == 0.5
\ No newline at end of file
+        assert changes[0].significance == 0.5
+
+
+class TestIndexedChangeDetector:
+    """Test ChangeDetector against the checksum-indexed SQLite store"""
+    
+    @staticmethod
+    def _summary(changes):
+        """Changes in a comparable, order-independent form"""
+        return sorted(
+            (
+                c.entity_id,
+                c.operation.value,
+                sorted(c.fields_changed),
+                sorted(c.old_values.items()),
+                sorted(c.new_values.items()),
+                c.significance,
+                sorted(c.metadata.items())
+            )
+            for c in changes
+        )
+    
+    @pytest.mark.asyncio
+    async def test_matches_in_memory_store(self):
+        """Test that indexed detection reports the same changes"""
+        detectors = [
+            ChangeDetector(InMemoryStateStore(), significance_threshold=0.0),
+            ChangeDetector(SQLiteStateStore(), significance_threshold=0.0)
+        ]
+        runs = [
+            [{"id": str(i), "value": i, "status": "active"} for i in range(50)],
+            [{"id": str(i), "value": i * (2 if i % 7 == 0 else 1), "status": "active"} for i in range(5, 60)],
+            [{"id": str(i), "value": i, "status": "inactive" if i % 3 == 0 else "active"} for i in range(60)],
+            [{"id": str(i), "value": i, "status": "inactive" if i % 3 == 0 else "active"} for i in range(60)]
+        ]
+        
+        for data in runs:
+            results = [await detector.detect_changes("Entity", data) for detector in detectors]
+            assert self._summary(results[1]) == self._summary(results[0])
+        
+        for entity_id in ("0", "3", "7", "55"):
+            histories = [
+                await detector.get_entity_history("Entity", entity_id, limit=10)
+                for detector in detectors
+            ]
+            assert self._summary(histories[1]) == self._summary(histories[0])
+    
+    @pytest.mark.asyncio
+    async def test_loads_only_changed_entities(self):
+        """Test that detection loads old data only for changed entities"""
+        store = SQLiteStateStore()
+        detector = ChangeDetector(store, significance_threshold=0.0)
+        data = [{"id": str(i), "value": i} for i in range(1000)]
+        await detector.detect_changes("Entity", data)
+        
+        loaded = []
+        get_entity_states = store.get_entity_states
+        
+        async def tracking_get_entity_states(entity_type, entity_ids):
+            entity_ids = list(entity_ids)
+            loaded.extend(entity_ids)
+            return await get_entity_states(entity_type, entity_ids)
+        
+        store.get_entity_states = tracking_get_entity_states
+        data[10]["value"] = -1
+        changes = await detector.detect_changes("Entity", data[:-1])
+        
+        assert sorted(loaded) == ["10", "999"]
+        assert {(c.entity_id, c.operation) for c in changes} == {
+            ("10", ChangeType.UPDATE), ("999", ChangeType.DELETE)
+        }
+    
+    @pytest.mark.asyncio
+    async def test_rollback_to_snapshot(self):
+        """Test rolling back with delta-encoded snapshots"""
+        detector = ChangeDetector(SQLiteStateStore(), significance_threshold=0.0)
+        for i in range(5):
+            with freeze_time(datetime(2024, 1, 15, 10, i)):
+                data = [{"id": f"entity_{j}", "version": i} for j in range(i + 1)]
+                await detector.detect_changes("Entity", data)
+        
+        entities_restored, snapshots_removed = await detector.rollback_to_snapshot(
+            "Entity", datetime(2024, 1, 15, 10, 2)
+        )
+        
+        assert entities_restored == 3
+        assert snapshots_removed >= 2
+        current_snapshot = await detector.state_store.get_latest_snapshot("Entity")
+        assert current_snapshot.entity_count == 3
+        assert {e.data["version"] for e in current_snapshot.entities.values()} == {2}
+    
+    @pytest.mark.asyncio
+    async def test_detect_after_deleting_old_snapshots(self):
+        """Test detecting an update to an entity unchanged since a deleted snapshot"""
+        detector = ChangeDetector(SQLiteStateStore(), significance_threshold=0.0)
+        await detector.detect_changes("Entity", [{"id": "1", "v": 1}, {"id": "2", "v": 1}])
+        await detector.detect_changes("Entity", [{"id": "1", "v": 1}, {"id": "2", "v": 2}])
+        await detector.state_store.delete_old_snapshots("Entity", keep_count=1)
+        
+        changes = await detector.detect_changes("Entity", [{"id": "1", "v": 5}, {"id": "2", "v": 2}])
+        
+        assert [(c.entity_id, c.operation, c.old_values, c.new_values) for c in changes] == [
+            ("1", ChangeType.UPDATE, {"v": 1}, {"v": 5})
+        ]
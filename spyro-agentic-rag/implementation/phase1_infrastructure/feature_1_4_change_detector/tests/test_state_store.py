@@ -10,7 +10,7 @@ import asyncio
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.state_store import InMemoryStateStore, FileStateStore
+from src.state_store import InMemoryStateStore, FileStateStore, SQLiteStateStore
 from src.models import EntityState, StateSnapshot
 
 
@@ -297,4 +297,201 @@ class TestFileStateStore:
         
         # Verify directory is empty
         assert os.path.exists(store.base_dir)
-        assert len(os.listdir(store.base_dir)) == 0
\ No newline at end of file
+        assert len(os.listdir(store.base_dir)) == 0
+
+
+class TestSQLiteStateStore:
+    """Test cases for the delta-encoded SQLite state store"""
+    
+    @pytest_asyncio.fixture
+    async def store(self):
+        """Create a temporary SQLite store"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SQLiteStateStore(os.path.join(tmpdir, "state.db"))
+            yield store
+            store.close()
+    
+    def _snapshot(self, timestamp, data_by_id):
+        """Build a Customer snapshot from entity data"""
+        return StateSnapshot(
+            timestamp=timestamp,
+            entity_type="Customer",
+            entities={
+                eid: EntityState(
+                    entity_type="Customer",
+                    entity_id=eid,
+                    data=data,
+                    last_modified=timestamp,
+                    checksum=str(sorted(data.items()))
+                )
+                for eid, data in data_by_id.items()
+            },
+            metadata={"entity_count": len(data_by_id)}
+        )
+    
+    def _history(self, base_time):
+        """Snapshots with updates, a deletion and a re-creation"""
+        states = [
+            {f"cust_{i}": {"name": f"Customer {i}", "tier": 1} for i in range(100)}
+        ]
+        for step in range(1, 5):
+            data = {eid: dict(values) for eid, values in states[-1].items()}
+            data[f"cust_{step}"]["tier"] = step + 1
+            if step == 2:
+                del data["cust_50"]
+            if step == 4:
+                data["cust_50"] = {"name": "Customer 50", "tier": 9}
+            states.append(data)
+        return [
+            self._snapshot(base_time + timedelta(minutes=i), data)
+            for i, data in enumerate(states)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_save_and_retrieve_snapshot(self, store):
+        """Test saving and retrieving snapshots"""
+        snapshot = self._snapshot(datetime.now(), {"cust_001": {"name": "Test Customer"}})
+        await store.save_snapshot(snapshot)
+        
+        retrieved = await store.get_latest_snapshot("Customer")
+        assert retrieved is not None
+        assert retrieved.to_dict() == snapshot.to_dict()
+        
+        state = await store.get_entity_state("Customer", "cust_001")
+        assert state.data["name"] == "Test Customer"
+        assert await store.get_entity_state("Customer", "missing") is None
+        assert await store.get_latest_snapshot("Product") is None
+    
+    @pytest.mark.asyncio
+    async def test_stores_only_deltas(self, store):
+        """Test that later snapshots store only changed entities"""
+        snapshots = self._history(datetime(2024, 1, 15, 10, 0))
+        for snapshot in snapshots:
+            await store.save_snapshot(snapshot)
+        
+        # Base of 100, one update per step, a tombstone and a re-creation
+        rows = store._conn.execute("SELECT COUNT(*) FROM entity_versions").fetchone()[0]
+        assert rows == 100 + 4 + 1 + 1
+        
+        listed = await store.list_snapshots("Customer", limit=10)
+        assert len(listed) == 5
+        for expected, retrieved in zip(reversed(snapshots), listed):
+            assert retrieved.timestamp == expected.timestamp
+            assert {eid: e.data for eid, e in retrieved.entities.items()} == \
+                {eid: e.data for eid, e in expected.entities.items()}
+    
+    @pytest.mark.asyncio
+    async def test_checksum_index(self, store):
+        """Test checksums and states served from the index"""
+        assert await store.get_entity_checksums("Customer") is None
+        
+        snapshots = self._history(datetime(2024, 1, 15, 10, 0))
+        for snapshot in snapshots:
+            await store.save_snapshot(snapshot)
+        
+        latest = snapshots[-1]
+        checksums = await store.get_entity_checksums("Customer")
+        assert checksums == {eid: e.checksum for eid, e in latest.entities.items()}
+        
+        states = await store.get_entity_states("Customer", ["cust_4", "cust_50", "missing"])
+        assert set(states) == {"cust_4", "cust_50"}
+        assert states["cust_4"].data == {"name": "Customer 4", "tier": 5}
+    
+    @pytest.mark.asyncio
+    async def test_entity_versions(self, store):
+        """Test reading one entity's versions, deletions included"""
+        snapshots = self._history(datetime(2024, 1, 15, 10, 0))
+        for snapshot in snapshots:
+            await store.save_snapshot(snapshot)
+        
+        versions = await store.get_entity_versions("Customer", "cust_50", limit=10)
+        assert [timestamp for timestamp, _ in versions] == [
+            snapshots[4].timestamp, snapshots[2].timestamp, snapshots[0].timestamp
+        ]
+        assert versions[0][1].data["tier"] == 9
+        assert versions[1][1] is None
+        assert versions[2][1].data["tier"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_delete_old_snapshots(self, store):
+        """Test that deleting old snapshots keeps the rest intact"""
+        snapshots = self._history(datetime(2024, 1, 15, 10, 0))
+        for snapshot in snapshots:
+            await store.save_snapshot(snapshot)
+        before = [s.to_dict() for s in await store.list_snapshots("Customer", limit=2)]
+        
+        deleted = await store.delete_old_snapshots("Customer", keep_count=2)
+        assert deleted == 3
+        
+        after = [s.to_dict() for s in await store.list_snapshots("Customer", limit=10)]
+        assert after == before
+        
+        # The remaining base snapshot holds no tombstones
+        tombstones = store._conn.execute(
+            "SELECT COUNT(*) FROM entity_versions WHERE state IS NULL"
+        ).fetchone()[0]
+        assert tombstones == 0
+    
+    @pytest.mark.asyncio
+    async def test_latest_is_last_saved(self, store):
+        """Test that a snapshot saved with an older timestamp is still the latest"""
+        now = datetime(2024, 1, 15, 10, 0)
+        await store.save_snapshot(self._snapshot(now, {"a": {"v": 1}}))
+        await store.save_snapshot(self._snapshot(now - timedelta(hours=1), {"a": {"v": 0}, "b": {"v": 0}}))
+        expected_checksums = {"a": str([("v", 0)]), "b": str([("v", 0)])}
+        
+        latest = await store.get_latest_snapshot("Customer")
+        assert {eid: e.data for eid, e in latest.entities.items()} == {"a": {"v": 0}, "b": {"v": 0}}
+        assert await store.get_entity_checksums("Customer") == expected_checksums
+        
+        assert await store.delete_old_snapshots("Customer", keep_count=1) == 1
+        
+        latest = await store.get_latest_snapshot("Customer")
+        assert {eid: e.data for eid, e in latest.entities.items()} == {"a": {"v": 0}, "b": {"v": 0}}
+        assert await store.get_entity_checksums("Customer") == expected_checksums
+    
+    @pytest.mark.asyncio
+    async def test_index_follows_folded_versions(self, store):
+        """Test that indexed states survive deleting the snapshot they were written in"""
+        snapshots = self._history(datetime(2024, 1, 15, 10, 0))
+        for snapshot in snapshots:
+            await store.save_snapshot(snapshot)
+        
+        await store.delete_old_snapshots("Customer", keep_count=1)
+        
+        latest = snapshots[-1]
+        states = await store.get_entity_states("Customer", list(latest.entities))
+        assert {eid: e.data for eid, e in states.items()} == \
+            {eid: e.data for eid, e in latest.entities.items()}
+    
+    @pytest.mark.asyncio
+    async def test_persistence_across_instances(self, store):
+        """Test data persists across store instances"""
+        await store.save_snapshot(self._snapshot(datetime.now(), {"cust_001": {"name": "Persistent"}}))
+        
+        new_store = SQLiteStateStore(store.db_path)
+        retrieved = await new_store.get_latest_snapshot("Customer")
+        new_store.close()
+        assert retrieved.entities["cust_001"].data["name"] == "Persistent"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_access(self, store):
+        """Test concurrent snapshot saves"""
+        now = datetime.now()
+        await asyncio.gather(*[
+            store.save_snapshot(self._snapshot(now + timedelta(seconds=i), {f"cust_{i}": {"index": i}}))
+            for i in range(5)
+        ])
+        
+        snapshots = await store.list_snapshots("Customer", limit=10)
+        assert len(snapshots) == 5
+    
+    @pytest.mark.asyncio
+    async def test_clear_store(self, store):
+        """Test clearing the store"""
+        await store.save_snapshot(self._snapshot(datetime.now(), {"cust_001": {"name": "Test"}}))
+        
+        await store.clear()
+        
+        assert await store.get_latest_snapshot("Customer") is None
+        assert await store.get_entity_checksums("Customer") is None
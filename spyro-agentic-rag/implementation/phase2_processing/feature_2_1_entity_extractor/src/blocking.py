@@ -0,0 +1,153 @@
+"""Candidate pair generation for entity resolution
+
+Comparing every pair of entities is quadratic, so the resolver only scores
+pairs that share a blocking key (name prefix, phonetic code, email, domain
+or cross-referenced id) or that sit close together when entities are sorted
+by name (sorted neighbourhood). Keys shared by very many entities are
+treated the same way: sorted by name and compared within a sliding window.
+"""
+
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Entity
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Soundex digit per letter; vowels, h, w and y carry no code
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6"
+}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a name and drop everything but letters and digits"""
+    return _NON_ALNUM.sub("", name.lower())
+
+
+def soundex(text: str) -> str:
+    """American Soundex code of the letters in text ("" if there are none)"""
+    letters = [c for c in text.lower() if "a" <= c <= "z"]
+    if not letters:
+        return ""
+
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code
+        if letter not in "hw":
+            previous = digit
+
+    return code.ljust(4, "0")
+
+
+def blocking_keys(
+    entity: Entity,
+    domain_extractor: Callable[[Dict], Optional[str]],
+    prefix_length: int = 4
+) -> Set[str]:
+    """Keys an entity shares with the entities it may duplicate
+
+    Args:
+        entity: Entity to key
+        domain_extractor: Returns the email/website domain of attributes
+        prefix_length: Characters of the normalized name used as a key
+
+    Returns:
+        Set of blocking keys
+    """
+    keys = set()
+    attributes = entity.attributes
+
+    name = normalize_name(str(attributes.get("name", "")))
+    if name:
+        keys.add(f"name:{name[:prefix_length]}")
+        phonetic = soundex(name)
+        if phonetic:
+            keys.add(f"phonetic:{phonetic}")
+
+    email = attributes.get("email", "")
+    if isinstance(email, str) and email:
+        keys.add(f"email:{email.lower()}")
+
+    domain = domain_extractor(attributes)
+    if domain:
+        keys.add(f"domain:{domain}")
+
+    # Cross references: an entity's own id in its system, and the
+    # {system}_id attributes pointing at other systems
+    if entity.source_system:
+        own_id = attributes.get("id", entity.source_id)
+        if own_id is not None:
+            keys.add(f"ref:{entity.source_system}:{own_id}")
+    for attr, value in attributes.items():
+        if attr.endswith("_id") and value is not None:
+            keys.add(f"ref:{attr[:-3]}:{value}")
+
+    return keys
+
+
+def _window_pairs(indices: List[int], sort_keys: List[str], window: int) -> Iterable[Tuple[int, int]]:
+    """Pairs of indices within window positions of each other in sort order"""
+    ordered = sorted(indices, key=lambda i: sort_keys[i])
+    for position, i in enumerate(ordered):
+        for j in ordered[position + 1:position + window]:
+            yield (i, j) if i < j else (j, i)
+
+
+def candidate_pairs(
+    entities: List[Entity],
+    domain_extractor: Callable[[Dict], Optional[str]],
+    window: int = 10,
+    max_block_size: int = 100,
+    prefix_length: int = 4
+) -> List[Tuple[int, int]]:
+    """Index pairs (i < j) of entities worth scoring, in order
+
+    Args:
+        entities: Entities to pair
+        domain_extractor: Returns the email/website domain of attributes
+        window: Sorted neighbourhood window size
+        max_block_size: Blocks larger than this are windowed, not fully paired
+        prefix_length: Characters of the normalized name used as a key
+
+    Returns:
+        Sorted list of unique index pairs
+    """
+    names = [normalize_name(str(e.attributes.get("name", ""))) for e in entities]
+    reversed_names = [name[::-1] for name in names]
+
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for i, entity in enumerate(entities):
+        for key in blocking_keys(entity, domain_extractor, prefix_length):
+            blocks[key].append(i)
+
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) <= max_block_size:
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    pairs.add((i, j))
+        else:
+            pairs.update(_window_pairs(members, names, window))
+
+    # Sorted neighbourhood over names and reversed names catches typos
+    # that change the prefix or the suffix
+    named = [i for i, name in enumerate(names) if name]
+    pairs.update(_window_pairs(named, names, window))
+    pairs.update(_window_pairs(named, reversed_names, window))
+
+    return sorted(pairs)
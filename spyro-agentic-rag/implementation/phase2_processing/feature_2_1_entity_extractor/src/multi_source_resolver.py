@@ -4,10 +4,11 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import asyncio
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from collections import defaultdict
 
 from .models import Entity, EntityType, ResolutionCandidate, ConfidenceLevel
+from .blocking import candidate_pairs
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,10 @@ class MultiSourceEntityResolver:
         self,
         similarity_threshold: float = 0.85,
         use_llm_validation: bool = False,
-        merge_strategy: str = "most_complete"
+        merge_strategy: str = "most_complete",
+        use_blocking: bool = True,
+        window_size: int = 10,
+        max_block_size: int = 100
     ):
         """Initialize resolver
         
@@ -30,10 +34,17 @@ class MultiSourceEntityResolver:
                 - most_complete: Use entity with most attributes
                 - most_recent: Use most recently updated
                 - weighted: Weighted merge based on source reliability
+            use_blocking: Only score pairs sharing a blocking key or sorted
+                neighbourhood window; otherwise score every pair
+            window_size: Sorted neighbourhood window size
+            max_block_size: Blocks larger than this are windowed, not fully paired
         """
         self.similarity_threshold = similarity_threshold
         self.use_llm_validation = use_llm_validation
         self.merge_strategy = merge_strategy
+        self.use_blocking = use_blocking
+        self.window_size = window_size
+        self.max_block_size = max_block_size
         self._resolution_cache = {}
     
     async def resolve_entities(
@@ -105,6 +116,25 @@ class MultiSourceEntityResolver:
         candidates = []
         processed = set()
         
+        # Score candidate pairs, name similarities in one batch
+        if self.use_blocking:
+            pairs = candidate_pairs(
+                entities,
+                self._extract_domain,
+                window=self.window_size,
+                max_block_size=self.max_block_size
+            )
+        else:
+            pairs = [(i, j) for i in range(len(entities)) for j in range(i + 1, len(entities))]
+        
+        name_scores = self._name_similarities(entities, pairs)
+        
+        matches = defaultdict(list)
+        for (i, j), name_score in zip(pairs, name_scores):
+            score, reasons = self._score_pair(entities[i], entities[j], name_score)
+            if score >= self.similarity_threshold:
+                matches[i].append((j, score, reasons))
+        
         for i, entity1 in enumerate(entities):
             if entity1.id in processed:
                 continue
@@ -113,17 +143,14 @@ class MultiSourceEntityResolver:
             similarity_scores = {}
             match_reasons = []
             
-            for j, entity2 in enumerate(entities[i+1:], i+1):
+            for j, score, reasons in matches.get(i, []):
+                entity2 = entities[j]
                 if entity2.id in processed:
                     continue
                 
-                # Calculate similarity
-                score, reasons = await self._calculate_similarity(entity1, entity2)
-                
-                if score >= self.similarity_threshold:
-                    candidate_entities.append(entity2)
-                    similarity_scores[f"{entity1.id}-{entity2.id}"] = score
-                    match_reasons.extend(reasons)
+                candidate_entities.append(entity2)
+                similarity_scores[f"{entity1.id}-{entity2.id}"] = score
+                match_reasons.extend(reasons)
             
             # Create candidate if duplicates found
             if len(candidate_entities) > 1:
@@ -138,12 +165,39 @@ class MultiSourceEntityResolver:
         
         return candidates
     
+    def _name_similarities(
+        self,
+        entities: List[Entity],
+        pairs: List[Tuple[int, int]]
+    ) -> List[float]:
+        """Token sort name similarity for each index pair, computed in one batch"""
+        if not pairs:
+            return []
+        
+        names = [str(e.attributes.get("name", "")).lower() for e in entities]
+        scores = process.cpdist(
+            [names[i] for i, _ in pairs],
+            [names[j] for _, j in pairs],
+            scorer=fuzz.token_sort_ratio,
+            workers=-1
+        )
+        return (scores / 100).tolist()
+    
     async def _calculate_similarity(
         self,
         entity1: Entity,
         entity2: Entity
     ) -> Tuple[float, List[str]]:
         """Calculate similarity between two entities"""
+        return self._score_pair(entity1, entity2)
+    
+    def _score_pair(
+        self,
+        entity1: Entity,
+        entity2: Entity,
+        name_score: Optional[float] = None
+    ) -> Tuple[float, List[str]]:
+        """Similarity between two entities, given a precomputed name score"""
         scores = []
         reasons = []
         
@@ -152,7 +206,8 @@ class MultiSourceEntityResolver:
         name2 = str(entity2.attributes.get("name", "")).lower()
         
         if name1 and name2:
-            name_score = fuzz.token_sort_ratio(name1, name2) / 100
+            if name_score is None:
+                name_score = fuzz.token_sort_ratio(name1, name2) / 100
             scores.append(name_score)
             
             if name_score >= 0.9:
@@ -0,0 +1,79 @@
+"""Tests for resolution candidate blocking"""
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.blocking import blocking_keys, candidate_pairs, normalize_name, soundex
+from src.models import Entity, EntityType
+from src.multi_source_resolver import MultiSourceEntityResolver
+
+
+class TestBlocking:
+    """Test blocking key and candidate pair generation"""
+    
+    @pytest.fixture
+    def extract_domain(self):
+        """Domain extractor used by the resolver"""
+        return MultiSourceEntityResolver()._extract_domain
+    
+    def test_soundex(self):
+        """Test standard Soundex codes"""
+        assert soundex("Robert") == "R163"
+        assert soundex("Rupert") == "R163"
+        assert soundex("Ashcraft") == "A261"
+        assert soundex("Tymczak") == "T522"
+        assert soundex("Lee") == "L000"
+        assert soundex("123") == ""
+    
+    def test_blocking_keys(self, extract_domain):
+        """Test name, phonetic, email, domain and cross reference keys"""
+        entity = Entity(
+            type=EntityType.CUSTOMER,
+            source_id="sf_1",
+            source_system="salesforce",
+            attributes={
+                "name": "Tech Corp",
+                "email": "Info@TechCorp.com",
+                "gainsight_id": "gs_9"
+            }
+        )
+        
+        keys = blocking_keys(entity, extract_domain)
+        
+        assert normalize_name("Tech Corp") == "techcorp"
+        assert keys == {
+            "name:tech",
+            f"phonetic:{soundex('techcorp')}",
+            "email:info@techcorp.com",
+            "domain:techcorp.com",
+            "ref:salesforce:sf_1",
+            "ref:gainsight:gs_9"
+        }
+    
+    def test_candidate_pairs(self, extract_domain):
+        """Test that only entities sharing a key or window are paired"""
+        entities = [
+            Entity(attributes={"name": "Alpha Systems", "website": "https://alpha.io"}),
+            Entity(attributes={"name": "Zulu Alpha", "email": "sales@alpha.io"}),
+            Entity(attributes={"name": "AlphaSystems"}),
+            Entity(attributes={"name": "Mike"}),
+            Entity(attributes={"name": "Quebec"})
+        ]
+        
+        pairs = candidate_pairs(entities, extract_domain, window=1)
+        
+        assert pairs == [(0, 1), (0, 2)]
+    
+    def test_large_blocks_are_windowed(self, extract_domain):
+        """Test that oversized blocks only pair sorted neighbours"""
+        entities = [Entity(attributes={"name": f"Acme {i:03d}"}) for i in range(50)]
+        
+        pairs = candidate_pairs(entities, extract_domain, window=3, max_block_size=10)
+        
+        # Each of the block, name and reversed name passes pairs every
+        # entity with at most window - 1 successors
+        assert len(pairs) <= 3 * 50 * 2
+        assert (0, 1) in pairs and (0, 3) not in pairs
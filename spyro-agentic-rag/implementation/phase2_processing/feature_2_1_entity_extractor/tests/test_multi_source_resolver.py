@@ -356,4 +356,42 @@ class TestMultiSourceEntityResolver:
         resolver.clear_cache()
         
         # Cache should be empty
-        assert len(resolver._resolution_cache) == 0
\ No newline at end of file
+        assert len(resolver._resolution_cache) == 0
+    
+    @pytest.mark.asyncio
+    async def test_blocking_matches_exhaustive(self, resolver):
+        """Test that blocked candidate search finds the same groups as scoring all pairs"""
+        names = ["Acme Analytics", "Blue Harbor", "Cedar Labs", "Delta Freight", "Echo Media"]
+        entities = []
+        for k, name in enumerate(names):
+            domain = name.replace(" ", "").lower() + ".com"
+            entities.append(Entity(
+                type=EntityType.CUSTOMER,
+                source_id=f"sf_{k}",
+                source_system="salesforce",
+                attributes={"name": name, "email": f"info@{domain}"}
+            ))
+            entities.append(Entity(
+                type=EntityType.CUSTOMER,
+                source_id=f"hs_{k}",
+                source_system="hubspot",
+                attributes={"name": f"{name} Inc", "email": f"info@{domain}"}
+            ))
+            # Same name pattern, different company: must not merge
+            entities.append(Entity(
+                type=EntityType.CUSTOMER,
+                source_id=f"zd_{k}",
+                source_system="zendesk",
+                attributes={"name": f"{name.split()[0]} Holdings", "email": f"support@other{k}.com"}
+            ))
+        
+        blocked = await resolver._find_duplicate_candidates(entities)
+        resolver.use_blocking = False
+        exhaustive = await resolver._find_duplicate_candidates(entities)
+        
+        def groups(candidates):
+            return {frozenset(e.source_id for e in c.entities) for c in candidates}
+        
+        expected = {frozenset({f"sf_{k}", f"hs_{k}"}) for k in range(len(names))}
+        assert groups(exhaustive) == expected
+        assert groups(blocked) == expected
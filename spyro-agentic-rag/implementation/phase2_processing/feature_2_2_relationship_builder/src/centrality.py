@@ -0,0 +1,597 @@
+"""Approximate and incremental centrality for hub detection"""
+
+import heapq
+import logging
+import random
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+import numpy as np
+import networkx as nx
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from .graph_backend import CSRGraph
+
+logger = logging.getLogger(__name__)
+
+EdgeKey = Tuple[Hashable, Hashable]
+
+Neighbors = Callable[[Hashable], Iterable[Tuple[Hashable, float]]]
+
+# Shortest-path DAGs deeper than this many hops fall back to the Python pass
+MAX_DAG_SWEEPS = 256
+
+# Edge length given to zero-weight edges in the CSR path, where SciPy's
+# Dijkstra treats stored zeros as missing edges
+MIN_CSR_LENGTH = 1e-9
+
+
+@dataclass
+class CentralityScores:
+    """Normalized centrality measures for every node of a graph"""
+    degree: Dict[Hashable, float]
+    betweenness: Dict[Hashable, float]
+    closeness: Dict[Hashable, float]
+    method: str  # exact, sampled, incremental or cached
+
+
+@dataclass
+class _PivotState:
+    """Single-source contributions of one sampled pivot"""
+    source: Hashable
+    weight: float
+    distance: np.ndarray
+    dependency: np.ndarray
+
+
+@dataclass
+class _SampledState:
+    """Everything needed to update sampled estimates in place"""
+    position: Dict[Hashable, int]
+    component: np.ndarray
+    small_components: Dict[int, List[Hashable]]
+    pivots: List[_PivotState]
+    betweenness: np.ndarray
+    harmonic: np.ndarray
+    small_betweenness: Dict[int, Dict[Hashable, float]] = field(default_factory=dict)
+    small_harmonic: Dict[int, Dict[Hashable, float]] = field(default_factory=dict)
+
+
+def _edge_key(u: Hashable, v: Hashable) -> EdgeKey:
+    return (u, v) if repr(u) <= repr(v) else (v, u)
+
+
+def _shortest_path_dag(
+    neighbors: Neighbors,
+    source: Hashable
+) -> Tuple[List[Hashable], Dict[Hashable, List[Hashable]], Dict[Hashable, float], Dict[Hashable, float]]:
+    """Brandes' weighted single-source pass
+
+    Returns:
+        (order, predecessors, path counts, distances) with order sorted by
+        non-decreasing distance from the source
+    """
+    order = []
+    predecessors = {source: []}
+    sigma = {source: 1.0}
+    distance = {}
+    seen = {source: 0.0}
+    counter = count()
+    queue = [(0.0, next(counter), source, source)]
+    while queue:
+        dist, _, pred, node = heapq.heappop(queue)
+        if node in distance:
+            continue
+        if node != source:
+            sigma[node] += sigma[pred]
+        order.append(node)
+        distance[node] = dist
+        for neighbor, length in neighbors(node):
+            neighbor_dist = dist + length
+            if neighbor in distance:
+                continue
+            if neighbor not in seen or neighbor_dist < seen[neighbor]:
+                seen[neighbor] = neighbor_dist
+                heapq.heappush(queue, (neighbor_dist, next(counter), node, neighbor))
+                sigma[neighbor] = 0.0
+                predecessors[neighbor] = [node]
+            elif neighbor_dist == seen[neighbor]:
+                sigma[neighbor] += sigma[node]
+                predecessors[neighbor].append(node)
+    return order, predecessors, sigma, distance
+
+
+def _dependencies(
+    order: List[Hashable],
+    predecessors: Dict[Hashable, List[Hashable]],
+    sigma: Dict[Hashable, float]
+) -> Dict[Hashable, float]:
+    """Brandes' accumulation of pair dependencies on each node"""
+    delta = dict.fromkeys(order, 0.0)
+    for node in reversed(order):
+        coefficient = (1.0 + delta[node]) / sigma[node]
+        for pred in predecessors[node]:
+            delta[pred] += sigma[pred] * coefficient
+    delta[order[0]] = 0.0
+    return delta
+
+
+def _dag_dependencies(
+    distance: np.ndarray,
+    source: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: np.ndarray
+) -> Optional[np.ndarray]:
+    """Brandes' dependencies from a precomputed distance row
+
+    Edges whose length closes the distance gap exactly form the shortest-path
+    DAG. Path counts flow forward and dependencies backward through it with
+    one sparse product per hop, so the cost is a few passes over the edges
+    rather than a Python loop over nodes.
+
+    Returns:
+        Dependency of every node, or None if the DAG is too deep to sweep
+    """
+    n = len(distance)
+    on_dag = np.isfinite(distance[src]) & (distance[src] + weight == distance[dst])
+    predecessors = sparse.csr_matrix(
+        (np.ones(int(on_dag.sum())), (dst[on_dag], src[on_dag])), shape=(n, n)
+    )
+    successors = predecessors.T.tocsr()
+
+    seed = np.zeros(n)
+    seed[source] = 1.0
+    sigma = seed
+    for _ in range(MAX_DAG_SWEEPS):
+        updated = seed + predecessors @ sigma
+        if np.array_equal(updated, sigma):
+            break
+        sigma = updated
+    else:
+        return None
+
+    with np.errstate(divide='ignore'):
+        inverse_sigma = np.where(sigma > 0, 1.0 / sigma, 0.0)
+    delta = np.zeros(n)
+    for _ in range(MAX_DAG_SWEEPS):
+        updated = sigma * (successors @ ((1.0 + delta) * inverse_sigma))
+        if np.array_equal(updated, delta):
+            break
+        delta = updated
+    else:
+        return None
+
+    delta[source] = 0.0
+    return delta
+
+
+class CentralityProvider:
+    """Degree, betweenness and closeness centrality that scale past 100k edges
+
+    Graphs up to exact_max_nodes nodes get the exact NetworkX measures. Larger
+    graphs are estimated from sampled pivots: one weighted Brandes pass per
+    pivot yields both its betweenness dependencies and the distances used for
+    harmonic closeness, and each pivot stands in for its share of the
+    component it was drawn from. Components no larger than
+    exact_component_size use every node as a pivot, so they stay exact and the
+    sample budget goes to the largest components.
+
+    Results are cached against the graph's edge set. When a later graph only
+    adds up to incremental_max_edges edges inside existing components, only
+    pivots whose shortest paths the new edges can shorten or tie are re-run.
+    """
+
+    def __init__(
+        self,
+        exact_max_nodes: int = 2000,
+        betweenness_pivots: int = 64,
+        exact_component_size: int = 32,
+        incremental_max_edges: int = 500,
+        weight: str = "weight",
+        seed: int = 42
+    ):
+        """Initialize the provider
+
+        Args:
+            exact_max_nodes: Largest graph given exact measures
+            betweenness_pivots: Pivots sampled across large components
+            exact_component_size: Largest component computed from every node
+            incremental_max_edges: Most added edges handled without a full pass
+            weight: Edge attribute used as distance
+            seed: Pivot sampling seed
+        """
+        self.exact_max_nodes = exact_max_nodes
+        self.betweenness_pivots = max(1, betweenness_pivots)
+        self.exact_component_size = exact_component_size
+        self.incremental_max_edges = incremental_max_edges
+        self.weight = weight
+        self.seed = seed
+
+        self._edges: Optional[Dict[EdgeKey, float]] = None
+        self._nodes: Optional[frozenset] = None
+        self._scores: Optional[CentralityScores] = None
+        self._state: Optional[_SampledState] = None
+        self._csr_version: Optional[str] = None
+        self._csr_scores: Optional[CentralityScores] = None
+
+    def compute(self, graph: nx.Graph) -> CentralityScores:
+        """Centrality measures for an undirected graph
+
+        Args:
+            graph: Graph with distances in the configured weight attribute
+
+        Returns:
+            Scores for every node, reused or updated from the last call
+            when the edge set allows it
+        """
+        edges = {
+            _edge_key(u, v): data.get(self.weight, 1)
+            for u, v, data in graph.edges(data=True)
+        }
+        nodes = frozenset(graph.nodes)
+
+        if self._scores is not None and nodes == self._nodes and edges == self._edges:
+            return CentralityScores(
+                self._scores.degree, self._scores.betweenness, self._scores.closeness, "cached"
+            )
+
+        degree = nx.degree_centrality(graph)
+        if graph.number_of_nodes() <= self.exact_max_nodes:
+            scores = CentralityScores(
+                degree=degree,
+                betweenness=nx.betweenness_centrality(graph, weight=self.weight),
+                closeness=nx.closeness_centrality(graph, distance=self.weight),
+                method="exact"
+            )
+            self._state = None
+        else:
+            added = self._incremental_edges(nodes, edges)
+            if added is not None:
+                self._update_sampled(graph, added)
+                method = "incremental"
+            else:
+                self._state = self._build_sampled(graph)
+                method = "sampled"
+            betweenness, closeness = self._normalized(graph.number_of_nodes())
+            scores = CentralityScores(degree, betweenness, closeness, method)
+
+        self._edges, self._nodes, self._scores = edges, nodes, scores
+        logger.debug(f"Centrality for {len(nodes)} nodes and {len(edges)} edges: {scores.method}")
+        return scores
+
+    def clear_cache(self):
+        """Forget the cached graph and sampled state"""
+        self._edges = self._nodes = self._scores = self._state = None
+        self._csr_version = self._csr_scores = None
+
+    def compute_csr(self, graph: CSRGraph) -> CentralityScores:
+        """Centrality measures for a CSRGraph, without NetworkX
+
+        Up to exact_max_nodes every node is a source, which gives exact
+        betweenness and the Wasserman-Faust closeness NetworkX computes.
+        Larger graphs use the same pivot sampling and harmonic closeness as
+        compute(). Results are cached by the graph's fingerprint; CSR graphs
+        are rebuilt from relationships on every call, so there is no
+        incremental update.
+
+        Args:
+            graph: Graph whose edge weights are distances
+
+        Returns:
+            Scores for every node, keyed by node id
+        """
+        version = graph.fingerprint()
+        if self._csr_scores is not None and version == self._csr_version:
+            cached = self._csr_scores
+            return CentralityScores(cached.degree, cached.betweenness, cached.closeness, "cached")
+
+        n = graph.number_of_nodes
+        length = np.maximum(graph.weights, MIN_CSR_LENGTH)
+        src, dst = graph.rows.astype(np.int64), graph.indices.astype(np.int64)
+        matrix = graph.to_scipy(min_weight=MIN_CSR_LENGTH)
+        indptr, indices = graph.indptr, graph.indices
+
+        def neighbors(i):
+            start, stop = indptr[i], indptr[i + 1]
+            return zip(indices[start:stop].tolist(), length[start:stop].tolist())
+
+        exact = n <= self.exact_max_nodes
+        if exact:
+            sources, weights, small = list(range(n)), [1.0] * n, []
+        else:
+            labels = graph.connected_components()
+            order = np.argsort(labels, kind="stable")
+            splits = np.flatnonzero(np.diff(labels[order])) + 1
+            components = sorted((list(c) for c in np.split(order, splits)), key=len, reverse=True)
+            sources, weights, small = self._sample_pivots(components)
+
+        betweenness = np.zeros(n)
+        closeness = np.zeros(n)
+        block = max(1, (1 << 18) // max(1, n))
+        for start in range(0, len(sources), block):
+            rows = sources[start:start + block]
+            distances = csgraph.dijkstra(matrix, directed=True, indices=rows)
+            for source, pivot_weight, distance in zip(rows, weights[start:start + block], distances):
+                dependency = _dag_dependencies(distance, source, src, dst, length)
+                if dependency is None:
+                    dependency, distance = self._python_pass(neighbors, source, n)
+                betweenness += pivot_weight * dependency
+                if exact:
+                    reachable = distance[np.isfinite(distance)]
+                    total = reachable.sum()
+                    if total > 0 and n > 1:
+                        r = len(reachable) - 1
+                        closeness[source] = (r / total) * (r / (n - 1))
+                else:
+                    with np.errstate(divide='ignore'):
+                        closeness += pivot_weight * np.where(distance > 0, 1.0 / distance, 0.0)
+
+        for members in small:
+            for source in members:
+                dependency, distance = self._python_pass(neighbors, source, n)
+                betweenness += dependency
+                with np.errstate(divide='ignore'):
+                    closeness += np.where(distance > 0, 1.0 / distance, 0.0)
+
+        betweenness_scale, harmonic_scale = self._scales(n)
+        degree = graph.degrees / (n - 1) if n > 1 else np.ones(n)
+        scores = CentralityScores(
+            degree=dict(zip(graph.node_ids, degree.tolist())),
+            betweenness=dict(zip(graph.node_ids, (betweenness * betweenness_scale).tolist())),
+            closeness=dict(zip(graph.node_ids, (closeness * (1.0 if exact else harmonic_scale)).tolist())),
+            method="exact" if exact else "sampled"
+        )
+        self._csr_version, self._csr_scores = version, scores
+        return scores
+
+    def _neighbors(self, graph: nx.Graph) -> Neighbors:
+        adj, weight = graph.adj, self.weight
+        return lambda node: ((neighbor, data.get(weight, 1)) for neighbor, data in adj[node].items())
+
+    @staticmethod
+    def _python_pass(neighbors: Neighbors, source: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Dependencies and distances from one source as dense arrays"""
+        order, predecessors, sigma, distance = _shortest_path_dag(neighbors, source)
+        delta = _dependencies(order, predecessors, sigma)
+        dependency = np.zeros(n)
+        distances = np.full(n, np.inf)
+        dependency[order] = [delta[node] for node in order]
+        distances[order] = [distance[node] for node in order]
+        return dependency, distances
+
+    @staticmethod
+    def _scales(n: int) -> Tuple[float, float]:
+        """Betweenness and harmonic closeness normalization, as in NetworkX"""
+        betweenness_scale = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        harmonic_scale = 1.0 / (n - 1) if n > 1 else 0.0
+        return betweenness_scale, harmonic_scale
+
+    def _sample_pivots(
+        self,
+        components: List[List[Hashable]]
+    ) -> Tuple[List[Hashable], List[float], List[List[Hashable]]]:
+        """Pivots for the large components and the small components left over
+
+        Args:
+            components: Node lists, largest first
+
+        Returns:
+            (pivots, pivot weights, small components); each pivot's weight is
+            the number of component nodes it stands in for
+        """
+        small = [members for members in components if len(members) <= self.exact_component_size]
+        large = [members for members in components if len(members) > self.exact_component_size]
+
+        rng = random.Random(self.seed)
+        large_nodes = sum(len(members) for members in large)
+        sources, weights = [], []
+        for members in large:
+            share = max(1, round(self.betweenness_pivots * len(members) / large_nodes))
+            share = min(share, len(members))
+            candidates = sorted(members, key=repr)
+            for source in rng.sample(candidates, share):
+                sources.append(source)
+                weights.append(len(members) / share)
+        return sources, weights, small
+
+    def _incremental_edges(
+        self,
+        nodes: frozenset,
+        edges: Dict[EdgeKey, float]
+    ) -> Optional[List[Tuple[Hashable, Hashable, float]]]:
+        """Added edges if the change can be applied to the sampled state"""
+        if self._state is None or nodes != self._nodes:
+            return None
+        if len(edges) - len(self._edges) > self.incremental_max_edges:
+            return None
+
+        added = []
+        for key, weight in edges.items():
+            previous = self._edges.get(key)
+            if previous is None:
+                added.append((key[0], key[1], weight))
+            elif previous != weight:
+                return None
+        if len(self._edges) + len(added) != len(edges) or len(added) > self.incremental_max_edges:
+            return None  # Edges were removed
+
+        # Edges joining components change pivot shares; resample instead
+        component, position = self._state.component, self._state.position
+        if any(component[position[u]] != component[position[v]] for u, v, _ in added):
+            return None
+        return added
+
+    def _build_sampled(self, graph: nx.Graph) -> _SampledState:
+        """Full pass: exact small components, sampled pivots on large ones"""
+        nodes = list(graph.nodes)
+        n = len(nodes)
+        position = {node: i for i, node in enumerate(nodes)}
+        component = np.zeros(n, dtype=np.int64)
+
+        components = sorted((list(c) for c in nx.connected_components(graph)), key=len, reverse=True)
+        small = {}
+        for index, members in enumerate(components):
+            component[[position[node] for node in members]] = index
+            if len(members) <= self.exact_component_size:
+                small[index] = members
+
+        state = _SampledState(
+            position=position,
+            component=component,
+            small_components=small,
+            pivots=[],
+            betweenness=np.zeros(n),
+            harmonic=np.zeros(n)
+        )
+
+        sources, weights, _ = self._sample_pivots(components)
+        state.pivots = self._run_pivots(graph, state, sources, weights)
+        for pivot in state.pivots:
+            self._add_pivot(state, pivot, 1.0)
+
+        for index in small:
+            self._run_small_component(graph, state, index)
+
+        return state
+
+    def _update_sampled(self, graph: nx.Graph, added: List[Tuple[Hashable, Hashable, float]]):
+        """Re-run only the pivots and small components the new edges touch"""
+        state = self._state
+        touched_small = set()
+        touched_large: Dict[int, List[Tuple[Hashable, Hashable, float]]] = {}
+        for u, v, weight in added:
+            index = int(state.component[state.position[u]])
+            if index in state.small_components:
+                touched_small.add(index)
+            else:
+                touched_large.setdefault(index, []).append((u, v, weight))
+
+        stale = []
+        for i, pivot in enumerate(state.pivots):
+            component_edges = touched_large.get(int(state.component[state.position[pivot.source]]), [])
+            if any(self._may_use_edge(state, pivot, u, v, weight) for u, v, weight in component_edges):
+                stale.append(i)
+
+        if stale:
+            rerun = self._run_pivots(
+                graph,
+                state,
+                [state.pivots[i].source for i in stale],
+                [state.pivots[i].weight for i in stale]
+            )
+            for i, pivot in zip(stale, rerun):
+                self._add_pivot(state, state.pivots[i], -1.0)
+                self._add_pivot(state, pivot, 1.0)
+                state.pivots[i] = pivot
+
+        for index in touched_small:
+            self._run_small_component(graph, state, index)
+
+        logger.debug(
+            f"Incremental centrality: {len(added)} new edges, {len(stale)} of "
+            f"{len(state.pivots)} pivots and {len(touched_small)} small components re-run"
+        )
+
+    @staticmethod
+    def _may_use_edge(state: _SampledState, pivot: _PivotState, u: Hashable, v: Hashable, weight: float) -> bool:
+        """Whether a new edge can shorten or tie a shortest path from the pivot"""
+        du = pivot.distance[state.position[u]]
+        dv = pivot.distance[state.position[v]]
+        return abs(du - dv) >= weight * (1 - 1e-12)
+
+    def _run_pivots(
+        self,
+        graph: nx.Graph,
+        state: _SampledState,
+        sources: List[Hashable],
+        weights: List[float]
+    ) -> List[_PivotState]:
+        """Single-source passes for a batch of pivots
+
+        Distances for the whole batch come from one compiled Dijkstra call;
+        dependencies are then swept over each pivot's shortest-path DAG.
+        """
+        if not sources:
+            return []
+
+        position = state.position
+        n = len(position)
+        edges = [
+            (position[u], position[v], data.get(self.weight, 1))
+            for u, v, data in graph.edges(data=True)
+            if u != v
+        ]
+        u, v, length = (np.array(column) for column in zip(*edges)) if edges else (np.zeros(0),) * 3
+        if len(length) and length.min() <= 0:
+            # Zero-length edges leave ties the DAG sweep cannot order
+            return [self._run_pivot(graph, state, source, weight) for source, weight in zip(sources, weights)]
+
+        src = np.concatenate([u, v]).astype(np.int64)
+        dst = np.concatenate([v, u]).astype(np.int64)
+        weight = np.concatenate([length, length]).astype(float)
+        matrix = sparse.csr_matrix((weight, (src, dst)), shape=(n, n))
+        rows = [position[source] for source in sources]
+        distances = csgraph.dijkstra(matrix, directed=True, indices=rows)
+
+        pivots = []
+        for source, pivot_weight, row, distance in zip(sources, weights, rows, distances):
+            dependency = _dag_dependencies(distance, row, src, dst, weight)
+            if dependency is None:
+                pivots.append(self._run_pivot(graph, state, source, pivot_weight))
+            else:
+                pivots.append(_PivotState(source, pivot_weight, distance, dependency))
+        return pivots
+
+    def _run_pivot(self, graph: nx.Graph, state: _SampledState, source: Hashable, weight: float) -> _PivotState:
+        order, predecessors, sigma, distance = _shortest_path_dag(self._neighbors(graph), source)
+        delta = _dependencies(order, predecessors, sigma)
+
+        n = len(state.position)
+        distances = np.full(n, np.inf)
+        dependency = np.zeros(n)
+        rows = np.fromiter((state.position[node] for node in order), dtype=np.int64, count=len(order))
+        distances[rows] = np.fromiter((distance[node] for node in order), dtype=float, count=len(order))
+        dependency[rows] = np.fromiter((delta[node] for node in order), dtype=float, count=len(order))
+        return _PivotState(source, weight, distances, dependency)
+
+    @staticmethod
+    def _add_pivot(state: _SampledState, pivot: _PivotState, sign: float):
+        with np.errstate(divide='ignore'):
+            inverse = np.where(pivot.distance > 0, 1.0 / pivot.distance, 0.0)
+        state.betweenness += sign * pivot.weight * pivot.dependency
+        state.harmonic += sign * pivot.weight * inverse
+
+    def _run_small_component(self, graph: nx.Graph, state: _SampledState, index: int):
+        """Exact betweenness and harmonic sums within one small component"""
+        members = state.small_components[index]
+        betweenness = dict.fromkeys(members, 0.0)
+        harmonic = dict.fromkeys(members, 0.0)
+        for source in members:
+            order, predecessors, sigma, distance = _shortest_path_dag(self._neighbors(graph), source)
+            for node, dependency in _dependencies(order, predecessors, sigma).items():
+                betweenness[node] += dependency
+            for node, dist in distance.items():
+                if dist > 0:
+                    harmonic[node] += 1.0 / dist
+        state.small_betweenness[index] = betweenness
+        state.small_harmonic[index] = harmonic
+
+    def _normalized(self, n: int) -> Tuple[Dict[Hashable, float], Dict[Hashable, float]]:
+        """Scale the raw sums the way NetworkX normalizes exact measures"""
+        state = self._state
+        betweenness_scale, closeness_scale = self._scales(n)
+
+        raw_betweenness = state.betweenness.copy()
+        raw_harmonic = state.harmonic.copy()
+        for index in state.small_components:
+            for node, value in state.small_betweenness[index].items():
+                raw_betweenness[state.position[node]] = value
+            for node, value in state.small_harmonic[index].items():
+                raw_harmonic[state.position[node]] = value
+
+        nodes = list(state.position)
+        betweenness = dict(zip(nodes, (raw_betweenness * betweenness_scale).tolist()))
+        closeness = dict(zip(nodes, (raw_harmonic * closeness_scale).tolist()))
+        return betweenness, closeness
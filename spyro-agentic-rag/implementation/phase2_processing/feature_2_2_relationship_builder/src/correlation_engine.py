@@ -0,0 +1,324 @@
+"""Vectorized lagged cross-correlation for temporal relationship analysis"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PairCorrelation:
+    """Lagged correlation result for one entity pair"""
+    index1: int
+    index2: int
+    correlation_coefficient: float
+    optimal_lag_days: int
+    overlap_days: int
+
+
+class CrossCorrelationEngine:
+    """Compute lagged Pearson correlations for all entity pairs at once
+
+    Every entity's daily series is packed into one matrix over a shared
+    calendar, with days outside an entity's own history masked out. A pair is
+    compared over the same window as the pairwise analysis: the days both
+    series cover, cut to the correlation window ending where the earlier series
+    ends. Rows are processed in groups that share an end date, so every pair in
+    a group uses the same window.
+
+    Within a group, lag-0 correlations for all pairs come from a handful of
+    masked matrix products. Only pairs that reach the minimum correlation go on
+    to the lag search, where the masked sums for every lag are
+    cross-correlations computed with FFTs.
+    """
+
+    def __init__(
+        self,
+        window_days: int,
+        max_lag_days: int,
+        lag_step_days: int = 1,
+        max_block_elements: int = 2 ** 22
+    ):
+        """Initialize the engine
+
+        Args:
+            window_days: Correlation window in days
+            max_lag_days: Largest lag tested in either direction
+            lag_step_days: Step between tested lags
+            max_block_elements: Upper bound on the size of intermediate arrays
+        """
+        self.window_days = window_days
+        self.max_lag_days = max_lag_days
+        self.lag_step_days = max(1, lag_step_days)
+        self.max_block_elements = max_block_elements
+
+        # Lag 0 first so that, as in the pairwise search, it wins ties
+        self.lags = np.array(
+            [0] + [
+                lag for lag in range(-max_lag_days, max_lag_days + 1, self.lag_step_days)
+                if lag != 0
+            ],
+            dtype=int
+        )
+
+    def build_matrix(
+        self,
+        series: Sequence[pd.Series]
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[pd.DatetimeIndex]]:
+        """Pack daily series into an aligned value matrix and validity mask
+
+        Args:
+            series: One daily series per entity
+
+        Returns:
+            (values, mask, dates) where values and mask have one row per series
+        """
+        indexes = [pd.to_datetime(s.index) for s in series if not s.empty]
+        if not indexes:
+            return np.zeros((len(series), 0)), np.zeros((len(series), 0), dtype=bool), None
+
+        start = min(index.min() for index in indexes)
+        end = max(index.max() for index in indexes)
+        dates = pd.date_range(start=start, end=end, freq='D')
+
+        values = np.zeros((len(series), len(dates)))
+        mask = np.zeros((len(series), len(dates)), dtype=bool)
+        for row, s in enumerate(series):
+            if s.empty:
+                continue
+            offsets = (pd.to_datetime(s.index) - start).days.to_numpy()
+            data = s.to_numpy(dtype=float)
+            keep = ~np.isnan(data)
+            values[row, offsets[keep]] = data[keep]
+            mask[row, offsets[keep]] = True
+
+        return values, mask, dates
+
+    def correlate(
+        self,
+        values: np.ndarray,
+        mask: np.ndarray,
+        min_correlation: float = 0.0,
+        min_overlap: int = 2
+    ) -> List[PairCorrelation]:
+        """Lagged correlations for every pair of rows that passes the prefilter
+
+        Args:
+            values: Matrix of daily values, one row per entity
+            mask: Boolean matrix marking the days each entity covers
+            min_correlation: Minimum absolute lag-0 correlation
+            min_overlap: Minimum shared days for a pair to be correlated
+
+        Returns:
+            One PairCorrelation per passing pair (index1 < index2), with
+            index1 as the shifted series, ordered by (index1, index2)
+        """
+        n, length = values.shape
+        if n < 2 or length == 0:
+            return []
+
+        x, m = self._standardize(values, mask)
+        has_data = mask.any(axis=1)
+        ends = np.where(has_data, length - 1 - np.argmax(mask[:, ::-1], axis=1), -1)
+
+        pairs = []
+        for end in np.unique(ends[has_data]):
+            # Rows ending here are paired with rows ending here or later; the
+            # pair window is the correlation window ending at this date
+            group = np.nonzero(ends == end)[0]
+            members = np.concatenate([group, np.nonzero(ends > end)[0]])
+            window = slice(max(0, end - self.window_days), end + 1)
+            wm = m[members, window]
+            wx = x[members, window] * wm
+
+            first, second, coefficient, overlap = self._lag_zero(wx, wm, len(group), min_correlation, min_overlap)
+            if len(first) == 0:
+                continue
+
+            # Orient each pair so the entity earlier in the input is shifted
+            first, second = members[first], members[second]
+            swap = first > second
+            first, second = np.where(swap, second, first), np.where(swap, first, second)
+            position = {row: index for index, row in enumerate(members)}
+            local_first = np.array([position[row] for row in first])
+            local_second = np.array([position[row] for row in second])
+
+            lags = self._optimal_lags(wx, wm, local_first, local_second)
+            pairs.extend(
+                PairCorrelation(
+                    index1=int(i),
+                    index2=int(j),
+                    correlation_coefficient=float(r),
+                    optimal_lag_days=int(lag),
+                    overlap_days=int(days)
+                )
+                for i, j, r, lag, days in zip(first, second, coefficient, lags, overlap)
+            )
+
+        pairs.sort(key=lambda pair: (pair.index1, pair.index2))
+        return pairs
+
+    def _lag_zero(
+        self,
+        wx: np.ndarray,
+        wm: np.ndarray,
+        group_size: int,
+        min_correlation: float,
+        min_overlap: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Lag-0 correlations between the first group_size rows and all later rows
+
+        Returns:
+            (rows, cols, coefficients, overlaps) for pairs passing the prefilter
+        """
+        found = ([], [], [], [])
+        block = max(1, self.max_block_elements // max(1, len(wm)))
+        for start in range(0, group_size, block):
+            rows = slice(start, min(group_size, start + block))
+
+            # Masked sums over the days both series cover
+            count = wm[rows] @ wm.T
+            sum_a = wx[rows] @ wm.T
+            sum_b = wm[rows] @ wx.T
+            sum_aa = (wx[rows] ** 2) @ wm.T
+            sum_bb = wm[rows] @ (wx ** 2).T
+            sum_ab = wx[rows] @ wx.T
+            r = self._pearson(count, sum_a, sum_b, sum_aa, sum_bb, sum_ab)
+
+            local_rows = np.arange(rows.start, rows.stop)[:, None]
+            upper = np.arange(len(wm))[None, :] > local_rows
+            passing = upper & (count >= max(2, min_overlap)) & (np.abs(r) >= min_correlation)
+            i, j = np.nonzero(passing)
+            found[0].append(i + start)
+            found[1].append(j)
+            found[2].append(r[i, j])
+            found[3].append(np.rint(count[i, j]).astype(int))
+
+        return tuple(np.concatenate(parts) for parts in found)
+
+    def _optimal_lags(
+        self,
+        wx: np.ndarray,
+        wm: np.ndarray,
+        first: np.ndarray,
+        second: np.ndarray
+    ) -> np.ndarray:
+        """Lag with the strongest correlation of first shifted against second
+
+        As in the pairwise analysis, both series are cut to the pair's common
+        date range before shifting, so a lagged series never draws on days
+        outside that range.
+        """
+        width = wm.shape[1]
+        # Zero padding to width + max_lag keeps the circular correlation exact
+        fft_size = 1 << int(np.ceil(np.log2(width + self.max_lag_days + 1)))
+        lag_index = np.where(self.lags >= 0, self.lags, fft_size + self.lags)
+        starts = np.argmax(wm > 0, axis=1)
+        days = np.arange(width)[None, :]
+
+        def xcorr(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            # sum_t a[t - lag] * b[t] for every lag, shape (pairs, lags)
+            spectrum = np.conj(np.fft.rfft(a, fft_size)) * np.fft.rfft(b, fft_size)
+            return np.fft.irfft(spectrum, fft_size, axis=-1)[:, lag_index]
+
+        best = np.zeros(len(first), dtype=int)
+        block = max(1, self.max_block_elements // fft_size)
+        for start in range(0, len(first), block):
+            a = first[start:start + block]
+            b = second[start:start + block]
+            common = days >= np.maximum(starts[a], starts[b])[:, None]
+            ma, mb = wm[a] * common, wm[b] * common
+            xa, xb = wx[a] * common, wx[b] * common
+            r = self._pearson(
+                np.rint(xcorr(ma, mb)),
+                xcorr(xa, mb),
+                xcorr(ma, xb),
+                xcorr(xa ** 2, mb),
+                xcorr(ma, xb ** 2),
+                xcorr(xa, xb)
+            )
+            # Rounding away FFT noise lets exact ties go to the earlier lag
+            best[start:start + block] = self.lags[np.argmax(np.round(np.abs(r), 9), axis=1)]
+
+        return best
+
+    @staticmethod
+    def _pearson(
+        count: np.ndarray,
+        sum_a: np.ndarray,
+        sum_b: np.ndarray,
+        sum_aa: np.ndarray,
+        sum_bb: np.ndarray,
+        sum_ab: np.ndarray
+    ) -> np.ndarray:
+        """Pearson's r from masked sums; 0 where undefined"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = count * sum_ab - sum_a * sum_b
+            variance = (count * sum_aa - sum_a ** 2) * (count * sum_bb - sum_b ** 2)
+            r = covariance / np.sqrt(variance)
+        r[(count < 1.5) | ~(variance > 1e-9 * np.maximum(count, 1) ** 4)] = 0.0
+        return np.clip(r, -1.0, 1.0)
+
+    def significant_pairs(
+        self,
+        series: Sequence[pd.Series],
+        min_correlation: float,
+        min_overlap: int
+    ) -> Tuple[List[PairCorrelation], np.ndarray, np.ndarray, Optional[pd.DatetimeIndex]]:
+        """Pairs whose lag-0 correlation reaches min_correlation
+
+        Args:
+            series: One daily series per entity
+            min_correlation: Minimum absolute lag-0 correlation
+            min_overlap: Minimum shared days for a pair
+
+        Returns:
+            (pairs, values, mask, dates); the matrix is returned so callers can
+            slice aligned series for follow-up tests without rebuilding it
+        """
+        values, mask, dates = self.build_matrix(series)
+        pairs = self.correlate(values, mask, min_correlation, min_overlap)
+        logger.debug(
+            f"Cross-correlated {len(series)} series over {values.shape[1]} days: "
+            f"{len(pairs)} of {len(series) * (len(series) - 1) // 2} pairs pass {min_correlation}"
+        )
+        return pairs, values, mask, dates
+
+    def aligned_pair(
+        self,
+        values: np.ndarray,
+        mask: np.ndarray,
+        dates: pd.DatetimeIndex,
+        index1: int,
+        index2: int
+    ) -> Tuple[pd.Series, pd.Series]:
+        """Two rows over the pair's correlation window, as date-indexed series
+
+        The window is the one correlate() used for the pair: the days both
+        series cover, cut to window_days ending where the earlier series ends.
+        """
+        covered1, covered2 = np.nonzero(mask[index1])[0], np.nonzero(mask[index2])[0]
+        end = min(covered1[-1], covered2[-1])
+        start = max(covered1[0], covered2[0], end - self.window_days)
+        span = slice(start, end + 1)
+        ts1 = pd.Series(np.where(mask[index1, span], values[index1, span], np.nan), index=dates[span])
+        ts2 = pd.Series(np.where(mask[index2, span], values[index2, span], np.nan), index=dates[span])
+        return ts1, ts2
+
+    @staticmethod
+    def _standardize(values: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Centre and scale each row over its valid days
+
+        Pearson's r is unchanged by an affine transform of either series, and
+        standardized values keep the FFT sums well conditioned.
+        """
+        m = mask.astype(float)
+        counts = np.maximum(m.sum(axis=1, keepdims=True), 1.0)
+        means = (values * m).sum(axis=1, keepdims=True) / counts
+        centred = (values - means) * m
+        scale = np.sqrt((centred ** 2).sum(axis=1, keepdims=True) / counts)
+        scale[scale == 0] = 1.0
+        return centred / scale, m
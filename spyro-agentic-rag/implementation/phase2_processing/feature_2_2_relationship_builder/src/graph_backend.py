@@ -0,0 +1,401 @@
+"""Compact graph backends for pattern recognition"""
+
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from .models import Entity, Relationship, RelationshipStrength
+
+logger = logging.getLogger(__name__)
+
+
+def relationship_weight(rel: Relationship) -> float:
+    """Edge weight used by pattern recognition: confidence scaled by strength"""
+    weight = rel.confidence
+    if rel.strength == RelationshipStrength.STRONG:
+        weight *= 1.2
+    elif rel.strength == RelationshipStrength.WEAK:
+        weight *= 0.8
+    return weight
+
+
+@dataclass
+class CSRGraph:
+    """Undirected weighted graph as CSR arrays over integer node positions
+
+    Holds one int32 column index and one float64 weight per edge direction
+    instead of a NetworkX dict-of-dicts, and runs the whole-graph algorithms
+    pattern recognition needs as array operations. Each row's neighbours are
+    sorted, so an edge can be found with a binary search.
+    """
+    node_ids: List[str]
+    entities: List[Entity]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_relationships(
+        cls,
+        entities: List[Entity],
+        relationships: List[Relationship]
+    ) -> "CSRGraph":
+        """Build the graph straight from entity and relationship dataclasses
+
+        Nodes follow the order of entities, with relationship endpoints
+        missing from it appended. As with repeated NetworkX add_edge calls,
+        the last relationship between two entities sets the edge weight.
+        Self-loops are dropped.
+        """
+        position: Dict[str, int] = {}
+        node_entities: List[Entity] = []
+
+        def add(entity: Entity) -> int:
+            index = position.get(entity.id)
+            if index is None:
+                index = position[entity.id] = len(node_entities)
+                node_entities.append(entity)
+            return index
+
+        for entity in entities:
+            index = add(entity)
+            node_entities[index] = entity
+
+        edges: Dict[Tuple[int, int], float] = {}
+        for rel in relationships:
+            u, v = add(rel.source), add(rel.target)
+            if u != v:
+                edges[(u, v) if u < v else (v, u)] = relationship_weight(rel)
+
+        n = len(node_entities)
+        if edges:
+            pairs = np.array(list(edges.keys()), dtype=np.int64)
+            weight = np.fromiter(edges.values(), dtype=float, count=len(edges))
+        else:
+            pairs = np.zeros((0, 2), dtype=np.int64)
+            weight = np.zeros(0)
+
+        rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+        data = np.concatenate([weight, weight])
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+        return cls(
+            node_ids=[entity.id for entity in node_entities],
+            entities=node_entities,
+            indptr=indptr,
+            indices=cols[order].astype(np.int32),
+            weights=data[order]
+        )
+
+    def __post_init__(self):
+        self.position = {node_id: i for i, node_id in enumerate(self.node_ids)}
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    @property
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Source position of every stored edge direction"""
+        return np.repeat(np.arange(self.number_of_nodes), self.degrees)
+
+    def degree(self, node_id: str) -> int:
+        """Degree of a node by id"""
+        i = self.position[node_id]
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """Neighbour ids of a node by id"""
+        i = self.position[node_id]
+        return [self.node_ids[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def to_scipy(self, min_weight: float = 0.0) -> sparse.csr_matrix:
+        """SciPy view of the adjacency, with weights raised to min_weight"""
+        n = self.number_of_nodes
+        return sparse.csr_matrix(
+            (np.maximum(self.weights, min_weight), self.indices, self.indptr), shape=(n, n)
+        )
+
+    def fingerprint(self) -> str:
+        """Digest of nodes, edges and weights, used as a cache version"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\x1f".join(self.node_ids).encode())
+        for array in (self.indptr, self.indices, self.weights):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def edge_weights(self, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Weights of edges (u[k], v[k]) and whether each edge exists"""
+        n = self.number_of_nodes
+        keys = self.rows.astype(np.int64) * n + self.indices
+        wanted = np.asarray(u, dtype=np.int64) * n + np.asarray(v, dtype=np.int64)
+        found_at = np.minimum(np.searchsorted(keys, wanted), max(0, len(keys) - 1))
+        exists = keys[found_at] == wanted if len(keys) else np.zeros(len(wanted), dtype=bool)
+        return np.where(exists, self.weights[found_at] if len(keys) else 0.0, 0.0), exists
+
+    def connected_components(self) -> np.ndarray:
+        """Component label of every node"""
+        _, labels = csgraph.connected_components(self.to_scipy(), directed=False)
+        return labels
+
+    def triangles(self, max_block: int = 2 ** 22) -> np.ndarray:
+        """Every triangle once, as rows of three node positions
+
+        Edges are oriented from the lower to the higher (degree, position)
+        rank, so each triangle is found exactly once from its lowest-ranked
+        corner and high-degree nodes keep short forward lists. Wedges are
+        expanded in blocks of at most max_block and closed with a binary
+        search over the sorted forward edge keys.
+        """
+        n = self.number_of_nodes
+        rows, cols = self.rows, self.indices.astype(np.int64)
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), self.degrees))] = np.arange(n)
+
+        forward = rank[rows] < rank[cols]
+        u, v = rows[forward], cols[forward]
+        order = np.lexsort((v, u))
+        u, v = u[order], v[order]
+        forward_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=n), out=forward_indptr[1:])
+        keys = u * n + v
+
+        lengths = np.diff(forward_indptr)[v]
+        cumulative = np.cumsum(lengths)
+        found = []
+        start = 0
+        while start < len(u):
+            done = cumulative[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(cumulative, done + max_block, side='right')))
+            block_lengths = lengths[start:stop]
+            total = int(block_lengths.sum())
+            if total:
+                # Third corners: the forward neighbours of each edge's head
+                first = forward_indptr[v[start:stop]]
+                offsets = np.repeat(first - np.cumsum(block_lengths) + block_lengths, block_lengths)
+                w = v[offsets + np.arange(total)]
+                a = np.repeat(u[start:stop], block_lengths)
+                b = np.repeat(v[start:stop], block_lengths)
+                wanted = a * n + w
+                hit = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+                closed = keys[hit] == wanted
+                found.append(np.stack([a[closed], b[closed], w[closed]], axis=1))
+            start = stop
+
+        return np.concatenate(found) if found else np.zeros((0, 3), dtype=np.int64)
+
+    def label_propagation(self, max_iterations: int = 100, seed: int = 42) -> np.ndarray:
+        """Community label of every node by label propagation
+
+        Each round every node proposes its neighbours' most frequent label,
+        keeping its own on ties and otherwise taking the smallest. A random
+        half of the changed nodes adopt their proposal, which stops the
+        two-colour oscillation of fully synchronous updates.
+        """
+        n = self.number_of_nodes
+        labels = np.arange(n, dtype=np.int64)
+        if self.number_of_edges == 0:
+            return labels
+
+        rng = np.random.default_rng(seed)
+        rows, cols = self.rows.astype(np.int64), self.indices.astype(np.int64)
+        for _ in range(max_iterations):
+            keys, counts = np.unique(rows * n + labels[cols], return_counts=True)
+            node, label = keys // n, keys % n
+            order = np.lexsort((label, label != labels[node], -counts, node))
+            first = order[np.r_[True, node[order][1:] != node[order][:-1]]]
+
+            proposed = labels.copy()
+            proposed[node[first]] = label[first]
+            changed = proposed != labels
+            if not changed.any():
+                break
+            update = changed & (rng.random(n) < 0.5)
+            if not update.any():
+                update = changed
+            labels[update] = proposed[update]
+
+        return labels
+
+
+# Queries for the Neo4j path. Node ids are read from a configurable property
+# so results can be mapped back onto the in-memory graph, and only nodes whose
+# id is in $ids (the analysed entities) are visited. {label} is the node label
+# pattern, e.g. ":`__Entity__`", or empty to match nodes of any label.
+TRIANGLES_QUERY = """
+MATCH (a{label})
+WHERE a[$id_property] IN $ids
+MATCH (a)--(b{label})--(c{label})--(a)
+WHERE a[$id_property] < b[$id_property] AND b[$id_property] < c[$id_property]
+  AND b[$id_property] IN $ids AND c[$id_property] IN $ids
+RETURN DISTINCT a[$id_property] AS a, b[$id_property] AS b, c[$id_property] AS c
+"""
+
+# Cypher projection of the analysed entities and the relationships between
+# them; each relationship is matched once and projected in both directions
+PROJECT_QUERY = """
+MATCH (source{label})
+WHERE source[$id_property] IN $ids
+OPTIONAL MATCH (source)-->(target{label})
+WHERE target[$id_property] IN $ids
+WITH gds.graph.project($graph_name, source, target, {{}}, {{undirectedRelationshipTypes: ['*']}}) AS g
+RETURN g.graphName AS graphName
+"""
+
+DROP_QUERY = "CALL gds.graph.drop($graph_name, false) YIELD graphName RETURN graphName"
+
+WCC_QUERY = """
+CALL gds.wcc.stream($graph_name)
+YIELD nodeId, componentId
+RETURN gds.util.asNode(nodeId)[$id_property] AS id, componentId AS label
+"""
+
+LABEL_PROPAGATION_QUERY = """
+CALL gds.labelPropagation.stream($graph_name, {maxIterations: $max_iterations})
+YIELD nodeId, communityId
+RETURN gds.util.asNode(nodeId)[$id_property] AS id, communityId AS label
+"""
+
+
+class Neo4jGraphAlgorithms:
+    """Run pattern recognition's whole-graph algorithms inside Neo4j
+
+    Triangles are listed with plain Cypher; components and label propagation
+    use the Graph Data Science library on a projection of the in-memory
+    graph's nodes that is created on first use and dropped by close(). Each
+    instance projects under its own name, so concurrent runs do not clash.
+    Results are mapped onto the positions of an in-memory CSRGraph; nodes or
+    triangles it does not contain are ignored. Any failed query falls back
+    to the CSRGraph's own algorithm.
+    """
+
+    def __init__(
+        self,
+        driver: Any,
+        graph: CSRGraph,
+        database: Optional[str] = None,
+        id_property: str = "id",
+        graph_name: str = "pattern_recognition",
+        node_label: Optional[str] = "__Entity__"
+    ):
+        """Initialize the backend
+
+        Args:
+            driver: neo4j.Driver (or compatible) connected to the database
+            graph: In-memory graph the results are mapped onto
+            database: Database name; None for the default
+            id_property: Node property holding the entity id
+            graph_name: Prefix of the GDS projection name; a per-instance
+                suffix is appended
+            node_label: Label of entity nodes; None matches nodes of any label
+        """
+        self.driver = driver
+        self.graph = graph
+        self.database = database
+        self.id_property = id_property
+        self.graph_name = f"{graph_name}_{uuid.uuid4().hex[:12]}"
+        self._label = f":`{node_label}`" if node_label else ""
+        self._projected = False
+
+    def _run(self, query: str, **params) -> List[Dict[str, Any]]:
+        with self.driver.session(database=self.database) as session:
+            return [record.data() for record in session.run(query, **params)]
+
+    def _project(self):
+        if not self._projected:
+            self._run(
+                PROJECT_QUERY.format(label=self._label),
+                graph_name=self.graph_name,
+                id_property=self.id_property,
+                ids=self.graph.node_ids
+            )
+            self._projected = True
+
+    def close(self):
+        """Drop the GDS projection if one was created"""
+        if self._projected:
+            try:
+                self._run(DROP_QUERY, graph_name=self.graph_name)
+            except Exception as e:
+                logger.warning(f"Failed to drop GDS graph {self.graph_name}: {e}")
+            self._projected = False
+
+    def _labels(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Map (id, label) records onto graph positions
+
+        Nodes missing from the results keep a label of their own.
+        """
+        n = self.graph.number_of_nodes
+        labels = np.arange(n, dtype=np.int64) + n
+        remap: Dict[Any, int] = {}
+        for record in records:
+            i = self.graph.position.get(record["id"])
+            if i is not None:
+                labels[i] = remap.setdefault(record["label"], len(remap))
+        return labels
+
+    def triangles(self) -> np.ndarray:
+        """Triangles whose three edges are all in the in-memory graph"""
+        try:
+            records = self._run(
+                TRIANGLES_QUERY.format(label=self._label),
+                id_property=self.id_property,
+                ids=self.graph.node_ids
+            )
+        except Exception as e:
+            logger.warning(f"Neo4j triangle query failed, using CSR: {e}")
+            return self.graph.triangles()
+
+        position = self.graph.position
+        rows = [
+            (position[r["a"]], position[r["b"]], position[r["c"]])
+            for r in records
+            if r["a"] in position and r["b"] in position and r["c"] in position
+        ]
+        if not rows:
+            return np.zeros((0, 3), dtype=np.int64)
+
+        found = np.array(rows, dtype=np.int64)
+        keep = np.ones(len(found), dtype=bool)
+        for x, y in ((0, 1), (1, 2), (0, 2)):
+            keep &= self.graph.edge_weights(found[:, x], found[:, y])[1]
+        return found[keep]
+
+    def connected_components(self) -> np.ndarray:
+        """Component label of every node from GDS weakly connected components"""
+        try:
+            self._project()
+            return self._labels(self._run(WCC_QUERY, graph_name=self.graph_name, id_property=self.id_property))
+        except Exception as e:
+            logger.warning(f"Neo4j component query failed, using CSR: {e}")
+            return self.graph.connected_components()
+
+    def label_propagation(self, max_iterations: int = 100, seed: int = 42) -> np.ndarray:
+        """Community label of every node from GDS label propagation"""
+        try:
+            self._project()
+            return self._labels(self._run(
+                LABEL_PROPAGATION_QUERY,
+                graph_name=self.graph_name,
+                id_property=self.id_property,
+                max_iterations=max_iterations
+            ))
+        except Exception as e:
+            logger.warning(f"Neo4j label propagation failed, using CSR: {e}")
+            return self.graph.label_propagation(max_iterations, seed)
@@ -34,6 +34,7 @@ class RelationshipType(str, Enum):
     
     # Semantic relationships
     WORKS_WITH = "WORKS_WITH"
+    MANAGES = "MANAGES"
     REPORTS_TO = "REPORTS_TO"
     RESPONSIBLE_FOR = "RESPONSIBLE_FOR"
     RELATED_TO = "RELATED_TO"
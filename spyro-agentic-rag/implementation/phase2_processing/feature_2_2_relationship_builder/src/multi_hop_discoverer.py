@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
 from typing import Dict, List, Optional, Set, Tuple, Any
 import networkx as nx
 
@@ -15,6 +15,7 @@ from .models import (
     PathAnalysis,
     RelationshipDiscoveryContext
 )
+from .path_engine import CompactGraph, PathSearchEngine, PathSearchSettings
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,7 @@ class MultiHopRelationshipDiscoverer:
         self.config = config or self._get_default_config()
         self.graph = nx.DiGraph()
         self._path_cache: Dict[Tuple[str, str], List[List[Entity]]] = {}
+        self._searched_sources: Set[str] = set()
         
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -45,7 +47,12 @@ class MultiHopRelationshipDiscoverer:
             },
             "performance": {
                 "max_paths_per_pair": 5,
-                "cache_paths": True
+                "max_targets_per_source": 50,
+                "cache_paths": True,
+                "parallel_workers": 4,
+                "batch_size": 100,
+                "min_parallel_sources": 500,
+                "time_budget_seconds": 60
             }
         }
     
@@ -77,19 +84,95 @@ class MultiHopRelationshipDiscoverer:
         self._build_graph(entities, relationships)
         
         # Find multi-hop paths
-        multi_hop_relationships = []
+        paths_by_source = await self._search_paths(entities, max_hops)
         
-        # Process entities in batches for efficiency
-        batch_size = 100
-        for i in range(0, len(entities), batch_size):
-            batch = entities[i:i + batch_size]
-            batch_relationships = await self._process_entity_batch(
-                batch, entities, max_hops, context
-            )
-            multi_hop_relationships.extend(batch_relationships)
+        multi_hop_relationships = []
+        for source_entity in entities:
+            for target_id, paths in paths_by_source.get(source_entity.id, []):
+                target_entity = self.graph.nodes[target_id]["entity"]
+                
+                # Analyze paths and create relationships
+                for path in paths:
+                    analysis = await self._analyze_path(path)
+                    
+                    if analysis.score >= self.config["min_path_strength"]:
+                        rel = self._create_multi_hop_relationship(
+                            source_entity,
+                            target_entity,
+                            path,
+                            analysis
+                        )
+                        
+                        if context.should_include_relationship(rel):
+                            multi_hop_relationships.append(rel)
         
         return multi_hop_relationships
     
+    async def _search_paths(
+        self,
+        entities: List[Entity],
+        max_hops: int
+    ) -> Dict[str, List[Tuple[str, List[List[Entity]]]]]:
+        """Find the best paths from every entity to its interesting targets
+        
+        Each source is searched once with a bounded depth-first search that
+        collects paths to all targets together (see PathSearchEngine), rather
+        than enumerating simple paths for every source/target pair.
+        
+        Returns:
+            Source ID -> [(target ID, entity paths best first)]
+        """
+        performance = self.config["performance"]
+        cache_paths = performance.get("cache_paths", True)
+        
+        sources = [
+            e.id for e in entities
+            if e.id in self.graph and not (cache_paths and e.id in self._searched_sources)
+        ]
+        
+        compact = CompactGraph.from_networkx(self.graph)
+        position = {node_id: i for i, node_id in enumerate(compact.node_ids)}
+        scoring = self.config["path_scoring"]
+        engine = PathSearchEngine(
+            compact,
+            PathSearchSettings(
+                max_hops=max_hops,
+                edge_weight_factor=scoring["edge_weight_factor"],
+                path_length_penalty=scoring["path_length_penalty"],
+                max_paths_per_target=performance.get("max_paths_per_pair", 5),
+                max_targets_per_source=performance.get("max_targets_per_source", 50)
+            ),
+            workers=performance.get("parallel_workers", 4),
+            batch_size=performance.get("batch_size", 100),
+            min_parallel_sources=performance.get("min_parallel_sources", 500)
+        )
+        hits = await engine.search(
+            [position[source_id] for source_id in sources],
+            performance.get("time_budget_seconds")
+        )
+        
+        found: Dict[str, Dict[str, List[List[Entity]]]] = defaultdict(dict)
+        for source_index, source_hits in hits.items():
+            source_id = compact.node_ids[source_index]
+            for target_index, _, path in source_hits:
+                entity_path = [self.graph.nodes[compact.node_ids[i]]["entity"] for i in path]
+                found[source_id].setdefault(compact.node_ids[target_index], []).append(entity_path)
+            
+            # A search cut short by the time budget may have missed paths,
+            # so it is repeated on the next call rather than cached
+            if cache_paths and source_index not in engine.partial_sources:
+                self._searched_sources.add(source_id)
+                for target_id, paths in found[source_id].items():
+                    self._path_cache[(source_id, target_id)] = paths
+        
+        # Sources searched in earlier calls are served from the cache
+        if cache_paths:
+            for (source_id, target_id), paths in self._path_cache.items():
+                if source_id not in found and source_id in self.graph and target_id in self.graph:
+                    found[source_id][target_id] = paths
+        
+        return {source_id: list(targets.items()) for source_id, targets in found.items()}
+    
     def _build_graph(self, entities: List[Entity], relationships: List[Relationship]):
         """Build NetworkX graph from entities and relationships"""
         self.graph.clear()
@@ -143,56 +226,6 @@ class MultiHopRelationshipDiscoverer:
         
         return weight
     
-    async def _process_entity_batch(
-        self,
-        batch: List[Entity],
-        all_entities: List[Entity],
-        max_hops: int,
-        context: RelationshipDiscoveryContext
-    ) -> List[Relationship]:
-        """Process a batch of entities to find multi-hop relationships"""
-        relationships = []
-        
-        for source_entity in batch:
-            # Find interesting targets (different type, not directly connected)
-            targets = self._find_interesting_targets(source_entity, all_entities)
-            
-            for target_entity in targets:
-                # Check cache first
-                cache_key = (source_entity.id, target_entity.id)
-                if self.config["performance"]["cache_paths"] and cache_key in self._path_cache:
-                    paths = self._path_cache[cache_key]
-                else:
-                    # Find paths between source and target
-                    paths = self._find_paths(
-                        source_entity.id,
-                        target_entity.id,
-                        max_hops
-                    )
-                    
-                    if self.config["performance"]["cache_paths"]:
-                        self._path_cache[cache_key] = paths
-                
-                # Analyze paths and create relationships
-                for path in paths:
-                    if len(path) <= 2:  # Skip direct relationships
-                        continue
-                    
-                    analysis = await self._analyze_path(path)
-                    
-                    if analysis.score >= self.config["min_path_strength"]:
-                        rel = self._create_multi_hop_relationship(
-                            source_entity,
-                            target_entity,
-                            path,
-                            analysis
-                        )
-                        
-                        if context.should_include_relationship(rel):
-                            relationships.append(rel)
-        
-        return relationships
-    
     def _find_interesting_targets(
         self,
         source: Entity,
@@ -230,45 +263,6 @@ class MultiHopRelationshipDiscoverer:
         
         return False
     
-    def _find_paths(
-        self,
-        source_id: str,
-        target_id: str,
-        max_hops: int
-    ) -> List[List[Entity]]:
-        """Find paths between two entities"""
-        if source_id not in self.graph or target_id not in self.graph:
-            return []
-        
-        paths = []
-        
-        try:
-            # Use NetworkX to find simple paths
-            nx_paths = nx.all_simple_paths(
-                self.graph,
-                source_id,
-                target_id,
-                cutoff=max_hops
-            )
-            
-            # Convert to entity paths
-            max_paths = self.config["performance"]["max_paths_per_pair"]
-            for i, nx_path in enumerate(nx_paths):
-                if i >= max_paths:
-                    break
-                
-                entity_path = []
-                for node_id in nx_path:
-                    node_data = self.graph.nodes[node_id]
-                    entity_path.append(node_data["entity"])
-                
-                paths.append(entity_path)
-                
-        except nx.NetworkXNoPath:
-            pass
-        
-        return paths
-    
     async def _analyze_path(self, path: List[Entity]) -> PathAnalysis:
         """Analyze a multi-hop path to determine significance"""
         edge_strengths = []
@@ -494,4 +488,5 @@ class MultiHopRelationshipDiscoverer:
     
     def clear_cache(self):
         """Clear path cache"""
-        self._path_cache.clear()
\ No newline at end of file
+        self._path_cache.clear()
+        self._searched_sources.clear()
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""Bounded multi-hop path search for relationship discovery"""
+
+import asyncio
+import heapq
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+# Attributes that make two entities of the same type worth connecting
+RELEVANCE_ATTRIBUTES = ("industry", "region", "product", "team")
+
+
+@dataclass
+class PathSearchSettings:
+    """Scoring and limits for a path search"""
+    max_hops: int
+    edge_weight_factor: float
+    path_length_penalty: float
+    max_paths_per_target: int = 5
+    max_targets_per_source: int = 50
+
+    def score(self, weight_sum: float, edges: int) -> float:
+        """Path score: scaled average edge weight minus a per-hop penalty"""
+        score = (weight_sum / edges) * self.edge_weight_factor - self.path_length_penalty * (edges - 1)
+        return max(0.0, min(1.0, score))
+
+
+@dataclass
+class CompactGraph:
+    """Picklable adjacency-list view of a directed relationship graph"""
+    node_ids: List[str]
+    node_types: List[str]
+    relevance: List[Dict[str, Any]]
+    successors: List[List[Tuple[int, float]]]
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> "CompactGraph":
+        """Index the nodes of a graph built by MultiHopRelationshipDiscoverer"""
+        node_ids = list(graph.nodes)
+        position = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        node_types, relevance, successors = [], [], []
+        for node_id in node_ids:
+            data = graph.nodes[node_id]
+            entity = data.get("entity")
+            attributes = entity.attributes if entity is not None else {}
+            node_types.append(data.get("type"))
+            relevance.append({key: attributes[key] for key in RELEVANCE_ATTRIBUTES if key in attributes})
+
+            edges = []
+            for neighbor, edge in graph[node_id].items():
+                edges.append((position[neighbor], edge.get("weight", 0.5)))
+            successors.append(edges)
+
+        return cls(node_ids, node_types, relevance, successors)
+
+    def is_interesting(self, source: int, target: int) -> bool:
+        """Different entity type, or same type with a shared business attribute"""
+        if self.node_types[source] != self.node_types[target]:
+            return True
+        source_attrs, target_attrs = self.relevance[source], self.relevance[target]
+        return any(
+            key in target_attrs and target_attrs[key] == value
+            for key, value in source_attrs.items()
+        )
+
+
+PathHit = Tuple[int, float, Tuple[int, ...]]
+
+
+def search_from_source(
+    graph: CompactGraph,
+    source: int,
+    settings: PathSearchSettings,
+    deadline: Optional[float] = None
+) -> Tuple[List[PathHit], bool]:
+    """Top-k weighted simple paths from one source to every interesting target
+
+    A single depth-first search bounded by max_hops visits each simple path
+    once. The running weight sum is carried along the stack, so paths sharing
+    a prefix share its cost instead of being re-scored per target.
+
+    Args:
+        graph: Graph to search
+        source: Source node index
+        settings: Scoring and limits
+        deadline: time.time() after which the search stops early
+
+    Returns:
+        ((target, score, path) hits, completed): hits best first, for at most
+        max_targets_per_source targets and max_paths_per_target paths each;
+        completed is False when the deadline cut the search short
+    """
+    max_hops = settings.max_hops
+    direct = {neighbor for neighbor, _ in graph.successors[source]}
+    interesting: Dict[int, bool] = {}
+    best: Dict[int, List[Tuple[float, Tuple[int, ...]]]] = {}
+
+    stack = [(source, 0.0, (source,))]
+    expanded = 0
+    completed = True
+    while stack:
+        node, weight_sum, path = stack.pop()
+        edges = len(path) - 1
+
+        if edges >= 2 and node not in direct:
+            if node not in interesting:
+                interesting[node] = graph.is_interesting(source, node)
+            if interesting[node]:
+                score = settings.score(weight_sum, edges)
+                paths = best.setdefault(node, [])
+                if len(paths) < settings.max_paths_per_target:
+                    heapq.heappush(paths, (score, path))
+                elif score > paths[0][0]:
+                    heapq.heapreplace(paths, (score, path))
+
+        if edges >= max_hops:
+            continue
+
+        expanded += 1
+        if deadline is not None and expanded % 1000 == 0 and time.time() > deadline:
+            completed = False
+            break
+
+        for neighbor, weight in graph.successors[node]:
+            if neighbor not in path:
+                stack.append((neighbor, weight_sum + weight, path + (neighbor,)))
+
+    ranked = sorted(best.items(), key=lambda item: -max(score for score, _ in item[1]))
+    hits = []
+    for target, paths in ranked[:settings.max_targets_per_source]:
+        for score, path in sorted(paths, key=lambda item: (-item[0], len(item[1]))):
+            hits.append((target, score, path))
+    return hits, completed
+
+
+# Graph shared with pool workers through the initializer
+_worker_graph: Optional[CompactGraph] = None
+
+
+def _init_worker(graph: CompactGraph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _search_batch(
+    sources: Sequence[int],
+    settings: PathSearchSettings,
+    deadline: Optional[float]
+) -> Dict[int, Tuple[List[PathHit], bool]]:
+    results = {}
+    for source in sources:
+        if deadline is not None and time.time() > deadline:
+            break
+        results[source] = search_from_source(_worker_graph, source, settings, deadline)
+    return results
+
+
+class PathSearchEngine:
+    """Runs bounded path searches for many sources, in a process pool when worthwhile"""
+
+    def __init__(
+        self,
+        graph: CompactGraph,
+        settings: PathSearchSettings,
+        workers: int = 4,
+        batch_size: int = 100,
+        min_parallel_sources: int = 500
+    ):
+        """Initialize the engine
+
+        Args:
+            graph: Graph to search
+            settings: Scoring and limits
+            workers: Worker processes; 1 searches in-process
+            batch_size: Sources per worker task
+            min_parallel_sources: Smallest source count worth a process pool
+        """
+        self.graph = graph
+        self.settings = settings
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.min_parallel_sources = min_parallel_sources
+        self.timed_out = False
+        self.partial_sources: Set[int] = set()
+
+    async def search(
+        self,
+        sources: Sequence[int],
+        time_budget_seconds: Optional[float] = None
+    ) -> Dict[int, List[PathHit]]:
+        """Search from every source within the time budget
+
+        Args:
+            sources: Source node indexes
+            time_budget_seconds: Wall-clock budget; None for no limit
+
+        Returns:
+            Hits per searched source; sources not reached in time are missing,
+            and sources whose search the deadline cut short are listed in
+            partial_sources
+        """
+        self.timed_out = False
+        self.partial_sources = set()
+        deadline = time.time() + time_budget_seconds if time_budget_seconds else None
+        batches = [
+            list(sources[i:i + self.batch_size])
+            for i in range(0, len(sources), self.batch_size)
+        ]
+
+        if self.workers > 1 and len(sources) >= self.min_parallel_sources:
+            try:
+                results = await self._search_parallel(batches, deadline)
+            except Exception as e:
+                logger.warning(f"Parallel path search failed, searching in-process: {e}")
+                results = self._search_serial(batches, deadline)
+        else:
+            results = self._search_serial(batches, deadline)
+
+        self.partial_sources = {source for source, (_, completed) in results.items() if not completed}
+        if len(results) < len(sources) or self.partial_sources:
+            self.timed_out = True
+            logger.warning(
+                f"Path search time budget of {time_budget_seconds}s reached after "
+                f"{len(results) - len(self.partial_sources)} of {len(sources)} sources"
+            )
+        return {source: hits for source, (hits, _) in results.items()}
+
+    def _search_serial(
+        self,
+        batches: List[List[int]],
+        deadline: Optional[float]
+    ) -> Dict[int, Tuple[List[PathHit], bool]]:
+        results = {}
+        for batch in batches:
+            for source in batch:
+                if deadline is not None and time.time() > deadline:
+                    return results
+                results[source] = search_from_source(self.graph, source, self.settings, deadline)
+        return results
+
+    async def _search_parallel(
+        self,
+        batches: List[List[int]],
+        deadline: Optional[float]
+    ) -> Dict[int, Tuple[List[PathHit], bool]]:
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.graph,)
+        )
+        results = {}
+        try:
+            futures = [
+                loop.run_in_executor(executor, _search_batch, batch, self.settings, deadline)
+                for batch in batches
+            ]
+            # Workers stop at the deadline themselves; the grace period covers
+            # returning their partial results
+            timeout = max(0.0, deadline - time.time()) + 5.0 if deadline is not None else None
+            done, pending = await asyncio.wait(futures, timeout=timeout)
+            for future in pending:
+                future.cancel()
+            for future in done:
+                results.update(future.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
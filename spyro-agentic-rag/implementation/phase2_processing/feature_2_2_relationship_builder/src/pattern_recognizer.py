@@ -3,7 +3,8 @@
 import asyncio
 import logging
 from collections import defaultdict, Counter
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any, Union
+import numpy as np
 import networkx as nx
 from networkx.algorithms import community
 
@@ -17,6 +18,8 @@ from .models import (
     CollaborationPattern,
     RelationshipDiscoveryContext
 )
+from .centrality import CentralityProvider, CentralityScores
+from .graph_backend import CSRGraph, Neo4jGraphAlgorithms, relationship_weight
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +27,29 @@ logger = logging.getLogger(__name__)
 class GraphPatternRecognizer:
     """Identify patterns in entity relationship graphs"""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        graph_driver: Optional[Any] = None
+    ):
         """Initialize pattern recognizer
         
         Args:
             config: Optional configuration dictionary
+            graph_driver: Optional neo4j.Driver for the neo4j backend
         """
         self.config = config or self._get_default_config()
+        self._graph_driver = graph_driver
         self._pattern_cache: Dict[str, List[GraphPattern]] = {}
         
+        hub_config = self.config["patterns"]["hub_detection"]
+        self._centrality = CentralityProvider(
+            exact_max_nodes=hub_config.get("exact_max_nodes", 2000),
+            betweenness_pivots=hub_config.get("betweenness_pivots", 64),
+            exact_component_size=hub_config.get("exact_component_size", 32),
+            incremental_max_edges=hub_config.get("incremental_max_edges", 500)
+        )
+        
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
         return {
@@ -40,12 +57,18 @@ class GraphPatternRecognizer:
                 "hub_detection": {
                     "enable": True,
                     "min_connections": 5,
-                    "centrality_threshold": 0.7
+                    "centrality_threshold": 0.7,
+                    # Larger graphs use sampled betweenness and harmonic closeness
+                    "exact_max_nodes": 2000,
+                    "betweenness_pivots": 64,
+                    "exact_component_size": 32,
+                    "incremental_max_edges": 500
                 },
                 "community_detection": {
                     "enable": True,
                     "min_community_size": 3,
-                    "algorithm": "louvain"  # louvain, girvan_newman, label_propagation
+                    "algorithm": "louvain",  # louvain, girvan_newman, label_propagation
+                    "max_iterations": 100  # label propagation on the csr and neo4j backends
                 },
                 "triangle_detection": {
                     "enable": True,
@@ -68,7 +91,16 @@ class GraphPatternRecognizer:
             },
             "performance": {
                 "cache_patterns": True,
-                "parallel_detection": True
+                "parallel_detection": True,
+                # networkx, csr (SciPy sparse arrays) or neo4j (algorithms run
+                # in the database through graph_driver, on top of csr)
+                "backend": "networkx"
+            },
+            "neo4j": {
+                "database": None,
+                "id_property": "id",
+                # None matches nodes of any label, at the cost of index use
+                "node_label": "__Entity__"
             }
         }
     
@@ -94,7 +126,11 @@ class GraphPatternRecognizer:
         context = context or RelationshipDiscoveryContext()
         
         # Build graph
-        graph = self._build_graph(entities, relationships)
+        backend = self.config["performance"].get("backend", "networkx")
+        if backend == "networkx":
+            graph = self._build_graph(entities, relationships)
+        else:
+            graph = CSRGraph.from_relationships(entities, relationships)
         
         # Check cache
         cache_key = f"{len(entities)}_{len(relationships)}"
@@ -105,31 +141,49 @@ class GraphPatternRecognizer:
         
         # Detect different pattern types
         detection_tasks = []
+        algorithms = self._graph_algorithms(graph, backend)
+        csr = isinstance(graph, CSRGraph)
         
         if self.config["patterns"]["hub_detection"]["enable"]:
-            detection_tasks.append(self._detect_hubs(graph, entities))
+            detection_tasks.append(
+                self._detect_hubs_csr(graph) if csr else self._detect_hubs(graph, entities)
+            )
         
         if self.config["patterns"]["community_detection"]["enable"]:
-            detection_tasks.append(self._detect_communities(graph, entities))
+            detection_tasks.append(
+                self._detect_communities_csr(graph, algorithms) if csr
+                else self._detect_communities(graph, entities)
+            )
         
         if self.config["patterns"]["triangle_detection"]["enable"]:
-            detection_tasks.append(self._detect_triangles(graph, entities, relationships))
+            detection_tasks.append(
+                self._detect_triangles_csr(graph, algorithms, relationships) if csr
+                else self._detect_triangles(graph, entities, relationships)
+            )
         
         if self.config["patterns"]["chain_detection"]["enable"]:
-            detection_tasks.append(self._detect_chains(graph, entities))
+            detection_tasks.append(
+                self._detect_chains_csr(graph) if csr else self._detect_chains(graph, entities)
+            )
         
         if self.config["patterns"]["star_detection"]["enable"]:
-            detection_tasks.append(self._detect_stars(graph, entities))
+            detection_tasks.append(
+                self._detect_stars_csr(graph) if csr else self._detect_stars(graph, entities)
+            )
         
         # Run detection in parallel if enabled
-        if self.config["performance"]["parallel_detection"] and detection_tasks:
-            pattern_sets = await asyncio.gather(*detection_tasks)
-            for pattern_set in pattern_sets:
-                patterns.extend(pattern_set)
-        else:
-            for task in detection_tasks:
-                task_patterns = await task
-                patterns.extend(task_patterns)
+        try:
+            if self.config["performance"]["parallel_detection"] and detection_tasks:
+                pattern_sets = await asyncio.gather(*detection_tasks)
+                for pattern_set in pattern_sets:
+                    patterns.extend(pattern_set)
+            else:
+                for task in detection_tasks:
+                    task_patterns = await task
+                    patterns.extend(task_patterns)
+        finally:
+            if isinstance(algorithms, Neo4jGraphAlgorithms):
+                algorithms.close()
         
         # Score and rank patterns
         patterns = self._score_patterns(patterns, graph)
@@ -158,26 +212,39 @@ class GraphPatternRecognizer:
                 name=entity.get_name()
             )
         
-        # Add edges
+        # Add edges, weighted by confidence adjusted for strength
         for rel in relationships:
-            weight = rel.confidence
-            
-            # Adjust weight based on strength
-            if rel.strength == RelationshipStrength.STRONG:
-                weight *= 1.2
-            elif rel.strength == RelationshipStrength.WEAK:
-                weight *= 0.8
-            
             graph.add_edge(
                 rel.source.id,
                 rel.target.id,
                 relationship=rel,
-                weight=weight,
+                weight=relationship_weight(rel),
                 type=rel.relationship_type.value
             )
         
         return graph
     
+    def _graph_algorithms(
+        self,
+        graph: Union[nx.Graph, CSRGraph],
+        backend: str
+    ) -> Union[nx.Graph, CSRGraph, Neo4jGraphAlgorithms]:
+        """Where whole-graph algorithms run for the configured backend"""
+        if backend != "neo4j":
+            return graph
+        if self._graph_driver is None:
+            logger.warning("neo4j backend configured without a graph_driver, using csr")
+            return graph
+        
+        neo4j_config = self.config.get("neo4j", {})
+        return Neo4jGraphAlgorithms(
+            self._graph_driver,
+            graph,
+            database=neo4j_config.get("database"),
+            id_property=neo4j_config.get("id_property", "id"),
+            node_label=neo4j_config.get("node_label", "__Entity__")
+        )
+    
     async def _detect_hubs(
         self,
         graph: nx.Graph,
@@ -187,18 +254,16 @@ class GraphPatternRecognizer:
         patterns = []
         config = self.config["patterns"]["hub_detection"]
         
-        # Calculate centrality measures
-        degree_centrality = nx.degree_centrality(graph)
-        betweenness_centrality = nx.betweenness_centrality(graph, weight='weight')
-        closeness_centrality = nx.closeness_centrality(graph, distance='weight')
+        # Calculate centrality measures, exact or sampled depending on graph size
+        scores = self._centrality.compute(graph)
         
         # Combine centrality measures
         combined_centrality = {}
         for node in graph.nodes():
             combined_centrality[node] = (
-                degree_centrality.get(node, 0) * 0.4 +
-                betweenness_centrality.get(node, 0) * 0.4 +
-                closeness_centrality.get(node, 0) * 0.2
+                scores.degree.get(node, 0) * 0.4 +
+                scores.betweenness.get(node, 0) * 0.4 +
+                scores.closeness.get(node, 0) * 0.2
             )
         
         # Find hubs
@@ -215,28 +280,76 @@ class GraphPatternRecognizer:
                     for neighbor in graph.neighbors(node_id)
                 ]
                 
-                pattern = GraphPattern(
-                    pattern_type="hub",
-                    entities=[hub_entity] + connected_entities,
-                    centrality_scores={
-                        node_id: centrality,
-                        **{e.id: combined_centrality.get(e.id, 0) 
-                           for e in connected_entities}
-                    },
-                    metadata={
-                        "hub_id": node_id,
-                        "degree": degree,
-                        "centrality_measures": {
-                            "degree": degree_centrality[node_id],
-                            "betweenness": betweenness_centrality[node_id],
-                            "closeness": closeness_centrality[node_id]
-                        }
-                    }
-                )
-                
-                patterns.append(pattern)
+                patterns.append(self._hub_pattern(
+                    node_id, degree, hub_entity, connected_entities, combined_centrality, scores
+                ))
+        
+        self._create_hub_relationships(patterns)
+        return patterns
+    
+    async def _detect_hubs_csr(self, graph: CSRGraph) -> List[GraphPattern]:
+        """Detect hub patterns on a CSR graph"""
+        patterns = []
+        config = self.config["patterns"]["hub_detection"]
+        
+        scores = self._centrality.compute_csr(graph)
+        combined = (
+            np.array([scores.degree[n] for n in graph.node_ids]) * 0.4 +
+            np.array([scores.betweenness[n] for n in graph.node_ids]) * 0.4 +
+            np.array([scores.closeness[n] for n in graph.node_ids]) * 0.2
+        )
+        combined_centrality = dict(zip(graph.node_ids, combined.tolist()))
         
-        # Create hub relationships
+        degrees = graph.degrees
+        hubs = np.flatnonzero(
+            (degrees >= config["min_connections"]) & (combined >= config["centrality_threshold"])
+        )
+        for i in hubs:
+            neighbors = graph.indices[graph.indptr[i]:graph.indptr[i + 1]]
+            patterns.append(self._hub_pattern(
+                graph.node_ids[i],
+                int(degrees[i]),
+                graph.entities[i],
+                [graph.entities[j] for j in neighbors],
+                combined_centrality,
+                scores
+            ))
+        
+        self._create_hub_relationships(patterns)
+        return patterns
+    
+    def _hub_pattern(
+        self,
+        node_id: str,
+        degree: int,
+        hub_entity: Entity,
+        connected_entities: List[Entity],
+        combined_centrality: Dict[str, float],
+        scores: CentralityScores
+    ) -> GraphPattern:
+        """Build a hub pattern around one node"""
+        return GraphPattern(
+            pattern_type="hub",
+            entities=[hub_entity] + connected_entities,
+            centrality_scores={
+                node_id: combined_centrality[node_id],
+                **{e.id: combined_centrality.get(e.id, 0) 
+                   for e in connected_entities}
+            },
+            metadata={
+                "hub_id": node_id,
+                "degree": degree,
+                "centrality_measures": {
+                    "degree": scores.degree[node_id],
+                    "betweenness": scores.betweenness[node_id],
+                    "closeness": scores.closeness[node_id]
+                },
+                "centrality_method": scores.method
+            }
+        )
+    
+    def _create_hub_relationships(self, patterns: List[GraphPattern]):
+        """Create HUB_OF relationships for hub patterns"""
         for pattern in patterns:
             hub = pattern.get_central_entity()
             if hub:
@@ -254,8 +367,6 @@ class GraphPatternRecognizer:
                             f"Centrality score: {pattern.centrality_scores[hub.id]:.2f}"
                         ]
                     )
-        
-        return patterns
     
     async def _detect_communities(
         self,
@@ -288,30 +399,80 @@ class GraphPatternRecognizer:
             
             # Calculate community metrics
             subgraph = graph.subgraph(comm_nodes)
-            density = nx.density(subgraph)
             
-            # Calculate centrality within community
-            comm_centrality = nx.degree_centrality(subgraph)
-            
-            pattern = GraphPattern(
-                pattern_type="community",
-                entities=comm_entities,
-                centrality_scores={
-                    entity.id: comm_centrality.get(entity.id, 0)
-                    for entity in comm_entities
-                },
-                metadata={
-                    "size": len(comm_nodes),
-                    "density": density,
-                    "cohesion": self._calculate_cohesion(subgraph),
-                    "entity_types": Counter(e.type for e in comm_entities)
-                }
-            )
+            patterns.append(self._community_pattern(
+                comm_entities,
+                nx.degree_centrality(subgraph),
+                nx.density(subgraph),
+                self._calculate_cohesion(subgraph)
+            ))
+        
+        return patterns
+    
+    async def _detect_communities_csr(
+        self,
+        graph: CSRGraph,
+        algorithms: Union[CSRGraph, Neo4jGraphAlgorithms]
+    ) -> List[GraphPattern]:
+        """Detect label propagation communities on a CSR graph"""
+        patterns = []
+        config = self.config["patterns"]["community_detection"]
+        if config["algorithm"] != "label_propagation":
+            logger.debug(f"{config['algorithm']} is not available on the CSR backend, using label propagation")
+        
+        labels = algorithms.label_propagation(config.get("max_iterations", 100))
+        _, community = np.unique(labels, return_inverse=True)
+        sizes = np.bincount(community)
+        
+        # Edges inside each community, counted once per direction
+        rows, cols = graph.rows, graph.indices
+        internal = community[rows] == community[cols]
+        internal_degree = np.bincount(rows[internal], minlength=graph.number_of_nodes)
+        edge_counts = np.bincount(community[rows[internal]], minlength=len(sizes)) / 2
+        weight_sums = np.bincount(
+            community[rows[internal]], weights=graph.weights[internal], minlength=len(sizes)
+        ) / 2
+        
+        order = np.argsort(community, kind="stable")
+        members_of = np.split(order, np.cumsum(sizes)[:-1])
+        for c in np.flatnonzero(sizes >= config["min_community_size"]):
+            members = members_of[c]
+            size = len(members)
+            density = 2 * edge_counts[c] / (size * (size - 1)) if size > 1 else 0.0
+            avg_weight = weight_sums[c] / edge_counts[c] if edge_counts[c] > 0 else 0
             
-            patterns.append(pattern)
+            patterns.append(self._community_pattern(
+                [graph.entities[i] for i in members],
+                {graph.node_ids[i]: internal_degree[i] / (size - 1) for i in members},
+                float(density),
+                float(density * avg_weight) if size > 1 else 0.0
+            ))
         
         return patterns
     
+    def _community_pattern(
+        self,
+        comm_entities: List[Entity],
+        comm_centrality: Dict[str, float],
+        density: float,
+        cohesion: float
+    ) -> GraphPattern:
+        """Build a community pattern"""
+        return GraphPattern(
+            pattern_type="community",
+            entities=comm_entities,
+            centrality_scores={
+                entity.id: comm_centrality.get(entity.id, 0)
+                for entity in comm_entities
+            },
+            metadata={
+                "size": len(comm_entities),
+                "density": density,
+                "cohesion": cohesion,
+                "entity_types": Counter(e.type for e in comm_entities)
+            }
+        )
+    
     async def _detect_triangles(
         self,
         graph: nx.Graph,
@@ -325,6 +486,7 @@ class GraphPatternRecognizer:
         # Find all triangles
         triangles = [clique for clique in nx.enumerate_all_cliques(graph) 
                     if len(clique) == 3]
+        rel_index = self._index_relationships(relationships)
         
         for triangle_nodes in triangles:
             # Get triangle entities
@@ -347,33 +509,100 @@ class GraphPatternRecognizer:
             avg_strength = sum(edge_weights) / len(edge_weights) if edge_weights else 0
             
             if avg_strength >= config["min_triangle_strength"]:
-                # Analyze triangle for collaboration
-                collab_strength = self._analyze_collaboration_strength(
+                patterns.append(self._triangle_pattern(
                     triangle_entities,
-                    relationships
-                )
-                
-                pattern = CollaborationPattern(
-                    pattern_type="triangle",
-                    entities=triangle_entities,
-                    collaboration_strength=collab_strength,
-                    supporting_evidence=self._get_triangle_evidence(
-                        triangle_entities,
-                        relationships
-                    ),
-                    collaboration_type=self._determine_collaboration_type(
-                        triangle_entities
-                    ),
-                    metadata={
-                        "avg_edge_strength": avg_strength,
-                        "triangle_type": self._classify_triangle(triangle_entities)
-                    }
-                )
-                
-                patterns.append(pattern)
+                    avg_strength,
+                    self._relationships_among(rel_index, triangle_nodes)
+                ))
+        
+        return patterns
+    
+    async def _detect_triangles_csr(
+        self,
+        graph: CSRGraph,
+        algorithms: Union[CSRGraph, Neo4jGraphAlgorithms],
+        relationships: List[Relationship]
+    ) -> List[GraphPattern]:
+        """Detect triangle patterns on a CSR graph"""
+        patterns = []
+        config = self.config["patterns"]["triangle_detection"]
+        
+        triangles = algorithms.triangles()
+        if len(triangles) == 0:
+            return patterns
+        
+        a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+        avg_strength = (
+            graph.edge_weights(a, b)[0] + graph.edge_weights(a, c)[0] + graph.edge_weights(b, c)[0]
+        ) / 3
+        strong = avg_strength >= config["min_triangle_strength"]
+        
+        rel_index = self._index_relationships(relationships)
+        for triangle, strength in zip(triangles[strong], avg_strength[strong]):
+            triangle_ids = [graph.node_ids[i] for i in triangle]
+            patterns.append(self._triangle_pattern(
+                [graph.entities[i] for i in triangle],
+                float(strength),
+                self._relationships_among(rel_index, triangle_ids)
+            ))
         
         return patterns
     
+    def _triangle_pattern(
+        self,
+        triangle_entities: List[Entity],
+        avg_strength: float,
+        relationships: List[Relationship]
+    ) -> CollaborationPattern:
+        """Build a collaboration pattern for one triangle"""
+        # Analyze triangle for collaboration
+        collab_strength = self._analyze_collaboration_strength(
+            triangle_entities,
+            relationships
+        )
+        
+        return CollaborationPattern(
+            pattern_type="triangle",
+            entities=triangle_entities,
+            collaboration_strength=collab_strength,
+            supporting_evidence=self._get_triangle_evidence(
+                triangle_entities,
+                relationships
+            ),
+            collaboration_type=self._determine_collaboration_type(
+                triangle_entities
+            ),
+            metadata={
+                "avg_edge_strength": avg_strength,
+                "triangle_type": self._classify_triangle(triangle_entities)
+            }
+        )
+    
+    def _index_relationships(
+        self,
+        relationships: List[Relationship]
+    ) -> Dict[Tuple[str, str], List[Relationship]]:
+        """Relationships keyed by their sorted endpoint ids"""
+        index = defaultdict(list)
+        for rel in relationships:
+            source_id, target_id = rel.source.id, rel.target.id
+            key = (source_id, target_id) if source_id <= target_id else (target_id, source_id)
+            index[key].append(rel)
+        return index
+    
+    def _relationships_among(
+        self,
+        index: Dict[Tuple[str, str], List[Relationship]],
+        entity_ids: List[str]
+    ) -> List[Relationship]:
+        """Relationships whose endpoints are both in entity_ids"""
+        ids = sorted(set(entity_ids))
+        found = []
+        for i, first in enumerate(ids):
+            for second in ids[i:]:
+                found.extend(index.get((first, second), []))
+        return found
+    
     async def _detect_chains(
         self,
         graph: nx.Graph,
@@ -401,24 +630,47 @@ class GraphPatternRecognizer:
                     graph.nodes[node_id]["entity"]
                     for node_id in chain
                 ]
-                
-                pattern = GraphPattern(
-                    pattern_type="chain",
-                    entities=chain_entities,
-                    metadata={
-                        "chain_length": len(chain),
-                        "chain_type": self._classify_chain(chain_entities),
-                        "direction": self._determine_chain_direction(
-                            chain_entities,
-                            graph
-                        )
-                    }
-                )
-                
-                patterns.append(pattern)
+                patterns.append(self._chain_pattern(chain_entities, graph))
+        
+        return patterns
+    
+    async def _detect_chains_csr(self, graph: CSRGraph) -> List[GraphPattern]:
+        """Detect chain patterns on a CSR graph"""
+        patterns = []
+        config = self.config["patterns"]["chain_detection"]
+        visited = set()
+        
+        for i in np.flatnonzero(graph.degrees == 2):
+            start_node = graph.node_ids[i]
+            if start_node in visited:
+                continue
+            
+            chain = self._build_chain(graph, start_node, visited, config)
+            if len(chain) >= config["min_chain_length"]:
+                chain_entities = [graph.entities[graph.position[node_id]] for node_id in chain]
+                patterns.append(self._chain_pattern(chain_entities, graph))
         
         return patterns
     
+    def _chain_pattern(
+        self,
+        chain_entities: List[Entity],
+        graph: Union[nx.Graph, CSRGraph]
+    ) -> GraphPattern:
+        """Build a chain pattern"""
+        return GraphPattern(
+            pattern_type="chain",
+            entities=chain_entities,
+            metadata={
+                "chain_length": len(chain_entities),
+                "chain_type": self._classify_chain(chain_entities),
+                "direction": self._determine_chain_direction(
+                    chain_entities,
+                    graph
+                )
+            }
+        )
+    
     async def _detect_stars(
         self,
         graph: nx.Graph,
@@ -443,26 +695,59 @@ class GraphPatternRecognizer:
                     graph.nodes[n]["entity"]
                     for n in neighbors
                 ]
-                
-                pattern = GraphPattern(
-                    pattern_type="star",
-                    entities=[center_entity] + spoke_entities,
-                    centrality_scores={
-                        center_entity.id: 1.0,
-                        **{e.id: 0.1 for e in spoke_entities}
-                    },
-                    metadata={
-                        "center_id": node,
-                        "spoke_count": len(neighbors),
-                        "leaf_count": leaf_count,
-                        "star_type": self._classify_star(center_entity, spoke_entities)
-                    }
-                )
-                
-                patterns.append(pattern)
+                patterns.append(self._star_pattern(node, center_entity, spoke_entities, leaf_count))
         
         return patterns
     
+    async def _detect_stars_csr(self, graph: CSRGraph) -> List[GraphPattern]:
+        """Detect star patterns on a CSR graph"""
+        patterns = []
+        config = self.config["patterns"]["star_detection"]
+        
+        degrees = graph.degrees
+        leaf_counts = np.bincount(
+            graph.rows,
+            weights=(degrees[graph.indices] == 1),
+            minlength=graph.number_of_nodes
+        ).astype(int)
+        centers = np.flatnonzero(
+            (degrees >= config["min_spokes"]) & (leaf_counts >= config["min_spokes"] * 0.7)
+        )
+        
+        for i in centers:
+            neighbors = graph.indices[graph.indptr[i]:graph.indptr[i + 1]]
+            patterns.append(self._star_pattern(
+                graph.node_ids[i],
+                graph.entities[i],
+                [graph.entities[j] for j in neighbors],
+                int(leaf_counts[i])
+            ))
+        
+        return patterns
+    
+    def _star_pattern(
+        self,
+        node_id: str,
+        center_entity: Entity,
+        spoke_entities: List[Entity],
+        leaf_count: int
+    ) -> GraphPattern:
+        """Build a star pattern around one center"""
+        return GraphPattern(
+            pattern_type="star",
+            entities=[center_entity] + spoke_entities,
+            centrality_scores={
+                center_entity.id: 1.0,
+                **{e.id: 0.1 for e in spoke_entities}
+            },
+            metadata={
+                "center_id": node_id,
+                "spoke_count": len(spoke_entities),
+                "leaf_count": leaf_count,
+                "star_type": self._classify_star(center_entity, spoke_entities)
+            }
+        )
+    
     def _calculate_cohesion(self, subgraph: nx.Graph) -> float:
         """Calculate cohesion score for a subgraph"""
         if len(subgraph) < 2:
@@ -576,7 +861,7 @@ class GraphPatternRecognizer:
     
     def _build_chain(
         self,
-        graph: nx.Graph,
+        graph: Union[nx.Graph, CSRGraph],
         start_node: str,
         visited: Set[str],
         config: Dict[str, Any]
@@ -632,7 +917,7 @@ class GraphPatternRecognizer:
     def _determine_chain_direction(
         self,
         entities: List[Entity],
-        graph: nx.Graph
+        graph: Union[nx.Graph, CSRGraph]
     ) -> str:
         """Determine if chain has a direction"""
         # This would analyze the actual relationships
@@ -655,7 +940,7 @@ class GraphPatternRecognizer:
     def _score_patterns(
         self,
         patterns: List[GraphPattern],
-        graph: nx.Graph
+        graph: Union[nx.Graph, CSRGraph]
     ) -> List[GraphPattern]:
         """Score and rank patterns by importance"""
         weights = self.config["scoring"]
@@ -705,5 +990,6 @@ class GraphPatternRecognizer:
         return patterns
     
     def clear_cache(self):
-        """Clear pattern cache"""
-        self._pattern_cache.clear()
\ No newline at end of file
+        """Clear pattern and centrality caches"""
+        self._pattern_cache.clear()
+        self._centrality.clear_cache()
\ No newline at end of file
@@ -1,9 +1,10 @@
 """Core relationship building functionality"""
 
 import asyncio
+import bisect
 import logging
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Set, Tuple, Any
 import yaml
 
@@ -56,11 +57,14 @@ class RelationshipBuilder:
                 },
                 "semantic": {
                     "enable": True,
-                    "confidence_threshold": 0.7
+                    "confidence_threshold": 0.7,
+                    "max_team_peers": 25
                 },
                 "temporal": {
                     "enable": True,
-                    "correlation_window_days": 90
+                    "correlation_window_days": 90,
+                    "precedence_window_days": 90,
+                    "max_successors": 5
                 },
                 "deduplication": {
                     "enable": True,
@@ -158,6 +162,7 @@ class RelationshipBuilder:
         
         # Build entity index for faster lookup
         entity_index = self._build_entity_index(entities)
+        attribute_index = self._build_attribute_index(entities)
         
         # Discover different types of relationships
         tasks = []
@@ -166,10 +171,10 @@ class RelationshipBuilder:
             tasks.append(self._build_explicit_relationships(entities, entity_index, context))
         
         if self.config["relationship_discovery"]["semantic"]["enable"]:
-            tasks.append(self._build_semantic_relationships(entities, context))
+            tasks.append(self._build_semantic_relationships(entities, context, attribute_index))
         
         if self.config["relationship_discovery"]["temporal"]["enable"]:
-            tasks.append(self._build_temporal_relationships(entities, context))
+            tasks.append(self._build_temporal_relationships(entities, context, attribute_index))
         
         # Run discovery tasks in parallel
         if tasks:
@@ -207,6 +212,41 @@ class RelationshipBuilder:
         
         return dict(index)
     
+    def _build_attribute_index(self, entities: List[Entity]) -> Dict[str, Any]:
+        """Group entities by the attributes the semantic and temporal passes pair on
+        
+        Returns:
+            Dictionary with "teams" (team name -> Person entities in input order)
+            and "dates" (entities with a parseable date, sorted by that date)
+        """
+        teams = defaultdict(list)
+        dates = []
+        
+        for position, entity in enumerate(entities):
+            team = entity.attributes.get("team")
+            if entity.type == "Person" and team is not None:
+                teams[team].append(entity)
+            
+            raw_date = entity.attributes.get("created_date") or entity.attributes.get("start_date")
+            if raw_date:
+                parsed = self._parse_date(raw_date)
+                if parsed is not None:
+                    dates.append((parsed, position, entity, raw_date))
+        
+        dates.sort(key=lambda item: (item[0], item[1]))
+        return {"teams": dict(teams), "dates": dates}
+    
+    def _parse_date(self, value: Any) -> Optional[datetime]:
+        """Parse an ISO date, normalizing timezone-aware values to naive UTC"""
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            return None
+        
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    
     async def _build_explicit_relationships(
         self,
         entities: List[Entity],
@@ -273,20 +313,25 @@ class RelationshipBuilder:
     async def _build_semantic_relationships(
         self,
         entities: List[Entity],
-        context: RelationshipDiscoveryContext
+        context: RelationshipDiscoveryContext,
+        attribute_index: Optional[Dict[str, Any]] = None
     ) -> List[Relationship]:
-        """Build semantic relationships (placeholder for semantic miner integration)"""
+        """Build semantic relationships (placeholder for semantic miner integration)
+        
+        People in the same team work with each other. Each member is paired
+        with at most max_team_peers of the teammates listed after them, so very
+        large teams do not produce a quadratic number of relationships.
+        """
         # This will be implemented when SemanticRelationshipMiner is ready
         relationships = []
+        attribute_index = attribute_index or self._build_attribute_index(entities)
+        max_peers = self.config["relationship_discovery"]["semantic"].get("max_team_peers")
         
         # For now, add some simple semantic relationships based on entity attributes
-        for i, entity1 in enumerate(entities):
-            for entity2 in entities[i+1:]:
-                # Check for same team membership
-                if (entity1.type == "Person" and entity2.type == "Person" and
-                    entity1.attributes.get("team") == entity2.attributes.get("team") and
-                    entity1.attributes.get("team") is not None):
-                    
+        for members in attribute_index["teams"].values():
+            for i, entity1 in enumerate(members):
+                peers = members[i+1:] if max_peers is None else members[i+1:i+1+max_peers]
+                for entity2 in peers:
                     rel = Relationship(
                         source=entity1,
                         target=entity2,
@@ -304,38 +349,47 @@ class RelationshipBuilder:
     async def _build_temporal_relationships(
         self,
         entities: List[Entity],
-        context: RelationshipDiscoveryContext
+        context: RelationshipDiscoveryContext,
+        attribute_index: Optional[Dict[str, Any]] = None
     ) -> List[Relationship]:
-        """Build temporal relationships (placeholder for temporal analyzer integration)"""
+        """Build temporal relationships (placeholder for temporal analyzer integration)
+        
+        Sweeps the entities in date order: each entity precedes the next
+        max_successors entities with a strictly later date, as long as they
+        fall within precedence_window_days.
+        """
         # This will be implemented when TemporalRelationshipAnalyzer is ready
         relationships = []
+        attribute_index = attribute_index or self._build_attribute_index(entities)
+        temporal_config = self.config["relationship_discovery"]["temporal"]
+        max_successors = temporal_config.get("max_successors")
+        window_days = temporal_config.get("precedence_window_days")
+        window = timedelta(days=window_days) if window_days is not None else None
+        
+        dated = attribute_index["dates"]
+        timestamps = [item[0] for item in dated]
         
         # For now, add simple temporal relationships based on dates
-        for i, entity1 in enumerate(entities):
-            for entity2 in entities[i+1:]:
-                # Check for temporal precedence
-                date1 = entity1.attributes.get("created_date") or entity1.attributes.get("start_date")
-                date2 = entity2.attributes.get("created_date") or entity2.attributes.get("start_date")
+        for dt1, _, entity1, date1 in dated:
+            # Skip entities on the same date; precedence is strict
+            start = bisect.bisect_right(timestamps, dt1)
+            end = len(dated) if max_successors is None else min(len(dated), start + max_successors)
+            
+            for dt2, _, entity2, date2 in dated[start:end]:
+                if window is not None and dt2 - dt1 > window:
+                    break
                 
-                if date1 and date2:
-                    try:
-                        dt1 = datetime.fromisoformat(str(date1).replace('Z', '+00:00'))
-                        dt2 = datetime.fromisoformat(str(date2).replace('Z', '+00:00'))
-                        
-                        if dt1 < dt2:
-                            rel = Relationship(
-                                source=entity1,
-                                target=entity2,
-                                relationship_type=RelationshipType.PRECEDES,
-                                direction=RelationshipDirection.UNIDIRECTIONAL,
-                                strength=RelationshipStrength.MODERATE,
-                                confidence=0.7,
-                                evidence=[f"Temporal order: {date1} before {date2}"],
-                                temporal_aspect=TemporalAspect.PAST
-                            )
-                            relationships.append(rel)
-                    except (ValueError, TypeError):
-                        pass
+                rel = Relationship(
+                    source=entity1,
+                    target=entity2,
+                    relationship_type=RelationshipType.PRECEDES,
+                    direction=RelationshipDirection.UNIDIRECTIONAL,
+                    strength=RelationshipStrength.MODERATE,
+                    confidence=0.7,
+                    evidence=[f"Temporal order: {date1} before {date2}"],
+                    temporal_aspect=TemporalAspect.PAST
+                )
+                relationships.append(rel)
         
         return relationships
     
@@ -357,12 +411,11 @@ class RelationshipBuilder:
             
             if key in seen:
                 # Merge based on strategy
-                existing = seen[key]
+                idx = seen[key]
+                existing = deduped[idx]
                 if strategy == "highest_confidence":
                     if rel.confidence > existing.confidence:
-                        seen[key] = rel
                         # Update in deduped list
-                        idx = deduped.index(existing)
                         deduped[idx] = rel
                 elif strategy == "merge_evidence":
                     # Merge evidence from both
@@ -370,7 +423,7 @@ class RelationshipBuilder:
                     existing.evidence = list(set(existing.evidence))
                     existing.confidence = max(existing.confidence, rel.confidence)
             else:
-                seen[key] = rel
+                seen[key] = len(deduped)
                 deduped.append(rel)
         
         return deduped
@@ -1,12 +1,13 @@
 """Semantic relationship mining from text"""
 
 import asyncio
+import bisect
 import logging
 import re
 from collections import defaultdict
 from typing import Dict, List, Optional, Set, Tuple, Any
 import spacy
-from spacy.matcher import Matcher
+from spacy.matcher import Matcher, PhraseMatcher
 
 from .models import (
     Entity,
@@ -21,6 +22,83 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Pipeline components the dependency extraction reads (pos_, lemma_, dep_)
+DEPENDENCY_PIPES = {"tok2vec", "transformer", "tagger", "morphologizer", "attribute_ruler", "lemmatizer", "parser"}
+
+
+class EntityLexicon:
+    """Surface forms of a set of entities, compiled once
+    
+    Each entity is known by its lowercased name and, for multi-word names,
+    its acronym and its last word when longer than three characters. Later
+    entities win when two share a form. The forms are compiled into a spaCy
+    PhraseMatcher on the LOWER attribute, which finds every form in a
+    document in one pass over its tokens instead of a lookup per token and
+    noun chunk.
+    """
+    
+    def __init__(self, entities: List[Entity]):
+        """Build the lexicon
+        
+        Args:
+            entities: Entities to recognise
+        """
+        self.fingerprint = self.fingerprint_of(entities)
+        self.terms: Dict[str, Entity] = {}
+        for entity in entities:
+            # Add entity name variations
+            name = entity.get_name()
+            self.terms[name.lower()] = entity
+            
+            # Add common variations
+            if " " in name:
+                # Add acronym
+                acronym = "".join(word[0].upper() for word in name.split())
+                self.terms[acronym.lower()] = entity
+                
+                # Add last word (common for companies)
+                last_word = name.split()[-1]
+                if len(last_word) > 3:
+                    self.terms[last_word.lower()] = entity
+        
+        self._matcher: Optional[PhraseMatcher] = None
+        self._vocab = None
+    
+    @staticmethod
+    def fingerprint_of(entities: List[Entity]) -> int:
+        """Hash of the entity ids and names a lexicon was built from"""
+        return hash(tuple((entity.id, entity.get_name()) for entity in entities))
+    
+    def matcher(self, nlp) -> PhraseMatcher:
+        """PhraseMatcher over all surface forms for the pipeline's vocab"""
+        if self._matcher is None or self._vocab is not nlp.vocab:
+            self._matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+            terms = list(self.terms)
+            for term, pattern in zip(terms, nlp.tokenizer.pipe(terms)):
+                self._matcher.add(term, [pattern])
+            self._vocab = nlp.vocab
+        return self._matcher
+    
+    def find_mentions(self, doc, nlp) -> List[EntityMention]:
+        """Mentions of lexicon entities in a processed document
+        
+        Single-token forms get confidence 1.0 and multi-token forms 0.9, as
+        token and noun chunk matches do in the per-text path.
+        """
+        mentions = []
+        for match_id, start, end in self.matcher(nlp)(doc):
+            entity = self.terms[nlp.vocab.strings[match_id]]
+            span = doc[start:end]
+            mentions.append(EntityMention(
+                entity_id=entity.id,
+                entity_type=entity.type,
+                surface_form=span.text,
+                start_pos=span.start_char,
+                end_pos=span.end_char,
+                confidence=1.0 if end - start == 1 else 0.9
+            ))
+        return mentions
+
 
 class SemanticRelationshipMiner:
     """Extract relationships from text using NLP"""
@@ -34,6 +112,7 @@ class SemanticRelationshipMiner:
         self.config = config or self._get_default_config()
         self._nlp = None
         self._matcher = None
+        self._lexicon: Optional[EntityLexicon] = None
         self._relationship_patterns = self._load_relationship_patterns()
         
     def _get_default_config(self) -> Dict[str, Any]:
@@ -53,6 +132,14 @@ class SemanticRelationshipMiner:
             "performance": {
                 "max_text_length": 10000,
                 "cache_extractions": True
+            },
+            "corpus": {
+                # Opt-in: extract_from_documents streams through nlp.pipe
+                # (mine_from_corpus is always available directly)
+                "enabled": False,
+                "n_process": -1,  # -1 uses every core above min_parallel_documents
+                "batch_size": 64,
+                "min_parallel_documents": 200
             }
         }
     
@@ -68,7 +155,9 @@ class SemanticRelationshipMiner:
             
             # Add entity ruler for better entity recognition
             if "entity_ruler" not in self._nlp.pipe_names:
-                ruler = self._nlp.add_pipe("entity_ruler", before="ner")
+                # A blank pipeline has no ner to run before
+                before = "ner" if "ner" in self._nlp.pipe_names else None
+                ruler = self._nlp.add_pipe("entity_ruler", before=before)
         
         return self._nlp
     
@@ -154,6 +243,28 @@ class SemanticRelationshipMiner:
         # Find entity mentions in text
         mentions = await self._find_entity_mentions(text, entities)
         
+        return await self._relationships_from_mentions(text, mentions, document_metadata, context)
+    
+    async def _relationships_from_mentions(
+        self,
+        text: str,
+        mentions: List[EntityMention],
+        document_metadata: Optional[Dict[str, Any]],
+        context: RelationshipDiscoveryContext,
+        doc: Optional[Any] = None
+    ) -> List[Relationship]:
+        """Run the extraction methods over a text's entity mentions
+        
+        Args:
+            text: Text to analyze
+            mentions: Entity mentions found in text
+            document_metadata: Optional document metadata
+            context: Discovery context
+            doc: Parsed text, if already processed
+        
+        Returns:
+            List of discovered relationships
+        """
         if len(mentions) < 2:
             return []  # Need at least 2 entities for relationships
         
@@ -165,7 +276,7 @@ class SemanticRelationshipMiner:
             relationships.extend(pattern_rels)
         
         if self.config["relationship_patterns"]["enable_dependency_parsing"]:
-            dep_rels = await self._extract_dependency_relationships(text, mentions)
+            dep_rels = await self._extract_dependency_relationships(text, mentions, doc)
             relationships.extend(dep_rels)
         
         if self.config["relationship_patterns"]["enable_llm_extraction"] and context.enable_llm:
@@ -195,23 +306,8 @@ class SemanticRelationshipMiner:
         """Find entity mentions in text"""
         mentions = []
         
-        # Create entity lookup
-        entity_lookup = {}
-        for entity in entities:
-            # Add entity name variations
-            name = entity.get_name()
-            entity_lookup[name.lower()] = entity
-            
-            # Add common variations
-            if " " in name:
-                # Add acronym
-                acronym = "".join(word[0].upper() for word in name.split())
-                entity_lookup[acronym.lower()] = entity
-                
-                # Add last word (common for companies)
-                last_word = name.split()[-1]
-                if len(last_word) > 3:
-                    entity_lookup[last_word.lower()] = entity
+        # Entity lookup, rebuilt only when the entities change
+        entity_lookup = self._lexicon_for(entities).terms
         
         # Process text with spaCy
         doc = self.nlp(text.lower())
@@ -230,8 +326,9 @@ class SemanticRelationshipMiner:
                 )
                 mentions.append(mention)
         
-        # Find mentions using noun phrases
-        for chunk in doc.noun_chunks:
+        # Find mentions using noun phrases (needs a dependency parse)
+        noun_chunks = doc.noun_chunks if doc.has_annotation("DEP") else []
+        for chunk in noun_chunks:
             chunk_text = chunk.text.strip()
             if chunk_text in entity_lookup:
                 entity = entity_lookup[chunk_text]
@@ -250,6 +347,12 @@ class SemanticRelationshipMiner:
         
         return mentions
     
+    def _lexicon_for(self, entities: List[Entity]) -> EntityLexicon:
+        """Lexicon for the entities, reused while they are unchanged"""
+        if self._lexicon is None or self._lexicon.fingerprint != EntityLexicon.fingerprint_of(entities):
+            self._lexicon = EntityLexicon(entities)
+        return self._lexicon
+    
     def _deduplicate_mentions(self, mentions: List[EntityMention]) -> List[EntityMention]:
         """Remove overlapping entity mentions"""
         if not mentions:
@@ -322,21 +425,24 @@ class SemanticRelationshipMiner:
     async def _extract_dependency_relationships(
         self,
         text: str,
-        mentions: List[EntityMention]
+        mentions: List[EntityMention],
+        doc: Optional[Any] = None
     ) -> List[Relationship]:
         """Extract relationships using dependency parsing"""
         relationships = []
         
-        # Process text with spaCy
-        doc = self.nlp(text)
+        # Process text with spaCy unless the caller already has
+        if doc is None:
+            doc = self.nlp(text)
         
-        # Create mention token mapping
+        # Create mention token mapping: tokens starting inside each mention
+        token_starts = [token.idx for token in doc]
         mention_tokens = {}
         for mention in mentions:
-            for token in doc:
-                if (token.idx >= mention.start_pos and 
-                    token.idx < mention.end_pos):
-                    mention_tokens[token.i] = mention
+            first = bisect.bisect_left(token_starts, mention.start_pos)
+            last = bisect.bisect_left(token_starts, mention.end_pos)
+            for i in range(first, last):
+                mention_tokens[i] = mention
         
         # Look for dependency patterns
         for token in doc:
@@ -491,6 +597,9 @@ class SemanticRelationshipMiner:
         Returns:
             List of discovered relationships
         """
+        if self.config.get("corpus", {}).get("enabled", False):
+            return await self.mine_from_corpus(documents, entities, context)
+        
         all_relationships = []
         
         # Process documents in batches
@@ -513,6 +622,68 @@ class SemanticRelationshipMiner:
         
         return all_relationships
     
+    async def mine_from_corpus(
+        self,
+        documents: List[Dict[str, Any]],
+        entities: List[Entity],
+        context: Optional[RelationshipDiscoveryContext] = None
+    ) -> List[Relationship]:
+        """Extract relationships from many documents in one spaCy stream
+        
+        The entity lexicon is compiled once into a PhraseMatcher, and texts
+        are streamed through nlp.pipe with the components extraction does not
+        read disabled, across n_process worker processes for large corpora.
+        Each text is parsed once; the same Doc serves mention matching and
+        dependency extraction.
+        
+        Args:
+            documents: List of documents with 'text' and optional metadata
+            entities: Known entities
+            context: Optional discovery context
+        
+        Returns:
+            List of discovered relationships
+        """
+        if not documents or not entities:
+            return []
+        
+        context = context or RelationshipDiscoveryContext()
+        corpus_config = self.config.get("corpus", {})
+        max_length = self.config["performance"]["max_text_length"]
+        
+        lexicon = self._lexicon_for(entities)
+        nlp = self.nlp
+        texts = [(document.get("text") or "")[:max_length] for document in documents]
+        
+        n_process = corpus_config.get("n_process", -1)
+        if len(texts) < corpus_config.get("min_parallel_documents", 200):
+            n_process = 1
+        
+        all_relationships = []
+        docs = nlp.pipe(
+            texts,
+            batch_size=corpus_config.get("batch_size", 64),
+            n_process=n_process,
+            disable=self._corpus_disabled_pipes()
+        )
+        for document, doc in zip(documents, docs):
+            if not doc.text:
+                continue
+            
+            mentions = self._deduplicate_mentions(lexicon.find_mentions(doc, nlp))
+            metadata = {k: v for k, v in document.items() if k != "text"}
+            all_relationships.extend(
+                await self._relationships_from_mentions(doc.text, mentions, metadata, context, doc)
+            )
+        
+        return all_relationships
+    
+    def _corpus_disabled_pipes(self) -> List[str]:
+        """Pipeline components corpus mode can skip"""
+        if not self.config["relationship_patterns"]["enable_dependency_parsing"]:
+            return list(self.nlp.pipe_names)
+        return [name for name in self.nlp.pipe_names if name not in DEPENDENCY_PIPES]
+    
     def get_relationship_context(
         self,
         text: str,
@@ -20,6 +20,7 @@ from .models import (
     TemporalAspect,
     RelationshipDiscoveryContext
 )
+from .correlation_engine import CrossCorrelationEngine
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +52,8 @@ class TemporalRelationshipAnalyzer:
                 "fill_method": "forward"
             },
             "significance_level": 0.05,
-            "min_events_required": 10
+            "min_events_required": 10,
+            "engine": "vectorized"  # vectorized, pairwise
         }
     
     async def analyze_temporal_patterns(
@@ -88,28 +90,100 @@ class TemporalRelationshipAnalyzer:
             return []
         
         # Discover temporal relationships
+        if self.config.get("engine", "vectorized") == "vectorized":
+            correlations = await self._correlate_vectorized(active_entities, entity_events)
+        else:
+            correlations = await self._correlate_pairwise(active_entities, entity_events)
+        
         relationships = []
+        for correlation in correlations:
+            if correlation.is_significant(self.config["min_correlation"]):
+                # Create relationship(s) from correlation
+                rels = self._create_temporal_relationships(correlation)
+                
+                for rel in rels:
+                    if context.should_include_relationship(rel):
+                        relationships.append(rel)
+        
+        return relationships
+    
+    async def _correlate_pairwise(
+        self,
+        entities: List[Entity],
+        entity_events: Dict[str, List[Event]]
+    ) -> List[TemporalCorrelation]:
+        """Correlate entity pairs one at a time"""
+        correlations = []
         
-        # Process entity pairs
-        for i, entity1 in enumerate(active_entities):
-            for entity2 in active_entities[i+1:]:
-                # Analyze temporal correlation
+        for i, entity1 in enumerate(entities):
+            for entity2 in entities[i+1:]:
                 correlation = await self._analyze_entity_correlation(
                     entity1,
                     entity2,
                     entity_events[entity1.id],
                     entity_events[entity2.id]
                 )
-                
-                if correlation and correlation.is_significant(self.config["min_correlation"]):
-                    # Create relationship(s) from correlation
-                    rels = self._create_temporal_relationships(correlation)
-                    
-                    for rel in rels:
-                        if context.should_include_relationship(rel):
-                            relationships.append(rel)
+                if correlation:
+                    correlations.append(correlation)
         
-        return relationships
+        return correlations
+    
+    async def _correlate_vectorized(
+        self,
+        entities: List[Entity],
+        entity_events: Dict[str, List[Event]]
+    ) -> List[TemporalCorrelation]:
+        """Correlate all entity pairs in one pass
+        
+        Lagged correlations for every pair come from CrossCorrelationEngine;
+        only pairs whose correlation reaches min_correlation go on to the
+        causality test. Each pair is compared, and tested for causality, over
+        the same window as _align_time_series: the days both entities cover,
+        cut to the correlation window ending where the earlier one ends.
+        """
+        lag_config = self.config["lag_detection"]
+        engine = CrossCorrelationEngine(
+            window_days=self.config["correlation_window_days"],
+            max_lag_days=lag_config["max_lag_days"],
+            lag_step_days=lag_config["lag_step_days"]
+        )
+        
+        series = [self._events_to_time_series(entity_events[e.id]) for e in entities]
+        pairs, values, mask, dates = engine.significant_pairs(
+            series,
+            min_correlation=self.config["min_correlation"],
+            min_overlap=self.config["min_events_required"]
+        )
+        
+        correlations = []
+        for pair in pairs:
+            entity1, entity2 = entities[pair.index1], entities[pair.index2]
+            cache_key = (entity1.id, entity2.id)
+            if cache_key in self._correlation_cache:
+                correlations.append(self._correlation_cache[cache_key])
+                continue
+            
+            ts1, ts2 = engine.aligned_pair(values, mask, dates, pair.index1, pair.index2)
+            causality_score = await self._test_causality(ts1, ts2, pair.optimal_lag_days)
+            
+            correlation = TemporalCorrelation(
+                entity1=entity1,
+                entity2=entity2,
+                correlation_coefficient=pair.correlation_coefficient,
+                optimal_lag_days=pair.optimal_lag_days,
+                causality_score=causality_score,
+                confidence=self._calculate_confidence(
+                    pair.correlation_coefficient,
+                    causality_score,
+                    pair.overlap_days
+                ),
+                time_window_days=self.config["correlation_window_days"],
+                events_analyzed=pair.overlap_days
+            )
+            self._correlation_cache[cache_key] = correlation
+            correlations.append(correlation)
+        
+        return correlations
     
     def _group_events_by_entity(self, events: List[Event]) -> Dict[str, List[Event]]:
         """Group events by entity ID"""
@@ -222,7 +296,7 @@ class TemporalRelationshipAnalyzer:
             
             # Fill missing values
             if self.config["event_aggregation"]["fill_method"] == "forward":
-                series = series.fillna(method='ffill')
+                series = series.ffill()
             elif self.config["event_aggregation"]["fill_method"] == "zero":
                 series = series.fillna(0)
             else:
@@ -314,22 +388,30 @@ class TemporalRelationshipAnalyzer:
         if self.config["causality_test"] == "granger":
             return await self._granger_causality_test(ts1, ts2, lag)
         else:
-            # Simple lag correlation as causality proxy
-            if lag == 0:
-                return 0.5  # No clear causality
-            
-            # Shift series based on lag
-            if lag > 0:
-                # ts1 leads ts2
-                ts1_shifted = ts1.shift(lag)
-                correlation = abs(self._calculate_correlation(ts1_shifted, ts2))
-            else:
-                # ts2 leads ts1
-                ts2_shifted = ts2.shift(-lag)
-                correlation = abs(self._calculate_correlation(ts1, ts2_shifted))
-            
-            # Convert correlation to causality score
-            return min(correlation * 1.2, 1.0)
+            return self._lag_causality_score(ts1, ts2, lag)
+    
+    def _lag_causality_score(
+        self,
+        ts1: pd.Series,
+        ts2: pd.Series,
+        lag: int
+    ) -> float:
+        """Simple lag correlation as causality proxy"""
+        if lag == 0:
+            return 0.5  # No clear causality
+        
+        # Shift series based on lag
+        if lag > 0:
+            # ts1 leads ts2
+            ts1_shifted = ts1.shift(lag)
+            correlation = abs(self._calculate_correlation(ts1_shifted, ts2))
+        else:
+            # ts2 leads ts1
+            ts2_shifted = ts2.shift(-lag)
+            correlation = abs(self._calculate_correlation(ts1, ts2_shifted))
+        
+        # Convert correlation to causality score
+        return min(correlation * 1.2, 1.0)
     
     async def _granger_causality_test(
         self,
@@ -370,7 +452,7 @@ class TemporalRelationshipAnalyzer:
         except Exception as e:
             logger.warning(f"Granger causality test failed: {e}")
             # Fall back to simple method
-            return await self._test_causality(ts1, ts2, lag)
+            return self._lag_causality_score(ts1, ts2, lag)
     
     def _calculate_confidence(
         self,
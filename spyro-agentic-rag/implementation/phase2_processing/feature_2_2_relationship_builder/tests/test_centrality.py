@@ -0,0 +1,80 @@
+"""Tests for CentralityProvider"""
+
+import pytest
+import networkx as nx
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.centrality import CentralityProvider
+
+
+class TestCentralityProvider:
+    """Test CentralityProvider functionality"""
+
+    @pytest.fixture
+    def graph(self):
+        """Weighted graph with one large component and a few small ones"""
+        graph = nx.connected_watts_strogatz_graph(300, 6, 0.2, seed=3)
+        for k, (u, v) in enumerate(graph.edges()):
+            graph[u][v]["weight"] = 0.5 + (k % 7) * 0.1
+        for k in range(5):
+            base = 1000 + k * 10
+            nx.add_path(graph, range(base, base + 4), weight=0.8)
+        return graph
+
+    def test_exact_for_small_graphs(self, graph):
+        """Test that small graphs get the exact NetworkX measures"""
+        scores = CentralityProvider(exact_max_nodes=1000).compute(graph)
+
+        assert scores.method == "exact"
+        assert scores.betweenness == nx.betweenness_centrality(graph, weight="weight")
+
+    def test_all_pivots_match_exact(self, graph):
+        """Test that sampling every node reproduces exact betweenness and harmonic closeness"""
+        provider = CentralityProvider(exact_max_nodes=0, betweenness_pivots=graph.number_of_nodes())
+        scores = provider.compute(graph)
+
+        n = graph.number_of_nodes()
+        betweenness = nx.betweenness_centrality(graph, weight="weight")
+        harmonic = nx.harmonic_centrality(graph, distance="weight")
+        assert scores.method == "sampled"
+        for node in graph:
+            assert scores.betweenness[node] == pytest.approx(betweenness[node], abs=1e-9)
+            assert scores.closeness[node] == pytest.approx(harmonic[node] / (n - 1), abs=1e-9)
+
+    def test_sampled_ranks_top_nodes(self, graph):
+        """Test that sampled betweenness finds the same top nodes"""
+        scores = CentralityProvider(exact_max_nodes=0, betweenness_pivots=60).compute(graph)
+
+        exact = nx.betweenness_centrality(graph, weight="weight")
+        top_exact = set(sorted(exact, key=exact.get, reverse=True)[:10])
+        top_sampled = set(sorted(scores.betweenness, key=scores.betweenness.get, reverse=True)[:10])
+        assert len(top_exact & top_sampled) >= 6
+
+    def test_cache_and_incremental_update(self, graph):
+        """Test that repeats hit the cache and additions match a full pass"""
+        provider = CentralityProvider(exact_max_nodes=0, betweenness_pivots=20)
+        provider.compute(graph)
+        assert provider.compute(graph.copy()).method == "cached"
+
+        updated = graph.copy()
+        updated.add_edge(0, 150, weight=0.3)
+        updated.add_edge(1000, 1002, weight=0.5)
+        incremental = provider.compute(updated)
+        full = CentralityProvider(exact_max_nodes=0, betweenness_pivots=20).compute(updated)
+
+        assert incremental.method == "incremental"
+        for node in updated:
+            assert incremental.betweenness[node] == pytest.approx(full.betweenness[node], abs=1e-9)
+            assert incremental.closeness[node] == pytest.approx(full.closeness[node], abs=1e-9)
+
+    def test_removal_triggers_full_pass(self, graph):
+        """Test that removed edges are not applied incrementally"""
+        provider = CentralityProvider(exact_max_nodes=0, betweenness_pivots=20)
+        provider.compute(graph)
+
+        updated = graph.copy()
+        updated.remove_edge(*next(iter(graph.edges(0))))
+        assert provider.compute(updated).method == "sampled"
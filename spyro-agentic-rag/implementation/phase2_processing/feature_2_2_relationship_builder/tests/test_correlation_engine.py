@@ -0,0 +1,123 @@
+"""Tests for CrossCorrelationEngine"""
+
+import pytest
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Entity, Event
+from src.correlation_engine import CrossCorrelationEngine
+from src.temporal_analyzer import TemporalRelationshipAnalyzer
+
+
+class TestCrossCorrelationEngine:
+    """Test CrossCorrelationEngine functionality"""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Create an analyzer with a deterministic causality score"""
+        analyzer = TemporalRelationshipAnalyzer()
+        analyzer.config["causality_test"] = "lag"
+        analyzer.config["lag_detection"] = {"max_lag_days": 10, "lag_step_days": 1}
+        return analyzer
+
+    @pytest.fixture
+    def random_events(self):
+        """Entities with overlapping histories, some following a shared driver"""
+        rng = np.random.default_rng(7)
+        base_date = datetime(2024, 1, 1)
+        driver = np.cumsum(rng.normal(size=200))
+
+        entities, events = [], []
+        for k in range(12):
+            entity = Entity(id=f"cust_{k:03d}", type="Customer")
+            entities.append(entity)
+            start = int(rng.integers(0, 60))
+            length = int(rng.integers(30, 140))
+            lag = int(rng.integers(0, 8))
+            for day in range(start, min(200, start + length)):
+                if rng.random() < 0.3:
+                    continue
+                value = driver[max(0, day - lag)] if k % 3 else rng.normal()
+                events.append(Event(
+                    entity_id=entity.id,
+                    event_type="usage",
+                    timestamp=base_date + timedelta(days=day),
+                    value=float(value) + rng.normal() * 0.1
+                ))
+        return entities, events
+
+    def test_detects_known_lag(self):
+        """Test lag detection on a shifted copy"""
+        dates = pd.date_range(start='2024-01-01', periods=80, freq='D')
+        rng = np.random.default_rng(1)
+        leader = pd.Series(np.cumsum(rng.normal(size=80)), index=dates)
+        follower = leader.shift(4).dropna()
+
+        engine = CrossCorrelationEngine(window_days=90, max_lag_days=10)
+        values, mask, _ = engine.build_matrix([leader, follower])
+        pairs = engine.correlate(values, mask)
+
+        assert len(pairs) == 1
+        assert pairs[0].optimal_lag_days == 4
+        assert pairs[0].overlap_days == 76
+
+    def test_prefilter_and_overlap(self):
+        """Test that weak or barely overlapping pairs are dropped"""
+        dates = pd.date_range(start='2024-01-01', periods=60, freq='D')
+        rng = np.random.default_rng(2)
+        base = pd.Series(rng.normal(size=60), index=dates)
+        noise = pd.Series(rng.normal(size=60), index=dates)
+        short = base.iloc[-5:] * 2
+
+        engine = CrossCorrelationEngine(window_days=90, max_lag_days=5)
+        pairs, _, _, _ = engine.significant_pairs([base, noise, short], min_correlation=0.6, min_overlap=10)
+
+        assert pairs == []
+
+    def test_aligned_pair_uses_correlation_window(self):
+        """Test that aligned series are cut to the window ending at the earlier end"""
+        dates = pd.date_range(start='2024-01-01', periods=200, freq='D')
+        rng = np.random.default_rng(3)
+        first = pd.Series(rng.normal(size=200), index=dates)
+        second = pd.Series(rng.normal(size=180), index=dates[10:190])
+
+        engine = CrossCorrelationEngine(window_days=30, max_lag_days=5)
+        values, mask, matrix_dates = engine.build_matrix([first, second])
+        ts1, ts2 = engine.aligned_pair(values, mask, matrix_dates, 0, 1)
+
+        assert ts1.index[-1] == dates[189]
+        assert ts1.index[0] == dates[159]
+        assert ts1.index.equals(ts2.index)
+        assert ts1.to_numpy() == pytest.approx(first.iloc[159:190].to_numpy())
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("window_days", [90, 40])
+    async def test_matches_pairwise_analysis(self, analyzer, random_events, window_days):
+        """Test that the vectorized engine agrees with the pairwise path"""
+        analyzer.config["correlation_window_days"] = window_days
+        entities, events = random_events
+        entity_events = analyzer._group_events_by_entity(events)
+
+        vectorized = await analyzer._correlate_vectorized(entities, entity_events)
+        analyzer.clear_cache()
+        pairwise = await analyzer._correlate_pairwise(entities, entity_events)
+
+        min_correlation = analyzer.config["min_correlation"]
+        expected = {
+            (c.entity1.id, c.entity2.id): c for c in pairwise
+            if c.is_significant(min_correlation)
+        }
+        actual = {(c.entity1.id, c.entity2.id): c for c in vectorized}
+
+        assert expected
+        assert actual.keys() == expected.keys()
+        for key, correlation in expected.items():
+            assert actual[key].correlation_coefficient == pytest.approx(correlation.correlation_coefficient, abs=1e-6)
+            assert actual[key].optimal_lag_days == correlation.optimal_lag_days
+            assert actual[key].events_analyzed == correlation.events_analyzed
+            assert actual[key].causality_score == pytest.approx(correlation.causality_score, abs=1e-6)
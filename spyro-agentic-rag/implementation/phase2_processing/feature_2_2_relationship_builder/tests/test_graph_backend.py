@@ -0,0 +1,198 @@
+"""Tests for the CSR and Neo4j pattern recognition backends"""
+
+import pytest
+import networkx as nx
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Entity, Relationship, RelationshipType, RelationshipStrength
+from src.graph_backend import CSRGraph, Neo4jGraphAlgorithms
+from src.pattern_recognizer import GraphPatternRecognizer
+
+
+class FakeSession:
+    """Session returning canned records per query keyword"""
+
+    def __init__(self, responses, calls=None):
+        self.responses = responses
+        self.calls = calls if calls is not None else []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def run(self, query, **params):
+        self.calls.append((query, params))
+        for keyword, records in self.responses.items():
+            if keyword in query:
+                if isinstance(records, Exception):
+                    raise records
+                return [type("Record", (), {"data": lambda self, r=r: r})() for r in records]
+        return []
+
+
+class FakeDriver:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def session(self, database=None):
+        return FakeSession(self.responses, self.calls)
+
+
+class TestGraphBackend:
+    """Test CSRGraph and Neo4jGraphAlgorithms functionality"""
+
+    @pytest.fixture
+    def random_graph(self):
+        """Entities and relationships from a random graph with leaves and a path"""
+        graph = nx.gnm_random_graph(120, 400, seed=4)
+        for i in range(120, 130):
+            graph.add_edge(i, 0)
+        nx.add_path(graph, range(200, 206))
+
+        types = ["Team", "Customer", "Project"]
+        strengths = [RelationshipStrength.STRONG, RelationshipStrength.MODERATE, RelationshipStrength.WEAK]
+        entities = {i: Entity(id=f"node_{i:03d}", type=types[i % 3]) for i in graph}
+        relationships = [
+            Relationship(
+                source=entities[u],
+                target=entities[v],
+                relationship_type=RelationshipType.WORKS_WITH,
+                confidence=0.5 + (k % 5) * 0.1,
+                strength=strengths[k % 3]
+            )
+            for k, (u, v) in enumerate(graph.edges())
+        ]
+        return graph, list(entities.values()), relationships
+
+    def test_csr_structure(self, random_graph):
+        """Test degrees, triangles and components against NetworkX"""
+        graph, entities, relationships = random_graph
+        csr = CSRGraph.from_relationships(entities, relationships)
+        position = {i: csr.position[f"node_{i:03d}"] for i in graph}
+
+        assert csr.number_of_edges == graph.number_of_edges()
+        assert all(csr.degrees[position[i]] == graph.degree(i) for i in graph)
+
+        expected = {
+            frozenset(position[i] for i in clique)
+            for clique in nx.enumerate_all_cliques(graph) if len(clique) == 3
+        }
+        found = csr.triangles(max_block=64)
+        assert len(found) == len(expected)
+        assert {frozenset(row) for row in found.tolist()} == expected
+
+        labels = csr.connected_components()
+        assert len(set(labels.tolist())) == nx.number_connected_components(graph)
+
+    def test_label_propagation(self):
+        """Test that two cliques joined by one edge form two communities"""
+        entities = [Entity(id=f"n{i}", type="Team") for i in range(10)]
+        graph = nx.barbell_graph(5, 0)
+        relationships = [
+            Relationship(source=entities[u], target=entities[v], relationship_type=RelationshipType.WORKS_WITH)
+            for u, v in graph.edges()
+        ]
+        labels = CSRGraph.from_relationships(entities, relationships).label_propagation()
+
+        assert len(set(labels[:5].tolist())) == 1
+        assert len(set(labels[5:].tolist())) == 1
+        assert labels[0] != labels[9]
+
+    @pytest.mark.asyncio
+    async def test_csr_backend_matches_networkx(self, random_graph):
+        """Test that both backends find the same hubs, triangles, chains and stars"""
+        _, entities, relationships = random_graph
+        results = {}
+        for backend in ("networkx", "csr"):
+            recognizer = GraphPatternRecognizer()
+            recognizer.config["performance"]["backend"] = backend
+            recognizer.config["patterns"]["community_detection"]["enable"] = False
+            patterns = await recognizer.recognize_patterns(entities, relationships)
+            results[backend] = {
+                (p.pattern_type, frozenset(e.id for e in p.entities)): p.metadata["importance_score"]
+                for p in patterns
+            }
+
+        assert results["csr"].keys() == results["networkx"].keys()
+        for key, score in results["networkx"].items():
+            assert results["csr"][key] == pytest.approx(score)
+
+    def test_neo4j_results_mapped_to_graph(self, random_graph):
+        """Test that Neo4j records map onto CSR positions and unknown ids are dropped"""
+        _, entities, relationships = random_graph
+        csr = CSRGraph.from_relationships(entities, relationships)
+        u, v = csr.rows[0], csr.indices[0]
+        w = next(j for j in csr.indices[csr.indptr[v]:csr.indptr[v + 1]] if j != u)
+        driver = FakeDriver({
+            "RETURN DISTINCT a[$id_property] AS a": [
+                {"a": csr.node_ids[u], "b": csr.node_ids[v], "c": csr.node_ids[w]},
+                {"a": "unknown", "b": csr.node_ids[v], "c": csr.node_ids[w]}
+            ],
+            "gds.labelPropagation": [
+                {"id": csr.node_ids[0], "label": 7},
+                {"id": csr.node_ids[1], "label": 7},
+                {"id": "unknown", "label": 7}
+            ]
+        })
+        algorithms = Neo4jGraphAlgorithms(driver, csr)
+
+        triangles = algorithms.triangles()
+        closes = csr.edge_weights(np.array([u]), np.array([w]))[1][0]
+        assert len(triangles) == (1 if closes else 0)
+
+        labels = algorithms.label_propagation()
+        assert labels[0] == labels[1]
+        assert len(set(labels.tolist())) == csr.number_of_nodes - 1
+
+    def test_neo4j_queries_limited_to_graph_nodes(self, random_graph):
+        """Test that the projection and triangle query only visit the analysed entities"""
+        _, entities, relationships = random_graph
+        csr = CSRGraph.from_relationships(entities, relationships)
+        driver = FakeDriver({"gds.wcc": []})
+        algorithms = Neo4jGraphAlgorithms(driver, csr)
+
+        algorithms.connected_components()
+        algorithms.triangles()
+
+        project = next((q, p) for q, p in driver.calls if "gds.graph.project" in q)
+        triangles = next((q, p) for q, p in driver.calls if "AS a, b" in q)
+        for query, params in (project, triangles):
+            assert "(source:`__Entity__`)" in query or "(a:`__Entity__`)" in query
+            assert params["ids"] == csr.node_ids
+        assert "'*'" not in project[0].split("undirectedRelationshipTypes")[0]
+
+    def test_neo4j_projection_name_unique_per_instance(self, random_graph):
+        """Test that concurrent backends project and drop their own GDS graphs"""
+        _, entities, relationships = random_graph
+        csr = CSRGraph.from_relationships(entities, relationships)
+        driver = FakeDriver({"gds.wcc": []})
+        first = Neo4jGraphAlgorithms(driver, csr)
+        second = Neo4jGraphAlgorithms(driver, csr)
+        assert first.graph_name != second.graph_name
+        assert first.graph_name.startswith("pattern_recognition_")
+
+        first.connected_components()
+        second.connected_components()
+        first.close()
+
+        names = [p["graph_name"] for q, p in driver.calls if "graph_name" in p]
+        assert second.graph_name in names
+        dropped = [p["graph_name"] for q, p in driver.calls if "gds.graph.drop" in q]
+        assert dropped == [first.graph_name]
+
+    def test_neo4j_failure_falls_back_to_csr(self, random_graph):
+        """Test that failing queries fall back to the in-memory algorithms"""
+        _, entities, relationships = random_graph
+        csr = CSRGraph.from_relationships(entities, relationships)
+        driver = FakeDriver({"": RuntimeError("GDS not installed")})
+        algorithms = Neo4jGraphAlgorithms(driver, csr)
+
+        assert np.array_equal(algorithms.connected_components(), csr.connected_components())
+        assert len(algorithms.triangles()) == len(csr.triangles())
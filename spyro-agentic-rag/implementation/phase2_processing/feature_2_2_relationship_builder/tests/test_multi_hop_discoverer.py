@@ -310,6 +310,22 @@ class TestMultiHopDiscoverer:
         discoverer.clear_cache()
         assert len(discoverer._path_cache) == 0
     
+    @pytest.mark.asyncio
+    async def test_partial_search_not_cached(self, discoverer, sample_entities, sample_relationships, monkeypatch):
+        """Test that searches cut short by the time budget are not cached"""
+        import src.path_engine as path_engine
+        search = path_engine.search_from_source
+        monkeypatch.setattr(
+            path_engine, "search_from_source",
+            lambda *args: (search(*args)[0], False)
+        )
+        discoverer.config["performance"]["cache_paths"] = True
+        
+        await discoverer.discover_multi_hop(sample_entities, sample_relationships)
+        
+        assert len(discoverer._searched_sources) == 0
+        assert len(discoverer._path_cache) == 0
+    
     @pytest.mark.asyncio
     async def test_get_path_between(self, discoverer, sample_entities, sample_relationships):
         """Test getting specific path between entities"""
@@ -0,0 +1,112 @@
+"""Tests for PathSearchEngine"""
+
+import pytest
+import networkx as nx
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Entity
+from src.path_engine import CompactGraph, PathSearchEngine, PathSearchSettings, search_from_source
+
+
+class TestPathSearchEngine:
+    """Test PathSearchEngine functionality"""
+
+    @pytest.fixture
+    def graph(self):
+        """Customer -> Project -> Team with a weaker detour through a Product"""
+        graph = nx.DiGraph()
+        for node_id, node_type in [
+            ("cust", "Customer"), ("proj", "Project"), ("prod", "Product"),
+            ("team", "Team"), ("team_2", "Team"), ("cust_2", "Customer")
+        ]:
+            graph.add_node(node_id, entity=Entity(id=node_id, type=node_type), type=node_type)
+
+        graph.add_edge("cust", "proj", weight=0.9)
+        graph.add_edge("proj", "team", weight=0.9)
+        graph.add_edge("cust", "prod", weight=0.4)
+        graph.add_edge("prod", "proj", weight=0.4)
+        graph.add_edge("team", "team_2", weight=0.8)
+        graph.add_edge("proj", "cust_2", weight=0.8)
+        return CompactGraph.from_networkx(graph)
+
+    @pytest.fixture
+    def settings(self):
+        """Create search settings matching the discoverer defaults"""
+        return PathSearchSettings(
+            max_hops=3,
+            edge_weight_factor=0.7,
+            path_length_penalty=0.1,
+            max_paths_per_target=1
+        )
+
+    def _ids(self, graph, hits):
+        return [(graph.node_ids[target], [graph.node_ids[i] for i in path]) for target, _, path in hits]
+
+    def test_best_paths_to_all_targets(self, graph, settings):
+        """Test that one search returns the best path to every interesting target"""
+        source = graph.node_ids.index("cust")
+        hits, completed = search_from_source(graph, source, settings)
+        hits = self._ids(graph, hits)
+
+        assert completed
+        assert hits == [
+            ("team", ["cust", "proj", "team"]),
+            ("team_2", ["cust", "proj", "team", "team_2"])
+        ]
+
+    def test_target_limit(self, graph, settings):
+        """Test that only the highest scoring targets are kept"""
+        settings.max_targets_per_source = 1
+        source = graph.node_ids.index("cust")
+        hits, _ = search_from_source(graph, source, settings)
+
+        assert [graph.node_ids[target] for target, _, _ in hits] == ["team"]
+
+    def test_max_hops(self, graph, settings):
+        """Test that paths never exceed max_hops edges"""
+        settings.max_hops = 2
+        settings.max_paths_per_target = 5
+        source = graph.node_ids.index("cust")
+        hits, _ = search_from_source(graph, source, settings)
+
+        assert hits
+        assert all(len(path) <= 3 for _, _, path in hits)
+
+    @pytest.mark.asyncio
+    async def test_time_budget(self, graph, settings):
+        """Test that an exhausted time budget returns partial results"""
+        engine = PathSearchEngine(graph, settings, workers=1)
+        results = await engine.search(list(range(len(graph.node_ids))), time_budget_seconds=1e-9)
+
+        assert engine.timed_out
+        assert len(results) < len(graph.node_ids)
+
+    def test_deadline_marks_search_incomplete(self, settings):
+        """Test that a search stopped by the deadline reports itself incomplete"""
+        graph = nx.complete_graph(12, create_using=nx.DiGraph)
+        for node_id in graph.nodes:
+            graph.nodes[node_id].update(entity=Entity(id=str(node_id), type="Team"), type="Team")
+        compact = CompactGraph.from_networkx(graph)
+        settings.max_hops = 4
+
+        _, completed = search_from_source(compact, 0, settings)
+        assert completed
+
+        _, completed = search_from_source(compact, 0, settings, deadline=time.time() - 1)
+        assert not completed
+
+    @pytest.mark.asyncio
+    async def test_partial_sources(self, graph, settings, monkeypatch):
+        """Test that sources cut short by the deadline are reported"""
+        import src.path_engine as path_engine
+        monkeypatch.setattr(path_engine, "search_from_source", lambda *args: ([], False))
+        engine = PathSearchEngine(graph, settings, workers=1)
+        results = await engine.search([0, 1], time_budget_seconds=60)
+
+        assert results == {0: [], 1: []}
+        assert engine.partial_sources == {0, 1}
+        assert engine.timed_out
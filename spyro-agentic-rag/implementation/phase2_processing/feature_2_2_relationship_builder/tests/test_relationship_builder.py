@@ -261,6 +261,53 @@ class TestRelationshipBuilder:
             target_date = rel.target.attributes.get("created_date")
             assert source_date < target_date
     
+    @pytest.mark.asyncio
+    async def test_temporal_precedence_window(self, builder):
+        """Test that precedence follows date order within the successor window"""
+        temporal_config = builder.config["relationship_discovery"]["temporal"]
+        temporal_config["max_successors"] = 2
+        temporal_config["precedence_window_days"] = 45
+        
+        # Listed out of date order; two entities share a date
+        dates = ["2024-03-01", "2024-01-01", "2024-01-10T00:00:00Z", "2024-01-10", "2024-01-20", "2024-06-01"]
+        entities = [
+            Entity(id=f"event_{i}", type="Event", attributes={"created_date": date})
+            for i, date in enumerate(dates)
+        ]
+        
+        relationships = await builder._build_temporal_relationships(
+            entities,
+            RelationshipDiscoveryContext()
+        )
+        pairs = {(r.source.id, r.target.id) for r in relationships}
+        
+        assert pairs == {
+            ("event_1", "event_2"),
+            ("event_1", "event_3"),
+            ("event_2", "event_4"),
+            ("event_3", "event_4"),
+            ("event_4", "event_0")
+        }
+    
+    @pytest.mark.asyncio
+    async def test_team_peer_limit(self, builder):
+        """Test that large teams are paired within the peer window"""
+        builder.config["relationship_discovery"]["semantic"]["max_team_peers"] = 3
+        entities = [
+            Entity(id=f"person_{i}", type="Person", attributes={"team": "Support" if i % 2 else "Sales"})
+            for i in range(20)
+        ] + [Entity(id="cust_001", type="Customer", attributes={"team": "Sales"})]
+        
+        relationships = await builder._build_semantic_relationships(
+            entities,
+            RelationshipDiscoveryContext()
+        )
+        
+        # 10 members per team: 7 with 3 later peers, then 2, 1 and 0
+        assert len(relationships) == 2 * (7 * 3 + 2 + 1)
+        assert all(r.source.attributes["team"] == r.target.attributes["team"] for r in relationships)
+        assert all("cust_001" not in {r.source.id, r.target.id} for r in relationships)
+    
     @pytest.mark.asyncio
     async def test_semantic_relationships(self, builder):
         """Test semantic relationship building"""
@@ -4,6 +4,7 @@ import pytest
 import asyncio
 import sys
 import os
+import spacy
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -16,6 +17,13 @@ from src.models import (
 )
 from src.semantic_miner import SemanticRelationshipMiner
 
+# Without a trained pipeline the miner falls back to spacy.blank("en"), which
+# has no dependency parse or noun chunks
+requires_model = pytest.mark.skipif(
+    not spacy.util.is_package("en_core_web_sm"),
+    reason="spaCy model en_core_web_sm is not installed"
+)
+
 
 class TestSemanticMiner:
     """Test SemanticRelationshipMiner functionality"""
@@ -36,6 +44,7 @@ class TestSemanticMiner:
             Entity(id="cust_001", type="Customer", attributes={"name": "TechCorp"})
         ]
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_mine_from_text_basic(self, miner, sample_entities):
         """Test basic relationship extraction from text"""
@@ -54,6 +63,7 @@ class TestSemanticMiner:
         assert len(alice_bob_rels) > 0
         assert alice_bob_rels[0].relationship_type == RelationshipType.WORKS_WITH
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_entity_mention_detection(self, miner, sample_entities):
         """Test entity mention detection in text"""
@@ -97,6 +107,7 @@ class TestSemanticMiner:
         assert rel.relationship_type == RelationshipType.MANAGES
         assert rel.direction == RelationshipDirection.UNIDIRECTIONAL
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_bidirectional_relationships(self, miner, sample_entities):
         """Test bidirectional relationship extraction"""
@@ -113,6 +124,7 @@ class TestSemanticMiner:
         # Bidirectional relationships should be marked as such
         assert any(r.direction == RelationshipDirection.BIDIRECTIONAL for r in collab_rels)
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_responsibility_relationships(self, miner, sample_entities):
         """Test responsibility relationship extraction"""
@@ -130,6 +142,7 @@ class TestSemanticMiner:
         assert rel.source.attributes["name"] == "Alice Johnson"
         assert rel.target.attributes["name"] == "Migration Project"
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_impact_relationships(self, miner, sample_entities):
         """Test impact relationship extraction"""
@@ -185,6 +198,7 @@ class TestSemanticMiner:
         if relationships:
             assert all(r.confidence < 0.9 for r in relationships)
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_document_metadata_inclusion(self, miner, sample_entities):
         """Test inclusion of document metadata in relationships"""
@@ -206,6 +220,7 @@ class TestSemanticMiner:
             assert "document" in rel.metadata
             assert rel.metadata["document"]["source"] == "org_chart.txt"
     
+    @requires_model
     @pytest.mark.asyncio
     async def test_extract_from_documents(self, miner, sample_entities):
         """Test extraction from multiple documents"""
@@ -284,4 +299,34 @@ class TestSemanticMiner:
         
         # Both empty
         result3 = await miner.mine_from_text("", [])
-        assert result3 == []
\ No newline at end of file
+        assert result3 == []
+    
+    @pytest.mark.asyncio
+    async def test_mine_from_corpus(self, miner, sample_entities):
+        """Test corpus mode over several documents"""
+        documents = [
+            {"text": "Alice Johnson manages Engineering.", "source": "doc1"},
+            {"text": "Bob Smith works with Alice Johnson on the API project.", "source": "doc2"},
+            {"text": "", "source": "doc3"}
+        ]
+        
+        relationships = await miner.mine_from_corpus(documents, sample_entities)
+        
+        sources = {rel.metadata["document"]["source"] for rel in relationships}
+        assert sources == {"doc1", "doc2"}
+        
+        pairs = {frozenset([rel.source.id, rel.target.id]) for rel in relationships}
+        assert frozenset(["person_001", "team_001"]) in pairs
+        assert frozenset(["person_001", "person_002"]) in pairs
+    
+    @pytest.mark.asyncio
+    async def test_lexicon_reused_for_same_entities(self, miner, sample_entities):
+        """Test that the entity lexicon is only rebuilt when entities change"""
+        await miner._find_entity_mentions("Alice Johnson", sample_entities)
+        lexicon = miner._lexicon
+        
+        await miner._find_entity_mentions("Bob Smith", list(sample_entities))
+        assert miner._lexicon is lexicon
+        
+        await miner._find_entity_mentions("Bob Smith", sample_entities[:1])
+        assert miner._lexicon is not lexicon
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Recompute the materialized metric summaries
+
+Run after loading or fixing data so dashboard questions see the new numbers
+without waiting for the API's scheduled refresh:
+
+    python scripts/materialize_metrics.py                  # all metrics
+    python scripts/materialize_metrics.py roadmap_status   # selected metrics
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.config import Config
+from src.utils.logging import setup_logging
+from src.utils.metrics_materializer import METRICS, MetricsMaterializer
+from src.utils.neo4j_driver import acquire_driver, release_driver
+
+logger = setup_logging(__name__)
+
+
+def main():
+    names = sys.argv[1:] or None
+    known = {metric.name for metric in METRICS}
+    unknown = [name for name in names or [] if name not in known]
+    if unknown:
+        print(f"Unknown metrics: {', '.join(unknown)} (available: {', '.join(sorted(known))})")
+        sys.exit(1)
+    
+    config = Config()
+    driver = acquire_driver(config)
+    try:
+        materializer = MetricsMaterializer(driver, database=config.neo4j_database)
+        results = materializer.refresh(names)
+    finally:
+        release_driver(driver)
+    
+    for name, result in results.items():
+        print(f"{name}: {result if isinstance(result, str) else f'{result:.0f}ms'}")
+    if any(isinstance(result, str) for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Run a business question set concurrently and compare it with a baseline
+
+The in-process v3 agent keeps one conversation memory, so --target agent
+answers one question at a time whatever --concurrency says; concurrent runs
+need --target api.
+
+Examples:
+    # All 60 questions against the in-process v3 agent (sequential)
+    python scripts/run_evaluation.py --target agent
+
+    # Against a running API, 4 in flight, at most 30 requests per minute
+    python scripts/run_evaluation.py --target api --api-url http://localhost:8000 --concurrency 4 --rpm 30
+
+    # Record this run as the baseline for later releases
+    python scripts/run_evaluation.py --target api --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.evaluation import (
+    BUSINESS_QUESTIONS, AgentTarget, ApiTarget, EvaluationRunner, RateLimiter,
+    ResponseCache, as_question_set, compare_to_baseline, default_version, load_questions
+)
+from src.utils.config import Config
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Batch evaluation of business questions")
+    parser.add_argument(
+        "--target", choices=["agent", "api"], default="agent",
+        help="agent runs the in-process v3 agent one question at a time; api runs concurrently"
+    )
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--questions", help="JSON question set (defaults to the 60 business questions)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum questions in flight (api target only)")
+    parser.add_argument("--rpm", type=float, default=None, help="Maximum requests started per minute")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-question timeout in seconds")
+    parser.add_argument("--version", help="Agent version key (defaults to <target>@<git commit>, plus a diff hash if dirty)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write cached responses")
+    parser.add_argument("--cache-dir", default=".cache/eval_responses")
+    parser.add_argument("--output-dir", default="evaluation_results")
+    parser.add_argument("--baseline", default="evaluation_results/baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    return parser.parse_args()
+
+
+async def evaluate(args: argparse.Namespace) -> int:
+    questions = load_questions(args.questions) if args.questions else as_question_set(BUSINESS_QUESTIONS)
+    version = args.version or default_version(args.target)
+    config = Config.from_env()
+    
+    agent = None
+    concurrency = args.concurrency
+    if args.target == "api":
+        target = ApiTarget(args.api_url, config.api_key, timeout=args.timeout)
+    else:
+        from src.agents.spyro_agent_enhanced_v3 import create_agent
+        agent = create_agent(config)
+        target = AgentTarget(agent)
+        if not target.concurrent and concurrency > 1:
+            # Queued questions would otherwise spend their timeout waiting for the agent
+            print(f"{type(agent).__name__} shares one conversation memory; running questions one at a time")
+            concurrency = 1
+    
+    runner = EvaluationRunner(
+        target,
+        version=version,
+        rate_limiter=RateLimiter(concurrency, args.rpm),
+        cache=None if args.no_cache else ResponseCache(args.cache_dir),
+        timeout=args.timeout
+    )
+    try:
+        report = await runner.run(questions)
+    finally:
+        if agent:
+            agent.close()
+        if isinstance(target, ApiTarget):
+            await target.aclose()
+    
+    output_path = os.path.join(args.output_dir, f"{version.replace('/', '_')}.json")
+    report.save(output_path)
+    summary = report.summary()
+    print(f"\n{version}: {summary['passed']}/{summary['total']} passed ({summary['pass_rate']}%), "
+          f"{summary['errors']} errors, {summary['cached']} cached, wall time {report.wall_time_seconds:.0f}s")
+    print(f"Latency (s): {summary['latency_seconds']}")
+    print(f"Tokens: {summary['tokens']['total']} total, cost ${summary['cost_usd']}")
+    print(f"Report: {output_path}")
+    
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            diff = compare_to_baseline(report.to_dict(), json.load(f))
+        print(f"\nCompared with baseline {diff['baseline_version']}:")
+        print(f"  pass rate {diff['pass_rate_delta']:+.1f} pts, latency delta (s) {diff['latency_delta_seconds']}, "
+              f"tokens {diff['tokens_delta']:+d}")
+        for item in diff["newly_failing"]:
+            print(f"  NEW FAIL  Q{item['id']}: {item['question']}")
+        for item in diff["newly_passing"]:
+            print(f"  NEW PASS  Q{item['id']}: {item['question']}")
+        for item in diff["latency_regressions"]:
+            print(f"  SLOWER    Q{item['id']}: {item['baseline_seconds']:.1f}s -> {item['current_seconds']:.1f}s")
+        if diff["newly_failing"]:
+            exit_code = 1
+    
+    if args.save_baseline:
+        report.save(args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+    return exit_code
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for noisy in ("httpx", "neo4j", "openai"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+    sys.exit(asyncio.run(evaluate(parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,57 @@ Comprehensive Cypher query handler for SpyroSolutions business questions
 """
 
 import re
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import json
 
+from ..utils.keyword_automaton import KeywordAutomaton
+
+
+@dataclass
+class QueryTemplate:
+    """A hand-written Cypher query and the keywords that select it"""
+    name: str
+    # Every group must be present in the question; any keyword of a group will do
+    keywords: Tuple[Tuple[str, ...], ...]
+    query: str
+    formatter: Callable[[List[Dict[str, Any]], Dict[str, Any]], str]
+    # Sample phrasings, used for embedding similarity routing
+    examples: List[str] = field(default_factory=list)
+    params: Optional[Callable[[str], Dict[str, Any]]] = None
+
+    def matches(self, found: Set[str]) -> bool:
+        """Whether the keywords found in a question satisfy this template"""
+        return all(any(keyword in found for keyword in group) for group in self.keywords)
+
+    def extract_params(self, question: str) -> Dict[str, Any]:
+        """Query parameters for a question (empty for static queries)"""
+        return self.params(question) if self.params else {}
+
+
+def _score_threshold_params(question: str) -> Dict[str, Any]:
+    match = re.search(r'below (\d+)', question.lower())
+    return {"threshold": int(match.group(1)) if match else 70}
+
+
+DEFAULT_QUERY = """
+                MATCH (n)
+                WHERE any(label in labels(n) WHERE label IN ['Customer', 'Product', 'Team', 'Risk', 'CUSTOMER', 'PRODUCT', 'TEAM', 'RISK'])
+                RETURN labels(n) as entity_type, n.name as name, properties(n) as properties
+                LIMIT 10
+                """
+
+
 class CypherQueryHandler:
     """Handles direct Cypher queries for specific business questions"""
     
+    def __init__(self):
+        # Templates are checked in order; the first match wins
+        self.templates = self._build_templates()
+        self.automaton = KeywordAutomaton(
+            keyword for template in self.templates for group in template.keywords for keyword in group
+        )
+    
     @staticmethod
     def serialize_value(value):
         """Convert Neo4j values to JSON-serializable format"""
@@ -38,19 +82,14 @@ class CypherQueryHandler:
             return float(value_str.replace('K', '')) * 1000
         return float(value_str) if value_str else 0
     
-    def get_query_for_question(self, question: str) -> Dict[str, Any]:
-        """Return appropriate Cypher query and formatter based on question"""
-        question_lower = question.lower()
-        
-        # Customer success score queries
-        if "percentage" in question_lower and "arr" in question_lower and "success scores below" in question_lower:
-            threshold = 70
-            match = re.search(r'below (\d+)', question_lower)
-            if match:
-                threshold = int(match.group(1))
-            
-            return {
-                "query": f"""
+    def _build_templates(self) -> List[QueryTemplate]:
+        """Question templates, in priority order"""
+        return [
+            # Customer success score queries
+            QueryTemplate(
+                name="arr_percentage_by_success_score",
+                keywords=(("percentage",), ("arr",), ("success scores below",)),
+                query="""
                 // Get customers with their scores and subscription values
                 MATCH (c) WHERE ('Customer' IN labels(c) OR ('__Entity__' IN labels(c) AND 'CUSTOMER' IN labels(c)))
                 OPTIONAL MATCH (c)-[:HAS_SUCCESS_SCORE]->(s)
@@ -65,7 +104,7 @@ class CypherQueryHandler:
                          ELSE 0
                      END as revenue
                 WITH sum(revenue) as total_arr,
-                     sum(CASE WHEN score < {threshold} THEN revenue ELSE 0 END) as low_score_arr
+                     sum(CASE WHEN score < $threshold THEN revenue ELSE 0 END) as low_score_arr
                 RETURN CASE 
                     WHEN total_arr > 0 THEN round((low_score_arr / total_arr) * 100, 1)
                     ELSE 0
@@ -73,13 +112,19 @@ class CypherQueryHandler:
                 low_score_arr as arr_at_risk,
                 total_arr as total_arr
                 """,
-                "formatter": lambda records: f"{records[0]['percentage']}% of our ARR (${records[0]['arr_at_risk']/1000000:.1f}M out of ${records[0]['total_arr']/1000000:.1f}M) is dependent on customers with success scores below {threshold}."
-            }
-        
-        # Top 5 customers by revenue
-        elif "top 5 customers by revenue" in question_lower:
-            return {
-                "query": """
+                params=_score_threshold_params,
+                formatter=lambda records, params: f"{records[0]['percentage']}% of our ARR (${records[0]['arr_at_risk']/1000000:.1f}M out of ${records[0]['total_arr']/1000000:.1f}M) is dependent on customers with success scores below {params['threshold']}.",
+                examples=[
+                    "What percentage of our ARR is dependent on customers with success scores below 70?",
+                    "How much of our annual recurring revenue comes from customers with low success scores?"
+                ]
+            ),
+            
+            # Top 5 customers by revenue
+            QueryTemplate(
+                name="top_5_customers_by_revenue",
+                keywords=(("top 5 customers by revenue",),),
+                query="""
                 MATCH (c) WHERE ('Customer' IN labels(c) OR ('__Entity__' IN labels(c) AND 'CUSTOMER' IN labels(c)))
                 OPTIONAL MATCH (c)-[:SUBSCRIBES_TO]->(sub)
                 OPTIONAL MATCH (c)-[:HAS_SUCCESS_SCORE]->(s)
@@ -93,16 +138,21 @@ class CypherQueryHandler:
                 LIMIT 5
                 RETURN c.name as customer, sub.value as revenue, success_score
                 """,
-                "formatter": lambda records: "Top 5 customers by revenue:\n" + "\n".join([
+                formatter=lambda records, params: "Top 5 customers by revenue:\n" + "\n".join([
                     f"{i+1}. {r['customer']}: {r['revenue']} (Success Score: {r['success_score']})"
                     for i, r in enumerate(records)
-                ])
-            }
-        
-        # Revenue at risk for specific customer (TechCorp)
-        elif "revenue at risk" in question_lower and "techcorp" in question_lower:
-            return {
-                "query": """
+                ]),
+                examples=[
+                    "Who are our top 5 customers by revenue?",
+                    "Which five customers bring in the most revenue?"
+                ]
+            ),
+            
+            # Revenue at risk for specific customer (TechCorp)
+            QueryTemplate(
+                name="techcorp_revenue_at_risk",
+                keywords=(("revenue at risk",), ("techcorp",)),
+                query="""
                 MATCH (c) WHERE ('Customer' IN labels(c) OR ('__Entity__' IN labels(c) AND 'CUSTOMER' IN labels(c)))
                 AND (toLower(c.name) = 'techcorp' OR toLower(c.name) CONTAINS 'techcorp')
                 OPTIONAL MATCH (c)-[:SUBSCRIBES_TO]->(sub)
@@ -115,13 +165,18 @@ class CypherQueryHandler:
                        coalesce(sla.penalty_percentage, 10) as sla_penalty,
                        coalesce(score.score, score.value, 85) as success_score
                 """,
-                "formatter": lambda records: self._format_techcorp_risk(records)
-            }
-        
-        # Customers generating 80% of revenue
-        elif "80%" in question_lower and "revenue" in question_lower:
-            return {
-                "query": """
+                formatter=lambda records, params: self._format_techcorp_risk(records),
+                examples=[
+                    "How much revenue is at risk if TechCorp misses their SLA?",
+                    "What is the revenue at risk for TechCorp?"
+                ]
+            ),
+            
+            # Customers generating 80% of revenue
+            QueryTemplate(
+                name="customers_80_percent_revenue",
+                keywords=(("80%",), ("revenue",)),
+                query="""
                 MATCH (c) WHERE ('Customer' IN labels(c) OR ('__Entity__' IN labels(c) AND 'CUSTOMER' IN labels(c)))
                 OPTIONAL MATCH (c)-[:SUBSCRIBES_TO]->(sub)
                 WITH c, sub,
@@ -145,13 +200,18 @@ class CypherQueryHandler:
                 RETURN c.name as customer, cust.revenue as revenue, 
                        collect(DISTINCT {type: r.type, severity: r.severity, description: r.description}) as risks
                 """,
-                "formatter": lambda records: self._format_80_percent_revenue(records)
-            }
-        
-        # Customer concerns
-        elif "customer concerns" in question_lower:
-            return {
-                "query": """
+                formatter=lambda records, params: self._format_80_percent_revenue(records),
+                examples=[
+                    "What are the top risks for customers that generate 80% of our revenue?",
+                    "Which customers make up 80% of revenue and what risks do they have?"
+                ]
+            ),
+            
+            # Customer concerns
+            QueryTemplate(
+                name="customer_concerns",
+                keywords=(("customer concerns",),),
+                query="""
                 MATCH (concern) WHERE ('Concern' IN labels(concern) OR ('__Entity__' IN labels(concern) AND 'CONCERN' IN labels(concern)))
                 OPTIONAL MATCH (c)-[:HAS_CONCERN]->(concern)
                 WHERE ('Customer' IN labels(c) OR ('__Entity__' IN labels(c) AND 'CUSTOMER' IN labels(c)))
@@ -164,40 +224,55 @@ class CypherQueryHandler:
                        concern.status as status,
                        customers
                 """,
-                "formatter": lambda records: "Top customer concerns:\n" + "\n".join([
+                formatter=lambda records, params: "Top customer concerns:\n" + "\n".join([
                     f"{i+1}. {r['concern_type']}: {r['description']}\n   Priority: {r['priority']} | Status: {r['status']} | Customers: {', '.join(r['customers'][:3])}"
                     for i, r in enumerate(records)
-                ])
-            }
-        
-        # Customer commitments at risk
-        elif "commitments" in question_lower and ("risk" in question_lower or "high risk" in question_lower):
-            return {
-                "query": """MATCH (cm) WHERE ('Commitment' IN labels(cm) OR ('__Entity__' IN labels(cm) AND 'COMMITMENT' IN labels(cm))) AND (cm.risk_level = 'High' OR cm.status IN ['Not Met', 'At Risk', 'at_risk'])
+                ]),
+                examples=[
+                    "What are the top customer concerns?",
+                    "What issues are customers raising most often?"
+                ]
+            ),
+            
+            # Customer commitments at risk
+            QueryTemplate(
+                name="commitments_at_risk",
+                keywords=(("commitments",), ("risk",)),
+                query="""MATCH (cm) WHERE ('Commitment' IN labels(cm) OR ('__Entity__' IN labels(cm) AND 'COMMITMENT' IN labels(cm))) AND (cm.risk_level = 'High' OR cm.status IN ['Not Met', 'At Risk', 'at_risk'])
 RETURN coalesce(cm.type, cm.commitmentId, 'Commitment') as commitment_type, cm.description as description, coalesce(cm.target, 'TBD') as target, coalesce(cm.current_performance, cm.current, 'N/A') as current, cm.status as status, coalesce(cm.risk_level, 'High') as risk_level
 ORDER BY CASE coalesce(cm.risk_level, 'High') WHEN 'High' THEN 1 WHEN 'Medium' THEN 2 ELSE 3 END, cm.status""",
-                "formatter": lambda records: "Customer commitments at high risk:\n" + "\n".join([
+                formatter=lambda records, params: "Customer commitments at high risk:\n" + "\n".join([
                     f"\n{i+1}. {r['commitment_type']}: {r['description']}\n   Status: {r['status']} | Risk: {r['risk_level']}"
                     for i, r in enumerate(records) if r['description']
-                ])
-            }
-        
-        # Product satisfaction scores
-        elif "satisfaction" in question_lower and "product" in question_lower:
-            return {
-                "query": """MATCH (p) WHERE ('Product' IN labels(p) OR ('__Entity__' IN labels(p) AND 'PRODUCT' IN labels(p))) AND (p.satisfaction_score IS NOT NULL OR p.nps_score IS NOT NULL)
+                ]),
+                examples=[
+                    "Which customer commitments are at high risk?",
+                    "What commitments are we at risk of not meeting?"
+                ]
+            ),
+            
+            # Product satisfaction scores
+            QueryTemplate(
+                name="product_satisfaction",
+                keywords=(("satisfaction",), ("product",)),
+                query="""MATCH (p) WHERE ('Product' IN labels(p) OR ('__Entity__' IN labels(p) AND 'PRODUCT' IN labels(p))) AND (p.satisfaction_score IS NOT NULL OR p.nps_score IS NOT NULL)
 RETURN p.name as product, coalesce(p.satisfaction_score, 'N/A') as satisfaction_score, coalesce(p.nps_score, 'N/A') as nps_score
 ORDER BY p.satisfaction_score DESC""",
-                "formatter": lambda records: "Product satisfaction scores:\n" + "\n".join([
+                formatter=lambda records, params: "Product satisfaction scores:\n" + "\n".join([
                     f"- {r['product']}: Satisfaction Score: {r['satisfaction_score']}/5.0 | NPS: {r['nps_score']}"
                     for r in records
-                ])
-            }
-        
-        # Promised features and delivery status
-        elif "features" in question_lower and "promised" in question_lower:
-            return {
-                "query": """
+                ]),
+                examples=[
+                    "What are the satisfaction scores for each product?",
+                    "How satisfied are customers with our products?"
+                ]
+            ),
+            
+            # Promised features and delivery status
+            QueryTemplate(
+                name="promised_features",
+                keywords=(("features",), ("promised",)),
+                query="""
                 MATCH (f) 
                 WHERE ('Feature' IN labels(f) OR ('__Entity__' IN labels(f) AND 'FEATURE' IN labels(f)))
                 AND (f.promised = true OR exists(f.commitment_date))
@@ -210,30 +285,40 @@ ORDER BY p.satisfaction_score DESC""",
                        collect(DISTINCT c.name) as waiting_customers
                 ORDER BY f.expected_date
                 """,
-                "formatter": lambda records: "Promised features and delivery status:\n" + "\n".join([
+                formatter=lambda records, params: "Promised features and delivery status:\n" + "\n".join([
                     f"- {r['feature']}: {r['status']} (Expected: {r['expected_date'] or 'TBD'}) | Customers waiting: {', '.join(r['waiting_customers'][:3])}"
                     for r in records
-                ])
-            }
-        
-        # Teams with high costs relative to revenue
-        elif "teams" in question_lower and ("costs" in question_lower or "operational costs" in question_lower) and "revenue" in question_lower:
-            return {
-                "query": """MATCH (t) WHERE ('Team' IN labels(t) OR ('__Entity__' IN labels(t) AND 'TEAM' IN labels(t))) AND t.monthly_cost > 0 AND t.revenue_supported > 0
+                ]),
+                examples=[
+                    "Which features were promised to customers and what is their delivery status?",
+                    "When will the features we promised customers be delivered?"
+                ]
+            ),
+            
+            # Teams with high costs relative to revenue
+            QueryTemplate(
+                name="team_costs_vs_revenue",
+                keywords=(("teams",), ("costs",), ("revenue",)),
+                query="""MATCH (t) WHERE ('Team' IN labels(t) OR ('__Entity__' IN labels(t) AND 'TEAM' IN labels(t))) AND t.monthly_cost > 0 AND t.revenue_supported > 0
 WITH t.name as team, t.monthly_cost as team_cost, t.revenue_supported as supported_revenue, t.efficiency_ratio as efficiency_ratio
 ORDER BY efficiency_ratio ASC
 LIMIT 5
 RETURN team, team_cost, supported_revenue, round(team_cost / supported_revenue * 100, 2) as cost_to_revenue_ratio""",
-                "formatter": lambda records: "Teams with highest operational costs relative to revenue:\n" + "\n".join([
+                formatter=lambda records, params: "Teams with highest operational costs relative to revenue:\n" + "\n".join([
                     f"{i+1}. {r['team']}: ${r['team_cost']:,.0f} monthly cost / ${r['supported_revenue']/1000000:.1f}M revenue = {r['cost_to_revenue_ratio']}% ratio"
                     for i, r in enumerate(records)
-                ])
-            }
-        
-        # Product profitability margins
-        elif "profitability margin" in question_lower and "product" in question_lower:
-            return {
-                "query": """
+                ]),
+                examples=[
+                    "Which teams have the highest operational costs relative to the revenue they support?",
+                    "What is the cost to revenue ratio of our teams?"
+                ]
+            ),
+            
+            # Product profitability margins
+            QueryTemplate(
+                name="product_profitability_margin",
+                keywords=(("profitability margin",), ("product",)),
+                query="""
                 MATCH (p) WHERE ('Product' IN labels(p) OR ('__Entity__' IN labels(p) AND 'PRODUCT' IN labels(p)))
                 OPTIONAL MATCH (p)<-[:SUBSCRIBES_TO]-(sub)
                 OPTIONAL MATCH (p)-[:HAS_COST]->(c)
@@ -250,23 +335,42 @@ RETURN team, team_cost, supported_revenue, round(team_cost / supported_revenue *
                        round((revenue - costs) / revenue * 100, 1) as profit_margin
                 ORDER BY profit_margin DESC
                 """,
-                "formatter": lambda records: "Profitability margin by product:\n" + "\n".join([
+                formatter=lambda records, params: "Profitability margin by product:\n" + "\n".join([
                     f"- {r['product']}: {r['profit_margin']}% margin (${r['revenue']/1000000:.1f}M revenue - ${r['costs']/1000000:.1f}M costs)"
                     for r in records
-                ])
+                ]),
+                examples=[
+                    "What is the profitability margin for each product?",
+                    "Which products have the best profit margins?"
+                ]
+            ),
+        ]
+    
+    def match_templates(self, question: str) -> List[QueryTemplate]:
+        """Templates whose keywords all occur in the question, in priority order"""
+        found = self.automaton.find(question)
+        return [template for template in self.templates if template.matches(found)]
+    
+    def get_query_for_question(self, question: str) -> Dict[str, Any]:
+        """Return appropriate Cypher query, parameters and formatter based on question"""
+        matches = self.match_templates(question)
+        if matches:
+            template = matches[0]
+            params = template.extract_params(question)
+            return {
+                "name": template.name,
+                "query": template.query,
+                "params": params,
+                "formatter": lambda records: template.formatter(records, params)
             }
         
         # Default: return general entities
-        else:
-            return {
-                "query": """
-                MATCH (n)
-                WHERE any(label in labels(n) WHERE label IN ['Customer', 'Product', 'Team', 'Risk', 'CUSTOMER', 'PRODUCT', 'TEAM', 'RISK'])
-                RETURN labels(n) as entity_type, n.name as name, properties(n) as properties
-                LIMIT 10
-                """,
-                "formatter": lambda records: json.dumps([self.serialize_value(dict(r)) for r in records], indent=2)
-            }
+        return {
+            "name": "general_entities",
+            "query": DEFAULT_QUERY,
+            "params": {},
+            "formatter": lambda records: json.dumps([self.serialize_value(dict(r)) for r in records], indent=2)
+        }
     
     def _format_techcorp_risk(self, records):
         """Format TechCorp risk assessment"""
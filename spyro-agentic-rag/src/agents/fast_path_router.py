@@ -0,0 +1,207 @@
+"""
+Deterministic fast path for known business questions
+
+Questions that match one of the hand-written CypherQueryHandler templates are
+answered without the ReAct loop: the template's parameterized Cypher is run
+directly and its formatted result is turned into an answer by a single
+synthesis call. Anything the router is not confident about (no match, query
+error, empty result) returns None so the caller falls back to the full agent.
+
+Matching runs in two stages:
+
+1. A compiled keyword automaton finds templates whose required keywords all
+   occur in the question.
+2. When an embedder is available, the question is compared against each
+   template's sample phrasings. A keyword match must also clear a looser
+   similarity floor, which filters accidental substring hits; without a
+   keyword match, a very close paraphrase can still select a template.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from .cypher_query_handler import CypherQueryHandler, QueryTemplate
+from ..utils.example_selector import CypherExampleSelector
+from ..utils.neo4j_driver import read_session
+from ..utils.result_encoder import encode_records
+
+logger = logging.getLogger(__name__)
+
+SYNTHESIS_PROMPT = """You are a business analyst for SpyroSolutions.
+Answer the user's question using only the query result below. Quote the
+figures exactly as given, keep the answer concise, and do not speculate
+beyond the data."""
+
+
+@dataclass
+class FastPathMatch:
+    """A template selected for a question"""
+    template: QueryTemplate
+    method: str  # "keyword" or "embedding"
+    similarity: Optional[float] = None
+
+
+class FastPathRouter:
+    """Answers template questions with one Cypher query and one LLM call"""
+
+    def __init__(
+        self,
+        driver: Any,
+        chat_llm: Any,
+        database: str = "neo4j",
+        embedder: Any = None,
+        similarity_threshold: float = 0.92,
+        keyword_similarity_floor: float = 0.75,
+        cache_dir: Optional[str] = None,
+        max_rows: int = 50,
+        token_budget: int = 1500
+    ):
+        """
+        Initialize the router and index the template phrasings
+
+        Args:
+            driver: Neo4j driver
+            chat_llm: LangChain chat model used for the synthesis call
+            database: Neo4j database name
+            embedder: Object with embed_query(text); None routes by keywords only
+            similarity_threshold: Similarity needed to route without a keyword match
+            keyword_similarity_floor: Similarity a keyword match must still reach
+            cache_dir: Directory for the cached phrasing embeddings
+            max_rows: Row cap for the table fallback formatting
+            token_budget: Token budget for the table fallback formatting
+        """
+        self.driver = driver
+        self.chat_llm = chat_llm
+        self.database = database
+        self.similarity_threshold = similarity_threshold
+        self.keyword_similarity_floor = keyword_similarity_floor
+        self.max_rows = max_rows
+        self.token_budget = token_budget
+        self.handler = CypherQueryHandler()
+
+        # One row per sample phrasing, mapped back to its template
+        self._phrasings = [
+            {"question": question, "cypher": template.query, "template": index}
+            for index, template in enumerate(self.handler.templates)
+            for question in template.examples
+        ]
+        self.phrasing_index = None
+        if embedder is not None and self._phrasings:
+            try:
+                self.phrasing_index = CypherExampleSelector(
+                    self._phrasings, embedder, cache_dir=cache_dir
+                )
+            except Exception as e:
+                logger.warning(f"Fast path embedding index unavailable, routing by keywords only: {e}")
+
+    def _template_similarities(self, question: str) -> Optional[List[float]]:
+        """Best phrasing similarity per template, or None if embedding failed"""
+        try:
+            similarities = self.phrasing_index.similarities(question)
+        except Exception as e:
+            logger.warning(f"Fast path embedding failed, routing by keywords only: {e}")
+            return None
+
+        best = [float("-inf")] * len(self.handler.templates)
+        for phrasing, similarity in zip(self._phrasings, similarities):
+            index = phrasing["template"]
+            best[index] = max(best[index], float(similarity))
+        return best
+
+    def match(self, question: str) -> Optional[FastPathMatch]:
+        """
+        Select a template for a question
+
+        Args:
+            question: The user's question
+
+        Returns:
+            The selected template, or None if the full agent should answer
+        """
+        keyword_matches = self.handler.match_templates(question)
+        if self.phrasing_index is None:
+            return FastPathMatch(keyword_matches[0], "keyword") if keyword_matches else None
+
+        similarities = self._template_similarities(question)
+        if similarities is None:
+            return FastPathMatch(keyword_matches[0], "keyword") if keyword_matches else None
+
+        templates = self.handler.templates
+        for template in keyword_matches:
+            similarity = similarities[templates.index(template)]
+            if similarity >= self.keyword_similarity_floor:
+                return FastPathMatch(template, "keyword", round(similarity, 4))
+            logger.info(
+                f"Keyword match '{template.name}' rejected (similarity {similarity:.3f} "
+                f"< {self.keyword_similarity_floor})"
+            )
+
+        best = max(range(len(templates)), key=lambda i: similarities[i])
+        if similarities[best] >= self.similarity_threshold:
+            return FastPathMatch(templates[best], "embedding", round(similarities[best], 4))
+        return None
+
+    def _run_template(self, template: QueryTemplate, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with read_session(self.driver, self.database) as session:
+            return session.execute_read(lambda tx: tx.run(template.query, params).data())
+
+    def answer(self, question: str, callbacks: Optional[List[Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Answer a question on the fast path
+
+        Args:
+            question: The user's question
+            callbacks: LangChain callbacks for the synthesis call
+
+        Returns:
+            Dictionary with the answer and routing details, or None to fall back
+        """
+        match = self.match(question)
+        if match is None:
+            return None
+
+        template = match.template
+        params = template.extract_params(question)
+        start = time.monotonic()
+        try:
+            records = self._run_template(template, params)
+        except Exception as e:
+            logger.warning(f"Fast path query '{template.name}' failed, falling back to agent: {e}")
+            return None
+        query_ms = (time.monotonic() - start) * 1000
+
+        if not records:
+            logger.info(f"Fast path query '{template.name}' returned no rows, falling back to agent")
+            return None
+
+        try:
+            context = template.formatter(records, params)
+        except Exception as e:
+            logger.debug(f"Template formatter for '{template.name}' failed, using table encoding: {e}")
+            context = encode_records(records, max_rows=self.max_rows, token_budget=self.token_budget)
+
+        response = self.chat_llm.invoke(
+            [
+                SystemMessage(content=SYNTHESIS_PROMPT),
+                HumanMessage(content=f"Question: {question}\n\nQuery result:\n{context}")
+            ],
+            config={"callbacks": callbacks or []}
+        )
+
+        logger.info(
+            f"Fast path answered with template '{template.name}' ({match.method} match, "
+            f"{len(records)} rows, query {query_ms:.0f}ms)"
+        )
+        return {
+            "answer": response.content,
+            "template": template.name,
+            "match": match.method,
+            "similarity": match.similarity,
+            "params": params,
+            "rows": len(records),
+            "records": records
+        }
@@ -14,13 +14,13 @@ from langchain_openai import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
 from langchain_community.callbacks import get_openai_callback
 
-import neo4j
 from neo4j_graphrag.embeddings import OpenAIEmbeddings
 from neo4j_graphrag.retrievers import VectorRetriever, HybridRetriever, Text2CypherRetriever
 from neo4j_graphrag.generation import GraphRAG
 from neo4j_graphrag.llm import OpenAILLM
 
 from ..utils.config import Config
+from ..utils.neo4j_driver import acquire_driver, release_driver
 from ..utils.schemas import SPYRO_SCHEMA
 from ..utils.cypher_examples import CYPHER_EXAMPLES, CYPHER_INSTRUCTIONS
 
@@ -36,11 +36,8 @@ class SpyroAgent:
     def __init__(self, config: Config):
         self.config = config
         
-        # Initialize Neo4j driver
-        self.driver = neo4j.GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=(config.neo4j_username, config.neo4j_password)
-        )
+        # Shared, pre-warmed Neo4j driver
+        self.driver = acquire_driver(config)
         
         # Initialize embeddings and LLM
         self.embedder = OpenAIEmbeddings(
@@ -342,7 +339,7 @@ Remember: Product name in query = HybridSearch. Always."""
     
     def close(self):
         """Close database connection"""
-        self.driver.close()
+        release_driver(self.driver)
         logger.info("Database connection closed")
 
 
@@ -15,13 +15,13 @@ from langchain_openai import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
 from langchain_community.callbacks import get_openai_callback
 
-import neo4j
 from neo4j_graphrag.embeddings import OpenAIEmbeddings
 from neo4j_graphrag.retrievers import VectorRetriever, HybridRetriever, Text2CypherRetriever
 from neo4j_graphrag.generation import GraphRAG
 from neo4j_graphrag.llm import OpenAILLM
 
 from ..utils.config import Config
+from ..utils.neo4j_driver import acquire_driver, release_driver
 from ..utils.schema_compatibility import get_unified_schema, get_compatible_cypher
 from ..utils.cypher_examples_compatible import COMPATIBLE_CYPHER_EXAMPLES, COMPATIBLE_CYPHER_INSTRUCTIONS
 
@@ -88,11 +88,8 @@ class SpyroAgentEnhanced:
         self.config = config
         self.schema_tracker = SchemaTracker()
         
-        # Initialize Neo4j driver
-        self.driver = neo4j.GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=(config.neo4j_username, config.neo4j_password)
-        )
+        # Shared, pre-warmed Neo4j driver
+        self.driver = acquire_driver(config)
         
         # Initialize embeddings and LLM
         self.embedder = OpenAIEmbeddings(
@@ -475,7 +472,7 @@ Remember: Always try UnifiedSearch first - it knows about both schemas!"""
     
     def close(self):
         """Close database connection"""
-        self.driver.close()
+        release_driver(self.driver)
         logger.info("Database connection closed")
 
 
@@ -4,29 +4,42 @@ Implements true agentic RAG with autonomous tool selection and source visibility
 """
 
 import os
-from typing import List, Dict, Any, Optional, Set
+import uuid
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Callable
 from datetime import datetime
 import logging
-import json
 import re
 
 from langchain.agents import initialize_agent, Tool, AgentType
 from langchain_openai import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
-from langchain_community.callbacks import get_openai_callback
 
-import neo4j
 from neo4j_graphrag.embeddings import OpenAIEmbeddings
-from neo4j_graphrag.retrievers import VectorRetriever, HybridRetriever, Text2CypherRetriever
+from neo4j_graphrag.retrievers import VectorRetriever, HybridRetriever
 from neo4j_graphrag.generation import GraphRAG
 from neo4j_graphrag.llm import OpenAILLM
 
 from ..utils.config import Config
+from ..utils.neo4j_driver import acquire_driver, release_driver
 from ..utils.schema_compatibility import get_unified_schema, get_compatible_cypher
 from ..utils.cypher_examples_enhanced_v2 import ENHANCED_CYPHER_EXAMPLES, ENHANCED_CYPHER_INSTRUCTIONS
+from ..utils.example_selector import CypherExampleSelector
+from ..utils.cypher_plan_cache import (
+    CypherPlanCache, PlanCachingText2CypherRetriever, compute_schema_hash, record_result_formatter
+)
+from ..utils.result_encoder import encode_records
+from ..utils.usage import UsageCallbackHandler, instrument_openai_client, usage_collector
 
 logger = logging.getLogger(__name__)
 
+# Session used when callers do not pass a session_id
+DEFAULT_SESSION_ID = "default"
+
 
 class SchemaTracker:
     """Tracks which schemas were used in a query"""
@@ -78,21 +91,84 @@ class SchemaTracker:
         return counts
 
 
+class AgentSession:
+    """
+    Conversation state owned by a single session.
+    
+    Each session gets its own memory, schema tracker and LangChain executor so
+    concurrent callers never see each other's history or tracked sources. The
+    lock serializes turns within the session; different sessions run in parallel.
+    """
+    
+    def __init__(
+        self,
+        session_id: str,
+        schema_tracker: SchemaTracker,
+        memory: ConversationBufferMemory,
+        tools: List[Tool],
+        agent: Any
+    ):
+        self.session_id = session_id
+        self.schema_tracker = schema_tracker
+        self.memory = memory
+        self.tools = tools
+        self.agent = agent
+        self.lock = threading.Lock()
+        self.created_at = datetime.now()
+        self.last_used = self.created_at
+
+
+class SessionStore:
+    """Bounded LRU of agent sessions keyed by session_id"""
+    
+    def __init__(self, factory: Callable[[str], AgentSession], max_sessions: int = 256):
+        self._factory = factory
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, AgentSession]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str) -> AgentSession:
+        """Return the session, creating it (and evicting the oldest) if needed"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_used = datetime.now()
+                return session
+            
+            # Executors are cheap to build; retrievers and the LLM client are shared
+            session = self._factory(session_id)
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.info(f"Evicted idle session {evicted_id}")
+            return session
+    
+    def peek(self, session_id: str) -> Optional[AgentSession]:
+        """Return the session if it exists, without creating or touching it"""
+        with self._lock:
+            return self._sessions.get(session_id)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
 class SpyroAgentEnhanced:
     """
     Enhanced LangChain-based agent with schema source tracking.
     Shows users which data sources (Spyro RAG vs LlamaIndex) are being queried.
+    
+    The driver, retrievers and LLM clients are shared by every session, while
+    conversation memory and schema tracking live in per-session state held in
+    a bounded LRU. Use aquery() from async code so runs happen on a worker pool.
     """
     
     def __init__(self, config: Config):
         self.config = config
-        self.schema_tracker = SchemaTracker()
         
-        # Initialize Neo4j driver
-        self.driver = neo4j.GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=(config.neo4j_username, config.neo4j_password)
-        )
+        # Shared, pre-warmed Neo4j driver
+        self.driver = acquire_driver(config)
         
         # Initialize embeddings and LLM
         self.embedder = OpenAIEmbeddings(
@@ -104,16 +180,60 @@ class SpyroAgentEnhanced:
             model_params={"temperature": config.agent_temperature}
         )
         
+        # Record provider token usage for retriever LLM and embedding calls
+        instrument_openai_client(self.llm.client, "graphrag")
+        instrument_openai_client(self.embedder.client, "embedding")
+        self.usage_callback = UsageCallbackHandler(kind="agent")
+        
         # Initialize retrievers
         self._initialize_retrievers()
         
-        # Create LangChain tools
-        self._create_tools()
+        # Chat model shared by all session executors
+        self.chat_llm = ChatOpenAI(
+            temperature=self.config.agent_temperature,
+            model_name=self.config.agent_model,
+            openai_api_key=self.config.openai_api_key
+        )
         
-        # Initialize agent
-        self._initialize_agent()
+        # Per-session state and the worker pool that runs blocking agent calls
+        self.sessions = SessionStore(self._create_session, config.agent_max_sessions)
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.agent_max_workers,
+            thread_name_prefix="spyro-agent"
+        )
         
         logger.info("SpyroAgentEnhanced initialized successfully")
+    
+    @property
+    def tools(self) -> List[Tool]:
+        """Tools of the default session (names and descriptions are identical across sessions)"""
+        return self.sessions.get(DEFAULT_SESSION_ID).tools
+    
+    @property
+    def memory(self) -> ConversationBufferMemory:
+        """Memory of the default session"""
+        return self.sessions.get(DEFAULT_SESSION_ID).memory
+    
+    @property
+    def schema_tracker(self) -> SchemaTracker:
+        """Schema tracker of the default session"""
+        return self.sessions.get(DEFAULT_SESSION_ID).schema_tracker
+    
+    @property
+    def agent(self) -> Any:
+        """LangChain executor of the default session"""
+        return self.sessions.get(DEFAULT_SESSION_ID).agent
+    
+    def _create_session(self, session_id: str) -> AgentSession:
+        """Build isolated conversation state for a session"""
+        schema_tracker = SchemaTracker()
+        memory = ConversationBufferMemory(
+            memory_key="chat_history",
+            return_messages=True
+        )
+        tools = self._create_tools(schema_tracker)
+        agent = self._initialize_agent(tools, memory)
+        return AgentSession(session_id, schema_tracker, memory, tools, agent)
         
     def _initialize_retrievers(self):
         """Initialize all neo4j-graphrag retrievers with schema compatibility"""
@@ -158,14 +278,41 @@ User Query: {{query_text}}
 Generate ONLY the Cypher query without any explanation or markdown formatting.
 """
         
-        self.text2cypher_retriever = Text2CypherRetriever(
+        # Validated question -> Cypher plans, dropped when the graph schema changes
+        self.plan_cache = None
+        if self.config.cypher_plan_cache_enabled:
+            self.plan_cache = CypherPlanCache(
+                max_size=self.config.cypher_plan_cache_size,
+                embedder=self.embedder,
+                similarity_threshold=self.config.cypher_plan_cache_similarity,
+                schema_hash_fn=lambda: compute_schema_hash(self.driver),
+                path=self.config.cypher_plan_cache_path
+            )
+        
+        self.text2cypher_retriever = PlanCachingText2CypherRetriever(
             driver=self.driver,
             llm=self.llm,
             neo4j_schema=unified_schema,
             examples=example_strings,
-            custom_prompt=custom_prompt
+            custom_prompt=custom_prompt,
+            result_formatter=record_result_formatter,
+            plan_cache=self.plan_cache,
+            max_rows=self.config.graph_result_max_rows
         )
         
+        # Only the most relevant examples go into each prompt
+        try:
+            self.example_selector = CypherExampleSelector(
+                ENHANCED_CYPHER_EXAMPLES,
+                embedder=self.embedder,
+                top_k=self.config.cypher_examples_top_k,
+                mmr_lambda=self.config.cypher_examples_mmr_lambda,
+                cache_dir=self.config.cypher_examples_cache_dir
+            )
+        except Exception as e:
+            logger.warning(f"Example selector unavailable, using all examples: {e}")
+            self.example_selector = None
+        
         # Create GraphRAG instances
         self.vector_rag = GraphRAG(
             retriever=self.vector_retriever,
@@ -179,7 +326,17 @@ Generate ONLY the Cypher query without any explanation or markdown formatting.
         
         logger.info("Retrievers initialized with schema compatibility")
         
-    def _analyze_query_results(self, results: Any) -> None:
+    def _select_examples(self, query: str) -> Optional[Dict[str, str]]:
+        """Prompt params with the few-shot examples most similar to the query"""
+        if not self.example_selector:
+            return None
+        try:
+            return {"examples": self.example_selector.select_formatted(query)}
+        except Exception as e:
+            logger.warning(f"Example selection failed, using all examples: {e}")
+            return None
+        
+    def _analyze_query_results(self, results: Any, schema_tracker: SchemaTracker) -> None:
         """Analyze query results to track schema sources"""
         try:
             # Handle different result types
@@ -189,28 +346,39 @@ Generate ONLY the Cypher query without any explanation or markdown formatting.
                         # Neo4j node
                         name = item.content._properties.get('name', 'Unknown')
                         labels = list(item.content._labels) if hasattr(item.content, '_labels') else []
-                        self.schema_tracker.add_entity(name, labels)
+                        schema_tracker.add_entity(name, labels)
             elif isinstance(results, list):
                 for result in results:
                     if isinstance(result, dict):
                         name = result.get('name', 'Unknown')
                         labels = result.get('labels', [])
-                        self.schema_tracker.add_entity(name, labels)
+                        schema_tracker.add_entity(name, labels)
         except Exception as e:
             logger.debug(f"Could not analyze results: {e}")
         
-    def _create_tools(self):
-        """Create LangChain tools for each retriever with schema tracking"""
+    def _track_record_entities(self, records: List[Any], schema_tracker: SchemaTracker) -> None:
+        """Track graph nodes (or name/labels columns) found in Text2Cypher records"""
+        for record in records:
+            if 'name' in record.keys() and 'labels' in record.keys():
+                schema_tracker.add_entity(record['name'], list(record['labels'] or []))
+            for value in record.values():
+                if hasattr(value, 'labels') and hasattr(value, 'get'):
+                    schema_tracker.add_entity(value.get('name', 'Unknown'), list(value.labels))
+                elif isinstance(value, dict) and 'labels' in value and 'name' in value:
+                    schema_tracker.add_entity(value['name'], value['labels'])
+        
+    def _create_tools(self, schema_tracker: SchemaTracker) -> List[Tool]:
+        """Create LangChain tools for each retriever, reporting into the given tracker"""
         
         def vector_search(query: str) -> str:
             """Execute semantic similarity search"""
             try:
-                self.schema_tracker.add_query_pattern("Vector Search")
+                schema_tracker.add_query_pattern("Vector Search")
                 result = self.vector_rag.search(
                     query_text=query,
                     retriever_config={"top_k": self.config.retriever_top_k}
                 )
-                self._analyze_query_results(result)
+                self._analyze_query_results(result, schema_tracker)
                 return result.answer
             except Exception as e:
                 logger.error(f"Vector search error: {e}")
@@ -219,72 +387,35 @@ Generate ONLY the Cypher query without any explanation or markdown formatting.
         def hybrid_search(query: str) -> str:
             """Execute combined vector and keyword search"""
             try:
-                self.schema_tracker.add_query_pattern("Hybrid Search (Vector + Keyword)")
+                schema_tracker.add_query_pattern("Hybrid Search (Vector + Keyword)")
                 result = self.hybrid_rag.search(
                     query_text=query,
                     retriever_config={"top_k": self.config.retriever_top_k}
                 )
-                self._analyze_query_results(result)
+                self._analyze_query_results(result, schema_tracker)
                 return result.answer
             except Exception as e:
                 logger.error(f"Hybrid search error: {e}")
                 return f"Error in hybrid search: {str(e)}"
         
-        def serialize_neo4j_value(value):
-            """Convert Neo4j values to JSON-serializable format"""
-            if hasattr(value, 'isoformat'):
-                return value.isoformat()
-            elif hasattr(value, 'to_native'):
-                return str(value.to_native())
-            elif isinstance(value, (list, tuple)):
-                return [serialize_neo4j_value(v) for v in value]
-            elif isinstance(value, dict):
-                return {k: serialize_neo4j_value(v) for k, v in value.items()}
-            return value
-        
         def graph_query(query: str) -> str:
             """Execute graph queries for specific entities and relationships"""
             try:
-                self.schema_tracker.add_query_pattern("Graph Query (Cypher)")
+                schema_tracker.add_query_pattern("Graph Query (Cypher)")
                 
-                result = self.text2cypher_retriever.search(query_text=query)
+                result = self.text2cypher_retriever.search(
+                    query_text=query,
+                    prompt_params=self._select_examples(query)
+                )
                 if result.items:
-                    # Format results and track schemas
-                    formatted_results = []
-                    for item in result.items[:10]:
-                        content = item.content
-                        
-                        # Handle different content types
-                        if hasattr(content, '__dict__'):
-                            # Neo4j Record or Node
-                            if hasattr(content, 'data'):
-                                # It's a Record
-                                record_dict = {}
-                                for key in content.keys():
-                                    record_dict[key] = serialize_neo4j_value(content[key])
-                                formatted_results.append(record_dict)
-                            elif hasattr(content, '_labels'):
-                                # It's a Node
-                                name = content._properties.get('name', 'Unknown') if hasattr(content, '_properties') else 'Unknown'
-                                labels = list(content._labels)
-                                self.schema_tracker.add_entity(name, labels)
-                                formatted_results.append({
-                                    'name': name,
-                                    'labels': labels,
-                                    'properties': serialize_neo4j_value(content._properties) if hasattr(content, '_properties') else {}
-                                })
-                            else:
-                                formatted_results.append(str(content))
-                        elif isinstance(content, dict):
-                            # Dictionary result
-                            if 'labels' in content and 'name' in content:
-                                self.schema_tracker.add_entity(content['name'], content['labels'])
-                            formatted_results.append(serialize_neo4j_value(content))
-                        else:
-                            # String or other
-                            formatted_results.append(str(content))
-                    
-                    return json.dumps(formatted_results, indent=2)
+                    # Compact table instead of indented JSON keeps tool observations small
+                    records = [item.content for item in result.items]
+                    self._track_record_entities(records, schema_tracker)
+                    return encode_records(
+                        records,
+                        max_rows=self.config.graph_result_max_rows,
+                        token_budget=self.config.graph_result_token_budget
+                    )
                 
                 return "No results found for the graph query."
             except Exception as e:
@@ -294,7 +425,7 @@ Generate ONLY the Cypher query without any explanation or markdown formatting.
         def unified_search(query: str) -> str:
             """Execute a search that automatically checks both schema formats"""
             try:
-                self.schema_tracker.add_query_pattern("Unified Search")
+                schema_tracker.add_query_pattern("Unified Search")
                 
                 # Try different search strategies
                 # 1. First try graph query for specific questions about entities
@@ -312,7 +443,7 @@ Generate ONLY the Cypher query without any explanation or markdown formatting.
                 return hybrid_search(query)
         
         # Define tools with detailed descriptions
-        self.tools = [
+        tools = [
             Tool(
                 name="UnifiedSearch",
                 func=unified_search,
@@ -358,27 +489,17 @@ Generate ONLY the Cypher query without any explanation or markdown formatting.
             )
         ]
         
-        logger.info(f"Created {len(self.tools)} tools with schema tracking")
+        logger.debug(f"Created {len(tools)} tools with schema tracking")
+        return tools
         
-    def _initialize_agent(self):
-        """Initialize the LangChain agent"""
-        # Create memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
-        
-        # Create agent
-        self.agent = initialize_agent(
-            tools=self.tools,
-            llm=ChatOpenAI(
-                temperature=self.config.agent_temperature,
-                model_name=self.config.agent_model,
-                openai_api_key=self.config.openai_api_key
-            ),
+    def _initialize_agent(self, tools: List[Tool], memory: ConversationBufferMemory) -> Any:
+        """Initialize a LangChain agent executor bound to one session's tools and memory"""
+        agent = initialize_agent(
+            tools=tools,
+            llm=self.chat_llm,
             agent=AgentType.OPENAI_FUNCTIONS,
             verbose=self.config.agent_verbose,
-            memory=self.memory,
+            memory=memory,
             max_iterations=self.config.agent_max_iterations,
             agent_kwargs={
                 "system_message": """You are an intelligent assistant for SpyroSolutions with access to a comprehensive knowledge graph.
@@ -413,12 +534,15 @@ When answering, be specific and data-driven. Users expect real insights from the
             }
         )
         
-        logger.info("Agent initialized with dual-schema support and tracking")
+        logger.debug("Agent initialized with dual-schema support and tracking")
+        return agent
     
     def query(self, user_query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute an agentic query with schema source tracking
         
+        Blocks until the agent finishes; turns within one session are serialized.
+        
         Args:
             user_query: The user's question
             session_id: Optional session ID for conversation tracking
@@ -426,22 +550,47 @@ When answering, be specific and data-driven. Users expect real insights from the
         Returns:
             Dictionary with answer, metadata, and schema sources
         """
+        session = self.sessions.get(session_id or DEFAULT_SESSION_ID)
+        
+        with session.lock:
+            return self._run_query(session, user_query, session_id)
+    
+    async def aquery(self, user_query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute query() on the agent worker pool without blocking the event loop
+        
+        Args:
+            user_query: The user's question
+            session_id: Optional session ID for conversation tracking
+            
+        Returns:
+            Dictionary with answer, metadata, and schema sources
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self.query, user_query, session_id)
+        )
+    
+    def _run_query(self, session: AgentSession, user_query: str, session_id: Optional[str]) -> Dict[str, Any]:
+        """Run one turn against a session; the caller holds the session lock"""
         start_time = datetime.now()
+        request_id = str(uuid.uuid4())
         
         # Reset schema tracker for new query
-        self.schema_tracker.reset()
+        session.schema_tracker.reset()
         
         try:
-            # Track token usage
-            with get_openai_callback() as cb:
+            # Track provider-reported usage for every LLM/embedding call in this request
+            with usage_collector.track(request_id) as usage:
                 # Execute query
-                response = self.agent.run(user_query)
+                response = session.agent.run(user_query, callbacks=[self.usage_callback])
                 
                 # Calculate metrics
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
                 # Get schema tracking summary
-                schema_summary = self.schema_tracker.get_summary()
+                schema_summary = session.schema_tracker.get_summary()
                 
                 result = {
                     "query": user_query,
@@ -450,9 +599,11 @@ When answering, be specific and data-driven. Users expect real insights from the
                         "agent_type": "LangChain with OpenAI Functions (Enhanced)",
                         "model": self.config.agent_model,
                         "execution_time_seconds": execution_time,
-                        "tokens_used": cb.total_tokens,
-                        "cost_usd": cb.total_cost,
-                        "tools_available": [tool.name for tool in self.tools],
+                        "tokens_used": usage.total_tokens,
+                        "cost_usd": round(usage.cost_usd, 6),
+                        "usage": usage.summary(),
+                        "request_id": request_id,
+                        "tools_available": [tool.name for tool in session.tools],
                         "session_id": session_id,
                         "timestamp": datetime.now().isoformat(),
                         "schema_support": "Dual (Spyro RAG + LlamaIndex)"
@@ -460,7 +611,10 @@ When answering, be specific and data-driven. Users expect real insights from the
                     "schema_sources": schema_summary
                 }
                 
-                logger.info(f"Query completed in {execution_time:.2f}s using {cb.total_tokens} tokens")
+                logger.info(
+                    f"Query completed in {execution_time:.2f}s using {usage.total_tokens} tokens "
+                    f"over {len(usage.records)} LLM calls"
+                )
                 logger.info(f"Schemas accessed: {schema_summary['schemas_accessed']}")
                 
                 return result
@@ -477,17 +631,35 @@ When answering, be specific and data-driven. Users expect real insights from the
                     "execution_time_seconds": (datetime.now() - start_time).total_seconds(),
                     "timestamp": datetime.now().isoformat()
                 },
-                "schema_sources": self.schema_tracker.get_summary()
+                "schema_sources": session.schema_tracker.get_summary()
             }
     
-    def clear_memory(self):
-        """Clear conversation memory"""
-        self.memory.clear()
-        logger.info("Conversation memory cleared")
-        
-    def get_conversation_history(self) -> List[Dict[str, str]]:
-        """Get conversation history"""
-        messages = self.memory.chat_memory.messages
+    def clear_memory(self, session_id: Optional[str] = None) -> bool:
+        """
+        Clear conversation memory for a session
+        
+        Args:
+            session_id: Session to clear; defaults to the shared default session
+            
+        Returns:
+            True if the session existed
+        """
+        session = self.sessions.peek(session_id or DEFAULT_SESSION_ID)
+        if session is None:
+            return False
+        
+        with session.lock:
+            session.memory.clear()
+        logger.info(f"Conversation memory cleared for session {session.session_id}")
+        return True
+        
+    def get_conversation_history(self, session_id: Optional[str] = None) -> List[Dict[str, str]]:
+        """Get conversation history for a session (empty if the session is unknown)"""
+        session = self.sessions.peek(session_id or DEFAULT_SESSION_ID)
+        if session is None:
+            return []
+        
+        messages = list(session.memory.chat_memory.messages)
         history = []
         
         for msg in messages:
@@ -499,8 +671,9 @@ When answering, be specific and data-driven. Users expect real insights from the
         return history
     
     def close(self):
-        """Close database connection"""
-        self.driver.close()
+        """Stop the worker pool and close the database connection"""
+        self._executor.shutdown(wait=False)
+        release_driver(self.driver)
         logger.info("Database connection closed")
 
 
@@ -5,8 +5,11 @@ to enable truly autonomous decision-making.
 """
 
 import logging
-import json
-from typing import Dict, List, Any, Optional, Tuple
+import contextvars
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from functools import lru_cache
 import time
@@ -15,19 +18,27 @@ from langchain.agents import AgentExecutor, initialize_agent, AgentType
 from langchain.memory import ConversationBufferMemory
 from langchain_core.tools import Tool
 from langchain_openai import ChatOpenAI
-from neo4j import GraphDatabase
+from neo4j_graphrag.embeddings import OpenAIEmbeddings
 from neo4j_graphrag.llm import OpenAILLM
 from neo4j_graphrag.types import RetrieverResultItem
 from neo4j_graphrag.retrievers import (
     VectorRetriever, VectorCypherRetriever, HybridRetriever,
-    HybridCypherRetriever, Text2CypherRetriever
+    HybridCypherRetriever
 )
 
 from ..utils.cypher_examples_enhanced_v4 import ENHANCED_CYPHER_EXAMPLES, CYPHER_GENERATION_INSTRUCTIONS
 from ..utils.neo4j_data_model_context_complete import DATA_MODEL_CONTEXT, QUERY_CONTEXT_HINTS
 from ..utils.config import Config
+from ..utils.neo4j_driver import acquire_driver, release_driver
 from ..utils.logging import setup_logging
-from ..utils.example_formatter import format_instructions, format_examples
+from ..utils.example_formatter import build_text2cypher_prompt, format_examples
+from ..utils.example_selector import CypherExampleSelector, format_example
+from ..utils.cypher_plan_cache import (
+    CypherPlanCache, PlanCachingText2CypherRetriever, compute_schema_hash, record_result_formatter
+)
+from ..utils.result_encoder import encode_records
+from ..utils.usage import UsageCallbackHandler, instrument_openai_client, usage_collector
+from .fast_path_router import FastPathRouter
 
 
 logger = setup_logging(__name__)
@@ -48,8 +59,14 @@ cypher_handler.setFormatter(logging.Formatter(
 ))
 cypher_logger.addHandler(cypher_handler)
 
+# Tracker for the speculative search strategy running in this context, so a
+# discarded strategy's entities and patterns never reach the agent's tracker
+_strategy_tracker: contextvars.ContextVar[Optional["SchemaSourceTracker"]] = contextvars.ContextVar(
+    "strategy_tracker", default=None
+)
+
 
-class CypherLoggingText2CypherRetriever(Text2CypherRetriever):
+class CypherLoggingText2CypherRetriever(PlanCachingText2CypherRetriever):
     """Wrapper for Text2CypherRetriever that logs all generated Cypher queries"""
     
     def __init__(self, *args, **kwargs):
@@ -209,6 +226,12 @@ class SchemaSourceTracker:
             "primary_schema": "llamaindex" if "llamaindex" in self.schemas_used else "spyro" if "spyro" in self.schemas_used else "none"
         }
     
+    def merge(self, other: "SchemaSourceTracker"):
+        """Add everything another tracker recorded"""
+        self.entities_found.update(other.entities_found)
+        self.schemas_used.update(other.schemas_used)
+        self.query_patterns.extend(other.query_patterns)
+    
     def reset(self):
         """Reset tracking for new query"""
         self.entities_found.clear()
@@ -226,20 +249,27 @@ class SpyroAgentEnhanced:
         self.text2cypher_retriever = None
         self.vector_rag = None
         self.hybrid_rag = None
+        self.embedder = None
+        self.example_selector = None
+        self.plan_cache = None
         self.memory = None
         self.agent = None
         self.schema_tracker = SchemaSourceTracker()
+        # One pool per strategy, so searches abandoned after an early winner
+        # only hold up later searches of the same kind
+        self._search_executors: Dict[str, ThreadPoolExecutor] = {}
+        self._search_executors_lock = threading.Lock()
+        self.usage_callback = UsageCallbackHandler(kind="agent")
+        self.synthesis_callback = UsageCallbackHandler(kind="synthesis")
+        self.fast_path = None
         self._initialize()
         
     def _initialize(self):
         """Initialize all components"""
         logger.info("Initializing SpyroSolutions Enhanced Agent v3...")
         
-        # Initialize Neo4j driver
-        self.driver = GraphDatabase.driver(
-            self.config.neo4j_uri,
-            auth=(self.config.neo4j_username, self.config.neo4j_password)
-        )
+        # Shared, pre-warmed Neo4j driver
+        self.driver = acquire_driver(self.config)
         
         # Initialize LLM for retrievers (use agent model config)
         self.llm = OpenAILLM(
@@ -250,6 +280,12 @@ class SpyroAgentEnhanced:
             }
         )
         
+        self.embedder = OpenAIEmbeddings()
+        
+        # Record provider token usage for retriever LLM and embedding calls
+        instrument_openai_client(self.llm.client, "graphrag")
+        instrument_openai_client(self.embedder.client, "embedding")
+        
         # Initialize retrievers
         self._initialize_retrievers()
         
@@ -259,6 +295,20 @@ class SpyroAgentEnhanced:
             temperature=self.config.agent_temperature
         )
         
+        # Known business questions skip the agent loop
+        if self.config.fast_path_enabled:
+            self.fast_path = FastPathRouter(
+                driver=self.driver,
+                chat_llm=self.chat_llm,
+                database=self.config.neo4j_database,
+                embedder=self.embedder,
+                similarity_threshold=self.config.fast_path_similarity,
+                keyword_similarity_floor=self.config.fast_path_keyword_similarity,
+                cache_dir=self.config.cypher_examples_cache_dir,
+                max_rows=self.config.graph_result_max_rows,
+                token_budget=self.config.graph_result_token_budget
+            )
+        
         # Create tools
         self.tools = self._create_tools()
         
@@ -270,28 +320,48 @@ class SpyroAgentEnhanced:
         
     def _initialize_retrievers(self):
         """Initialize all retriever types with enhanced examples"""
-        # Text2Cypher with comprehensive examples
-        cypher_instructions = format_instructions(
-            DATA_MODEL_CONTEXT + "\n\n" + CYPHER_GENERATION_INSTRUCTIONS
-        )
-        
-        # Format examples as strings for Text2CypherRetriever
-        cypher_examples = []
-        for example in ENHANCED_CYPHER_EXAMPLES:
-            # Format each example as a string
-            example_str = f"Question: {example['question']}\nCypher: {example['cypher'].strip()}"
-            cypher_examples.append(example_str)
+        # Text2Cypher with comprehensive examples; {examples} is filled per query
+        cypher_instructions = build_text2cypher_prompt(DATA_MODEL_CONTEXT, CYPHER_GENERATION_INSTRUCTIONS)
+        
+        # Format examples as strings for Text2CypherRetriever (used when no selector is available)
+        cypher_examples = [format_example(example) for example in ENHANCED_CYPHER_EXAMPLES]
+        
+        # Validated question -> Cypher plans, dropped when the graph schema changes
+        if self.config.cypher_plan_cache_enabled:
+            self.plan_cache = CypherPlanCache(
+                max_size=self.config.cypher_plan_cache_size,
+                embedder=self.embedder,
+                similarity_threshold=self.config.cypher_plan_cache_similarity,
+                schema_hash_fn=lambda: compute_schema_hash(self.driver),
+                path=self.config.cypher_plan_cache_path
+            )
         
         self.text2cypher_retriever = CypherLoggingText2CypherRetriever(
             driver=self.driver,
             llm=self.llm,
             neo4j_schema=self._get_neo4j_schema(),
             examples=cypher_examples,
-            custom_prompt=cypher_instructions
+            custom_prompt=cypher_instructions,
+            result_formatter=record_result_formatter,
+            plan_cache=self.plan_cache,
+            max_rows=self.config.graph_result_max_rows
         )
         
         logger.info(f"Text2Cypher initialized with {len(ENHANCED_CYPHER_EXAMPLES)} comprehensive examples")
         
+        # Only the most relevant examples go into each prompt
+        try:
+            self.example_selector = CypherExampleSelector(
+                ENHANCED_CYPHER_EXAMPLES,
+                embedder=self.embedder,
+                top_k=self.config.cypher_examples_top_k,
+                mmr_lambda=self.config.cypher_examples_mmr_lambda,
+                cache_dir=self.config.cypher_examples_cache_dir
+            )
+        except Exception as e:
+            logger.warning(f"Example selector unavailable, using all examples: {e}")
+            self.example_selector = None
+        
         # Vector retriever
         try:
             self.vector_rag = VectorRetriever(
@@ -334,6 +404,16 @@ Technical Schema Details:
 """
             return enhanced_schema
     
+    def _select_examples(self, query: str) -> Optional[Dict[str, str]]:
+        """Prompt params with the few-shot examples most similar to the query"""
+        if not self.example_selector:
+            return None
+        try:
+            return {"examples": self.example_selector.select_formatted(query)}
+        except Exception as e:
+            logger.warning(f"Example selection failed, using all examples: {e}")
+            return None
+    
     def _analyze_query_results(self, result):
         """Analyze query results to track schema sources"""
         try:
@@ -345,17 +425,32 @@ Technical Schema Details:
                             # Neo4j node
                             name = content._properties.get('name', 'Unknown') if hasattr(content, '_properties') else 'Unknown'
                             labels = list(content._labels) if hasattr(content, '_labels') else []
-                            self.schema_tracker.add_entity(name, labels)
+                            self._tracker().add_entity(name, labels)
         except Exception as e:
             logger.debug(f"Could not analyze results: {e}")
         
+    def _tracker(self) -> SchemaSourceTracker:
+        """Tracker of the speculative strategy in this context, else the agent's"""
+        return _strategy_tracker.get() or self.schema_tracker
+    
+    def _track_record_entities(self, records: List[Any]) -> None:
+        """Track graph nodes (or name/labels columns) found in Text2Cypher records"""
+        for record in records:
+            if 'name' in record.keys() and 'labels' in record.keys():
+                self._tracker().add_entity(record['name'], list(record['labels'] or []))
+            for value in record.values():
+                if hasattr(value, 'labels') and hasattr(value, 'get'):
+                    self._tracker().add_entity(value.get('name', 'Unknown'), list(value.labels))
+                elif isinstance(value, dict) and 'labels' in value and 'name' in value:
+                    self._tracker().add_entity(value['name'], value['labels'])
+        
     def _create_tools(self):
         """Create LangChain tools with enhanced descriptions"""
         
         def vector_search(query: str) -> str:
             """Execute semantic similarity search"""
             try:
-                self.schema_tracker.add_query_pattern("Vector Search")
+                self._tracker().add_query_pattern("Vector Search")
                 result = self.vector_rag.search(
                     query_text=query,
                     retriever_config={"top_k": self.config.retriever_top_k}
@@ -369,7 +464,7 @@ Technical Schema Details:
         def hybrid_search(query: str) -> str:
             """Execute combined vector and keyword search"""
             try:
-                self.schema_tracker.add_query_pattern("Hybrid Search (Vector + Keyword)")
+                self._tracker().add_query_pattern("Hybrid Search (Vector + Keyword)")
                 result = self.hybrid_rag.search(
                     query_text=query,
                     retriever_config={"top_k": self.config.retriever_top_k}
@@ -380,22 +475,10 @@ Technical Schema Details:
                 logger.error(f"Hybrid search error: {e}")
                 return f"Error in hybrid search: {str(e)}"
         
-        def serialize_neo4j_value(value):
-            """Convert Neo4j values to JSON-serializable format"""
-            if hasattr(value, 'isoformat'):
-                return value.isoformat()
-            elif hasattr(value, 'to_native'):
-                return str(value.to_native())
-            elif isinstance(value, (list, tuple)):
-                return [serialize_neo4j_value(v) for v in value]
-            elif isinstance(value, dict):
-                return {k: serialize_neo4j_value(v) for k, v in value.items()}
-            return value
-        
         def graph_query(query: str) -> str:
             """Execute graph queries using natural language"""
             try:
-                self.schema_tracker.add_query_pattern("Graph Query (Text2Cypher)")
+                self._tracker().add_query_pattern("Graph Query (Text2Cypher)")
                 
                 # Log the graph query invocation
                 cypher_logger.info(f"=== GraphQuery Tool Invoked ===")
@@ -409,59 +492,93 @@ Technical Schema Details:
                         cypher_logger.info(f"Added context hint for '{keyword}': {hint}")
                         break
                 
-                result = self.text2cypher_retriever.search(query_text=enhanced_query)
+                result = self.text2cypher_retriever.search(
+                    query_text=enhanced_query,
+                    prompt_params=self._select_examples(query)
+                )
                 if result.items:
-                    # Format results
-                    formatted_results = []
-                    for item in result.items[:10]:
-                        content = item.content
-                        
-                        # Handle different content types
-                        if hasattr(content, '__dict__'):
-                            # Neo4j Record or Node
-                            if hasattr(content, 'data'):
-                                # It's a Record
-                                record_dict = {}
-                                for key in content.keys():
-                                    record_dict[key] = serialize_neo4j_value(content[key])
-                                formatted_results.append(record_dict)
-                            elif hasattr(content, '_labels'):
-                                # It's a Node
-                                name = content._properties.get('name', 'Unknown') if hasattr(content, '_properties') else 'Unknown'
-                                labels = list(content._labels)
-                                self.schema_tracker.add_entity(name, labels)
-                                formatted_results.append({
-                                    'name': name,
-                                    'labels': labels,
-                                    'properties': serialize_neo4j_value(content._properties) if hasattr(content, '_properties') else {}
-                                })
-                            else:
-                                formatted_results.append(str(content))
-                        elif isinstance(content, dict):
-                            # Dictionary result
-                            if 'labels' in content and 'name' in content:
-                                self.schema_tracker.add_entity(content['name'], content['labels'])
-                            formatted_results.append(serialize_neo4j_value(content))
-                        else:
-                            # String or other
-                            formatted_results.append(str(content))
-                    
-                    return json.dumps(formatted_results, indent=2)
+                    # Compact table instead of indented JSON keeps tool observations small
+                    records = [item.content for item in result.items]
+                    self._track_record_entities(records)
+                    return encode_records(
+                        records,
+                        max_rows=self.config.graph_result_max_rows,
+                        token_budget=self.config.graph_result_token_budget
+                    )
                 
                 return "No results found for the graph query."
             except Exception as e:
                 logger.error(f"Graph query error: {e}")
                 return f"Error in graph query: {str(e)}"
         
+        no_graph_results = "No results found for the graph query."
+        
+        def has_results(result: Optional[str]) -> bool:
+            """Whether a strategy produced something worth returning"""
+            return bool(result) and result != no_graph_results and not result.startswith("Error in ")
+        
+        def speculative_search(query: str, strategies: List[Tuple[str, Callable[[str], str]]]) -> str:
+            """
+            Run all strategies concurrently and return the highest-priority non-empty result
+            
+            A lower-priority result is only used once every strategy ahead of it has
+            finished empty. Strategies still queued are cancelled; ones already running
+            cannot be interrupted, so they finish in the background and are discarded.
+            Each strategy records into its own tracker, and only the tracker of the
+            returned result is merged into the agent's.
+            """
+            def run_strategy(func: Callable[[str], str], tracker: SchemaSourceTracker) -> str:
+                _strategy_tracker.set(tracker)
+                return func(query)
+            
+            trackers = [SchemaSourceTracker() for _ in strategies]
+            # Copy the context so usage tracking follows the work onto pool threads
+            futures = [
+                self._search_executor(name).submit(contextvars.copy_context().run, run_strategy, func, tracker)
+                for (name, func), tracker in zip(strategies, trackers)
+            ]
+            fallback = "Unable to search - no retrievers available"
+            fallback_tracker = None
+            
+            try:
+                # Block on each strategy in priority order; later ones keep running meanwhile
+                for (name, _), future, tracker in zip(strategies, futures, trackers):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f"Speculative {name} search failed: {e}")
+                        continue
+                    if has_results(result):
+                        logger.debug(f"Unified search answered by {name}")
+                        self._tracker().merge(tracker)
+                        return result
+                    if result:
+                        fallback, fallback_tracker = result, tracker
+                
+                if fallback_tracker:
+                    self._tracker().merge(fallback_tracker)
+                return fallback
+            finally:
+                for future in futures:
+                    future.cancel()
+        
         def unified_search(query: str) -> str:
             """Execute a comprehensive search across the knowledge graph"""
             try:
-                self.schema_tracker.add_query_pattern("Unified Search")
+                self._tracker().add_query_pattern("Unified Search")
+                
+                if self.config.speculative_search:
+                    strategies = [("graph", graph_query)]
+                    if self.hybrid_rag:
+                        strategies.append(("hybrid", hybrid_search))
+                    if self.vector_rag:
+                        strategies.append(("vector", vector_search))
+                    return speculative_search(query, strategies)
                 
                 # Try Text2Cypher first for structured queries
                 try:
                     graph_result = graph_query(query)
-                    if graph_result and graph_result != "No results found for the graph query.":
+                    if graph_result and graph_result != no_graph_results:
                         return graph_result
                 except:
                     pass
@@ -590,69 +707,92 @@ Remember: The data model documentation above is your source of truth. Use it to
     def query(self, user_query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """Execute an agentic query with enhanced context"""
         start_time = datetime.now()
+        request_id = str(uuid.uuid4())
         
         # Reset schema tracker for new query
         self.schema_tracker.reset()
         
-        try:
-            # Log the query
-            logger.info(f"Processing query: {user_query[:100]}...")
-            
-            # Execute agent
-            response = self.agent.run(user_query)
-            
-            # Calculate execution time
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            # Get schema tracking summary
-            schema_summary = self.schema_tracker.get_summary()
-            
-            # Estimate tokens (rough approximation)
-            prompt_tokens = len(user_query.split()) * 1.3
-            completion_tokens = len(response.split()) * 1.3
-            total_tokens = int(prompt_tokens + completion_tokens)
-            
-            # Estimate cost (GPT-4 pricing)
-            cost_per_1k_prompt = 0.03
-            cost_per_1k_completion = 0.06
-            cost = (prompt_tokens / 1000 * cost_per_1k_prompt) + \
-                   (completion_tokens / 1000 * cost_per_1k_completion)
-            
-            result = {
-                "query": user_query,
-                "answer": response,
-                "metadata": {
-                    "agent_type": "enhanced_v3",
-                    "model": self.config.agent_model,
-                    "execution_time_seconds": round(execution_time, 2),
-                    "tokens_used": total_tokens,
-                    "cost_usd": round(cost, 4),
-                    "tools_available": [tool.name for tool in self.tools],
-                    "session_id": session_id,
-                    "timestamp": datetime.now().isoformat(),
-                    "schema_sources": schema_summary
+        # Every LLM/embedding call made below is recorded against this request
+        with usage_collector.track(request_id) as usage:
+            try:
+                # Log the query
+                logger.info(f"Processing query: {user_query[:100]}...")
+                
+                # Template questions are answered directly; everything else goes to the agent
+                fast_path = self._try_fast_path(user_query)
+                if fast_path:
+                    response = fast_path["answer"]
+                else:
+                    response = self.agent.run(user_query, callbacks=[self.usage_callback])
+                
+                # Calculate execution time
+                execution_time = (datetime.now() - start_time).total_seconds()
+                
+                # Get schema tracking summary
+                schema_summary = self.schema_tracker.get_summary()
+                
+                result = {
+                    "query": user_query,
+                    "answer": response,
+                    "metadata": {
+                        "agent_type": "enhanced_v3",
+                        "model": self.config.agent_model,
+                        "execution_time_seconds": round(execution_time, 2),
+                        "tokens_used": usage.total_tokens,
+                        "cost_usd": round(usage.cost_usd, 6),
+                        "usage": usage.summary(),
+                        "request_id": request_id,
+                        "route": "fast_path" if fast_path else "agent",
+                        "fast_path": {
+                            key: fast_path[key] for key in ("template", "match", "similarity", "params", "rows")
+                        } if fast_path else None,
+                        "tools_available": [tool.name for tool in self.tools],
+                        "session_id": session_id,
+                        "timestamp": datetime.now().isoformat(),
+                        "schema_sources": schema_summary
+                    }
                 }
-            }
-            
-            logger.info(f"Query completed in {execution_time:.2f}s using {schema_summary['primary_schema']} schema")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Agent query error: {e}", exc_info=True)
-            
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            return {
-                "query": user_query,
-                "answer": f"I encountered an error while processing your query: {str(e)}",
-                "metadata": {
-                    "agent_type": "enhanced_v3",
-                    "model": self.config.agent_model,
-                    "execution_time_seconds": round(execution_time, 2),
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
+                
+                logger.info(
+                    f"Query completed in {execution_time:.2f}s using {schema_summary['primary_schema']} schema, "
+                    f"{usage.total_tokens} tokens over {len(usage.records)} LLM calls"
+                )
+                return result
+                
+            except Exception as e:
+                logger.error(f"Agent query error: {e}", exc_info=True)
+                
+                execution_time = (datetime.now() - start_time).total_seconds()
+                
+                return {
+                    "query": user_query,
+                    "answer": f"I encountered an error while processing your query: {str(e)}",
+                    "metadata": {
+                        "agent_type": "enhanced_v3",
+                        "model": self.config.agent_model,
+                        "execution_time_seconds": round(execution_time, 2),
+                        "tokens_used": usage.total_tokens,
+                        "cost_usd": round(usage.cost_usd, 6),
+                        "request_id": request_id,
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat()
+                    }
                 }
-            }
+    
+    def _try_fast_path(self, user_query: str) -> Optional[Dict[str, Any]]:
+        """Answer a known question from its Cypher template, or None to use the agent"""
+        if not self.fast_path:
+            return None
+        try:
+            result = self.fast_path.answer(user_query, callbacks=[self.synthesis_callback])
+        except Exception as e:
+            logger.warning(f"Fast path failed, falling back to agent: {e}")
+            return None
+        if result:
+            self._track_record_entities(result["records"])
+            # Keep the exchange in memory so follow-up questions have context
+            self.memory.save_context({"input": user_query}, {"output": result["answer"]})
+        return result
     
     def get_conversation_history(self) -> List[Dict[str, str]]:
         """Get the conversation history"""
@@ -672,11 +812,28 @@ Remember: The data model documentation above is your source of truth. Use it to
             self.memory.clear()
             logger.info("Conversation memory cleared")
     
+    def _search_executor(self, strategy: str) -> ThreadPoolExecutor:
+        """Get the thread pool for one unified search strategy"""
+        executor = self._search_executors.get(strategy)
+        if executor is None:
+            with self._search_executors_lock:
+                executor = self._search_executors.get(strategy)
+                if executor is None:
+                    # Sized for one search per concurrently served query
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.config.agent_max_workers,
+                        thread_name_prefix=f"unified-search-{strategy}"
+                    )
+                    self._search_executors[strategy] = executor
+        return executor
+    
     def close(self):
         """Close connections and cleanup"""
+        for executor in self._search_executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
         if self.driver:
-            self.driver.close()
-            logger.info("Neo4j driver closed")
+            release_driver(self.driver)
+            logger.info("Neo4j driver released")
 
 
 def create_agent(config: Config) -> SpyroAgentEnhanced:
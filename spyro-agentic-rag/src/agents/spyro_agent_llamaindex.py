@@ -14,13 +14,13 @@ from langchain_openai import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
 from langchain_community.callbacks import get_openai_callback
 
-import neo4j
 from neo4j_graphrag.embeddings import OpenAIEmbeddings
 from neo4j_graphrag.retrievers import VectorRetriever, HybridRetriever, Text2CypherRetriever
 from neo4j_graphrag.generation import GraphRAG
 from neo4j_graphrag.llm import OpenAILLM
 
 from ..utils.config import Config
+from ..utils.neo4j_driver import acquire_driver, release_driver
 from ..utils.llamaindex_schema import LLAMAINDEX_SCHEMA
 from ..utils.cypher_examples_llamaindex import LLAMAINDEX_CYPHER_EXAMPLES, LLAMAINDEX_CYPHER_INSTRUCTIONS
 from ..utils.cypher_examples_extracted import EXTRACTED_CYPHER_EXAMPLES, EXTRACTED_CYPHER_INSTRUCTIONS
@@ -37,11 +37,8 @@ class SpyroAgentLlamaIndex:
     def __init__(self, config: Config):
         self.config = config
         
-        # Initialize Neo4j driver
-        self.driver = neo4j.GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=(config.neo4j_username, config.neo4j_password)
-        )
+        # Shared, pre-warmed Neo4j driver
+        self.driver = acquire_driver(config)
         
         # Initialize embeddings and LLM
         self.embedder = OpenAIEmbeddings(
@@ -352,7 +349,7 @@ Remember: All data uses the LlamaIndex schema format with :__Entity__:TYPE label
     
     def close(self):
         """Close database connection"""
-        self.driver.close()
+        release_driver(self.driver)
         logger.info("Database connection closed")
 
 
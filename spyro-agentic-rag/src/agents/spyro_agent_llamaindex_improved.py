@@ -15,7 +15,6 @@ from langchain_openai import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
 from langchain_community.callbacks import get_openai_callback
 
-import neo4j
 from neo4j_graphrag.embeddings import OpenAIEmbeddings
 from neo4j_graphrag.retrievers import VectorRetriever, HybridRetriever, Text2CypherRetriever
 from neo4j_graphrag.generation import GraphRAG
@@ -28,6 +27,7 @@ from neo4j_graphrag.exceptions import (
 )
 
 from ..utils.config import Config
+from ..utils.neo4j_driver import acquire_driver, release_driver
 from typing import Optional as OptionalType
 from ..utils.llamaindex_schema import LLAMAINDEX_SCHEMA
 from ..utils.cypher_examples_llamaindex import LLAMAINDEX_CYPHER_EXAMPLES, LLAMAINDEX_CYPHER_INSTRUCTIONS
@@ -44,11 +44,8 @@ class SpyroAgentLlamaIndexImproved:
     def __init__(self, config: Config):
         self.config = config
         
-        # Initialize Neo4j driver
-        self.driver = neo4j.GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=(config.neo4j_username, config.neo4j_password)
-        )
+        # Shared, pre-warmed Neo4j driver
+        self.driver = acquire_driver(config)
         
         # Initialize embeddings and LLM
         self.embedder = OpenAIEmbeddings(
@@ -399,7 +396,7 @@ If you encounter errors, explain what data you were looking for and suggest alte
     
     def close(self):
         """Clean up resources"""
-        self.driver.close()
+        release_driver(self.driver)
         logger.info("SpyroAgent closed")
 
 
@@ -9,12 +9,16 @@ from typing import Optional, List, Dict, Any
 import uuid
 
 from fastapi import FastAPI, HTTPException, Depends, Header, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from ..agents.spyro_agent_enhanced_v3 import SpyroAgentEnhanced as SpyroAgent, create_agent
 from ..utils.config import Config
 from ..utils.logging import setup_logging
+from ..utils.metrics_materializer import MetricsMaterializer
+from ..utils.neo4j_driver import driver_registry
+from ..utils.usage import usage_collector
 
 # Setup logging
 logger = setup_logging(__name__)
@@ -22,16 +26,26 @@ logger = setup_logging(__name__)
 # Global agent instance
 agent: Optional[SpyroAgent] = None
 
+# Background job keeping the metric summaries fresh
+materializer: Optional[MetricsMaterializer] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
-    global agent
+    global agent, materializer
     
     # Startup
     try:
         config = Config.from_env()
         agent = create_agent(config)
+        materializer = MetricsMaterializer(
+            agent.driver,
+            database=config.neo4j_database,
+            max_age_seconds=config.metrics_max_age
+        )
+        if config.metrics_refresh_interval > 0:
+            materializer.start(config.metrics_refresh_interval)
         logger.info("SpyroSolutions Agentic RAG API started successfully")
     except Exception as e:
         logger.error(f"Failed to initialize agent: {e}")
@@ -40,6 +54,8 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    if materializer:
+        materializer.stop()
     if agent:
         agent.close()
         logger.info("SpyroSolutions Agentic RAG API shut down")
@@ -77,6 +93,12 @@ class QueryMetadata(BaseModel):
     execution_time_seconds: float
     tokens_used: Optional[int] = None
     cost_usd: Optional[float] = None
+    usage: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Provider-reported tokens, latency and cost per call kind (agent, text2cypher, graphrag, embedding, synthesis)"
+    )
+    route: Optional[str] = Field(None, description="'fast_path' for template answers, 'agent' for the full agent loop")
+    fast_path: Optional[Dict[str, Any]] = Field(None, description="Template, match method and similarity for fast path answers")
     tools_available: List[str]
     session_id: Optional[str]
     timestamp: str
@@ -175,7 +197,8 @@ async def execute_query(
         return QueryResponse(
             query=result["query"],
             answer=result["answer"],
-            metadata=QueryMetadata(**result["metadata"])
+            metadata=QueryMetadata(**result["metadata"]),
+            request_id=result["metadata"].get("request_id") or str(uuid.uuid4())
         )
         
     except Exception as e:
@@ -262,6 +285,40 @@ async def get_tools(api_key: str = Depends(verify_api_key)):
     }
 
 
+@app.get("/usage/stats")
+async def get_usage_stats(api_key: str = Depends(verify_api_key)):
+    """Token, cost and latency percentiles over recent requests"""
+    return usage_collector.stats()
+
+
+@app.get("/metrics/freshness")
+async def get_metrics_freshness(api_key: str = Depends(verify_api_key)):
+    """Age in seconds of each materialized metric summary"""
+    if not materializer:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metrics materializer not initialized"
+        )
+    return {"max_age_seconds": materializer.max_age_seconds, "age_seconds": await run_in_threadpool(materializer.freshness)}
+
+
+@app.post("/metrics/refresh")
+async def refresh_metrics(api_key: str = Depends(verify_api_key)):
+    """Recompute all metric summaries now (e.g. after a data load)"""
+    if not materializer:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metrics materializer not initialized"
+        )
+    return {"compute_ms": await run_in_threadpool(materializer.refresh)}
+
+
+@app.get("/neo4j/pool")
+async def get_pool_stats(api_key: str = Depends(verify_api_key)):
+    """Shared Neo4j driver settings and connection pool usage"""
+    return driver_registry.stats()
+
+
 @app.get("/capabilities")
 async def get_capabilities():
     """Get detailed system capabilities"""
@@ -300,6 +357,10 @@ async def get_capabilities():
             "GET /conversation - Get conversation history",
             "POST /conversation/clear - Clear memory",
             "GET /tools - List available tools",
+            "GET /usage/stats - Token, cost and latency percentiles",
+            "GET /metrics/freshness - Age of materialized metric summaries",
+            "POST /metrics/refresh - Recompute metric summaries",
+            "GET /neo4j/pool - Neo4j connection pool usage",
             "GET /capabilities - This endpoint"
         ]
     }
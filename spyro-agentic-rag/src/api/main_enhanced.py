@@ -9,12 +9,15 @@ from typing import Optional, List, Dict, Any
 import uuid
 
 from fastapi import FastAPI, HTTPException, Depends, Header, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from ..agents.spyro_agent_enhanced_fixed import create_agent, SpyroAgentEnhanced as SpyroAgent
 from ..utils.config import Config
 from ..utils.logging import setup_logging
+from ..utils.neo4j_driver import driver_registry, read_session
+from ..utils.usage import usage_collector
 
 # Setup logging
 logger = setup_logging(__name__)
@@ -77,6 +80,10 @@ class QueryMetadata(BaseModel):
     execution_time_seconds: float
     tokens_used: Optional[int] = None
     cost_usd: Optional[float] = None
+    usage: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Provider-reported tokens, latency and cost per call kind (agent, text2cypher, graphrag, embedding)"
+    )
     tools_available: List[str]
     session_id: Optional[str]
     timestamp: str
@@ -122,6 +129,7 @@ class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     agent_ready: bool
+    active_sessions: int = 0
     capabilities: List[str]
     timestamp: str
     schema_support: str = "Dual (Spyro RAG + LlamaIndex)"
@@ -159,6 +167,7 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         agent_ready=agent is not None,
+        active_sessions=len(agent.sessions) if agent else 0,
         capabilities=[
             "autonomous_tool_selection",
             "vector_search",
@@ -198,18 +207,22 @@ async def execute_query(
             detail="Agent not initialized"
         )
     
+    # Anonymous callers get their own session; the id is returned in metadata
+    session_id = request.session_id or str(uuid.uuid4())
+    
     try:
-        # Execute query
-        result = agent.query(
+        # Execute query on the agent worker pool so other requests keep flowing
+        result = await agent.aquery(
             user_query=request.question,
-            session_id=request.session_id
+            session_id=session_id
         )
         
         # Create response with schema tracking
         response = QueryResponse(
             query=result["query"],
             answer=result["answer"],
-            metadata=QueryMetadata(**result["metadata"])
+            metadata=QueryMetadata(**result["metadata"]),
+            request_id=result["metadata"].get("request_id") or str(uuid.uuid4())
         )
         
         # Add schema sources if available
@@ -239,7 +252,7 @@ async def get_conversation(
         )
     
     try:
-        history = agent.get_conversation_history()
+        history = agent.get_conversation_history(session_id)
         
         return ConversationResponse(
             session_id=session_id,
@@ -259,8 +272,11 @@ async def get_conversation(
 
 
 @app.post("/conversation/clear")
-async def clear_conversation(api_key: str = Depends(verify_api_key)):
-    """Clear conversation memory"""
+async def clear_conversation(
+    session_id: Optional[str] = None,
+    api_key: str = Depends(verify_api_key)
+):
+    """Clear conversation memory for a session"""
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -268,8 +284,13 @@ async def clear_conversation(api_key: str = Depends(verify_api_key)):
         )
     
     try:
-        agent.clear_memory()
-        return {"message": "Conversation memory cleared successfully"}
+        # Waits for an in-flight turn of the session, so keep it off the event loop
+        cleared = await run_in_threadpool(agent.clear_memory, session_id)
+        return {
+            "message": "Conversation memory cleared successfully",
+            "session_id": session_id,
+            "session_found": cleared
+        }
         
     except Exception as e:
         logger.error(f"Memory clear error: {e}", exc_info=True)
@@ -303,6 +324,18 @@ async def get_tools(api_key: str = Depends(verify_api_key)):
     }
 
 
+@app.get("/usage/stats")
+async def get_usage_stats(api_key: str = Depends(verify_api_key)):
+    """Token, cost and latency percentiles over recent requests"""
+    return usage_collector.stats()
+
+
+@app.get("/neo4j/pool")
+async def get_pool_stats(api_key: str = Depends(verify_api_key)):
+    """Shared Neo4j driver settings and connection pool usage"""
+    return driver_registry.stats()
+
+
 @app.get("/capabilities")
 async def get_capabilities():
     """Get detailed system capabilities"""
@@ -330,7 +363,7 @@ async def get_capabilities():
                 "VectorSearch": "Semantic similarity search",
                 "UnifiedSearch": "Automatic schema-aware search"
             },
-            "conversation_memory": "Maintains context across multiple queries",
+            "conversation_memory": "Maintains context across multiple queries, isolated per session_id",
             "parallel_execution": "Can execute multiple tools for comprehensive results"
         },
         "data_sources": {
@@ -353,17 +386,19 @@ async def get_capabilities():
         "api_endpoints": [
             "POST /query - Execute query with source tracking",
             "GET /health - Health check",
-            "GET /conversation - Get conversation history",
-            "POST /conversation/clear - Clear memory",
+            "GET /conversation - Get conversation history for a session",
+            "POST /conversation/clear - Clear memory for a session",
             "GET /tools - List available tools",
+            "GET /usage/stats - Token, cost and latency percentiles",
+            "GET /neo4j/pool - Neo4j connection pool usage",
             "GET /capabilities - This endpoint"
         ]
     }
 
 
 @app.get("/schema/stats")
-async def get_schema_stats(api_key: str = Depends(verify_api_key)):
-    """Get statistics about data in each schema"""
+def get_schema_stats(api_key: str = Depends(verify_api_key)):
+    """Get statistics about data in each schema (sync handler, runs in the threadpool)"""
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -371,7 +406,7 @@ async def get_schema_stats(api_key: str = Depends(verify_api_key)):
         )
     
     try:
-        with agent.driver.session() as session:
+        with read_session(agent.driver, agent.config.neo4j_database) as session:
             # Count entities in each schema
             stats = {}
             
@@ -0,0 +1,13 @@
+"""Batch evaluation of business question sets against agents and the API"""
+
+from .questions import BUSINESS_QUESTIONS, as_question_set, load_questions
+from .runner import (
+    AgentTarget, ApiTarget, EvaluationReport, EvaluationRunner, RateLimiter,
+    ResponseCache, compare_to_baseline, default_version
+)
+
+__all__ = [
+    'BUSINESS_QUESTIONS', 'as_question_set', 'load_questions',
+    'AgentTarget', 'ApiTarget', 'EvaluationReport', 'EvaluationRunner', 'RateLimiter',
+    'ResponseCache', 'compare_to_baseline', 'default_version'
+]
@@ -0,0 +1,97 @@
+"""
+Question sets for batch evaluation
+"""
+
+import json
+from typing import Dict, List, Union
+
+# The 60 SpyroSolutions business questions used for regression runs
+BUSINESS_QUESTIONS = [
+    "What percentage of our ARR is dependent on customers with success scores below 70?",
+    "Which customers are at high risk due to low product adoption?",
+    "What is the impact on revenue if we lose our top 3 enterprise customers?",
+    "How many customers have success scores below 60, and what is their combined ARR?",
+    "What percentage of customers experienced negative events in the last 90 days?",
+    "Which customers are at highest risk of churn based on success scores and recent events?",
+    "What are the projected quarterly revenue trends for the next fiscal year?",
+    "Which teams have the highest operational costs relative to their output?",
+    "How many active risks are unmitigated, and what is their potential financial impact?",
+    "What is the customer retention rate across different product lines?",
+    "Which product features have the highest usage but lowest satisfaction scores?",
+    "What is the average time to resolve critical customer issues by product?",
+    "How many customers would be affected if SpyroCloud experiences an outage?",
+    "What is the distribution of customers across different industry verticals?",
+    "Which regions have the highest concentration of at-risk customers?",
+    "What percentage of our customer base uses multiple products?",
+    "How much ARR is at risk from customers with upcoming renewal dates?",
+    "Which customers have the highest lifetime value?",
+    "What is the correlation between team size and project completion rates?",
+    "How many critical milestones are at risk of being missed this quarter?",
+    "What is the average customer acquisition cost by product line?",
+    "Which features are most commonly requested but not yet implemented?",
+    "What is the ratio of operational costs to revenue for each product?",
+    "How many customers have exceeded their usage limits in the past month?",
+    "What percentage of projects are currently over budget?",
+    "Which teams have the highest employee satisfaction scores?",
+    "What is the average deal size for new enterprise customers?",
+    "How many security incidents have been reported in the last quarter?",
+    "What is the customer satisfaction trend over the past year?",
+    "Which competitive threats pose the highest risk to our market share?",
+    "What is the average time from lead to customer conversion?",
+    "How many customers are using deprecated features?",
+    "What percentage of our revenue comes from the top 10% of customers?",
+    "Which SLAs are most frequently violated?",
+    "What is the cost per customer for each support tier?",
+    "How many expansion opportunities exist within our current customer base?",
+    "What is the success rate of our customer onboarding process?",
+    "Which product integrations are most valuable to customers?",
+    "What is the average revenue per employee across different departments?",
+    "How many customers have not been contacted in the last 60 days?",
+    "What percentage of features are actively used by more than 50% of customers?",
+    "Which customers have the highest support ticket volume?",
+    "What is the trend in customer acquisition costs over time?",
+    "How many high-value opportunities are in the pipeline?",
+    "What percentage of customers are promoters (NPS score 9-10)?",
+    "Which product updates have had the most positive impact on retention?",
+    "What is the distribution of contract values across customer segments?",
+    "How many days of runway do we have at current burn rate?",
+    "Which customers are underutilizing their subscriptions?",
+    "What is the ratio of customer success managers to customers?",
+    "How many critical dependencies exist in our technology stack?",
+    "What percentage of revenue is recurring vs one-time?",
+    "Which marketing channels have the highest ROI?",
+    "What is the average resolution time for different risk categories?",
+    "How many customers have custom contractual terms?",
+    "What is the relationship between product usage and renewal probability?",
+    "Which teams are most effective at meeting their OKRs?",
+    "What percentage of our codebase has technical debt?",
+    "How many customers would benefit from upgrading their plan?",
+    "What is the geographic distribution of our revenue?"
+]
+
+
+def load_questions(path: str) -> List[Dict[str, Union[int, str]]]:
+    """
+    Load a question set from a JSON file
+
+    The file may hold a list of strings or of {"id": ..., "question": ...} objects.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        List of {"id": ..., "question": ...} dictionaries
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    return as_question_set(data)
+
+
+def as_question_set(questions: List[Union[str, Dict]]) -> List[Dict[str, Union[int, str]]]:
+    """Normalize strings or question dictionaries to numbered {"id", "question"} entries"""
+    return [
+        {"id": q.get("id", i), "question": q["question"]} if isinstance(q, dict) else {"id": i, "question": q}
+        for i, q in enumerate(questions, 1)
+    ]
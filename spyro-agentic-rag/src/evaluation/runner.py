@@ -0,0 +1,416 @@
+"""
+Concurrent batch evaluation of business question sets
+
+Replaces the one-off sequential harnesses (fixed sleeps between questions)
+with a single engine:
+
+- Questions run concurrently against an in-process agent or the HTTP API,
+  bounded by a shared rate limiter (max in-flight requests and requests per
+  minute)
+- Responses are cached per (agent version, question), so re-running a report
+  or resuming an interrupted run only calls the agent for new questions
+- Reports include pass rate, latency percentiles and token/cost totals, and
+  can be diffed against a stored baseline to surface pass/fail and latency
+  regressions between releases
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Indicators that an answer is grounded in graph data, or generic/failed
+GROUNDED_INDICATORS = [
+    "%", "$", "M", "million", "thousand", "customers", "teams", "products",
+    "TechCorp", "SpyroCloud", "SpyroAI", "SpyroSecure", "GlobalRetail",
+    "FinanceHub", "StartupXYZ", "RetailPlus", "EduTech", "HealthTech",
+    "ARR", "revenue", "score", "operational cost", "adoption rate",
+    "0", "1", "2", "3", "4", "5", "6", "7", "8", "9"
+]
+GENERIC_INDICATORS = [
+    "no data available", "no results found", "unable to retrieve",
+    "it seems", "it appears", "technical issue", "error",
+    "cannot provide", "don't have access", "missing data",
+    "no direct results", "could not find", "not available",
+    "typically", "generally", "usually", "commonly"
+]
+
+
+def grade_answer(answer: str) -> Dict[str, Any]:
+    """Heuristic grounding check used by the business question harnesses"""
+    answer_lower = answer.lower()
+    grounded = sum(1 for indicator in GROUNDED_INDICATORS if indicator.lower() in answer_lower)
+    generic = sum(1 for indicator in GENERIC_INDICATORS if indicator in answer_lower)
+    return {
+        "passed": grounded > 2 and generic < 2 and len(answer) > 50,
+        "grounded_indicators": grounded,
+        "generic_indicators": generic
+    }
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p90/p95/p99/max of a list of values (zeros when empty)"""
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+def default_version(label: str = "") -> str:
+    """
+    Version key for caching and reports: label plus the current git commit
+
+    Uncommitted changes to tracked files add a hash of the diff, so answers
+    cached for the clean commit are not served for edited code. Untracked
+    files are left out because run reports are written into the tree.
+    """
+    try:
+        commit = _git("rev-parse", "--short", "HEAD").strip()
+        diff = _git("diff", "HEAD")
+        if diff:
+            commit += f"-dirty.{hashlib.sha256(diff.encode('utf-8')).hexdigest()[:8]}"
+    except (OSError, subprocess.SubprocessError):
+        commit = "unknown"
+    return f"{label}@{commit}" if label else commit
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], capture_output=True, text=True, check=True, timeout=5
+    ).stdout
+
+
+class RateLimiter:
+    """Bounds concurrent requests and spaces request starts to a per-minute rate"""
+
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: Optional[float] = None):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self._semaphore.acquire()
+        if self._interval:
+            async with self._lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._semaphore.release()
+
+
+class ResponseCache:
+    """On-disk cache of responses keyed by agent version and question"""
+
+    def __init__(self, directory: str = ".cache/eval_responses"):
+        self.directory = directory
+
+    def _path(self, version: str, question: str) -> str:
+        key = hashlib.sha256(f"{version}\n{question.strip()}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, version: str, question: str) -> Optional[Dict[str, Any]]:
+        path = self._path(version, question)
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached response {path}: {e}")
+            return None
+
+    def put(self, version: str, question: str, response: Dict[str, Any]) -> None:
+        path = self._path(version, question)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(response, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache response {path}: {e}")
+
+
+class EvaluationTarget(Protocol):
+    """Something that answers a question with {"answer": ..., "metadata": {...}}"""
+
+    async def ask(self, question: str) -> Dict[str, Any]:
+        ...
+
+
+class AgentTarget:
+    """
+    Evaluates an in-process spyro agent
+
+    Session-aware agents (those exposing aquery) get a fresh conversation per
+    question and run concurrently. Other agents keep a single executor and
+    conversation memory, so their questions run one at a time, each starting
+    from cleared memory so answers do not depend on question order.
+    """
+
+    def __init__(self, agent: Any):
+        self.agent = agent
+        self.concurrent = hasattr(agent, "aquery")
+        # A threading lock rather than an asyncio one: a question that timed
+        # out keeps running in its worker thread and must still block the next
+        self._query_lock = threading.Lock()
+
+    def _query_alone(self, question: str) -> Dict[str, Any]:
+        with self._query_lock:
+            if hasattr(self.agent, "clear_memory"):
+                self.agent.clear_memory()
+            return self.agent.query(question)
+
+    async def ask(self, question: str) -> Dict[str, Any]:
+        if self.concurrent:
+            return await self.agent.aquery(question, session_id=f"eval-{uuid.uuid4().hex[:12]}")
+        return await asyncio.to_thread(self._query_alone, question)
+
+
+class ApiTarget:
+    """Evaluates a running spyro API over HTTP"""
+
+    def __init__(self, base_url: str, api_key: str, timeout: float = 120.0):
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            headers={"X-API-Key": api_key},
+            timeout=timeout
+        )
+
+    async def ask(self, question: str) -> Dict[str, Any]:
+        response = await self._client.post("/query", json={"question": question})
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+@dataclass
+class QuestionResult:
+    """Outcome of one question"""
+    id: Any
+    question: str
+    answer: str
+    passed: bool
+    latency_seconds: float
+    tokens_used: int = 0
+    cost_usd: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+    grounded_indicators: int = 0
+    generic_indicators: int = 0
+
+
+@dataclass
+class EvaluationReport:
+    """Results and aggregate statistics of one run"""
+    version: str
+    started_at: str
+    wall_time_seconds: float
+    results: List[QuestionResult] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        total = len(self.results)
+        passed = sum(1 for r in self.results if r.passed)
+        answered = [r for r in self.results if r.error is None]
+        return {
+            "total": total,
+            "passed": passed,
+            "failed": total - passed,
+            "errors": total - len(answered),
+            "pass_rate": round(passed * 100.0 / total, 1) if total else 0.0,
+            "cached": sum(1 for r in self.results if r.cached),
+            "latency_seconds": percentiles([r.latency_seconds for r in answered]),
+            "tokens": {
+                "total": sum(r.tokens_used for r in self.results),
+                "per_question": percentiles([float(r.tokens_used) for r in answered])
+            },
+            "cost_usd": round(sum(r.cost_usd for r in self.results), 4)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "started_at": self.started_at,
+            "wall_time_seconds": round(self.wall_time_seconds, 2),
+            "summary": self.summary(),
+            "results": [asdict(r) for r in self.results]
+        }
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class EvaluationRunner:
+    """Runs question sets concurrently against a target"""
+
+    def __init__(
+        self,
+        target: EvaluationTarget,
+        version: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        timeout: float = 120.0
+    ):
+        """
+        Initialize the runner
+
+        Args:
+            target: Agent or API to evaluate
+            version: Agent version; cache entries and reports are keyed by it
+            rate_limiter: Shared limiter (defaults to 8 concurrent, no rate cap)
+            cache: Response cache; None always calls the target
+            timeout: Per-question timeout in seconds
+        """
+        self.target = target
+        self.version = version
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cache = cache
+        self.timeout = timeout
+
+    async def _run_one(self, item: Dict[str, Any]) -> QuestionResult:
+        question = item["question"]
+        response = self.cache.get(self.version, question) if self.cache else None
+        cached = response is not None
+
+        if response is None:
+            async with self.rate_limiter:
+                start = time.monotonic()
+                try:
+                    response = await asyncio.wait_for(self.target.ask(question), self.timeout)
+                except asyncio.TimeoutError:
+                    return QuestionResult(item["id"], question, "", False, self.timeout, error="timeout")
+                except Exception as e:
+                    return QuestionResult(item["id"], question, "", False, time.monotonic() - start, error=str(e))
+                response = dict(response, latency_seconds=time.monotonic() - start)
+            if self.cache and "error" not in response.get("metadata", {}):
+                self.cache.put(self.version, question, response)
+
+        metadata = response.get("metadata") or {}
+        answer = response.get("answer") or ""
+        grade = grade_answer(answer)
+        return QuestionResult(
+            id=item["id"],
+            question=question,
+            answer=answer,
+            passed=grade["passed"] and "error" not in metadata,
+            latency_seconds=round(response.get("latency_seconds", 0.0), 3),
+            tokens_used=metadata.get("tokens_used") or 0,
+            cost_usd=metadata.get("cost_usd") or 0.0,
+            cached=cached,
+            error=metadata.get("error"),
+            grounded_indicators=grade["grounded_indicators"],
+            generic_indicators=grade["generic_indicators"]
+        )
+
+    async def run(self, questions: List[Dict[str, Any]]) -> EvaluationReport:
+        """
+        Evaluate every question
+
+        Args:
+            questions: List of {"id": ..., "question": ...} dictionaries
+
+        Returns:
+            Report with results in question order
+        """
+        started_at = datetime.now().isoformat()
+        start = time.monotonic()
+        completed = 0
+
+        async def tracked(item: Dict[str, Any]) -> QuestionResult:
+            nonlocal completed
+            result = await self._run_one(item)
+            completed += 1
+            logger.info(
+                f"[{completed}/{len(questions)}] Q{result.id} "
+                f"{'PASS' if result.passed else 'FAIL'} {result.latency_seconds:.1f}s"
+                f"{' (cached)' if result.cached else ''}"
+            )
+            return result
+
+        results = await asyncio.gather(*(tracked(item) for item in questions))
+        return EvaluationReport(
+            version=self.version,
+            started_at=started_at,
+            wall_time_seconds=time.monotonic() - start,
+            results=list(results)
+        )
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    latency_regression_ratio: float = 1.5
+) -> Dict[str, Any]:
+    """
+    Diff a report against a baseline report
+
+    Args:
+        report: Current report (EvaluationReport.to_dict())
+        baseline: Baseline report in the same format
+        latency_regression_ratio: A question regresses when its latency exceeds
+            the baseline latency by this factor
+
+    Returns:
+        Pass/fail changes, per-question latency regressions and summary deltas
+    """
+    previous = {r["question"]: r for r in baseline.get("results", [])}
+    newly_failing, newly_passing, slower = [], [], []
+    for result in report.get("results", []):
+        before = previous.get(result["question"])
+        if before is None:
+            continue
+        if before["passed"] and not result["passed"]:
+            newly_failing.append({"id": result["id"], "question": result["question"]})
+        elif result["passed"] and not before["passed"]:
+            newly_passing.append({"id": result["id"], "question": result["question"]})
+        if (before["latency_seconds"] and result["error"] is None
+                and result["latency_seconds"] > before["latency_seconds"] * latency_regression_ratio):
+            slower.append({
+                "id": result["id"],
+                "question": result["question"],
+                "baseline_seconds": before["latency_seconds"],
+                "current_seconds": result["latency_seconds"]
+            })
+
+    current_summary, baseline_summary = report["summary"], baseline["summary"]
+    return {
+        "baseline_version": baseline.get("version"),
+        "version": report.get("version"),
+        "pass_rate_delta": round(current_summary["pass_rate"] - baseline_summary["pass_rate"], 1),
+        "latency_delta_seconds": {
+            key: round(current_summary["latency_seconds"][key] - baseline_summary["latency_seconds"][key], 3)
+            for key in ("p50", "p90", "p95")
+        },
+        "tokens_delta": current_summary["tokens"]["total"] - baseline_summary["tokens"]["total"],
+        "newly_failing": newly_failing,
+        "newly_passing": newly_passing,
+        "latency_regressions": slower
+    }
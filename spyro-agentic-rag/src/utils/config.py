@@ -19,6 +19,14 @@ class Config:
     neo4j_password: str = os.getenv("NEO4J_PASSWORD", "password123")
     neo4j_database: str = os.getenv("NEO4J_DATABASE", "neo4j")
     
+    # Neo4j connection pool (shared by all agents in the process)
+    neo4j_max_pool_size: int = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+    neo4j_connection_acquisition_timeout: float = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30"))
+    neo4j_liveness_check_timeout: float = float(os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "30"))
+    neo4j_max_connection_lifetime: float = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+    neo4j_connection_timeout: float = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "15"))
+    neo4j_warmup_connections: int = int(os.getenv("NEO4J_WARMUP_CONNECTIONS", "4"))
+    
     # OpenAI Configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     
@@ -33,10 +41,37 @@ class Config:
     agent_verbose: bool = os.getenv("AGENT_VERBOSE", "true").lower() == "true"
     agent_max_iterations: int = int(os.getenv("AGENT_MAX_ITERATIONS", "3"))
     
+    # Serving Configuration
+    agent_max_workers: int = int(os.getenv("AGENT_MAX_WORKERS", "8"))
+    agent_max_sessions: int = int(os.getenv("AGENT_MAX_SESSIONS", "256"))
+    
     # Retriever Configuration
     vector_index_name: str = os.getenv("VECTOR_INDEX_NAME", "spyro_vector_index")
     fulltext_index_name: str = os.getenv("FULLTEXT_INDEX_NAME", "spyro_fulltext_index")
     retriever_top_k: int = int(os.getenv("RETRIEVER_TOP_K", "5"))
+    speculative_search: bool = os.getenv("SPECULATIVE_SEARCH", "true").lower() == "true"
+    graph_result_max_rows: int = int(os.getenv("GRAPH_RESULT_MAX_ROWS", "50"))
+    graph_result_token_budget: int = int(os.getenv("GRAPH_RESULT_TOKEN_BUDGET", "1500"))
+    
+    # Text2Cypher few-shot example selection
+    cypher_examples_top_k: int = int(os.getenv("CYPHER_EXAMPLES_TOP_K", "8"))
+    cypher_examples_mmr_lambda: float = float(os.getenv("CYPHER_EXAMPLES_MMR_LAMBDA", "0.7"))
+    cypher_examples_cache_dir: str = os.getenv("CYPHER_EXAMPLES_CACHE_DIR", ".cache/cypher_examples")
+    
+    # Validated Cypher plan cache (skips Text2Cypher generation for repeat questions)
+    cypher_plan_cache_enabled: bool = os.getenv("CYPHER_PLAN_CACHE_ENABLED", "true").lower() == "true"
+    cypher_plan_cache_size: int = int(os.getenv("CYPHER_PLAN_CACHE_SIZE", "500"))
+    cypher_plan_cache_similarity: float = float(os.getenv("CYPHER_PLAN_CACHE_SIMILARITY", "0.95"))
+    cypher_plan_cache_path: str = os.getenv("CYPHER_PLAN_CACHE_PATH", ".cache/cypher_plans.json")
+    
+    # Deterministic fast path for template questions (skips the agent loop)
+    fast_path_enabled: bool = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    fast_path_similarity: float = float(os.getenv("FAST_PATH_SIMILARITY", "0.92"))
+    fast_path_keyword_similarity: float = float(os.getenv("FAST_PATH_KEYWORD_SIMILARITY", "0.75"))
+    
+    # Materialized metric summaries (0 disables the background refresh)
+    metrics_refresh_interval: int = int(os.getenv("METRICS_REFRESH_INTERVAL", "300"))
+    metrics_max_age: int = int(os.getenv("METRICS_MAX_AGE", "900"))
     
     # Logging Configuration
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
@@ -8,9 +8,11 @@ from .cypher_examples_enhanced_v3 import ENHANCED_CYPHER_EXAMPLES as V3_EXAMPLES
 from .cypher_examples_relationship_fixes import RELATIONSHIP_MODEL_EXAMPLES
 from .cypher_examples_risk_queries import RISK_FILTERING_EXAMPLES
 from .cypher_examples_data_quality import DATA_QUALITY_EXAMPLES
+from .cypher_examples_metric_summaries import METRIC_SUMMARY_EXAMPLES
 
 # Combine all examples, with new ones taking precedence
 ENHANCED_CYPHER_EXAMPLES = (
+    METRIC_SUMMARY_EXAMPLES +      # Precomputed aggregates for dashboard questions
     RELATIONSHIP_MODEL_EXAMPLES +  # Fixes for Q7, Q52, Q53
     RISK_FILTERING_EXAMPLES +      # Fixes for Q4, Q29, Q45, Q48
     DATA_QUALITY_EXAMPLES +        # Fixes for Q54, Q50, Q60, Q31
@@ -27,4 +29,6 @@ When generating Cypher queries:
 5. Success scores are in HAS_SUCCESS_SCORE relationships
 6. For relationship model entities (PROJECTION, MARKETING_CHANNEL, REVENUE), traverse relationships to find data
 7. Always filter to avoid returning all entities when looking for "at risk" or specific conditions
+8. For ARR by success score, team cost-to-revenue, roadmap status and risks per objective, read the
+   precomputed MetricSummary/MetricRow nodes instead of aggregating over entities
 """
\ No newline at end of file
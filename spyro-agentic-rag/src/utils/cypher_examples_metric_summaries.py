@@ -0,0 +1,54 @@
+"""
+Cypher examples that read materialized metric summaries instead of scanning entities
+"""
+
+METRIC_SUMMARY_EXAMPLES = [
+    {
+        "question": "What percentage of our ARR is dependent on customers with success scores below 70?",
+        "cypher": """
+// Precomputed: ARR by success score band (refreshed by the metrics job)
+MATCH (m:MetricSummary {name: 'arr_by_success_score'})
+RETURN m.pct_arr_below_70 AS percentage, m.arr_below_70 AS arr_at_risk, m.total_arr AS total_arr,
+       m.computed_at AS as_of
+"""
+    },
+    {
+        "question": "How is our ARR distributed across customer success score ranges?",
+        "cypher": """
+MATCH (m:MetricSummary {name: 'arr_by_success_score'})-[:HAS_ROW]->(r:MetricRow)
+RETURN r.band_min AS score_from, r.band_max AS score_to, r.customers AS customers,
+       r.arr AS arr, r.pct_of_total_arr AS pct_of_arr, m.computed_at AS as_of
+ORDER BY r.band_min
+"""
+    },
+    {
+        "question": "Which teams have the highest operational costs relative to the revenue they support?",
+        "cypher": """
+MATCH (m:MetricSummary {name: 'team_cost_to_revenue'})-[:HAS_ROW]->(r:MetricRow)
+WHERE r.cost_to_revenue_pct IS NOT NULL
+RETURN r.team AS team, r.monthly_cost AS monthly_cost, r.revenue_supported AS revenue_supported,
+       r.cost_to_revenue_pct AS cost_to_revenue_pct, m.computed_at AS as_of
+ORDER BY r.rank
+LIMIT 5
+"""
+    },
+    {
+        "question": "What percentage of roadmap items are at risk or behind schedule?",
+        "cypher": """
+MATCH (m:MetricSummary {name: 'roadmap_status'})
+RETURN m.at_risk_items AS at_risk_items, m.total_items AS total_items, m.at_risk_pct AS at_risk_percentage,
+       m.computed_at AS as_of
+"""
+    },
+    {
+        "question": "Which company objectives have the most risks?",
+        "cypher": """
+MATCH (m:MetricSummary {name: 'objective_risks'})-[:HAS_ROW]->(r:MetricRow)
+WHERE r.risk_count > 0
+RETURN r.objective AS objective, r.risk_count AS risks, r.active_risks AS active_risks,
+       r.high_severity_risks AS high_severity_risks, r.impact_amount AS impact_amount, m.computed_at AS as_of
+ORDER BY r.rank
+LIMIT 10
+"""
+    }
+]
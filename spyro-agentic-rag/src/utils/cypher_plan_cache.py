@@ -0,0 +1,508 @@
+"""
+Validated Cypher plan cache for Text2Cypher retrieval
+
+Maps a normalized question to Cypher that already executed successfully and
+returned rows, so repeat questions (and paraphrases that only differ in quoted
+names or numbers) skip LLM generation and go straight to Neo4j. Literals found
+in both the question and the Cypher are extracted into parameters, and the
+whole cache is dropped when the graph schema hash changes.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import neo4j
+import numpy as np
+from neo4j.exceptions import CypherSyntaxError, Neo4jError
+from neo4j_graphrag.exceptions import SearchValidationError, Text2CypherRetrievalError
+from neo4j_graphrag.generation.prompts import Text2CypherTemplate
+from neo4j_graphrag.retrievers import Text2CypherRetriever
+from neo4j_graphrag.retrievers.text2cypher import extract_cypher
+from neo4j_graphrag.types import RawSearchResult, RetrieverResultItem, Text2CypherSearchModel
+from pydantic import ValidationError
+
+from .result_encoder import inject_limit
+from .usage import usage_kind
+
+logger = logging.getLogger(__name__)
+
+# Quoted strings and numbers in a question; these become Cypher parameters
+_LITERAL_RE = re.compile(r"'([^']+)'|\"([^\"]+)\"|(?<![\w.])(\d+(?:\.\d+)?)(?![\w.])")
+_PUNCTUATION_RE = re.compile(r"[^\w\s<>$%]")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Capitalized, mixed-case or alphanumeric words that may name an entity
+_NAME_RE = re.compile(r"\b(?:[A-Z][\w&-]*|\w*[a-z][A-Z]\w*|\w*\d\w*[A-Za-z]\w*)")
+# String literals inside generated Cypher
+_CYPHER_STRING_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+
+def _parse_number(text: str) -> Any:
+    return float(text) if "." in text else int(text)
+
+
+def normalize_question(question: str) -> Tuple[str, str, List[Tuple[str, Any]]]:
+    """
+    Normalize a question into cache keys
+
+    Args:
+        question: Natural language question
+
+    Returns:
+        Tuple of (exact key, template key, literals). The template key has every
+        quoted string replaced by <str> and every number by <num>; literals are
+        (kind, value) pairs in order of appearance.
+    """
+    literals: List[Tuple[str, Any]] = []
+
+    def _placeholder(match: re.Match) -> str:
+        if match.group(3) is not None:
+            literals.append(("num", _parse_number(match.group(3))))
+            return " <num> "
+        literals.append(("str", match.group(1) if match.group(1) is not None else match.group(2)))
+        return " <str> "
+
+    def _clean(text: str) -> str:
+        text = _PUNCTUATION_RE.sub(" ", text.lower())
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    template_key = _clean(_LITERAL_RE.sub(_placeholder, question))
+    exact_key = _clean(question)
+    return exact_key, template_key, literals
+
+
+def question_names(question: str) -> frozenset:
+    """
+    Unquoted words of a question that look like entity names
+
+    Quoted strings and numbers are left out since they become parameters. The
+    first word only counts when it is not plain capitalization ("What", "Show").
+    """
+    text = _LITERAL_RE.sub(" ", question)
+    names = set()
+    for index, match in enumerate(_NAME_RE.finditer(text)):
+        word = match.group(0)
+        if index == 0 and match.start() == len(text) - len(text.lstrip()) and word[1:].islower():
+            continue
+        names.add(word.lower())
+    return frozenset(names)
+
+
+def parameterize_cypher(cypher: str, literals: List[Tuple[str, Any]]) -> Optional[str]:
+    """
+    Replace question literals in Cypher with $p0, $p1, ... parameters
+
+    Returns None when a literal is missing from the Cypher or appears more than
+    once, since the mapping back to the question would then be ambiguous.
+    """
+    for index, (kind, value) in enumerate(literals):
+        if kind == "num":
+            pattern = re.compile(rf"(?<![\w.$]){re.escape(str(value))}(?![\w.])")
+        else:
+            pattern = re.compile(rf"'{re.escape(value)}'|\"{re.escape(value)}\"")
+        if len(pattern.findall(cypher)) != 1:
+            return None
+        cypher = pattern.sub(f"$p{index}", cypher)
+    return cypher
+
+
+def compute_schema_hash(driver: neo4j.Driver, database: Optional[str] = None) -> str:
+    """Hash the labels, relationship types and property keys of the graph"""
+    records, _, _ = driver.execute_query(
+        """
+        CALL db.labels() YIELD label
+        WITH collect(label) AS labels
+        CALL db.relationshipTypes() YIELD relationshipType
+        WITH labels, collect(relationshipType) AS types
+        CALL db.propertyKeys() YIELD propertyKey
+        RETURN labels, types, collect(propertyKey) AS keys
+        """,
+        database_=database,
+        routing_=neo4j.RoutingControl.READ
+    )
+    record = records[0] if records else {}
+    payload = json.dumps(
+        {name: sorted(record.get(name) or []) for name in ("labels", "types", "keys")},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CypherPlan:
+    """A validated Cypher query and the parameters to run it with"""
+    cypher: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    question: str = ""
+    source: str = "exact"
+
+
+class CypherPlanCache:
+    """
+    Thread-safe LRU of validated question -> Cypher plans
+
+    Lookups try the exact normalized question first, then the literal-free
+    template, then (with an embedder) the most similar cached question. A
+    similar question is only reused when both questions name the same
+    entities and none of the words it does not share with the new question
+    are baked into its Cypher, so "revenue for TechCorp" never serves the
+    plan of "revenue for FinanceHub".
+
+    Persisted plans are written by a background timer at most once per
+    save_delay seconds rather than on every store.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 500,
+        embedder: Any = None,
+        similarity_threshold: float = 0.95,
+        schema_hash_fn: Optional[Callable[[], str]] = None,
+        schema_check_interval: float = 300.0,
+        path: Optional[str] = None,
+        save_delay: float = 5.0
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of cached plans
+            embedder: Optional object with embed_query(text) for paraphrase matching
+            similarity_threshold: Minimum cosine similarity for an embedding match
+            schema_hash_fn: Returns the current schema hash; a change clears the cache
+            schema_check_interval: Seconds between schema hash checks
+            path: Optional JSON file used to persist plans across restarts
+            save_delay: Seconds to batch changes before writing path (0 writes at once)
+        """
+        self.max_size = max_size
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.schema_hash_fn = schema_hash_fn
+        self.schema_check_interval = schema_check_interval
+        self.path = path
+        self.save_delay = save_delay
+        self.schema_hash: Optional[str] = None
+        self._last_schema_check = 0.0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+
+        self.check_schema(force=True)
+        self._load()
+        if self.path:
+            atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "schema_hash": self.schema_hash
+            }
+
+    def check_schema(self, force: bool = False) -> None:
+        """Clear the cache if the schema hash changed since the last check"""
+        if not self.schema_hash_fn:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_schema_check < self.schema_check_interval:
+            return
+        self._last_schema_check = now
+
+        try:
+            current = self.schema_hash_fn()
+        except Exception as e:
+            logger.warning(f"Could not compute schema hash: {e}")
+            return
+
+        with self._lock:
+            if self.schema_hash is not None and current != self.schema_hash:
+                logger.info("Graph schema changed; clearing Cypher plan cache")
+                self._entries.clear()
+            self.schema_hash = current
+
+    def lookup(self, question: str) -> Optional[CypherPlan]:
+        """Return a cached plan for the question, if any"""
+        self.check_schema()
+        exact_key, template_key, literals = normalize_question(question)
+
+        with self._lock:
+            for key, source in ((exact_key, "exact"), (template_key, "template")):
+                entry = self._entries.get(key)
+                if entry is None or (source == "template" and not entry["parameterized"]):
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._to_plan(entry, literals, source)
+
+        plan = self._lookup_similar(question, literals)
+        with self._lock:
+            if plan:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return plan
+
+    def _lookup_similar(self, question: str, literals: List[Tuple[str, Any]]) -> Optional[CypherPlan]:
+        """Find the closest cached question by embedding similarity"""
+        if not self.embedder:
+            return None
+        names = question_names(question)
+        with self._lock:
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry.get("embedding") is not None
+                and (len(entry["literal_kinds"]) == len(literals) if entry["parameterized"] else not literals)
+            ]
+        # Paraphrases must name the same entities
+        candidates = [
+            (key, entry) for key, entry in candidates
+            if question_names(entry["question"]) == names
+        ]
+        if not candidates:
+            return None
+
+        try:
+            vector = np.asarray(self.embedder.embed_query(question), dtype=np.float32)
+        except Exception as e:
+            logger.debug(f"Plan cache embedding failed: {e}")
+            return None
+        vector /= np.linalg.norm(vector) or 1.0
+
+        matrix = np.asarray([entry["embedding"] for _, entry in candidates], dtype=np.float32)
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        key, entry = candidates[best]
+        if [kind for kind, _ in literals] != entry["literal_kinds"]:
+            return None
+        if self._bakes_other_words(entry, question):
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return self._to_plan(entry, literals, "similar")
+
+    @staticmethod
+    def _bakes_other_words(entry: Dict[str, Any], question: str) -> bool:
+        """Whether the plan's Cypher strings contain words only its own question has"""
+        own_words = set(normalize_question(entry["question"])[1].split())
+        other_words = own_words - set(normalize_question(question)[1].split())
+        if not other_words:
+            return False
+        strings = " ".join(
+            single if single is not None else double
+            for single, double in _CYPHER_STRING_RE.findall(entry["cypher"])
+        )
+        baked = set(_PUNCTUATION_RE.sub(" ", strings.lower()).split())
+        return bool(other_words & baked)
+
+    @staticmethod
+    def _to_plan(entry: Dict[str, Any], literals: List[Tuple[str, Any]], source: str) -> CypherPlan:
+        params = {}
+        if entry["parameterized"]:
+            params = {f"p{index}": value for index, (_, value) in enumerate(literals)}
+        return CypherPlan(cypher=entry["cypher"], params=params, question=entry["question"], source=source)
+
+    def store(self, question: str, cypher: str) -> None:
+        """Cache Cypher that executed successfully and returned rows"""
+        exact_key, template_key, literals = normalize_question(question)
+        parameterized = parameterize_cypher(cypher, literals) if literals else None
+
+        embedding = None
+        if self.embedder:
+            try:
+                vector = np.asarray(self.embedder.embed_query(question), dtype=np.float32)
+                embedding = (vector / (np.linalg.norm(vector) or 1.0)).tolist()
+            except Exception as e:
+                logger.debug(f"Plan cache embedding failed: {e}")
+
+        entry = {
+            "question": question,
+            "cypher": parameterized or cypher,
+            "parameterized": parameterized is not None,
+            "literal_kinds": [kind for kind, _ in literals],
+            "embedding": embedding,
+            "created_at": time.time()
+        }
+        key = template_key if parameterized is not None else exact_key
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        self._save()
+
+    def invalidate(self, question: str) -> None:
+        """Drop any plan cached for the question (e.g. after it failed to run)"""
+        exact_key, template_key, _ = normalize_question(question)
+        with self._lock:
+            self._entries.pop(exact_key, None)
+            self._entries.pop(template_key, None)
+        self._save()
+
+    def clear(self) -> None:
+        """Remove all cached plans"""
+        with self._lock:
+            self._entries.clear()
+        self._save()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read Cypher plan cache {self.path}: {e}")
+            return
+
+        if self.schema_hash_fn and data.get("schema_hash") != self.schema_hash:
+            logger.info("Ignoring persisted Cypher plans from a different schema")
+            return
+        with self._lock:
+            for key, entry in list(data.get("entries", {}).items())[-self.max_size:]:
+                self._entries[key] = entry
+        logger.info(f"Loaded {len(self._entries)} cached Cypher plans")
+
+    def _save(self) -> None:
+        """Schedule a write of the persisted plans"""
+        if not self.path:
+            return
+        if self.save_delay <= 0:
+            self.flush()
+            return
+        with self._save_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write the persisted plans now"""
+        if not self.path:
+            return
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            # Entries are replaced, never mutated, so a shallow copy is a snapshot
+            with self._lock:
+                data = {"schema_hash": self.schema_hash, "entries": dict(self._entries)}
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write Cypher plan cache {self.path}: {e}")
+
+
+class PlanCachingText2CypherRetriever(Text2CypherRetriever):
+    """
+    Text2CypherRetriever that reuses validated plans before asking the LLM
+
+    Also caps result size server-side: when max_rows is set, LIMIT max_rows + 1
+    is injected into every executed query so callers can tell a full result
+    from a truncated one without materializing huge result sets.
+    """
+
+    def __init__(
+        self,
+        *args,
+        plan_cache: Optional[CypherPlanCache] = None,
+        max_rows: Optional[int] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.plan_cache = plan_cache
+        self.max_rows = max_rows
+
+    def generate_cypher(self, query_text: str, prompt_params: Optional[Dict[str, Any]] = None) -> str:
+        """Build the Text2Cypher prompt (same rules as the base retriever) and ask the LLM"""
+        try:
+            validated_data = Text2CypherSearchModel(query_text=query_text)
+        except ValidationError as e:
+            raise SearchValidationError(e.errors()) from e
+
+        prompt_params = dict(prompt_params or {})
+        examples = prompt_params.pop("examples", None) or ("\n".join(self.examples) if self.examples else "")
+        schema = prompt_params.pop("schema", None) or self.neo4j_schema
+        prompt = Text2CypherTemplate(template=self.custom_prompt).format(
+            schema=schema,
+            examples=examples,
+            query_text=validated_data.query_text,
+            **prompt_params
+        )
+
+        with usage_kind("text2cypher"):
+            llm_result = self.llm.invoke(prompt)
+        return extract_cypher(llm_result.content)
+
+    def execute_cypher(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> List[neo4j.Record]:
+        """Run a read query with the row cap applied"""
+        if self.max_rows:
+            cypher = inject_limit(cypher, self.max_rows + 1)
+        records, _, _ = self.driver.execute_query(
+            query_=cypher,
+            parameters_=params or {},
+            database_=self.neo4j_database,
+            routing_=neo4j.RoutingControl.READ
+        )
+        return records
+
+    def get_search_results(
+        self, query_text: str, prompt_params: Optional[Dict[str, Any]] = None
+    ) -> RawSearchResult:
+        """Run a cached plan if one exists, otherwise generate Cypher and cache it on success"""
+        if self.plan_cache:
+            plan = self.plan_cache.lookup(query_text)
+            if plan:
+                try:
+                    records = self.execute_cypher(plan.cypher, plan.params)
+                    if records:
+                        logger.info(f"Cypher plan cache hit ({plan.source})")
+                        return RawSearchResult(
+                            records=records,
+                            metadata={"cypher": plan.cypher, "params": plan.params, "plan_cache": plan.source}
+                        )
+                except Neo4jError as e:
+                    logger.warning(f"Cached Cypher plan failed, regenerating: {e}")
+                self.plan_cache.invalidate(plan.question)
+
+        cypher = self.generate_cypher(query_text, prompt_params)
+        logger.debug(f"Text2Cypher generated: {cypher}")
+        try:
+            records = self.execute_cypher(cypher)
+        except CypherSyntaxError as e:
+            raise Text2CypherRetrievalError(f"Failed to get search result: {e.message}") from e
+
+        if self.plan_cache and records:
+            self.plan_cache.store(query_text, cypher)
+        return RawSearchResult(records=records, metadata={"cypher": cypher})
+
+
+def record_result_formatter(record: neo4j.Record) -> RetrieverResultItem:
+    """Keep the raw record as item content so tools can encode it compactly"""
+    return RetrieverResultItem(content=record)
@@ -13,6 +13,17 @@ Generate a Cypher query that answers the user's question based on the schema and
 Return only the Cypher query without any explanation.
 """
 
+def build_text2cypher_prompt(data_model_context: str, generation_instructions: str) -> str:
+    """Text2Cypher prompt template: data model, instructions and an {examples} slot
+
+    The result is formatted again by Text2CypherTemplate, so any literal braces
+    in the context or instructions must be doubled.
+    """
+    return format_instructions(
+        data_model_context + "\n\n" + generation_instructions +
+        "\n\nExamples of similar questions:\n{examples}"
+    )
+
 def format_examples(examples: list) -> str:
     """Format examples for the Text2Cypher retriever"""
     formatted = []
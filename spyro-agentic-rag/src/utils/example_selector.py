@@ -0,0 +1,179 @@
+"""
+Embedding-based few-shot example selection for Text2Cypher prompts
+
+Instead of pasting the whole example library into every prompt, the examples
+are embedded once into a NumPy matrix (cached on disk, keyed by a hash of the
+example set and embedding model) and each query only receives the top-k most
+similar examples, re-ranked with Maximal Marginal Relevance for diversity.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def format_example(example: Dict[str, str]) -> str:
+    """Format a single example the way the Text2Cypher retrievers expect"""
+    return f"Question: {example['question']}\nCypher: {example['cypher'].strip()}"
+
+
+class CypherExampleSelector:
+    """
+    Select the most relevant Cypher examples for a question
+
+    The selector is read-only after construction and safe to share across threads.
+    """
+
+    def __init__(
+        self,
+        examples: List[Dict[str, str]],
+        embedder: Any,
+        top_k: int = 8,
+        mmr_lambda: float = 0.7,
+        fetch_k: Optional[int] = None,
+        cache_dir: Optional[str] = ".cache/cypher_examples"
+    ):
+        """
+        Initialize the selector and load (or build) the example embedding matrix
+
+        Args:
+            examples: List of {"question": ..., "cypher": ...} dictionaries
+            embedder: Object with an embed_query(text) method (e.g. neo4j_graphrag OpenAIEmbeddings)
+            top_k: Number of examples injected into each prompt
+            mmr_lambda: Relevance/diversity trade-off (1.0 = pure similarity)
+            fetch_k: Candidates considered by MMR (defaults to 4 * top_k)
+            cache_dir: Directory for the cached matrix; None disables the disk cache
+        """
+        if not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda must be between 0 and 1")
+
+        self.examples = list(examples)
+        self.embedder = embedder
+        self.top_k = top_k
+        self.mmr_lambda = mmr_lambda
+        self.fetch_k = fetch_k or top_k * 4
+        self.cache_dir = cache_dir
+        self.fingerprint = self._fingerprint()
+        self.matrix = self._load_or_build_matrix()
+
+    def _fingerprint(self) -> str:
+        """Hash of the example set and embedding model; changes invalidate the cache"""
+        payload = json.dumps(
+            {
+                "model": getattr(self.embedder, "model", type(self.embedder).__name__),
+                "questions": [example["question"] for example in self.examples],
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Location of the cached embedding matrix"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"cypher_examples_{self.fingerprint[:16]}.npy")
+
+    def _load_or_build_matrix(self) -> np.ndarray:
+        """Load the normalized example matrix from disk or embed all examples"""
+        path = self.cache_path
+        if path and os.path.exists(path):
+            try:
+                matrix = np.load(path)
+                if matrix.shape[0] == len(self.examples):
+                    logger.info(f"Loaded {matrix.shape[0]} cached example embeddings from {path}")
+                    return matrix
+                logger.warning(f"Ignoring stale example embedding cache at {path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read example embedding cache {path}: {e}")
+
+        if not self.examples:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        vectors = [self.embedder.embed_query(example["question"]) for example in self.examples]
+        matrix = self._normalize(np.asarray(vectors, dtype=np.float32))
+        logger.info(f"Embedded {len(self.examples)} Cypher examples")
+
+        if path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, matrix)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write example embedding cache {path}: {e}")
+
+        return matrix
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot products are cosine similarities"""
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _mmr(self, query_vector: np.ndarray, candidates: np.ndarray, k: int) -> List[int]:
+        """Pick k candidate indices with Maximal Marginal Relevance"""
+        relevance = self.matrix[candidates] @ query_vector
+        candidate_vectors = self.matrix[candidates]
+        pairwise = candidate_vectors @ candidate_vectors.T
+
+        selected: List[int] = []
+        remaining = list(range(len(candidates)))
+        while remaining and len(selected) < k:
+            if selected:
+                redundancy = pairwise[np.ix_(remaining, selected)].max(axis=1)
+            else:
+                redundancy = np.zeros(len(remaining), dtype=np.float32)
+            scores = self.mmr_lambda * relevance[remaining] - (1 - self.mmr_lambda) * redundancy
+            best = remaining[int(np.argmax(scores))]
+            selected.append(best)
+            remaining.remove(best)
+
+        return [int(candidates[i]) for i in selected]
+
+    def _embed(self, query_text: str) -> np.ndarray:
+        return self._normalize(
+            np.asarray(self.embedder.embed_query(query_text), dtype=np.float32)
+        )
+
+    def similarities(self, query_text: str) -> np.ndarray:
+        """Cosine similarity between a question and every example, in example order"""
+        if not self.examples:
+            return np.zeros(0, dtype=np.float32)
+        return self.matrix @ self._embed(query_text)
+
+    def select(self, query_text: str, k: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Return the examples most relevant to a question
+
+        Args:
+            query_text: The natural language question
+            k: Number of examples (defaults to top_k)
+
+        Returns:
+            Selected examples, most relevant first
+        """
+        k = k or self.top_k
+        if len(self.examples) <= k:
+            return list(self.examples)
+
+        query_vector = self._embed(query_text)
+        similarities = self.matrix @ query_vector
+
+        fetch_k = min(max(self.fetch_k, k), len(self.examples))
+        candidates = np.argpartition(-similarities, fetch_k - 1)[:fetch_k]
+        candidates = candidates[np.argsort(-similarities[candidates])]
+
+        return [self.examples[i] for i in self._mmr(query_vector, candidates, k)]
+
+    def select_formatted(self, query_text: str, k: Optional[int] = None) -> str:
+        """Return the selected examples formatted for the Text2Cypher prompt"""
+        return "\n\n".join(format_example(example) for example in self.select(query_text, k))
@@ -0,0 +1,81 @@
+"""
+Aho-Corasick keyword automaton for routing questions to query templates
+
+All template keywords are compiled once into a single automaton, so a question
+is scanned in one pass regardless of how many templates or keywords exist,
+instead of running a chain of `keyword in question` checks per template.
+Keywords match as substrings, like the `in` checks they replace.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class KeywordAutomaton:
+    """Finds every occurrence of a fixed keyword set in a text in a single pass"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the automaton
+
+        Args:
+            keywords: Keywords to match (case-insensitive)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[str]] = [set()]
+        self.keywords: Set[str] = set()
+
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword:
+                self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].add(keyword)
+        self.keywords.add(keyword)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the keywords that occur in the text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matched keywords (lowercased)
+        """
+        found: Set[str] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found |= self._output[state]
+        return found
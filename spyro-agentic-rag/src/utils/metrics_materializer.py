@@ -0,0 +1,348 @@
+"""
+Materialized business metrics for dashboard-style questions
+
+Several hot questions (ARR by customer success score, team cost-to-revenue,
+roadmap items at risk, risks per objective) aggregate over every customer,
+subscription or team on each request. This module computes those rollups on a
+schedule and stores them in the graph as summary nodes, so queries read a
+handful of precomputed rows instead of scanning the entity graph:
+
+    (:MetricSummary {name, description, computed_at, compute_ms, row_count, ...totals})
+        -[:HAS_ROW]->(:MetricRow {metric, rank, ...columns})
+
+Summary nodes deliberately do not carry the __Entity__ label, so vector,
+hybrid and entity queries never see them. `computed_at` lets readers check
+freshness and fall back to the full query when a summary is missing or stale.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from neo4j import Driver
+
+from .neo4j_driver import read_session
+
+logger = logging.getLogger(__name__)
+
+# Subscription values are strings like "$8M", "$250K" or plain numbers
+_ARR_VALUE = """CASE
+            WHEN sub IS NULL OR sub.value IS NULL THEN 0.0
+            WHEN toString(sub.value) CONTAINS 'M' THEN coalesce(toFloat(replace(replace(replace(toString(sub.value), '$', ''), ',', ''), 'M', '')), 0.0) * 1000000
+            WHEN toString(sub.value) CONTAINS 'K' THEN coalesce(toFloat(replace(replace(replace(toString(sub.value), '$', ''), ',', ''), 'K', '')), 0.0) * 1000
+            ELSE coalesce(toFloat(replace(replace(toString(sub.value), '$', ''), ',', '')), 0.0)
+        END"""
+
+# Roadmap statuses counted as at risk
+AT_RISK_STATUSES = {"at_risk", "behind_schedule", "delayed", "blocked"}
+
+Rows = List[Dict[str, Any]]
+
+
+@dataclass
+class MetricDefinition:
+    """An aggregate query and how to turn its rows into summary totals and rows"""
+    name: str
+    description: str
+    query: str
+    summarize: Callable[[Rows], Tuple[Dict[str, Any], Rows]]
+
+
+def _pct(part: float, whole: float) -> float:
+    return round(part * 100.0 / whole, 2) if whole else 0.0
+
+
+def _summarize_arr_by_score(rows: Rows) -> Tuple[Dict[str, Any], Rows]:
+    total_arr = sum(row["arr"] or 0.0 for row in rows)
+    scored = sorted((row for row in rows if row["band"] is not None), key=lambda row: row["band"])
+
+    out_rows, cumulative = [], 0.0
+    for row in scored:
+        cumulative += row["arr"] or 0.0
+        out_rows.append({
+            "band_min": row["band"],
+            "band_max": row["band"] + 10,
+            "arr": row["arr"],
+            "customers": row["customers"],
+            "pct_of_total_arr": _pct(row["arr"] or 0.0, total_arr),
+            # ARR of customers scoring below band_max
+            "cumulative_arr": cumulative,
+            "cumulative_pct": _pct(cumulative, total_arr),
+        })
+
+    totals: Dict[str, Any] = {
+        "total_arr": total_arr,
+        "customers": sum(row["customers"] for row in rows),
+        "unscored_customers": sum(row["customers"] for row in rows if row["band"] is None),
+    }
+    for threshold in (50, 60, 70, 80, 90):
+        below = sum((row["arr"] or 0.0 for row in scored if row["band"] + 10 <= threshold), 0.0)
+        totals[f"arr_below_{threshold}"] = below
+        totals[f"pct_arr_below_{threshold}"] = _pct(below, total_arr)
+    return totals, out_rows
+
+
+def _summarize_team_costs(rows: Rows) -> Tuple[Dict[str, Any], Rows]:
+    out_rows = []
+    for row in rows:
+        cost, revenue = row["monthly_cost"] or 0.0, row["revenue_supported"] or 0.0
+        out_rows.append({
+            "team": row["team"],
+            "monthly_cost": cost,
+            "revenue_supported": revenue,
+            "cost_to_revenue_pct": _pct(cost, revenue) if revenue else None,
+        })
+    out_rows.sort(key=lambda row: (row["cost_to_revenue_pct"] is None, -(row["cost_to_revenue_pct"] or 0.0)))
+
+    total_cost = sum(row["monthly_cost"] for row in out_rows)
+    total_revenue = sum(row["revenue_supported"] for row in out_rows)
+    return {
+        "teams": len(out_rows),
+        "total_monthly_cost": total_cost,
+        "total_revenue_supported": total_revenue,
+        "cost_to_revenue_pct": _pct(total_cost, total_revenue),
+    }, out_rows
+
+
+def _summarize_roadmap(rows: Rows) -> Tuple[Dict[str, Any], Rows]:
+    total = sum(row["items"] for row in rows)
+    at_risk = sum(row["items"] for row in rows if row["status"] in AT_RISK_STATUSES)
+    out_rows = [
+        {"status": row["status"], "items": row["items"], "pct_of_items": _pct(row["items"], total)}
+        for row in sorted(rows, key=lambda row: -row["items"])
+    ]
+    return {
+        "total_items": total,
+        "at_risk_items": at_risk,
+        "at_risk_pct": _pct(at_risk, total),
+        "completed_items": sum(row["items"] for row in rows if row["status"] == "completed"),
+    }, out_rows
+
+
+def _summarize_objective_risks(rows: Rows) -> Tuple[Dict[str, Any], Rows]:
+    out_rows = sorted(rows, key=lambda row: (-row["risk_count"], -row["high_severity_risks"]))
+    return {
+        "objectives": len(rows),
+        "objectives_at_risk": sum(1 for row in rows if row["risk_count"] > 0),
+        "total_risks": sum(row["risk_count"] for row in rows),
+        "high_severity_risks": sum(row["high_severity_risks"] for row in rows),
+        "total_impact_amount": sum(row["impact_amount"] or 0.0 for row in rows),
+    }, out_rows
+
+
+METRICS: List[MetricDefinition] = [
+    MetricDefinition(
+        name="arr_by_success_score",
+        description="Customer ARR grouped into success score bands of 10 points",
+        query=f"""
+        MATCH (c:__Entity__:CUSTOMER)
+        OPTIONAL MATCH (c)-[:SUBSCRIBES_TO]->(sub)
+        WITH c, sum({_ARR_VALUE}) AS arr
+        OPTIONAL MATCH (c)-[:HAS_SUCCESS_SCORE]->(s)
+        WITH c, arr, max(toFloat(coalesce(s.score, s.value))) AS score
+        WITH CASE
+                 WHEN score IS NULL THEN null
+                 WHEN score >= 100 THEN 90
+                 ELSE toInteger(floor(score / 10)) * 10
+             END AS band, arr, c
+        RETURN band, sum(arr) AS arr, count(c) AS customers
+        """,
+        summarize=_summarize_arr_by_score
+    ),
+    MetricDefinition(
+        name="team_cost_to_revenue",
+        description="Monthly team cost as a percentage of the revenue each team supports",
+        query="""
+        MATCH (t:__Entity__:TEAM)
+        WITH t.name AS team,
+             toFloat(coalesce(t.monthly_cost, t.operational_cost)) AS monthly_cost,
+             toFloat(t.revenue_supported) AS revenue_supported
+        WHERE monthly_cost IS NOT NULL OR revenue_supported IS NOT NULL
+        RETURN team, monthly_cost, revenue_supported
+        """,
+        summarize=_summarize_team_costs
+    ),
+    MetricDefinition(
+        name="roadmap_status",
+        description="Roadmap items per status and the share at risk or behind schedule",
+        query="""
+        MATCH (ri:__Entity__:ROADMAP_ITEM)
+        RETURN coalesce(toLower(toString(ri.status)), 'unknown') AS status, count(ri) AS items
+        """,
+        summarize=_summarize_roadmap
+    ),
+    MetricDefinition(
+        name="objective_risks",
+        description="Risks, active risks, high severity risks and impact per company objective",
+        query="""
+        MATCH (o:__Entity__:OBJECTIVE)
+        OPTIONAL MATCH (o)-[:AT_RISK|AT_RISK_FROM]->(r)
+        WITH o, collect(DISTINCT r) AS risks
+        RETURN o.name AS objective,
+               o.status AS status,
+               size(risks) AS risk_count,
+               size([r IN risks WHERE toLower(toString(coalesce(r.status, ''))) = 'active']) AS active_risks,
+               size([r IN risks WHERE toLower(toString(coalesce(r.severity, ''))) IN ['high', 'critical']]) AS high_severity_risks,
+               reduce(total = 0.0, r IN risks | total + coalesce(toFloat(r.impact_amount), 0.0)) AS impact_amount
+        """,
+        summarize=_summarize_objective_risks
+    ),
+]
+
+
+class MetricsMaterializer:
+    """Computes METRICS into summary nodes, on demand or on a schedule"""
+
+    def __init__(
+        self,
+        driver: Driver,
+        database: Optional[str] = None,
+        max_age_seconds: float = 900,
+        metrics: Optional[List[MetricDefinition]] = None
+    ):
+        """
+        Initialize the materializer
+
+        Args:
+            driver: Neo4j driver
+            database: Neo4j database name
+            max_age_seconds: Summaries older than this are recomputed by refresh_stale
+            metrics: Metric definitions (defaults to METRICS)
+        """
+        self.driver = driver
+        self.database = database
+        self.max_age_seconds = max_age_seconds
+        self.metrics = {metric.name: metric for metric in (metrics or METRICS)}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._schema_ready = False
+
+    def ensure_schema(self) -> None:
+        """Create the summary constraint and row index if missing"""
+        if self._schema_ready:
+            return
+        with self.driver.session(database=self.database) as session:
+            session.run(
+                "CREATE CONSTRAINT metric_summary_name IF NOT EXISTS "
+                "FOR (m:MetricSummary) REQUIRE m.name IS UNIQUE"
+            ).consume()
+            session.run(
+                "CREATE INDEX metric_row_metric IF NOT EXISTS FOR (r:MetricRow) ON (r.metric)"
+            ).consume()
+        self._schema_ready = True
+
+    def _write(self, metric: MetricDefinition, totals: Dict[str, Any], rows: Rows, compute_ms: float) -> None:
+        # Neo4j properties cannot hold nulls; dropping them leaves the property unset
+        totals = {key: value for key, value in totals.items() if value is not None}
+        rows = [
+            dict({key: value for key, value in row.items() if value is not None}, rank=rank, metric=metric.name)
+            for rank, row in enumerate(rows, start=1)
+        ]
+
+        def write(tx):
+            tx.run(
+                """
+                MERGE (m:MetricSummary {name: $name})
+                WITH m
+                OPTIONAL MATCH (m)-[:HAS_ROW]->(old:MetricRow)
+                DETACH DELETE old
+                """,
+                name=metric.name
+            ).consume()
+            tx.run(
+                """
+                MATCH (m:MetricSummary {name: $name})
+                SET m = $totals,
+                    m.name = $name,
+                    m.description = $description,
+                    m.computed_at = datetime(),
+                    m.compute_ms = $compute_ms,
+                    m.row_count = size($rows)
+                WITH m
+                UNWIND $rows AS row
+                CREATE (m)-[:HAS_ROW]->(r:MetricRow)
+                SET r = row
+                """,
+                name=metric.name, totals=totals, description=metric.description,
+                compute_ms=round(compute_ms, 1), rows=rows
+            ).consume()
+
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(write)
+
+    def refresh(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Recompute metrics now
+
+        Call after bulk data loads so summaries reflect the new data immediately.
+
+        Args:
+            names: Metrics to recompute (defaults to all)
+
+        Returns:
+            Mapping of metric name to compute time in ms, or the error message
+        """
+        self.ensure_schema()
+        results: Dict[str, Any] = {}
+        for name in names or list(self.metrics):
+            metric = self.metrics[name]
+            start = time.monotonic()
+            try:
+                with read_session(self.driver, self.database) as session:
+                    records = session.execute_read(lambda tx: tx.run(metric.query).data())
+                totals, rows = metric.summarize(records)
+                compute_ms = (time.monotonic() - start) * 1000
+                self._write(metric, totals, rows, compute_ms)
+                results[name] = round(compute_ms, 1)
+                logger.info(f"Materialized metric {name}: {len(rows)} rows in {compute_ms:.0f}ms")
+            except Exception as e:
+                logger.error(f"Failed to materialize metric {name}: {e}")
+                results[name] = f"error: {e}"
+        return results
+
+    def freshness(self) -> Dict[str, Optional[float]]:
+        """Age in seconds of every known metric (None if never computed)"""
+        with read_session(self.driver, self.database) as session:
+            records = session.execute_read(lambda tx: tx.run(
+                """
+                MATCH (m:MetricSummary)
+                RETURN m.name AS name, duration.inSeconds(m.computed_at, datetime()).seconds AS age
+                """
+            ).data())
+        ages = {record["name"]: record["age"] for record in records}
+        return {name: ages.get(name) for name in self.metrics}
+
+    def refresh_stale(self) -> Dict[str, Any]:
+        """Recompute metrics that are missing or older than max_age_seconds"""
+        stale = [
+            name for name, age in self.freshness().items()
+            if age is None or age >= self.max_age_seconds
+        ]
+        return self.refresh(stale) if stale else {}
+
+    def start(self, interval_seconds: float) -> None:
+        """Refresh stale metrics in a background thread every interval"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.refresh_stale()
+                except Exception as e:
+                    logger.error(f"Metrics refresh failed: {e}")
+                self._stop.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=run, name="metrics-materializer", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics materializer started (every {interval_seconds:.0f}s)")
+
+    def stop(self) -> None:
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -166,6 +166,21 @@ Properties: description, promise_date, status, completion_percentage, revenue_at
 Relationships:
 - (CUSTOMER)-[:HAS_COMMITMENT]->(COMMITMENT)
 
+### Materialized Metrics (not __Entity__ nodes)
+
+Precomputed by the metrics job; computed_at holds the refresh time.
+(MetricSummary)-[:HAS_ROW]->(MetricRow): a summary is found by its name property; each
+row has metric (the summary name), rank and the columns listed below.
+
+- arr_by_success_score: total_arr, customers, arr_below_N / pct_arr_below_N for N in 50..90;
+  rows: band_min, band_max, arr, customers, pct_of_total_arr, cumulative_arr, cumulative_pct
+- team_cost_to_revenue: teams, total_monthly_cost, total_revenue_supported, cost_to_revenue_pct;
+  rows (highest ratio first): team, monthly_cost, revenue_supported, cost_to_revenue_pct
+- roadmap_status: total_items, at_risk_items, at_risk_pct, completed_items;
+  rows: status, items, pct_of_items
+- objective_risks: objectives, objectives_at_risk, total_risks, high_severity_risks, total_impact_amount;
+  rows (most risks first): objective, status, risk_count, active_risks, high_severity_risks, impact_amount
+
 ## Key Query Patterns
 
 ### Financial Calculations
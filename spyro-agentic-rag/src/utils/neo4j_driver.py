@@ -0,0 +1,182 @@
+"""
+Process-wide Neo4j driver registry
+
+Agents used to create their own GraphDatabase.driver with default pool
+settings, so each API worker held several independent pools and every first
+query paid for TCP/TLS setup and authentication. Agents now acquire a shared
+driver per (uri, user), configured from Config, and release it on close; the
+driver is closed when its last user releases it.
+
+A newly created driver is warmed up by verifying connectivity and opening a
+few connections up front, so the pool is ready before the first query.
+"""
+
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from neo4j import READ_ACCESS, Driver, GraphDatabase, Session
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _SharedDriver:
+    driver: Driver
+    uri: str
+    settings: Dict[str, Any]
+    references: int = 0
+    created_at: float = field(default_factory=time.time)
+    warmup_ms: Optional[float] = None
+
+
+class DriverRegistry:
+    """Reference-counted shared Neo4j drivers"""
+
+    def __init__(self):
+        self._drivers: Dict[Tuple[str, str], _SharedDriver] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _settings(config: Config) -> Dict[str, Any]:
+        return {
+            "max_connection_pool_size": config.neo4j_max_pool_size,
+            "connection_acquisition_timeout": config.neo4j_connection_acquisition_timeout,
+            "liveness_check_timeout": config.neo4j_liveness_check_timeout,
+            "max_connection_lifetime": config.neo4j_max_connection_lifetime,
+            "connection_timeout": config.neo4j_connection_timeout,
+        }
+
+    def acquire(self, config: Config) -> Driver:
+        """
+        Return the shared driver for the configured database, creating it if needed
+
+        Every acquire must be paired with a release.
+
+        Args:
+            config: Application configuration
+
+        Returns:
+            A neo4j.Driver shared with other users of the same uri and user
+        """
+        key = (config.neo4j_uri, config.neo4j_username)
+        with self._lock:
+            shared = self._drivers.get(key)
+            if shared is None:
+                settings = self._settings(config)
+                driver = GraphDatabase.driver(
+                    config.neo4j_uri,
+                    auth=(config.neo4j_username, config.neo4j_password),
+                    **settings
+                )
+                shared = _SharedDriver(driver=driver, uri=config.neo4j_uri, settings=settings)
+                self._drivers[key] = shared
+                logger.info(
+                    f"Created shared Neo4j driver for {config.neo4j_uri} "
+                    f"(pool size {settings['max_connection_pool_size']})"
+                )
+                if config.neo4j_warmup_connections > 0:
+                    shared.warmup_ms = self._warm_up(
+                        driver, config.neo4j_database, config.neo4j_warmup_connections
+                    )
+            shared.references += 1
+            return shared.driver
+
+    def release(self, driver: Optional[Driver]) -> None:
+        """Drop one reference to a shared driver, closing it when unused"""
+        if driver is None:
+            return
+        with self._lock:
+            for key, shared in self._drivers.items():
+                if shared.driver is driver:
+                    shared.references -= 1
+                    if shared.references <= 0:
+                        del self._drivers[key]
+                        driver.close()
+                        logger.info(f"Closed shared Neo4j driver for {shared.uri}")
+                    return
+        # Not a registry driver (e.g. created by a script); close it directly
+        driver.close()
+
+    @staticmethod
+    def _warm_up(driver: Driver, database: str, connections: int) -> Optional[float]:
+        """Verify connectivity and open `connections` pooled connections"""
+        start = time.monotonic()
+        try:
+            driver.verify_connectivity()
+            # Transactions hold their connection until closed, so keeping them
+            # open together forces the pool to establish distinct connections
+            with ExitStack() as stack:
+                for _ in range(connections):
+                    session = stack.enter_context(driver.session(database=database))
+                    tx = stack.enter_context(session.begin_transaction())
+                    tx.run("RETURN 1").consume()
+        except Exception as e:
+            logger.warning(f"Neo4j warm-up failed, connections will be opened on demand: {e}")
+            return None
+        warmup_ms = (time.monotonic() - start) * 1000
+        logger.info(f"Warmed up {connections} Neo4j connections in {warmup_ms:.0f}ms")
+        return round(warmup_ms, 1)
+
+    @staticmethod
+    def _pool_usage(driver: Driver) -> Dict[str, Dict[str, int]]:
+        """Open and in-use connections per server, read from the driver's pool"""
+        pool = getattr(driver, "_pool", None)
+        if pool is None:
+            return {}
+        usage = {}
+        try:
+            with pool.lock:
+                addresses = list(pool.connections.keys())
+                totals = {address: len(pool.connections[address]) for address in addresses}
+            for address in addresses:
+                usage[str(address)] = {
+                    "open": totals[address],
+                    "in_use": pool.in_use_connection_count(address)
+                }
+        except Exception as e:
+            logger.debug(f"Could not read Neo4j pool usage: {e}")
+        return usage
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool settings, references and connection usage for every shared driver"""
+        with self._lock:
+            drivers = list(self._drivers.values())
+        return {
+            "drivers": [
+                {
+                    "uri": shared.uri,
+                    "references": shared.references,
+                    "created_at": shared.created_at,
+                    "warmup_ms": shared.warmup_ms,
+                    "settings": shared.settings,
+                    "connections": self._pool_usage(shared.driver)
+                }
+                for shared in drivers
+            ]
+        }
+
+
+# Process-wide registry used by the agents and the API
+driver_registry = DriverRegistry()
+
+
+def acquire_driver(config: Config) -> Driver:
+    """Shared driver for the configured database (pair with release_driver)"""
+    return driver_registry.acquire(config)
+
+
+def release_driver(driver: Optional[Driver]) -> None:
+    """Release a driver obtained from acquire_driver"""
+    driver_registry.release(driver)
+
+
+def read_session(driver: Driver, database: Optional[str] = None) -> Session:
+    """Session routed to readers (followers on a cluster when using neo4j://)"""
+    return driver.session(database=database, default_access_mode=READ_ACCESS)
+
@@ -0,0 +1,197 @@
+"""
+Compact tabular encoding of Cypher results for agent tool observations
+
+Records are rendered as a single header line plus one pipe-separated line per
+row, with type-aware value formatting, instead of indented JSON. Output is kept
+under a token budget; when rows are dropped a truncation summary (row counts and
+numeric column totals) is appended so aggregations stay answerable.
+"""
+
+import math
+import re
+from typing import Any, Iterable, List, Mapping, Optional
+
+# Rough characters-per-token ratio for OpenAI tokenizers on tabular text
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_RETURN_RE = re.compile(r"\bRETURN\b", re.IGNORECASE)
+_TRAILING_LIMIT_RE = re.compile(r"\bLIMIT\s+(\d+)\s*$", re.IGNORECASE)
+_LIMIT_RE = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+_UNION_RE = re.compile(r"\bUNION\b", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def inject_limit(cypher: str, limit: int) -> str:
+    """
+    Cap the rows returned by a read query
+
+    Appends LIMIT to a query whose final clause is RETURN, or lowers an existing
+    trailing literal LIMIT. Queries where the cap cannot be applied safely
+    (UNION, parameterized LIMIT, RETURN inside a trailing subquery) are unchanged.
+
+    Args:
+        cypher: Generated Cypher query
+        limit: Maximum number of rows
+
+    Returns:
+        The query with a server-side LIMIT applied where possible
+    """
+    query = cypher.strip().rstrip(";").rstrip()
+    if _UNION_RE.search(query):
+        return cypher
+
+    returns = list(_RETURN_RE.finditer(query))
+    if not returns:
+        return cypher
+    tail = query[returns[-1].start():]
+    if tail.count("}") > tail.count("{"):
+        return cypher
+
+    existing = _TRAILING_LIMIT_RE.search(tail)
+    if existing:
+        if int(existing.group(1)) <= limit:
+            return query
+        return query[:len(query) - len(tail) + existing.start()] + f"LIMIT {limit}"
+    if _LIMIT_RE.search(tail):
+        return query
+
+    return f"{query}\nLIMIT {limit}"
+
+
+def _format_number(value: float) -> str:
+    if math.isnan(value) or math.isinf(value):
+        return str(value)
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    if abs(value) >= 1:
+        return f"{value:.2f}".rstrip("0").rstrip(".")
+    return f"{value:.4g}"
+
+
+def format_value(value: Any, max_chars: int = 200) -> str:
+    """Render a Neo4j/Python value as a short table cell"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return _format_number(value)
+
+    # Nodes: prefer the name, otherwise label plus a few properties
+    if hasattr(value, "labels") and hasattr(value, "items"):
+        props = dict(value.items())
+        if "name" in props:
+            text = str(props["name"])
+        else:
+            label = next(iter(value.labels), "Node")
+            text = f"{label}{{" + ", ".join(
+                f"{k}: {format_value(v, 40)}" for k, v in list(props.items())[:4]
+            ) + "}"
+    # Relationships
+    elif hasattr(value, "type") and hasattr(value, "start_node"):
+        text = value.type
+    # Neo4j temporal values and Python dates
+    elif hasattr(value, "iso_format"):
+        text = value.iso_format()
+    elif hasattr(value, "isoformat"):
+        text = value.isoformat()
+    elif isinstance(value, (list, tuple)):
+        shown = [format_value(v, 40) for v in value[:10]]
+        if len(value) > 10:
+            shown.append(f"+{len(value) - 10} more")
+        text = "[" + "; ".join(shown) + "]"
+    elif isinstance(value, Mapping):
+        text = "{" + ", ".join(f"{k}: {format_value(v, 40)}" for k, v in value.items()) + "}"
+    else:
+        text = str(value)
+
+    text = _WHITESPACE_RE.sub(" ", text).replace("|", "/").strip()
+    if len(text) > max_chars:
+        text = text[:max_chars - 1] + "…"
+    return text
+
+
+def _columns(records: List[Mapping]) -> List[str]:
+    columns: List[str] = []
+    for record in records:
+        for key in record.keys():
+            if key not in columns:
+                columns.append(key)
+    return columns
+
+
+def _numeric_summary(records: List[Mapping], columns: List[str]) -> List[str]:
+    """Totals for numeric columns, so truncated aggregations stay usable"""
+    summary = []
+    for column in columns:
+        values = [
+            record.get(column) for record in records
+            if isinstance(record.get(column), (int, float)) and not isinstance(record.get(column), bool)
+        ]
+        if values and len(values) == sum(1 for record in records if record.get(column) is not None):
+            summary.append(
+                f"{column}: sum={_format_number(float(sum(values)))}, "
+                f"min={_format_number(float(min(values)))}, max={_format_number(float(max(values)))}"
+            )
+    return summary
+
+
+def encode_records(
+    records: Iterable[Any],
+    max_rows: Optional[int] = None,
+    token_budget: int = 1500,
+    max_cell_chars: int = 200
+) -> str:
+    """
+    Encode query records as a compact table within a token budget
+
+    Args:
+        records: neo4j.Record objects or dictionaries
+        max_rows: Row cap used for the query; more records than this means the
+            result was cut server-side
+        token_budget: Approximate maximum tokens for the output
+        max_cell_chars: Maximum characters per cell
+
+    Returns:
+        Header line, one line per row and an optional truncation summary
+    """
+    rows: List[Mapping] = [dict(record.items()) if hasattr(record, "items") else record for record in records]
+    if not rows:
+        return "No rows returned."
+
+    limit_reached = max_rows is not None and len(rows) > max_rows
+    if limit_reached:
+        rows = rows[:max_rows]
+
+    columns = _columns(rows)
+    header = " | ".join(columns)
+    lines = [header]
+    used = estimate_tokens(header)
+    # Keep room for the truncation summary
+    budget = token_budget - 60 - 15 * len(columns)
+
+    for row in rows:
+        line = " | ".join(format_value(row.get(column), max_cell_chars) for column in columns)
+        cost = estimate_tokens(line)
+        if used + cost > budget and len(lines) > 1:
+            break
+        lines.append(line)
+        used += cost
+
+    shown = len(lines) - 1
+    if shown < len(rows) or limit_reached:
+        total = f"more than {len(rows)}" if limit_reached else str(len(rows))
+        lines.append(f"[truncated: showing {shown} of {total} rows]")
+        summary = _numeric_summary(rows, columns)
+        if summary and len(rows) > 1:
+            lines.append(f"[totals over {len(rows)} fetched rows: " + "; ".join(summary) + "]")
+
+    return "\n".join(lines)
+
@@ -0,0 +1,309 @@
+"""
+Token, latency and cost accounting from provider usage metadata
+
+Every LLM and embedding call made while serving a request is recorded into the
+request's RequestUsage (found through a context variable), using the token
+counts the provider returns rather than estimates:
+
+- LangChain chat models (the agent loop) report through UsageCallbackHandler
+- OpenAI clients used by neo4j_graphrag (Text2Cypher, GraphRAG answers,
+  embeddings) are wrapped with instrument_openai_client
+
+Finished requests are kept in a bounded window by UsageCollector, which
+computes percentiles for the /usage endpoint.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+# USD per 1K tokens (prompt, completion); matched by longest model-name prefix
+MODEL_PRICING: Dict[str, tuple] = {
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4.1-mini": (0.0004, 0.0016),
+    "gpt-4.1": (0.002, 0.008),
+    "gpt-4": (0.03, 0.06),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "text-embedding-3-small": (0.00002, 0.0),
+    "text-embedding-3-large": (0.00013, 0.0),
+    "text-embedding-ada-002": (0.0001, 0.0),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Price a call from the pricing table (0.0 for unknown models)"""
+    matches = [name for name in MODEL_PRICING if model and model.startswith(name)]
+    if not matches:
+        return 0.0
+    prompt_rate, completion_rate = MODEL_PRICING[max(matches, key=len)]
+    return prompt_tokens / 1000 * prompt_rate + completion_tokens / 1000 * completion_rate
+
+
+@dataclass
+class UsageRecord:
+    """One LLM or embedding call"""
+    kind: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    cost_usd: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class RequestUsage:
+    """All calls made while serving one request"""
+    request_id: Optional[str] = None
+    records: List[UsageRecord] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+    duration_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, record: UsageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(record.prompt_tokens for record in self.records)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(record.completion_tokens for record in self.records)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(record.cost_usd for record in self.records)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus a per-kind breakdown for response metadata"""
+        with self._lock:
+            records = list(self.records)
+        by_kind: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            entry = by_kind.setdefault(record.kind, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "latency_ms": 0.0, "cost_usd": 0.0, "models": []
+            })
+            entry["calls"] += 1
+            entry["prompt_tokens"] += record.prompt_tokens
+            entry["completion_tokens"] += record.completion_tokens
+            entry["latency_ms"] = round(entry["latency_ms"] + record.latency_ms, 1)
+            entry["cost_usd"] = round(entry["cost_usd"] + record.cost_usd, 6)
+            if record.model not in entry["models"]:
+                entry["models"].append(record.model)
+        return {
+            "llm_calls": len(records),
+            "prompt_tokens": sum(r.prompt_tokens for r in records),
+            "completion_tokens": sum(r.completion_tokens for r in records),
+            "total_tokens": sum(r.total_tokens for r in records),
+            "cost_usd": round(sum(r.cost_usd for r in records), 6),
+            "by_kind": by_kind
+        }
+
+
+_current_usage: contextvars.ContextVar[Optional[RequestUsage]] = contextvars.ContextVar(
+    "current_usage", default=None
+)
+
+
+# Lets a caller label the LLM calls made inside a block (e.g. "text2cypher")
+_kind_override: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "usage_kind", default=None
+)
+
+
+@contextmanager
+def usage_kind(kind: str) -> Iterator[None]:
+    """Attribute chat completions made inside the block to the given kind"""
+    token = _kind_override.set(kind)
+    try:
+        yield
+    finally:
+        _kind_override.reset(token)
+
+
+def current_usage() -> Optional[RequestUsage]:
+    """Usage of the request being served in this context, if any"""
+    return _current_usage.get()
+
+
+def record_usage(kind: str, model: str, prompt_tokens: int, completion_tokens: int, latency_ms: float) -> None:
+    """Record a call against the current request (no-op outside a tracked request)"""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    usage.add(UsageRecord(
+        kind=kind,
+        model=model or "unknown",
+        prompt_tokens=prompt_tokens or 0,
+        completion_tokens=completion_tokens or 0,
+        latency_ms=round(latency_ms, 1),
+        cost_usd=estimate_cost(model, prompt_tokens or 0, completion_tokens or 0)
+    ))
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 6)
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 6)}
+
+
+class UsageCollector:
+    """Keeps recent request usage and reports percentiles"""
+
+    def __init__(self, window: int = 1000):
+        self._requests: Deque[RequestUsage] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.total_requests = 0
+
+    @contextmanager
+    def track(self, request_id: Optional[str] = None) -> Iterator[RequestUsage]:
+        """Collect usage for every call made inside the block"""
+        usage = RequestUsage(request_id=request_id)
+        token = _current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_usage.reset(token)
+            usage.duration_ms = (time.monotonic() - usage.started_at) * 1000
+            with self._lock:
+                self._requests.append(usage)
+                self.total_requests += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Percentiles over the recent window, per request and per call kind"""
+        with self._lock:
+            requests = list(self._requests)
+            total_requests = self.total_requests
+
+        calls_by_kind: Dict[str, List[UsageRecord]] = {}
+        for usage in requests:
+            for record in usage.records:
+                calls_by_kind.setdefault(record.kind, []).append(record)
+
+        return {
+            "requests_total": total_requests,
+            "requests_in_window": len(requests),
+            "per_request": {
+                "latency_ms": _percentiles([u.duration_ms for u in requests]),
+                "total_tokens": _percentiles([float(u.total_tokens) for u in requests]),
+                "cost_usd": _percentiles([u.cost_usd for u in requests]),
+                "llm_calls": _percentiles([float(len(u.records)) for u in requests])
+            },
+            "per_call_kind": {
+                kind: {
+                    "calls": len(records),
+                    "latency_ms": _percentiles([r.latency_ms for r in records]),
+                    "prompt_tokens": _percentiles([float(r.prompt_tokens) for r in records]),
+                    "completion_tokens": _percentiles([float(r.completion_tokens) for r in records]),
+                    "cost_usd_total": round(sum(r.cost_usd for r in records), 6)
+                }
+                for kind, records in calls_by_kind.items()
+            },
+            "most_expensive": [
+                {"request_id": u.request_id, "cost_usd": round(u.cost_usd, 6),
+                 "total_tokens": u.total_tokens, "latency_ms": round(u.duration_ms, 1)}
+                for u in sorted(requests, key=lambda u: u.cost_usd, reverse=True)[:5]
+            ]
+        }
+
+
+# Process-wide collector shared by the agents and the API
+usage_collector = UsageCollector()
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """LangChain callback recording provider token usage for chat model calls"""
+
+    def __init__(self, kind: str = "agent"):
+        self.kind = kind
+        self._started: Dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.monotonic()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[Any], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.monotonic()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        latency_ms = (time.monotonic() - started) * 1000 if started else 0.0
+        llm_output = response.llm_output or {}
+        token_usage = llm_output.get("token_usage") or {}
+        record_usage(
+            self.kind,
+            llm_output.get("model_name", ""),
+            token_usage.get("prompt_tokens", 0),
+            token_usage.get("completion_tokens", 0),
+            latency_ms
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+
+
+def instrument_openai_client(client: Any, kind: str) -> Any:
+    """
+    Record usage for chat completions and embeddings made through an OpenAI client
+
+    neo4j_graphrag's OpenAILLM/OpenAIEmbeddings discard the usage block of the
+    response, so the client methods are wrapped in place. Safe to call once per
+    client; the client is returned for convenience.
+    """
+    def wrap(resource: Any, call_kind: str) -> None:
+        original = resource.create
+        if getattr(original, "_usage_instrumented", False):
+            return
+
+        def create(*args: Any, **kwargs: Any) -> Any:
+            started = time.monotonic()
+            response = original(*args, **kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                record_usage(
+                    call_kind if call_kind == "embedding" else (_kind_override.get() or call_kind),
+                    getattr(response, "model", None) or kwargs.get("model", ""),
+                    getattr(usage, "prompt_tokens", 0),
+                    getattr(usage, "completion_tokens", 0) or 0,
+                    (time.monotonic() - started) * 1000
+                )
+            return response
+
+        create._usage_instrumented = True
+        resource.create = create
+
+    try:
+        if hasattr(client, "chat"):
+            wrap(client.chat.completions, kind)
+        if hasattr(client, "embeddings"):
+            wrap(client.embeddings, "embedding")
+    except AttributeError as e:
+        logger.warning(f"Could not instrument OpenAI client for usage tracking: {e}")
+    return client
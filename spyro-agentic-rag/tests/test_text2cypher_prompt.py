@@ -0,0 +1,30 @@
+"""
+Check that the Text2Cypher prompt of the v3 agent formats cleanly
+
+Run with: python -m pytest tests/test_text2cypher_prompt.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neo4j_graphrag.generation.prompts import Text2CypherTemplate
+
+from src.utils.cypher_examples_enhanced_v4 import CYPHER_GENERATION_INSTRUCTIONS
+from src.utils.example_formatter import build_text2cypher_prompt
+from src.utils.neo4j_data_model_context_complete import DATA_MODEL_CONTEXT
+
+
+def test_v3_prompt_formats_with_data_model_context():
+    """Literal braces in the data model or instructions would raise KeyError here"""
+    template = build_text2cypher_prompt(DATA_MODEL_CONTEXT, CYPHER_GENERATION_INSTRUCTIONS)
+
+    prompt = Text2CypherTemplate(template=template).format(
+        schema="(:Customer)",
+        examples="Question: How many customers?\nCypher: MATCH (c:Customer) RETURN count(c)",
+        query_text="Which customers are at risk?"
+    )
+
+    assert "MetricSummary" in prompt
+    assert "Which customers are at risk?" in prompt
+    assert "How many customers?" in prompt